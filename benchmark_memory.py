@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for topology model objects.
+
+Reports the heap bytes used per node and per link, measured with
+tracemalloc, for standard and grid node types.
+
+Usage:
+    python benchmark_memory.py                # 10k objects per row
+    python benchmark_memory.py --count 100000 # Closer to a large model
+    python benchmark_memory.py --topology fat_tree --param k=34
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from models import (
+    NetworkModel, NodeModel, NodeType, LinkModel,
+    GridNodeModel, GridNodeType, GridLinkModel, GridLinkType
+)
+from services.topology_generator import generate_topology
+
+
+STANDARD_NODE_TYPES = [NodeType.HOST, NodeType.ROUTER, NodeType.SWITCH]
+GRID_NODE_TYPES = [GridNodeType.RTU, GridNodeType.IED, GridNodeType.CONTROL_CENTER]
+
+
+def _measure(build, count: int) -> float:
+    """Bytes per object retained by build(count)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build(count)
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return (after - before) / count
+
+
+def bytes_per_node(make_node, count: int, with_ports: bool = True) -> float:
+    """Bytes per node; with_ports materialises the default ports."""
+    def build(n):
+        nodes = [make_node() for _ in range(n)]
+        if with_ports:
+            for node in nodes:
+                node.ports
+        return nodes
+    return _measure(build, count)
+
+
+def bytes_per_link(make_link, count: int) -> float:
+    """
+    Bytes per link in a NetworkModel, including indexes and IP assignment.
+
+    The routers the links connect are built (with ports) before measuring.
+    """
+    network = NetworkModel()
+    with network.batch() as batch:
+        routers = [batch.add_node(NodeType.ROUTER) for _ in range(count + 1)]
+    for router in routers:
+        router.ports
+
+    def build(n):
+        with network.batch() as batch:
+            batch.add_links(
+                make_link(routers[i].id, routers[i + 1].id) for i in range(n)
+            )
+        return network
+    return _measure(build, count)
+
+
+def run_benchmark(count: int = 10_000) -> dict[str, float]:
+    """Run all measurements; returns {row label: bytes per object}."""
+    results = {}
+    for node_type in STANDARD_NODE_TYPES:
+        label = node_type.name.lower()
+        results[f"node {label}"] = bytes_per_node(lambda: NodeModel(node_type=node_type), count)
+        results[f"node {label} (ports unused)"] = bytes_per_node(
+            lambda: NodeModel(node_type=node_type), count, with_ports=False
+        )
+    for grid_type in GRID_NODE_TYPES:
+        results[f"grid node {grid_type.name.lower()}"] = bytes_per_node(
+            lambda: GridNodeModel(grid_type=grid_type), count
+        )
+    results["link p2p"] = bytes_per_link(
+        lambda a, b: LinkModel(source_node_id=a, target_node_id=b), count
+    )
+    results["grid link fiber"] = bytes_per_link(
+        lambda a, b: GridLinkModel(source_node_id=a, target_node_id=b, grid_link_type=GridLinkType.FIBER),
+        count
+    )
+    return results
+
+
+def topology_footprint(kind: str, seed: int = 0, **params) -> dict[str, float]:
+    """
+    Whole-model footprint of a generated topology.
+
+    Returns nodes, links, build seconds and total bytes divided by the
+    node and by the link count.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        topology = generate_topology(kind, seed=seed, **params)
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return {
+        "nodes": topology.node_count,
+        "links": topology.link_count,
+        "seconds": elapsed,
+        "bytes per node": used / max(topology.node_count, 1),
+        "bytes per link": used / max(topology.link_count, 1),
+    }
+
+
+def _parse_param(text: str):
+    key, _, value = text.partition("=")
+    for convert in (int, float):
+        try:
+            return key, convert(value)
+        except ValueError:
+            pass
+    return key, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure model memory per node and link")
+    parser.add_argument("--count", type=int, default=10_000, help="Objects per measurement")
+    parser.add_argument("--topology", help="Measure a generated topology (e.g. fat_tree, utility_grid)")
+    parser.add_argument("--param", action="append", default=[], help="Generator parameter, e.g. k=16")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    args = parser.parse_args()
+
+    if args.topology:
+        params = dict(_parse_param(p) for p in args.param)
+        for label, value in topology_footprint(args.topology, args.seed, **params).items():
+            print(f"{label:<16} {value:>12,.2f}" if isinstance(value, float) else f"{label:<16} {value:>12,}")
+        return 0
+
+    print(f"Python {sys.version.split()[0]}, {args.count} objects per row\n")
+    print(f"{'object':<32} {'bytes':>8}")
+    print("-" * 41)
+    for label, value in run_benchmark(args.count).items():
+        print(f"{label:<32} {value:>8.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -36,9 +36,23 @@ from .network import (
     LinkModel,
     ApplicationConfig,
     NetworkModel,
+    TopologyBatch,
     PORT_TYPE_SPECS,
     DEFAULT_PORT_CONFIGS,
 )
+from .ids import (
+    IdAllocator,
+    new_id,
+    reserve_id,
+    short_id,
+)
+from .connectivity import DisjointSet, ShortestPathTrees
+from .ipam import (
+    Subnet,
+    AddressPool,
+    HostPool,
+    IPAddressManager,
+)
 from .simulation import (
     SimulationStatus,
     SimulationStats,
@@ -46,6 +60,9 @@ from .simulation import (
     TrafficProtocol,
     TrafficApplication,
     TrafficFlow,
+    TraceFormat,
+    TraceConfig,
+    ResultsFormat,
     SimulationConfig,
     FlowStats,
     SimulationResults,
@@ -57,6 +74,7 @@ from .project import (
     Project,
     ProjectManager,
 )
+from .project_index import ProjectIndex
 
 # ============================================================================
 # V2 Grid Extensions
@@ -160,8 +178,22 @@ __all__ = [
     "LinkModel",
     "ApplicationConfig",
     "NetworkModel",
+    "TopologyBatch",
     "PORT_TYPE_SPECS",
     "DEFAULT_PORT_CONFIGS",
+    # ID allocation
+    "IdAllocator",
+    "new_id",
+    "reserve_id",
+    "short_id",
+    # Connectivity
+    "DisjointSet",
+    "ShortestPathTrees",
+    # IP address management
+    "Subnet",
+    "AddressPool",
+    "HostPool",
+    "IPAddressManager",
     # Simulation
     "SimulationStatus",
     "SimulationStats",
@@ -169,6 +201,9 @@ __all__ = [
     "TrafficProtocol",
     "TrafficApplication",
     "TrafficFlow",
+    "TraceFormat",
+    "TraceConfig",
+    "ResultsFormat",
     "SimulationConfig",
     "FlowStats",
     "SimulationResults",
@@ -178,6 +213,7 @@ __all__ = [
     "ProjectMetadata",
     "Project",
     "ProjectManager",
+    "ProjectIndex",
     
     # ===== V2 Grid Extensions =====
     # Grid Nodes (extends NodeModel)
@@ -0,0 +1,186 @@
+"""
+Connected-component tracking and shortest paths for topologies.
+
+DisjointSet is a union-find over node IDs with union by size and path
+halving, so adding nodes and links and asking whether two nodes are
+connected cost O(α(n)). Union-find can't split sets, so NetworkModel
+marks it stale when a node or link is removed and rebuilds it on the
+next query.
+
+ShortestPathTrees keeps one BFS tree per destination node, with a parent
+pointer (next hop and link) for every node that reaches it. A path from
+any source is read off the tree in O(hops), and highlighting every route
+to a node is the set of tree links. Trees are dropped when links change.
+"""
+
+from collections import deque
+from typing import TYPE_CHECKING, Hashable, Iterable, Optional
+
+if TYPE_CHECKING:
+    from .network import NetworkModel
+
+
+class DisjointSet:
+    """
+    Union-find over hashable items.
+
+    Usage:
+        components = DisjointSet()
+        components.union("n1", "n2")
+        components.connected("n1", "n2")  # True
+    """
+
+    def __init__(self, items: Iterable[Hashable] = ()):
+        self._parent: dict = {}
+        self._size: dict = {}
+        self.count = 0  # Number of disjoint sets
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item) -> bool:
+        return item in self._parent
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    def add(self, item: Hashable):
+        """Add an item as its own set (no-op if present)."""
+        if item not in self._parent:
+            self._parent[item] = item
+            self._size[item] = 1
+            self.count += 1
+
+    def find(self, item: Hashable) -> Hashable:
+        """Representative of the item's set (adds unknown items)."""
+        parent = self._parent
+        if item not in parent:
+            self.add(item)
+            return item
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: Hashable, b: Hashable) -> bool:
+        """Merge the sets of a and b; returns False if already joined."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size.pop(root_b)
+        self.count -= 1
+        return True
+
+    def connected(self, a: Hashable, b: Hashable) -> bool:
+        """Whether a and b are in the same set (False for unknown items)."""
+        if a not in self._parent or b not in self._parent:
+            return False
+        return self.find(a) == self.find(b)
+
+    def groups(self) -> list[list]:
+        """All sets, largest first; items keep insertion order."""
+        by_root: dict = {}
+        for item in self._parent:
+            by_root.setdefault(self.find(item), []).append(item)
+        return sorted(by_root.values(), key=len, reverse=True)
+
+    def clear(self):
+        self._parent.clear()
+        self._size.clear()
+        self.count = 0
+
+
+class ShortestPathTrees:
+    """
+    Memoized hop-count shortest-path trees of a NetworkModel.
+
+    tree(target) maps each node that can reach target to its
+    (next node, link ID) toward it, computed by one BFS over the model's
+    per-node link index and cached until a link is added, removed or
+    edited, or the topology is replaced.
+
+    Usage:
+        paths = ShortestPathTrees(network)
+        paths.path_links(source_id, target_id)  # Link IDs, source first
+        paths.detach()                          # Stop listening to edits
+    """
+
+    def __init__(self, network: "NetworkModel"):
+        self.network = network
+        self._trees: dict[str, dict[str, tuple[str, str]]] = {}
+        network.add_change_listener(self._on_change)
+        network.add_topology_listener(self._on_replaced)
+
+    def detach(self):
+        self.network.remove_change_listener(self._on_change)
+        self.network.remove_topology_listener(self._on_replaced)
+        self._trees.clear()
+
+    def invalidate(self):
+        """Drop all cached trees."""
+        self._trees.clear()
+
+    def _on_change(self, kind: str, object_id: str, obj):
+        if kind == "link":
+            self._trees.clear()
+        elif kind == "node":
+            # Nodes without links don't change other trees
+            self._trees.pop(object_id, None)
+
+    def _on_replaced(self, network: "NetworkModel"):
+        self._trees.clear()
+
+    def tree(self, target_id: str) -> dict[str, tuple[str, str]]:
+        """Parent pointers {node: (next node, link ID)} toward target_id."""
+        tree = self._trees.get(target_id)
+        if tree is None:
+            tree = self._trees[target_id] = self._bfs(target_id)
+        return tree
+
+    def _bfs(self, target_id: str) -> dict[str, tuple[str, str]]:
+        tree: dict[str, tuple[str, str]] = {}
+        if target_id not in self.network.nodes:
+            return tree
+        get_links = self.network.get_links_for_node
+        visited = {target_id}
+        queue = deque([target_id])
+        while queue:
+            current = queue.popleft()
+            for link in get_links(current):
+                neighbor = link.target_node_id if link.source_node_id == current else link.source_node_id
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    tree[neighbor] = (current, link.id)
+                    queue.append(neighbor)
+        return tree
+
+    def path_links(self, source_id: str, target_id: str) -> list[str]:
+        """Link IDs from source to target ([] if unreachable or the same node)."""
+        tree = self.tree(target_id)
+        links = []
+        node: Optional[str] = source_id
+        while node != target_id:
+            hop = tree.get(node)
+            if hop is None:
+                return []
+            node, link_id = hop
+            links.append(link_id)
+        return links
+
+    def path_nodes(self, source_id: str, target_id: str) -> list[str]:
+        """Node IDs from source to target, inclusive ([] if unreachable)."""
+        if source_id == target_id:
+            return [source_id] if source_id in self.network.nodes else []
+        tree = self.tree(target_id)
+        if source_id not in tree:
+            return []
+        nodes = [source_id]
+        while nodes[-1] != target_id:
+            nodes.append(tree[nodes[-1]][0])
+        return nodes
+
+    def tree_links(self, target_id: str) -> set[str]:
+        """Links on the shortest path of any node to target_id."""
+        return {link_id for _, link_id in self.tree(target_id).values()}
@@ -196,7 +196,7 @@ GRID_LINK_DEFAULTS: Dict[GridLinkType, Dict[str, Any]] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class WirelessParams:
     """Additional parameters for wireless links."""
     frequency_mhz: float = 900.0
@@ -210,7 +210,7 @@ class WirelessParams:
     fading_model: str = "NakagamiFading"
 
 
-@dataclass
+@dataclass(slots=True)
 class CellularParams:
     """Parameters specific to cellular (LTE/5G) links."""
     technology: str = "LTE"
@@ -223,7 +223,7 @@ class CellularParams:
     handover_enabled: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class SatelliteParams:
     """Parameters specific to satellite links."""
     orbit_type: str = "GEO"
@@ -235,7 +235,7 @@ class SatelliteParams:
     availability_percent: float = 99.5
 
 
-@dataclass
+@dataclass(slots=True)
 class GridLinkModel(LinkModel):
     """
     Extended link model for electric grid communications.
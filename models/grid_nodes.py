@@ -11,6 +11,7 @@ from typing import Optional, List
 import uuid
 
 # Import V1 base classes
+from .ids import short_id
 from .network import NodeModel, NodeType, MediumType, Position, PortConfig, PortType
 
 
@@ -110,7 +111,7 @@ class VoltageLevel(Enum):
     SECONDARY_240V = "240V"
 
 
-@dataclass
+@dataclass(slots=True)
 class DNP3Config:
     """DNP3 protocol configuration for a grid node."""
     enabled: bool = True
@@ -130,7 +131,7 @@ class DNP3Config:
     num_counters: int = 8
 
 
-@dataclass
+@dataclass(slots=True)
 class IEC61850Config:
     """IEC 61850 protocol configuration for a grid node."""
     enabled: bool = False
@@ -146,7 +147,7 @@ class IEC61850Config:
     logical_devices: List[str] = field(default_factory=lambda: ["LD0"])
 
 
-@dataclass
+@dataclass(slots=True)
 class GridNodeModel(NodeModel):
     """
     Extended node model for electric grid infrastructure.
@@ -224,7 +225,7 @@ class GridNodeModel(NodeModel):
     group_id: str = ""
     group_color: str = ""
     
-    def __post_init__(self):
+    def __post_init__(self, ports: Optional[list[PortConfig]] = None):
         """
         Initialize grid node with proper defaults based on grid_type.
         
@@ -238,7 +239,8 @@ class GridNodeModel(NodeModel):
         self.node_type = self.grid_type.to_base_node_type()
         
         # 2. Call parent __post_init__ for name and port initialization
-        super().__post_init__()
+        # (explicit super: slots=True rebuilds the class, breaking the zero-arg form)
+        super(GridNodeModel, self).__post_init__(ports)
         
         # 3. Apply grid-type-specific defaults from GRID_NODE_DEFAULTS
         defaults = GRID_NODE_DEFAULTS.get(self.grid_type, {})
@@ -263,7 +265,7 @@ class GridNodeModel(NodeModel):
         # 4. Override default name if it was auto-generated by parent
         # Parent generates names like "host_xxxx", we want "control_center_xxxx"
         if self.name.startswith(f"{self.node_type.name.lower()}_"):
-            self.name = f"{self.grid_type.name.lower()}_{self.id[:4]}"
+            self.name = f"{self.grid_type.name.lower()}_{short_id(self.id)}"
     
     @property
     def is_master(self) -> bool:
@@ -12,6 +12,7 @@ import uuid
 
 # Import V1 base classes
 from .simulation import TrafficFlow, TrafficProtocol, TrafficApplication
+from .ids import reserve_id, short_id
 
 
 class GridTrafficClass(Enum):
@@ -329,6 +330,8 @@ class GridTrafficFlow(TrafficFlow):
         4. Syncs interval_ms to parent's echo_interval
         5. Generates appropriate name if not specified
         """
+        reserve_id(self.id)
+        
         # 1. Set base application type from traffic class
         self.application = self.traffic_class.to_base_application()
         
@@ -365,7 +368,7 @@ class GridTrafficFlow(TrafficFlow):
         
         # 6. Generate name if not set
         if not self.name:
-            self.name = f"{self.traffic_class.name.lower()}_{self.id[:4]}"
+            self.name = f"{self.traffic_class.name.lower()}_{short_id(self.id)}"
     
     @property
     def is_periodic(self) -> bool:
@@ -0,0 +1,79 @@
+"""
+Compact, collision-free identifiers for model objects.
+
+IDs are a one-letter type prefix plus a decimal counter ("n12", "p340",
+"l57"). The counter is monotonic per prefix, so IDs created in one
+session never repeat, and IDs seen on load are reserved so new ones
+continue after them.
+
+Legacy projects use 8 hex characters from uuid4. The prefixes are not
+hex digits, so legacy and compact IDs can never be equal and old files
+load unchanged.
+"""
+
+import threading
+
+
+NODE_ID_PREFIX = "n"
+PORT_ID_PREFIX = "p"
+LINK_ID_PREFIX = "l"
+FLOW_ID_PREFIX = "t"
+
+
+class IdAllocator:
+    """
+    Hands out unique prefixed IDs.
+
+    Usage:
+        allocator = IdAllocator()
+        allocator.allocate("n")   # "n1"
+        allocator.reserve("n41")  # Loaded ID; next is "n42"
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next: dict[str, int] = {}
+
+    def allocate(self, prefix: str) -> str:
+        """Get the next unused ID for a prefix."""
+        with self._lock:
+            value = self._next.get(prefix, 1)
+            self._next[prefix] = value + 1
+        return f"{prefix}{value}"
+
+    def reserve(self, object_id: str) -> None:
+        """Mark an existing ID as used so it is never allocated again."""
+        digits = object_id[1:]
+        if not (digits.isascii() and digits.isdigit()):
+            return  # Legacy or custom ID: can't clash with allocated ones
+        prefix, value = object_id[0], int(digits)
+        if value >= self._next.get(prefix, 1):
+            with self._lock:
+                if value >= self._next.get(prefix, 1):
+                    self._next[prefix] = value + 1
+
+    def reset(self) -> None:
+        """Forget all allocated and reserved IDs (tests only)."""
+        with self._lock:
+            self._next.clear()
+
+
+_allocator = IdAllocator()
+
+
+def new_id(prefix: str) -> str:
+    """Allocate a process-wide unique ID for a prefix."""
+    return _allocator.allocate(prefix)
+
+
+def reserve_id(object_id: str) -> None:
+    """Reserve an ID loaded from a file or given explicitly."""
+    _allocator.reserve(object_id)
+
+
+def short_id(object_id: str) -> str:
+    """Short form of an ID for default display names."""
+    digits = object_id[1:]
+    if digits.isascii() and digits.isdigit():
+        return digits
+    return object_id[:4]
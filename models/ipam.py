@@ -0,0 +1,488 @@
+"""
+IP address management (IPAM).
+
+Hands out IPv4 subnets for links and LAN segments from configurable
+address pools. Used by NetworkModel for auto-assignment, by the ns-3
+script generator for unconfigured interfaces, and by the routing dialog
+to look up connected networks, so all three agree on the addressing.
+
+Allocation uses a buddy allocator per pool: free blocks are kept in a
+min-heap per prefix length, so allocating or releasing a subnet costs
+O(log n) and always returns the lowest free block (deterministic).
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+import heapq
+
+
+def ip_to_int(ip: str) -> int:
+    """Convert dotted-decimal IPv4 address to integer."""
+    parts = ip.split('.')
+    if len(parts) != 4:
+        raise ValueError(f"Invalid IPv4 address: {ip}")
+    value = 0
+    for part in parts:
+        octet = int(part)
+        if octet < 0 or octet > 255:
+            raise ValueError(f"Invalid IPv4 address: {ip}")
+        value = (value << 8) | octet
+    return value
+
+
+def int_to_ip(value: int) -> str:
+    """Convert integer to dotted-decimal IPv4 address."""
+    return f"{(value >> 24) & 0xFF}.{(value >> 16) & 0xFF}.{(value >> 8) & 0xFF}.{value & 0xFF}"
+
+
+def prefix_to_netmask(prefix_length: int) -> str:
+    """Convert prefix length to dotted-decimal netmask."""
+    if prefix_length <= 0:
+        return "0.0.0.0"
+    return int_to_ip((0xFFFFFFFF << (32 - prefix_length)) & 0xFFFFFFFF)
+
+
+def netmask_to_prefix(netmask: str) -> int:
+    """Convert dotted-decimal netmask to prefix length."""
+    return bin(ip_to_int(netmask)).count("1")
+
+
+def network_address(ip: str, netmask: str) -> str:
+    """Get the network address of an IP for the given netmask."""
+    return int_to_ip(ip_to_int(ip) & ip_to_int(netmask))
+
+
+def prefix_for_hosts(host_count: int) -> int:
+    """
+    Smallest prefix whose subnet holds host_count usable addresses.
+
+    Reserves the network and broadcast addresses, so the result is
+    never longer than /30.
+    """
+    needed = max(host_count, 2) + 2
+    bits = (needed - 1).bit_length()
+    return max(0, min(30, 32 - bits))
+
+
+@dataclass(frozen=True)
+class Subnet:
+    """An allocated IPv4 subnet."""
+    network: int
+    prefix_length: int
+
+    @property
+    def size(self) -> int:
+        return 1 << (32 - self.prefix_length)
+
+    @property
+    def network_address(self) -> str:
+        return int_to_ip(self.network)
+
+    @property
+    def netmask(self) -> str:
+        return prefix_to_netmask(self.prefix_length)
+
+    @property
+    def cidr(self) -> str:
+        return f"{int_to_ip(self.network)}/{self.prefix_length}"
+
+    @property
+    def num_hosts(self) -> int:
+        """Number of usable host addresses."""
+        if self.prefix_length >= 31:
+            return self.size
+        return self.size - 2
+
+    def host(self, index: int) -> str:
+        """
+        Get the address of the index-th host (1-based).
+
+        For /31 point-to-point subnets (RFC 3021) both addresses are usable,
+        so host(1) is the network address itself.
+        """
+        if self.prefix_length >= 31:
+            return int_to_ip(self.network + index - 1)
+        if index < 1 or index > self.num_hosts:
+            raise ValueError(f"Host index {index} out of range for {self.cidr}")
+        return int_to_ip(self.network + index)
+
+    def host_index(self, ip: str) -> int:
+        """Inverse of host(): the 1-based index of a host address."""
+        offset = ip_to_int(ip) - self.network
+        index = offset + 1 if self.prefix_length >= 31 else offset
+        if offset < 0 or offset >= self.size or index < 1 or index > self.num_hosts:
+            raise ValueError(f"{ip} is not a host address in {self.cidr}")
+        return index
+
+    def contains(self, ip: str) -> bool:
+        """Check if an address falls inside this subnet."""
+        return self.network <= ip_to_int(ip) < self.network + self.size
+
+    @classmethod
+    def from_cidr(cls, cidr: str) -> 'Subnet':
+        """Parse "a.b.c.d/n" notation (host bits are masked off)."""
+        address, _, prefix = cidr.partition('/')
+        prefix_length = int(prefix) if prefix else 32
+        mask = (0xFFFFFFFF << (32 - prefix_length)) & 0xFFFFFFFF
+        return cls(ip_to_int(address) & mask, prefix_length)
+
+
+class AddressPool:
+    """
+    Buddy allocator over a single CIDR block.
+
+    Free blocks are tracked per prefix length in a min-heap plus a set
+    for membership tests (heap entries are removed lazily).
+    """
+
+    def __init__(self, cidr: str):
+        self.subnet = Subnet.from_cidr(cidr)
+        self._free_heaps: dict[int, list[int]] = {}
+        self._free_sets: dict[int, set[int]] = {}
+        self.reset()
+
+    @property
+    def cidr(self) -> str:
+        return self.subnet.cidr
+
+    def reset(self):
+        """Mark the whole pool as free."""
+        self._free_heaps = {p: [] for p in range(self.subnet.prefix_length, 33)}
+        self._free_sets = {p: set() for p in range(self.subnet.prefix_length, 33)}
+        self._push_free(self.subnet.network, self.subnet.prefix_length)
+
+    def contains(self, subnet: Subnet) -> bool:
+        """Check if a subnet lies inside this pool."""
+        return (
+            subnet.prefix_length >= self.subnet.prefix_length and
+            self.subnet.network <= subnet.network < self.subnet.network + self.subnet.size
+        )
+
+    def _push_free(self, network: int, prefix_length: int):
+        self._free_sets[prefix_length].add(network)
+        heapq.heappush(self._free_heaps[prefix_length], network)
+
+    def _pop_free(self, prefix_length: int) -> Optional[int]:
+        heap = self._free_heaps[prefix_length]
+        free = self._free_sets[prefix_length]
+        while heap:
+            network = heapq.heappop(heap)
+            if network in free:
+                free.discard(network)
+                return network
+        return None
+
+    def allocate(self, prefix_length: int) -> Optional[Subnet]:
+        """Allocate the lowest free block of the given size."""
+        if prefix_length < self.subnet.prefix_length or prefix_length > 32:
+            return None
+
+        # Find the smallest free block that is large enough
+        for candidate in range(prefix_length, self.subnet.prefix_length - 1, -1):
+            network = self._pop_free(candidate)
+            if network is None:
+                continue
+            # Split down to the requested size, freeing the upper halves
+            while candidate < prefix_length:
+                candidate += 1
+                self._push_free(network + (1 << (32 - candidate)), candidate)
+            return Subnet(network, prefix_length)
+
+        return None
+
+    def reserve(self, subnet: Subnet) -> bool:
+        """
+        Take a specific block out of the free structure.
+
+        Returns False if any part of the block is already allocated.
+        """
+        if not self.contains(subnet):
+            return False
+
+        # Find the free ancestor block containing the subnet
+        for prefix_length in range(subnet.prefix_length, self.subnet.prefix_length - 1, -1):
+            mask = (0xFFFFFFFF << (32 - prefix_length)) & 0xFFFFFFFF
+            ancestor = subnet.network & mask
+            if ancestor in self._free_sets[prefix_length]:
+                self._free_sets[prefix_length].discard(ancestor)
+                # Split the ancestor, freeing every half not on the path
+                while prefix_length < subnet.prefix_length:
+                    prefix_length += 1
+                    half = 1 << (32 - prefix_length)
+                    if subnet.network & half:
+                        self._push_free(ancestor, prefix_length)
+                        ancestor += half
+                    else:
+                        self._push_free(ancestor + half, prefix_length)
+                return True
+
+        return False
+
+    def release(self, subnet: Subnet):
+        """Return a block to the pool, merging with free buddies."""
+        network = subnet.network
+        prefix_length = subnet.prefix_length
+
+        while prefix_length > self.subnet.prefix_length:
+            buddy = network ^ (1 << (32 - prefix_length))
+            if buddy not in self._free_sets[prefix_length]:
+                break
+            self._free_sets[prefix_length].discard(buddy)
+            network = min(network, buddy)
+            prefix_length -= 1
+
+        self._push_free(network, prefix_length)
+
+
+class HostPool:
+    """
+    Host addresses of one LAN subnet.
+
+    Hands out the lowest free host index. Released indices go on a
+    min-heap (entries are removed lazily), fresh ones come from a
+    high-water mark, so allocate and release are O(log n).
+    """
+
+    def __init__(self, subnet: Subnet):
+        self.subnet = subnet
+        self._next = 1
+        self._free: list[int] = []
+        self._used: set[int] = set()
+
+    def allocate(self) -> Optional[int]:
+        """Take the lowest free host index, or None if the subnet is full."""
+        while self._free:
+            index = heapq.heappop(self._free)
+            if index not in self._used:
+                self._used.add(index)
+                return index
+        while self._next <= self.subnet.num_hosts:
+            index = self._next
+            self._next += 1
+            if index not in self._used:
+                self._used.add(index)
+                return index
+        return None
+
+    def reserve(self, index: int) -> bool:
+        """Mark a specific host index as taken (False if unavailable)."""
+        if index < 1 or index > self.subnet.num_hosts or index in self._used:
+            return False
+        self._used.add(index)
+        return True
+
+    def release(self, index: int):
+        """Return a host index to the pool."""
+        if index in self._used:
+            self._used.discard(index)
+            heapq.heappush(self._free, index)
+
+
+@dataclass
+class IPAddressManager:
+    """
+    Allocates subnets for links and LAN segments.
+
+    Each allocation is keyed by an owner ID (a link ID for point-to-point
+    subnets, a switch node ID for LAN segments) so it can be looked up
+    and released later. Hosts on a LAN segment lease single addresses
+    from its subnet, keyed by the ID of the link that attaches them.
+
+    Usage:
+        ipam = IPAddressManager()
+        subnet = ipam.allocate_p2p(link.id)
+        port1.ip_address, port2.ip_address = subnet.host(1), subnet.host(2)
+        ...
+        ipam.release(link.id)
+
+        ipam.reserve(switch.id, "192.168.1.0/24")
+        host_port.ip_address = ipam.allocate_host(switch.id, link.id)
+    """
+    p2p_pool: str = "10.0.0.0/10"      # Point-to-point link subnets
+    lan_pool: str = "10.64.0.0/10"     # Switch / WiFi segment subnets
+    p2p_prefix_length: int = 30        # 30, or 31 for RFC 3021 links
+
+    _allocations: dict[str, Subnet] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        self._pools = {
+            "p2p": AddressPool(self.p2p_pool),
+            "lan": AddressPool(self.lan_pool),
+        }
+        self._unpooled: set[str] = set()          # Forced reservations held outside the pools
+        self._hosts: dict[str, HostPool] = {}     # LAN owner ID -> host addresses
+        self._leases: dict[str, tuple[str, int]] = {}  # Host owner ID -> (LAN owner ID, index)
+
+    @property
+    def allocations(self) -> dict[str, Subnet]:
+        """Read-only view of owner ID -> subnet."""
+        return dict(self._allocations)
+
+    def get(self, owner_id: str) -> Optional[Subnet]:
+        """Get the subnet allocated to an owner."""
+        return self._allocations.get(owner_id)
+
+    def find_owner(self, ip: str) -> Optional[str]:
+        """Find the owner whose subnet contains an address."""
+        value = ip_to_int(ip)
+        for owner_id, subnet in self._allocations.items():
+            if subnet.network <= value < subnet.network + subnet.size:
+                return owner_id
+        return None
+
+    def _allocate(self, pool_name: str, owner_id: str, prefix_length: int) -> Subnet:
+        existing = self._allocations.get(owner_id)
+        if existing is not None:
+            if existing.prefix_length == prefix_length:
+                return existing
+            self.release(owner_id)
+
+        subnet = self._pools[pool_name].allocate(prefix_length)
+        if subnet is None:
+            raise ValueError(
+                f"IP pool {self._pools[pool_name].cidr} exhausted "
+                f"(requested /{prefix_length} for {owner_id})"
+            )
+        self._allocations[owner_id] = subnet
+        return subnet
+
+    def allocate_p2p(self, owner_id: str) -> Subnet:
+        """Allocate a point-to-point subnet (/30 or /31)."""
+        return self._allocate("p2p", owner_id, self.p2p_prefix_length)
+
+    def allocate_p2p_many(self, owner_ids: Iterable[str]) -> list[Subnet]:
+        """Allocate point-to-point subnets for many owners in one pass."""
+        return [self.allocate_p2p(owner_id) for owner_id in owner_ids]
+
+    def allocate_lan(self, owner_id: str, host_count: int) -> Subnet:
+        """Allocate a LAN subnet sized for host_count hosts."""
+        return self._allocate("lan", owner_id, prefix_for_hosts(host_count))
+
+    def reserve(self, owner_id: str, cidr: str, force: bool = False) -> bool:
+        """
+        Record an externally chosen subnet (user-configured or loaded).
+
+        Subnets outside the managed pools are recorded without touching
+        the pools. Returns False if the subnet overlaps another allocation,
+        unless force is set: the subnet is then recorded anyway (the user
+        asked for it) but left out of the pools.
+        """
+        subnet = Subnet.from_cidr(cidr)
+        existing = self._allocations.get(owner_id)
+        if existing == subnet:
+            return True
+        if existing is not None:
+            self.release(owner_id)
+
+        for pool in self._pools.values():
+            if pool.contains(subnet):
+                if not pool.reserve(subnet):
+                    if not force:
+                        return False
+                    self._unpooled.add(owner_id)
+                break
+
+        self._allocations[owner_id] = subnet
+        return True
+
+    def _host_pool(self, lan_owner_id: str) -> HostPool:
+        subnet = self._allocations.get(lan_owner_id)
+        if subnet is None:
+            raise ValueError(f"No subnet allocated for {lan_owner_id}")
+        hosts = self._hosts.get(lan_owner_id)
+        if hosts is None:
+            hosts = self._hosts[lan_owner_id] = HostPool(subnet)
+        return hosts
+
+    def allocate_host(self, lan_owner_id: str, owner_id: str) -> str:
+        """
+        Lease the lowest free host address of a LAN subnet to an owner.
+
+        Idempotent for an owner that already holds a lease on the same LAN.
+        Raises ValueError if the LAN has no subnet or every host is taken.
+        """
+        lease = self._leases.get(owner_id)
+        if lease is not None:
+            if lease[0] == lan_owner_id:
+                return self._allocations[lan_owner_id].host(lease[1])
+            self.release(owner_id)
+
+        hosts = self._host_pool(lan_owner_id)
+        index = hosts.allocate()
+        if index is None:
+            raise ValueError(
+                f"Subnet {hosts.subnet.cidr} exhausted (requested a host for {owner_id})"
+            )
+        self._leases[owner_id] = (lan_owner_id, index)
+        return hosts.subnet.host(index)
+
+    def reserve_host(self, lan_owner_id: str, owner_id: str, ip: str) -> bool:
+        """
+        Record an existing host address (e.g. loaded from a project).
+
+        Returns False if the address is outside the LAN subnet or leased
+        to someone else.
+        """
+        hosts = self._host_pool(lan_owner_id)
+        try:
+            index = hosts.subnet.host_index(ip)
+        except ValueError:
+            return False
+        if self._leases.get(owner_id) == (lan_owner_id, index):
+            return True
+        if not hosts.reserve(index):
+            return False
+        self.release(owner_id)
+        self._leases[owner_id] = (lan_owner_id, index)
+        return True
+
+    def release(self, owner_id: str) -> bool:
+        """
+        Release an owner's subnet back to its pool, or its host lease.
+
+        Releasing a LAN subnet also drops the host leases inside it.
+        """
+        lease = self._leases.pop(owner_id, None)
+        if lease is not None:
+            hosts = self._hosts.get(lease[0])
+            if hosts is not None:
+                hosts.release(lease[1])
+
+        subnet = self._allocations.pop(owner_id, None)
+        if subnet is None:
+            return lease is not None
+        if self._hosts.pop(owner_id, None) is not None:
+            self._leases = {
+                key: value for key, value in self._leases.items() if value[0] != owner_id
+            }
+        if owner_id in self._unpooled:
+            self._unpooled.discard(owner_id)
+            return True
+        for pool in self._pools.values():
+            if pool.contains(subnet):
+                pool.release(subnet)
+                break
+        return True
+
+    def reset(self):
+        """Release every allocation."""
+        self._allocations.clear()
+        self._unpooled.clear()
+        self._hosts.clear()
+        self._leases.clear()
+        for pool in self._pools.values():
+            pool.reset()
+
+    def copy(self) -> 'IPAddressManager':
+        """Create an independent copy with the same allocations."""
+        clone = IPAddressManager(
+            p2p_pool=self.p2p_pool,
+            lan_pool=self.lan_pool,
+            p2p_prefix_length=self.p2p_prefix_length,
+        )
+        for owner_id, subnet in self._allocations.items():
+            clone.reserve(owner_id, subnet.cidr, force=owner_id in self._unpooled)
+        for owner_id, (lan_owner_id, index) in self._leases.items():
+            clone._host_pool(lan_owner_id).reserve(index)
+            clone._leases[owner_id] = (lan_owner_id, index)
+        return clone
@@ -5,11 +5,17 @@ These models represent the network configuration that will be
 translated to ns-3 simulation objects.
 """
 
-from dataclasses import dataclass, field
+from contextlib import contextmanager
+from dataclasses import dataclass, field, InitVar
 from enum import Enum, auto
-from typing import Optional
+from typing import Callable, Iterator, Optional
+import sys
 import uuid
 
+from .connectivity import DisjointSet
+from .ids import NODE_ID_PREFIX, PORT_ID_PREFIX, LINK_ID_PREFIX, new_id, reserve_id, short_id
+from .ipam import IPAddressManager, Subnet, network_address, netmask_to_prefix
+
 
 class NodeType(Enum):
     """
@@ -25,6 +31,10 @@ class NodeType(Enum):
     ACCESS_POINT = auto() # WiFi access point
 
 
+# Nodes that share the one WiFi channel of the generated script
+_WIFI_NODE_TYPES = frozenset({NodeType.STATION, NodeType.ACCESS_POINT})
+
+
 class MediumType(Enum):
     """
     Type of network medium/connection for a node.
@@ -118,7 +128,7 @@ class RouteType(Enum):
     DEFAULT = auto()    # Default gateway route
 
 
-@dataclass
+@dataclass(slots=True)
 class RouteEntry:
     """A single routing table entry."""
     id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
@@ -187,7 +197,7 @@ class VlanMode(Enum):
     TRUNK = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """2D position on the canvas."""
     x: float = 0.0
@@ -233,7 +243,7 @@ DEFAULT_PORT_CONFIGS = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class PortConfig:
     """
     Represents a physical/logical port on a network device.
@@ -241,7 +251,7 @@ class PortConfig:
     Includes Layer 1 (physical), Layer 2 (data link), and 
     Layer 3 (network) configurations.
     """
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=lambda: new_id(PORT_ID_PREFIX))
     
     # Physical layer (L1)
     port_number: int = 0
@@ -291,7 +301,7 @@ class PortConfig:
         return "available"
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeModel:
     """
     Represents a network node (host, router, switch).
@@ -302,14 +312,16 @@ class NodeModel:
         medium_type: Network medium (WIRED, WIFI_STATION, WIFI_AP, etc.)
         name: Display name
         position: Canvas position
-        ports: Physical/logical ports on this node
+        ports: Physical/logical ports on this node (defaults are created
+            on first access, so nodes whose ports are never read or are
+            replaced on load don't pay for them)
         
     Type-specific attributes:
         Host: is_server
         Router: routing_protocol, forwarding_enabled
         Switch: stp_enabled, switching_mode, subnet_base, subnet_mask
     """
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=lambda: new_id(NODE_ID_PREFIX))
     node_type: NodeType = NodeType.HOST
     medium_type: MediumType = MediumType.WIRED  # Network medium type
     protocol_stack: ProtocolStack = ProtocolStack.INTERNET  # Network stack (L2/L3)
@@ -317,8 +329,13 @@ class NodeModel:
     name: str = ""
     position: Position = field(default_factory=Position)
     
-    # Ports
-    ports: list[PortConfig] = field(default_factory=list)
+    # Ports (see the ports property)
+    ports: InitVar[Optional[list[PortConfig]]] = None
+    _ports: Optional[list[PortConfig]] = field(default=None, init=False, repr=False, compare=False)
+    # Called with (node, new ports) when ports are created, added or replaced (set by NetworkModel)
+    _port_listener: Optional[Callable[["NodeModel", list[PortConfig]], None]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     # Host-specific properties
     is_server: bool = False
@@ -332,7 +349,8 @@ class NodeModel:
     switching_mode: str = "learning"  # learning, hub
     subnet_base: str = ""  # e.g., "192.168.1.0" - if set, all connected hosts use this subnet
     subnet_mask: str = "255.255.255.0"
-    _next_host_ip: int = field(default=1, repr=False)  # Next host IP in subnet
+    _port_index: Optional[dict[str, int]] = field(default=None, repr=False, compare=False)  # port_id -> position
+    _link_port_index: Optional[dict[str, int]] = field(default=None, repr=False, compare=False)  # link_id -> position
     
     # WiFi-specific properties (for STATION and ACCESS_POINT)
     wifi_standard: str = "802.11n"  # 802.11a, 802.11b, 802.11g, 802.11n, 802.11ac, 802.11ax
@@ -359,29 +377,34 @@ class NodeModel:
     # Common optional properties
     description: str = ""
     
-    def __post_init__(self):
+    def __post_init__(self, ports: Optional[list[PortConfig]] = None):
         if not self.name:
-            self.name = f"{self.node_type.name.lower()}_{self.id[:4]}"
+            self.name = f"{self.node_type.name.lower()}_{short_id(self.id)}"
         
-        # Initialize default ports if none exist
-        if not self.ports:
-            self._initialize_default_ports()
+        # Default ports are created lazily by the ports property
+        if ports:
+            self._ports = ports
     
-    def _initialize_default_ports(self):
+    @property
+    def has_ports_materialized(self) -> bool:
+        """Check if the port list exists yet (without creating defaults)."""
+        return self._ports is not None
+    
+    def _initialize_default_ports(self) -> list[PortConfig]:
         """Create default ports based on node type."""
         config = DEFAULT_PORT_CONFIGS.get(self.node_type, DEFAULT_PORT_CONFIGS[NodeType.HOST])
-        num_ports = config["num_ports"]
         port_type = config["port_type"]
         spec = PORT_TYPE_SPECS[port_type]
         
-        for i in range(num_ports):
-            port = PortConfig(
+        return [
+            PortConfig(
                 port_number=i,
-                port_name=f"{spec['name_prefix']}{i}",
+                port_name=sys.intern(f"{spec['name_prefix']}{i}"),
                 port_type=port_type,
                 speed=spec["speed"],
             )
-            self.ports.append(port)
+            for i in range(config["num_ports"])
+        ]
     
     def add_port(self, port_type: PortType = PortType.GIGABIT_ETHERNET) -> PortConfig:
         """Add a new port to this node."""
@@ -389,11 +412,13 @@ class NodeModel:
         port_num = len(self.ports)
         port = PortConfig(
             port_number=port_num,
-            port_name=f"{spec['name_prefix']}{port_num}",
+            port_name=sys.intern(f"{spec['name_prefix']}{port_num}"),
             port_type=port_type,
             speed=spec["speed"],
         )
         self.ports.append(port)
+        if self._port_listener is not None:
+            self._port_listener(self, [port])
         return port
     
     def remove_port(self, port_id: str) -> Optional[PortConfig]:
@@ -407,10 +432,15 @@ class NodeModel:
     
     def get_port(self, port_id: str) -> Optional[PortConfig]:
         """Get a port by ID."""
-        for port in self.ports:
-            if port.id == port_id:
-                return port
-        return None
+        ports = self.ports
+        position = self._port_index.get(port_id) if self._port_index else None
+        if position is None or position >= len(ports) or ports[position].id != port_id:
+            # Ports were added, removed or reordered since the index was built
+            self._port_index = {port.id: i for i, port in enumerate(ports)}
+            position = self._port_index.get(port_id)
+            if position is None:
+                return None
+        return ports[position]
     
     def get_port_by_number(self, port_number: int) -> Optional[PortConfig]:
         """Get a port by its number."""
@@ -425,10 +455,18 @@ class NodeModel:
     
     def get_port_for_link(self, link_id: str) -> Optional[PortConfig]:
         """Get the port connected to a specific link."""
-        for port in self.ports:
-            if port.connected_link_id == link_id:
-                return port
-        return None
+        ports = self.ports
+        position = self._link_port_index.get(link_id) if self._link_port_index else None
+        if position is None or position >= len(ports) or ports[position].connected_link_id != link_id:
+            # Port bindings changed since the index was built
+            self._link_port_index = {
+                port.connected_link_id: i for i, port in enumerate(ports)
+                if port.connected_link_id
+            }
+            position = self._link_port_index.get(link_id)
+            if position is None:
+                return None
+        return ports[position]
     
     # Routing table management methods
     def add_route(self, route: RouteEntry) -> None:
@@ -492,7 +530,25 @@ class NodeModel:
         return self.get_port_for_link(link_id)
 
 
-@dataclass
+def _get_node_ports(node: NodeModel) -> list[PortConfig]:
+    if node._ports is None:
+        node._ports = node._initialize_default_ports()
+        if node._port_listener is not None:
+            node._port_listener(node, node._ports)
+    return node._ports
+
+
+def _set_node_ports(node: NodeModel, ports: list[PortConfig]):
+    node._ports = list(ports)
+    if node._port_listener is not None:
+        node._port_listener(node, node._ports)
+
+
+# Installed after the dataclass is built so the ports InitVar keeps its None default
+NodeModel.ports = property(_get_node_ports, _set_node_ports, doc="Ports on this node.")
+
+
+@dataclass(slots=True)
 class LinkModel:
     """
     Represents a network link/channel between two ports on two nodes.
@@ -507,7 +563,7 @@ class LinkModel:
         data_rate: Link speed (e.g., "100Mbps")
         delay: Propagation delay (e.g., "2ms")
     """
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=lambda: new_id(LINK_ID_PREFIX))
     channel_type: ChannelType = ChannelType.POINT_TO_POINT
     source_node_id: str = ""
     target_node_id: str = ""
@@ -518,7 +574,7 @@ class LinkModel:
     
     @property
     def name(self) -> str:
-        return f"link_{self.id[:4]}"
+        return f"link_{short_id(self.id)}"
 
 
 @dataclass 
@@ -535,12 +591,246 @@ class ApplicationConfig:
     num_packets: int = 100
 
 
+class _TrackedDict(dict):
+    """
+    Dict that reports added and removed items to its owner.
+    
+    Lets NetworkModel keep its indexes current when callers (loaders,
+    converters, tests) write to network.nodes / network.links directly.
+    Copies and pickles as a plain dict.
+    """
+    
+    def __init__(self, data=(), on_add=None, on_remove=None):
+        super().__init__()
+        self._on_add = on_add
+        self._on_remove = on_remove
+        self.update(data)
+    
+    def __setitem__(self, key, value):
+        if key in self:
+            old = dict.__getitem__(self, key)
+            if old is value:
+                return
+            self._on_remove(key, old)
+        dict.__setitem__(self, key, value)
+        self._on_add(key, value)
+    
+    def __delitem__(self, key):
+        value = dict.pop(self, key)
+        self._on_remove(key, value)
+    
+    _MISSING = object()
+    
+    def pop(self, key, default=_MISSING):
+        if key not in self:
+            if default is _TrackedDict._MISSING:
+                raise KeyError(key)
+            return default
+        value = dict.pop(self, key)
+        self._on_remove(key, value)
+        return value
+    
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self._on_remove(key, value)
+        return key, value
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+    
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+    
+    def clear(self):
+        items = list(self.items())
+        dict.clear(self)
+        for key, value in items:
+            self._on_remove(key, value)
+    
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class TopologyBatch:
+    """
+    Bulk builder returned by NetworkModel.batch().
+    
+    Nodes and links are added to the model immediately, but index
+    maintenance, IP assignment and listener notification run once when
+    the batch commits. Ports are picked from a per-node cursor instead of
+    scanning the node's port list on every link.
+    """
+    
+    def __init__(self, network: "NetworkModel", assign_ips: bool = True, grow_ports: bool = True):
+        self.network = network
+        self.assign_ips = assign_ips
+        self.grow_ports = grow_ports
+        self.nodes: list[NodeModel] = []
+        self.links: list[LinkModel] = []
+        self._free_ports: dict[str, list[PortConfig]] = {}
+        self._grown: set[str] = set()
+    
+    def add_node(self, node_type: NodeType, position: Optional[Position] = None, **fields) -> NodeModel:
+        """Create a node and add it to the network."""
+        node = NodeModel(node_type=node_type, position=position or Position(), **fields)
+        self._insert_node(node)
+        return node
+    
+    def add_nodes(self, nodes) -> list[NodeModel]:
+        """Add already-built NodeModels (e.g. from a generator)."""
+        added = []
+        for node in nodes:
+            self._insert_node(node)
+            added.append(node)
+        return added
+    
+    def add_link(
+        self,
+        source_id: str,
+        target_id: str,
+        channel_type: ChannelType = ChannelType.POINT_TO_POINT,
+        source_port_id: str = "",
+        target_port_id: str = "",
+        **fields
+    ) -> LinkModel:
+        """
+        Create a link between two nodes and bind its ports.
+        
+        Raises:
+            ValueError: If a node or requested port doesn't exist or is in use
+        """
+        link = LinkModel(
+            channel_type=channel_type,
+            source_node_id=source_id,
+            target_node_id=target_id,
+            source_port_id=source_port_id,
+            target_port_id=target_port_id,
+            **fields
+        )
+        self._insert_link(link)
+        return link
+    
+    def add_links(self, links) -> list[LinkModel]:
+        """
+        Add many links at once.
+        
+        Items are LinkModels or (source_id, target_id) pairs. Links
+        without port IDs get the next free port on each node.
+        """
+        added = []
+        for item in links:
+            if isinstance(item, LinkModel):
+                self._insert_link(item)
+                added.append(item)
+            else:
+                added.append(self.add_link(*item))
+        return added
+    
+    def _insert_node(self, node: NodeModel):
+        if node.id in self.network.nodes:
+            raise ValueError(f"Duplicate node ID: {node.id}")
+        reserve_id(node.id)
+        dict.__setitem__(self.network.nodes, node.id, node)
+        self.nodes.append(node)
+    
+    def _insert_link(self, link: LinkModel):
+        if link.id in self.network.links:
+            raise ValueError(f"Duplicate link ID: {link.id}")
+        source_port = self._bind_port(link.source_node_id, link.source_port_id)
+        try:
+            target_port = self._bind_port(link.target_node_id, link.target_port_id)
+        except ValueError:
+            self._free_ports[link.source_node_id].append(source_port)
+            raise
+        link.source_port_id = source_port.id
+        link.target_port_id = target_port.id
+        source_port.connected_link_id = link.id
+        target_port.connected_link_id = link.id
+        reserve_id(link.id)
+        dict.__setitem__(self.network.links, link.id, link)
+        self.links.append(link)
+    
+    def _bind_port(self, node_id: str, port_id: str) -> PortConfig:
+        node = self.network.nodes.get(node_id)
+        if node is None:
+            raise ValueError(f"Unknown node: {node_id}")
+        free = self._free_ports.get(node_id)
+        if free is None:
+            free = self._free_ports[node_id] = node.get_available_ports()[::-1]
+        
+        if port_id:
+            port = node.get_port(port_id)
+            if port is None or port.is_connected:
+                raise ValueError(f"Port {port_id} on {node.name} is missing or in use")
+            return port
+        
+        while free:
+            port = free.pop()
+            if not port.is_connected:
+                return port
+        if not self.grow_ports:
+            raise ValueError(f"No free ports on {node.name}")
+        self._grown.add(node_id)
+        return node.add_port(node.ports[-1].port_type if node.ports else PortType.GIGABIT_ETHERNET)
+    
+    def _commit(self):
+        network = self.network
+        for node in self.nodes:
+            network._index_node(node.id, node)
+        for node_id in self._grown:
+            network._index_node(node_id, network.nodes[node_id])
+        for link in self.links:
+            network._index_link(link.id, link)
+        
+        if self.assign_ips:
+            for link in self.links:
+                source = network.nodes[link.source_node_id]
+                target = network.nodes[link.target_node_id]
+                network._assign_ip_addresses(
+                    link, source, source.get_port(link.source_port_id),
+                    target, target.get_port(link.target_port_id)
+                )
+    
+    def _rollback(self):
+        # Also undoes a partial commit: indexes, subnets and addresses
+        network = self.network
+        for link in self.links:
+            network.ipam.release(link.id)
+            for node_id, port_id in (
+                (link.source_node_id, link.source_port_id),
+                (link.target_node_id, link.target_port_id),
+            ):
+                node = network.nodes.get(node_id)
+                port = node.get_port(port_id) if node else None
+                if port and port.connected_link_id == link.id:
+                    port.connected_link_id = None
+                    port.ip_address = ""
+            if dict.pop(network.links, link.id, None) is not None:
+                network._unindex_link(link.id, link)
+        for node in self.nodes:
+            network.ipam.release(node.id)  # Switch LAN subnets
+            if dict.pop(network.nodes, node.id, None) is not None:
+                network._unindex_node(node.id, node)
+
+
 @dataclass
 class NetworkModel:
     """
     Root model containing the entire network topology.
     
     This is the main data structure that gets translated to ns-3.
+    
+    Adjacency, port-pair, port and name indexes are kept current as
+    nodes and links are added or removed (including direct writes to
+    the nodes/links dicts), so topology queries cost O(degree) rather
+    than a scan of every link. Connected components are tracked with a
+    union-find that is rebuilt lazily after removals.
+    
+    Use batch() to build large topologies: side effects run once at the
+    end and listeners get a single topology-replaced notification.
     """
     nodes: dict[str, NodeModel] = field(default_factory=dict)
     links: dict[str, LinkModel] = field(default_factory=dict)
@@ -557,8 +847,373 @@ class NetworkModel:
     todos: list = field(default_factory=list)  # Unhandled patterns from import
     warnings: list = field(default_factory=list)  # Non-critical issues
     
-    # Auto IP assignment tracking
-    _next_subnet: int = field(default=1, repr=False)
+    # Auto IP assignment (subnet pools for links and LAN segments)
+    ipam: IPAddressManager = field(default_factory=IPAddressManager, repr=False, compare=False)
+    
+    # Topology indexes (maintained by _index_* hooks on the nodes/links dicts)
+    _links_by_node: dict[str, dict[str, None]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _link_by_ports: dict[tuple[str, str], str] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _port_owner: dict[str, str] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _node_by_name: dict[str, dict[str, None]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _node_names: dict[str, str] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _wifi_nodes: set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    
+    # Connected components (union-find can't split, so removals mark it stale)
+    _components: DisjointSet = field(default_factory=DisjointSet, init=False, repr=False, compare=False)
+    _components_stale: bool = field(default=False, init=False, repr=False, compare=False)
+    _wifi_anchor: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    # Called with the model after bulk changes (batch commit)
+    _topology_listeners: list[Callable[["NetworkModel"], None]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    # Called with (kind, object_id, object) for single edits (see add_change_listener)
+    _change_listeners: list[Callable[[str, str, object], None]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _batch: Optional[TopologyBatch] = field(default=None, init=False, repr=False, compare=False)
+    
+    # Attributes loaded on first access (see defer_section)
+    _deferred_sections: dict[str, Callable[[], object]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self):
+        self.nodes = _TrackedDict(self.nodes, self._node_added, self._node_removed)
+        self.links = _TrackedDict(self.links, self._link_added, self._link_removed)
+    
+    def __getattr__(self, name):
+        # Only called for missing attributes, i.e. deferred sections
+        deferred = self.__dict__.get("_deferred_sections")
+        if deferred and name in deferred:
+            value = deferred.pop(name)()
+            setattr(self, name, value)
+            return value
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+    
+    def defer_section(self, name: str, loader: Callable[[], object]):
+        """
+        Load an attribute (saved_flows, todos, ...) on first access.
+        
+        Used by the compact project loader so the canvas can be built
+        before rarely needed sections are decoded.
+        """
+        self.__dict__.pop(name, None)
+        self._deferred_sections[name] = loader
+    
+    def is_section_loaded(self, name: str) -> bool:
+        """False while an attribute passed to defer_section() hasn't been read."""
+        return name in self.__dict__ or name not in self._deferred_sections
+    
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _port_pair(port_a: str, port_b: str) -> tuple[str, str]:
+        return (port_a, port_b) if port_a <= port_b else (port_b, port_a)
+    
+    def _index_node(self, node_id: str, node: NodeModel):
+        reserve_id(node_id)
+        self._links_by_node.setdefault(node_id, {})
+        # Lazy default ports are indexed when the node creates them
+        node._port_listener = self._ports_added
+        if node.has_ports_materialized:
+            self._ports_added(node, node.ports)
+        self._index_node_name(node_id, node.name)
+        if node.node_type in _WIFI_NODE_TYPES:
+            self._wifi_nodes.add(node_id)
+        if not self._components_stale:
+            self._add_component_node(node_id, node)
+    
+    def _add_component_node(self, node_id: str, node: NodeModel):
+        self._components.add(node_id)
+        # All WiFi nodes share one channel in the generated script
+        if node.node_type in _WIFI_NODE_TYPES:
+            if self._wifi_anchor is None:
+                self._wifi_anchor = node_id
+            else:
+                self._components.union(self._wifi_anchor, node_id)
+    
+    def _index_node_name(self, node_id: str, name: str):
+        self._node_names[node_id] = name
+        self._node_by_name.setdefault(name, {})[node_id] = None
+    
+    def _unindex_node_name(self, node_id: str):
+        name = self._node_names.pop(node_id, None)
+        same_name = self._node_by_name.get(name)
+        if same_name is not None:
+            same_name.pop(node_id, None)
+            if not same_name:
+                del self._node_by_name[name]
+    
+    def _ports_added(self, node: NodeModel, ports: list[PortConfig]):
+        if self.nodes.get(node.id) is not node:
+            return  # Node was removed from this network
+        for port in ports:
+            reserve_id(port.id)
+            self._port_owner[port.id] = node.id
+    
+    def _unindex_node(self, node_id: str, node: NodeModel):
+        self._components_stale = True
+        if node._port_listener == self._ports_added:
+            node._port_listener = None
+        for port in (node.ports if node.has_ports_materialized else ()):
+            if self._port_owner.get(port.id) == node_id:
+                del self._port_owner[port.id]
+        self._unindex_node_name(node_id)
+        self._wifi_nodes.discard(node_id)
+        if not self._links_by_node.get(node_id):
+            self._links_by_node.pop(node_id, None)
+    
+    def _index_link(self, link_id: str, link: LinkModel):
+        reserve_id(link_id)
+        # Insertion-ordered dicts keep adjacency in link creation order
+        self._links_by_node.setdefault(link.source_node_id, {})[link_id] = None
+        self._links_by_node.setdefault(link.target_node_id, {})[link_id] = None
+        if link.source_port_id and link.target_port_id:
+            self._link_by_ports[self._port_pair(link.source_port_id, link.target_port_id)] = link_id
+        if not self._components_stale:
+            if link.source_node_id in self.nodes and link.target_node_id in self.nodes:
+                self._components.union(link.source_node_id, link.target_node_id)
+            else:
+                self._components_stale = True  # Link written before its nodes
+    
+    def _unindex_link(self, link_id: str, link: LinkModel):
+        self._components_stale = True
+        for node_id in (link.source_node_id, link.target_node_id):
+            incident = self._links_by_node.get(node_id)
+            if incident is not None:
+                incident.pop(link_id, None)
+                if not incident and node_id not in self.nodes:
+                    del self._links_by_node[node_id]
+        pair = self._port_pair(link.source_port_id, link.target_port_id)
+        if self._link_by_ports.get(pair) == link_id:
+            del self._link_by_ports[pair]
+    
+    def _node_added(self, node_id: str, node: NodeModel):
+        self._index_node(node_id, node)
+        if node.node_type == NodeType.SWITCH:
+            self._switch_subnet(node)
+        if self._change_listeners:
+            self.notify_changed("node", node_id, node)
+    
+    def _node_removed(self, node_id: str, node: NodeModel):
+        self._unindex_node(node_id, node)
+        self.ipam.release(node_id)
+        if self._change_listeners:
+            self.notify_changed("node", node_id, node)
+    
+    def _link_added(self, link_id: str, link: LinkModel):
+        self._index_link(link_id, link)
+        if self._change_listeners:
+            self.notify_changed("link", link_id, link)
+    
+    def _link_removed(self, link_id: str, link: LinkModel):
+        self._unindex_link(link_id, link)
+        if self._change_listeners:
+            self.notify_changed("link", link_id, link)
+    
+    def rebuild_indexes(self):
+        """
+        Rebuild all topology indexes from scratch.
+        
+        Only needed after mutating link endpoints in place instead of
+        through rewire_link(). Renames and switches between wired and
+        WiFi types are picked up by notify_changed().
+        """
+        self._links_by_node.clear()
+        self._link_by_ports.clear()
+        self._port_owner.clear()
+        self._node_by_name.clear()
+        self._node_names.clear()
+        self._wifi_nodes.clear()
+        self._reset_components()
+        for node_id, node in self.nodes.items():
+            self._index_node(node_id, node)
+        for link_id, link in self.links.items():
+            self._index_link(link_id, link)
+    
+    def _reset_components(self):
+        self._components.clear()
+        self._components_stale = False
+        self._wifi_anchor = None
+    
+    def _component_index(self) -> DisjointSet:
+        """The union-find, rebuilt first if removals made it stale."""
+        if self._components_stale:
+            self._reset_components()
+            for node_id, node in self.nodes.items():
+                self._add_component_node(node_id, node)
+            for link in self.links.values():
+                if link.source_node_id in self.nodes and link.target_node_id in self.nodes:
+                    self._components.union(link.source_node_id, link.target_node_id)
+        return self._components
+    
+    # ------------------------------------------------------------------
+    # Bulk building and change notification
+    # ------------------------------------------------------------------
+    
+    @contextmanager
+    def batch(self, assign_ips: bool = True, grow_ports: bool = True) -> Iterator[TopologyBatch]:
+        """
+        Build many nodes and links with side effects deferred to the end.
+        
+        Usage:
+            with network.batch() as batch:
+                core = batch.add_node(NodeType.ROUTER)
+                hosts = [batch.add_node(NodeType.HOST) for _ in range(1000)]
+                batch.add_links((core.id, host.id) for host in hosts)
+        
+        Indexes are updated, IP addresses assigned and topology listeners
+        notified once when the block exits. Topology queries inside the
+        block don't see the new links yet. If the block or the commit
+        raises (e.g. the address pool runs out), everything it added is
+        removed again and its subnets are released.
+        
+        Args:
+            assign_ips: Auto-assign addresses to the new links on commit
+            grow_ports: Add ports to nodes that run out instead of failing
+        """
+        if self._batch is not None:
+            raise RuntimeError("NetworkModel.batch() cannot be nested")
+        self._batch = TopologyBatch(self, assign_ips=assign_ips, grow_ports=grow_ports)
+        try:
+            yield self._batch
+            self._batch._commit()
+        except BaseException:
+            self._batch._rollback()
+            raise
+        finally:
+            batch, self._batch = self._batch, None
+        if batch.nodes or batch.links:
+            self.notify_topology_replaced()
+    
+    def add_topology_listener(self, callback: Callable[["NetworkModel"], None]):
+        """Register a callback for bulk topology changes."""
+        if callback not in self._topology_listeners:
+            self._topology_listeners.append(callback)
+    
+    def remove_topology_listener(self, callback: Callable[["NetworkModel"], None]):
+        """Unregister a callback added with add_topology_listener()."""
+        if callback in self._topology_listeners:
+            self._topology_listeners.remove(callback)
+    
+    def notify_topology_replaced(self):
+        """Tell listeners to reload everything from the model."""
+        for callback in list(self._topology_listeners):
+            callback(self)
+    
+    def add_change_listener(self, callback: Callable[[str, str, object], None]):
+        """
+        Register a callback for single edits.
+        
+        Called as callback(kind, object_id, obj) when a node or link is
+        added or removed, and by notify_changed() for in-place edits.
+        kind is "node", "link" or "flows"; whether the object still
+        exists is read from the model. Batches report through the
+        topology listeners instead.
+        """
+        if callback not in self._change_listeners:
+            self._change_listeners.append(callback)
+    
+    def remove_change_listener(self, callback: Callable[[str, str, object], None]):
+        """Unregister a callback added with add_change_listener()."""
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+    
+    def notify_changed(self, kind: str, object_id: str = "", obj: object = None):
+        """Report an in-place edit (moved node, edited link, new flows)."""
+        if kind == "node":
+            node = self.nodes.get(object_id)
+            if node is not None and self._node_names.get(object_id) != node.name:
+                self._unindex_node_name(object_id)  # Renamed
+                self._index_node_name(object_id, node.name)
+            if node is not None and (node.node_type in _WIFI_NODE_TYPES) != (object_id in self._wifi_nodes):
+                # Joined or left the shared WiFi channel
+                if object_id in self._wifi_nodes:
+                    self._wifi_nodes.discard(object_id)
+                else:
+                    self._wifi_nodes.add(object_id)
+                self._components_stale = True
+            if node is not None and (node.node_type == NodeType.SWITCH or self.ipam.get(object_id)):
+                self._switch_subnet(node)  # Reserve an edited subnet_base right away
+        for callback in list(self._change_listeners):
+            callback(kind, object_id, obj)
+    
+    # ------------------------------------------------------------------
+    # Topology queries
+    # ------------------------------------------------------------------
+    
+    def get_links_for_node(self, node_id: str) -> list[LinkModel]:
+        """Get all links attached to a node (O(degree))."""
+        links = []
+        for link_id in self._links_by_node.get(node_id, ()):
+            link = self.links.get(link_id)
+            if link and node_id in (link.source_node_id, link.target_node_id):
+                links.append(link)
+        return links
+    
+    def get_neighbors(self, node_id: str) -> list[str]:
+        """Get IDs of nodes directly linked to a node."""
+        return [
+            link.target_node_id if link.source_node_id == node_id else link.source_node_id
+            for link in self.get_links_for_node(node_id)
+        ]
+    
+    def get_degree(self, node_id: str) -> int:
+        """Number of links attached to a node."""
+        return len(self.get_links_for_node(node_id))
+    
+    def find_link_between(self, node_a: str, node_b: str) -> Optional[LinkModel]:
+        """Find a link joining two nodes (either direction)."""
+        for link in self.get_links_for_node(node_a):
+            if node_b in (link.source_node_id, link.target_node_id) and (
+                node_a != node_b or link.source_node_id == link.target_node_id
+            ):
+                return link
+        return None
+    
+    def are_connected(self, node_a: str, node_b: str) -> bool:
+        """Whether a path of links (or the shared WiFi channel) joins two nodes."""
+        if node_a not in self.nodes or node_b not in self.nodes:
+            return False
+        return self._component_index().connected(node_a, node_b)
+    
+    def get_components(self) -> list[list[str]]:
+        """Node IDs grouped by connected component, largest first."""
+        return self._component_index().groups()
+    
+    def component_count(self) -> int:
+        """Number of connected components (islands) in the topology."""
+        return self._component_index().count
+    
+    def find_link_by_ports(self, port_a: str, port_b: str) -> Optional[LinkModel]:
+        """Find the link joining two ports (either direction)."""
+        link = self.links.get(self._link_by_ports.get(self._port_pair(port_a, port_b), ""))
+        if link and self._port_pair(link.source_port_id, link.target_port_id) == self._port_pair(port_a, port_b):
+            return link
+        return None
+    
+    def find_port(self, port_id: str) -> Optional[tuple[NodeModel, PortConfig]]:
+        """Find a port and the node that owns it (ports are indexed as nodes create them)."""
+        node = self.nodes.get(self._port_owner.get(port_id, ""))
+        port = node.get_port(port_id) if node else None
+        if port is None:
+            return None  # Unknown, or removed from its node since
+        return node, port
+    
+    def find_node_by_name(self, name: str) -> Optional[NodeModel]:
+        """
+        Find a node by display name (first match if names repeat).
+        
+        Renames are indexed when reported through notify_changed().
+        """
+        for node_id in self._node_by_name.get(name, ()):
+            node = self.nodes.get(node_id)
+            if node is not None and node.name == name:
+                return node
+        return None
     
     def add_node(self, node_type: NodeType, position: Position) -> NodeModel:
         """Create and add a new node to the network."""
@@ -572,12 +1227,8 @@ class NetworkModel:
             return None
         
         # Remove connected links
-        links_to_remove = [
-            link_id for link_id, link in self.links.items()
-            if link.source_node_id == node_id or link.target_node_id == node_id
-        ]
-        for link_id in links_to_remove:
-            self.remove_link(link_id)
+        for link in self.get_links_for_node(node_id):
+            self.remove_link(link.id)
         
         return self.nodes.pop(node_id)
     
@@ -622,10 +1273,8 @@ class NetworkModel:
             target_port = available[0]
         
         # Check if link already exists between these ports
-        for link in self.links.values():
-            if (link.source_port_id == source_port.id and link.target_port_id == target_port.id) or \
-               (link.source_port_id == target_port.id and link.target_port_id == source_port.id):
-                return None
+        if self.find_link_by_ports(source_port.id, target_port.id):
+            return None
         
         link = LinkModel(
             channel_type=channel_type,
@@ -641,12 +1290,13 @@ class NetworkModel:
         target_port.connected_link_id = link.id
         
         # Auto-assign IP addresses based on topology
-        self._assign_ip_addresses(source_node, source_port, target_node, target_port)
+        self._assign_ip_addresses(link, source_node, source_port, target_node, target_port)
         
         return link
     
     def _assign_ip_addresses(
         self, 
+        link: LinkModel,
         node1: NodeModel, 
         port1: PortConfig, 
         node2: NodeModel, 
@@ -657,9 +1307,9 @@ class NetworkModel:
         
         Rules:
         1. If connecting to a switch with subnet_base configured, 
-           use that subnet for the non-switch node
+           lease the lowest free host of that subnet to the non-switch node
         2. Switch ports don't get IPs (Layer 2 device)
-        3. Otherwise, create a new point-to-point subnet
+        3. Otherwise, allocate a new point-to-point subnet from the IPAM
         """
         # Check if either node is a switch with subnet configured
         switch_node = None
@@ -678,22 +1328,17 @@ class NetworkModel:
             other_node = node1
             other_port = port1
         
-        if switch_node and switch_node.subnet_base:
+        subnet = self._switch_subnet(switch_node) if switch_node else None
+        if subnet is not None:
             # Use switch's subnet for the connected device
             # Switch ports typically don't have IPs (Layer 2)
             switch_port.ip_address = ""
-            
-            # Assign next available IP in switch's subnet to the other device
-            base_parts = switch_node.subnet_base.split('.')
-            if len(base_parts) == 4:
-                host_ip = switch_node._next_host_ip
-                switch_node._next_host_ip += 1
-                # Skip .0 (network) and .255 (broadcast)
-                if host_ip == 0:
-                    host_ip = 1
-                    switch_node._next_host_ip = 2
-                other_port.ip_address = f"{base_parts[0]}.{base_parts[1]}.{base_parts[2]}.{host_ip}"
-                other_port.netmask = switch_node.subnet_mask
+            if other_node.node_type == NodeType.SWITCH:
+                other_port.ip_address = ""
+            else:
+                # The lease is keyed by the link, so remove_link() frees it
+                other_port.ip_address = self.ipam.allocate_host(switch_node.id, link.id)
+                other_port.netmask = subnet.netmask
         
         elif switch_node:
             # Switch without subnet config - no IPs assigned
@@ -702,28 +1347,88 @@ class NetworkModel:
         
         else:
             # Point-to-point link between non-switch devices
-            subnet = self._next_subnet
-            self._next_subnet += 1
-            port1.ip_address = f"10.0.{subnet}.1"
-            port2.ip_address = f"10.0.{subnet}.2"
+            subnet = self.ipam.allocate_p2p(link.id)
+            port1.ip_address = subnet.host(1)
+            port2.ip_address = subnet.host(2)
+            port1.netmask = subnet.netmask
+            port2.netmask = subnet.netmask
+    
+    def _switch_subnet(self, switch: NodeModel) -> Optional[Subnet]:
+        """
+        Keep a switch's IPAM reservation in step with its subnet_base.
+        
+        Returns the LAN subnet, or None if none is configured. A subnet
+        the user picked is recorded even if it overlaps another one.
+        """
+        if switch.node_type != NodeType.SWITCH or not switch.subnet_base:
+            self.ipam.release(switch.id)
+            return None
+        try:
+            prefix = netmask_to_prefix(switch.subnet_mask)
+            cidr = f"{network_address(switch.subnet_base, switch.subnet_mask)}/{prefix}"
+        except ValueError:
+            self.ipam.release(switch.id)
+            return None
+        self.ipam.reserve(switch.id, cidr, force=True)
+        return self.ipam.get(switch.id)
+    
+    def rebuild_ip_allocations(self):
+        """
+        Re-register existing subnets with the IPAM.
+        
+        Call this after populating nodes/links directly (e.g. when loading
+        a saved project) so that new links don't reuse addresses.
+        """
+        self.ipam.reset()
+        
+        for node in self.nodes.values():
+            if node.node_type == NodeType.SWITCH:
+                self._switch_subnet(node)
+        
+        for link in self.links.values():
+            source_node = self.nodes.get(link.source_node_id)
+            target_node = self.nodes.get(link.target_node_id)
+            if not source_node or not target_node:
+                continue
+            if NodeType.SWITCH in (source_node.node_type, target_node.node_type):
+                # Hosts on a switch LAN keep their leased addresses
+                if source_node.node_type == NodeType.SWITCH:
+                    switch, host, host_port_id = source_node, target_node, link.target_port_id
+                else:
+                    switch, host, host_port_id = target_node, source_node, link.source_port_id
+                port = host.get_port(host_port_id)
+                if (host.node_type != NodeType.SWITCH and port and port.ip_address
+                        and self.ipam.get(switch.id) is not None):
+                    self.ipam.reserve_host(switch.id, link.id, port.ip_address)
+                continue
+            
+            port = source_node.get_port(link.source_port_id)
+            if not port or not port.ip_address:
+                continue
+            try:
+                network = network_address(port.ip_address, port.netmask)
+                self.ipam.reserve(link.id, f"{network}/{netmask_to_prefix(port.netmask)}")
+            except ValueError:
+                pass
     
     def reassign_switch_ips(self, switch_id: str):
         """
         Reassign IPs to all hosts connected to a switch based on its subnet config.
         Call this after changing a switch's subnet_base.
+        
+        Each readdressed host is reported through notify_changed().
         """
         switch = self.nodes.get(switch_id)
         if not switch or switch.node_type != NodeType.SWITCH:
             return
         
-        if not switch.subnet_base:
+        subnet = self._switch_subnet(switch)
+        if subnet is None:
             return
         
-        # Reset host IP counter
-        switch._next_host_ip = 1
-        
-        # Find all links connected to this switch
-        for link in self.links.values():
+        # Free every host lease first so hosts are renumbered from .1 in link order
+        hosts = []
+        for link in self.get_links_for_node(switch_id):
             other_node = None
             other_port = None
             
@@ -737,12 +1442,13 @@ class NetworkModel:
                     other_port = other_node.get_port(link.source_port_id)
             
             if other_node and other_port and other_node.node_type != NodeType.SWITCH:
-                base_parts = switch.subnet_base.split('.')
-                if len(base_parts) == 4:
-                    host_ip = switch._next_host_ip
-                    switch._next_host_ip += 1
-                    other_port.ip_address = f"{base_parts[0]}.{base_parts[1]}.{base_parts[2]}.{host_ip}"
-                    other_port.netmask = switch.subnet_mask
+                self.ipam.release(link.id)
+                hosts.append((link, other_node, other_port))
+        
+        for link, other_node, other_port in hosts:
+            other_port.ip_address = self.ipam.allocate_host(switch_id, link.id)
+            other_port.netmask = subnet.netmask
+            self.notify_changed("node", other_node.id)
     
     def remove_link(self, link_id: str) -> Optional[LinkModel]:
         """Remove a link and clean up port bindings."""
@@ -751,6 +1457,9 @@ class NetworkModel:
         
         link = self.links[link_id]
         
+        # Return the link's subnet to the pool
+        self.ipam.release(link_id)
+        
         # Unbind ports
         source_node = self.nodes.get(link.source_node_id)
         target_node = self.nodes.get(link.target_node_id)
@@ -769,6 +1478,95 @@ class NetworkModel:
         
         return self.links.pop(link_id)
     
+    def rewire_link(
+        self,
+        link_id: str,
+        source_node_id: Optional[str] = None,
+        target_node_id: Optional[str] = None,
+        source_port_id: Optional[str] = None,
+        target_port_id: Optional[str] = None
+    ) -> bool:
+        """
+        Move one or both ends of a link to other nodes/ports.
+        
+        Endpoints left as None keep their current value; when a node
+        changes without a port, the first available port is used.
+        Addresses are re-assigned for the new endpoints.
+        
+        Returns:
+            False if the link or a requested node/port doesn't exist or is in use
+        """
+        link = self.links.get(link_id)
+        if not link:
+            return False
+        
+        new_source = source_node_id or link.source_node_id
+        new_target = target_node_id or link.target_node_id
+        if new_source not in self.nodes or new_target not in self.nodes:
+            return False
+        
+        def pick_port(node_id, port_id, current_node, current_port):
+            node = self.nodes[node_id]
+            if port_id:
+                port = node.get_port(port_id)
+            elif node_id == current_node:
+                port = node.get_port(current_port)
+            else:
+                available = node.get_available_ports()
+                port = available[0] if available else None
+            if not port or (port.is_connected and port.connected_link_id != link_id):
+                return None
+            return port
+        
+        source_port = pick_port(new_source, source_port_id, link.source_node_id, link.source_port_id)
+        target_port = pick_port(new_target, target_port_id, link.target_node_id, link.target_port_id)
+        if not source_port or not target_port or source_port is target_port:
+            return False
+        existing = self.find_link_by_ports(source_port.id, target_port.id)
+        if existing and existing.id != link_id:
+            return False
+        
+        # Unbind the old endpoints and return the subnet to the pool
+        self.ipam.release(link_id)
+        for node_id, port_id in (
+            (link.source_node_id, link.source_port_id),
+            (link.target_node_id, link.target_port_id),
+        ):
+            node = self.nodes.get(node_id)
+            port = node.get_port(port_id) if node else None
+            if port and port.connected_link_id == link_id:
+                port.connected_link_id = None
+                port.ip_address = ""
+        
+        # Update the indexes in place so the link keeps its position in
+        # the adjacency of nodes it stays attached to
+        old_nodes = (link.source_node_id, link.target_node_id)
+        new_nodes = (new_source, new_target)
+        for node_id in old_nodes:
+            if node_id not in new_nodes:
+                self._links_by_node.get(node_id, {}).pop(link_id, None)
+        for node_id in new_nodes:
+            self._links_by_node.setdefault(node_id, {})[link_id] = None
+        pair = self._port_pair(link.source_port_id, link.target_port_id)
+        if self._link_by_ports.get(pair) == link_id:
+            del self._link_by_ports[pair]
+        self._link_by_ports[self._port_pair(source_port.id, target_port.id)] = link_id
+        if set(old_nodes) != set(new_nodes):
+            self._components_stale = True
+        
+        link.source_node_id, link.target_node_id = new_source, new_target
+        link.source_port_id, link.target_port_id = source_port.id, target_port.id
+        source_port.connected_link_id = link_id
+        target_port.connected_link_id = link_id
+        self._assign_ip_addresses(
+            link, self.nodes[new_source], source_port, self.nodes[new_target], target_port
+        )
+        self.notify_changed("link", link_id, link)
+        for node_id in old_nodes:
+            if node_id not in new_nodes:
+                self.notify_changed("node", node_id)  # Port released
+        return True
+    
     def get_node(self, node_id: str) -> Optional[NodeModel]:
         """Get a node by ID."""
         return self.nodes.get(node_id)
@@ -782,7 +1580,7 @@ class NetworkModel:
         self.nodes.clear()
         self.links.clear()
         self.applications.clear()
-        self._next_subnet = 1
+        self.ipam.reset()
     
     def to_dict(self) -> dict:
         """Serialize to dictionary for saving."""
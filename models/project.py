@@ -19,6 +19,7 @@ Directory Structure:
         │   ├── app_base.py            # Application base class
         │   └── *.py                   # Host application scripts
         └── results/                   # Simulation results
+            ├── runs.sqlite            # Run history for cross-run comparison
             └── run_YYYYMMDD_HHMMSS/   # Timestamped run folder
                 ├── run_info.json      # Run metadata
                 ├── flows.json         # Flows used for this run
@@ -36,6 +37,8 @@ from dataclasses import dataclass, field, asdict
 from typing import Optional, Dict, List, Any, TYPE_CHECKING
 from enum import Enum
 
+from .project_index import ProjectIndex
+
 if TYPE_CHECKING:
     from models.network import NetworkModel
     from models.simulation import SimulationConfig
@@ -160,19 +163,27 @@ class Project:
             return self._path / "results"
         return None
     
+    @property
+    def run_store_path(self) -> Optional[Path]:
+        """Get path to the run history database (see services.run_store)."""
+        if self._path:
+            return self._path / "results" / "runs.sqlite"
+        return None
+    
     def get_run_dir(self, run_id: str) -> Optional[Path]:
         """Get path to a specific run's directory."""
         if self._path:
             return self._path / "results" / run_id
         return None
     
-    def create_run_dir(self) -> Path:
-        """Create a new timestamped run directory."""
+    def create_run_dir(self, run_id: Optional[str] = None) -> Path:
+        """Create a run directory (named run_YYYYMMDD_HHMMSS unless run_id is given)."""
         if not self._path:
             raise ValueError("Project has no path set")
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        run_dir = self._path / "results" / f"run_{timestamp}"
+        if not run_id:
+            run_id = f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        run_dir = self._path / "results" / run_id
         run_dir.mkdir(parents=True, exist_ok=True)
         return run_dir
 
@@ -206,6 +217,7 @@ class ProjectManager:
         """
         self.workspace_root = Path(workspace_root)
         self.projects_dir = self.workspace_root / "projects"
+        self.project_index = ProjectIndex(self.projects_dir)
         self._current_project: Optional[Project] = None
     
     @property
@@ -217,45 +229,25 @@ class ProjectManager:
         """Create workspace directories if needed."""
         self.projects_dir.mkdir(parents=True, exist_ok=True)
     
-    def list_projects(self) -> List[Dict[str, Any]]:
+    def list_projects(self, refresh: bool = True) -> List[Dict[str, Any]]:
         """
         List all projects in the workspace.
         
+        Served from the workspace project index; only projects whose
+        directories changed since they were indexed are re-read.
+        
+        Args:
+            refresh: Validate the index first. False returns the last
+                indexed listing without touching the project directories
+                (follow up with project_index.refresh_in_background()).
+        
         Returns:
             List of project info dictionaries with name, path, modified date
         """
         self.ensure_workspace()
-        projects = []
-        
-        for item in self.projects_dir.iterdir():
-            if item.is_dir():
-                project_file = item / "project.json"
-                if project_file.exists():
-                    try:
-                        with open(project_file, 'r') as f:
-                            data = json.load(f)
-                        projects.append({
-                            "name": data.get("metadata", {}).get("name", item.name),
-                            "path": str(item),
-                            "description": data.get("metadata", {}).get("description", ""),
-                            "modified": data.get("metadata", {}).get("modified", ""),
-                            "has_topology": (item / "topology.json").exists(),
-                            "run_count": len(list((item / "results").glob("run_*"))) if (item / "results").exists() else 0
-                        })
-                    except Exception as e:
-                        # Include project even if metadata is corrupt
-                        projects.append({
-                            "name": item.name,
-                            "path": str(item),
-                            "description": f"(error reading metadata: {e})",
-                            "modified": "",
-                            "has_topology": (item / "topology.json").exists(),
-                            "run_count": 0
-                        })
-        
-        # Sort by modified date (newest first)
-        projects.sort(key=lambda p: p.get("modified", ""), reverse=True)
-        return projects
+        if not refresh:
+            return self.project_index.cached()
+        return self.project_index.list()
     
     def create_project(self, name: str, description: str = "") -> Project:
         """
@@ -380,7 +372,8 @@ class ProjectManager:
         network_model=None,
         sim_config=None,
         script_content: str = None,
-        output_dir: str = None
+        output_dir: str = None,
+        save_topology=None
     ):
         """
         Save all project components to disk.
@@ -391,6 +384,8 @@ class ProjectManager:
             sim_config: Optional SimulationConfig with flows to save
             script_content: Optional generated script content to save
             output_dir: Optional temp directory with generated files to copy
+            save_topology: Optional callable(path) that writes the topology
+                instead of a synchronous save (e.g. a background autosave save)
         """
         if not project._path:
             raise ValueError("Project has no path")
@@ -403,7 +398,10 @@ class ProjectManager:
         
         # Save topology if provided
         if network_model:
-            self._save_topology(project, network_model)
+            if save_topology is not None:
+                save_topology(project.topology_path)
+            else:
+                self._save_topology(project, network_model)
             
             # Save flows from network_model.saved_flows
             if hasattr(network_model, 'saved_flows') and network_model.saved_flows:
@@ -418,6 +416,7 @@ class ProjectManager:
             self._save_scripts(project, script_content, output_dir)
         
         project._state = ProjectState.SAVED
+        self.project_index.update(project._path)
     
     def _save_project_metadata(self, project: Project):
         """Save project.json file."""
@@ -430,6 +429,8 @@ class ProjectManager:
         
         with open(project_file, 'w') as f:
             json.dump(data, f, indent=2)
+        
+        self.project_index.update(project._path)
     
     def _save_flows_from_network(self, project: Project, network_model):
         """Save flows from network_model.saved_flows to flows.json."""
@@ -556,6 +557,7 @@ class ProjectManager:
         
         if path.exists():
             shutil.rmtree(path)
+        self.project_index.remove(path)
         
         if self._current_project and self._current_project._path == path:
             self._current_project = None
@@ -0,0 +1,248 @@
+"""
+Workspace project index.
+
+Listing projects used to parse every project.json and glob every
+results/ directory. The index caches each project's listing entry in
+one file beside the projects directory (so writing it doesn't change
+that directory's mtime):
+
+    .project_index.json
+    {"version": 1, "listing_mtime": ..., "projects": {
+        "<dir name>": {"signature": [...], "name": ..., "description": ...,
+                       "modified": ..., "has_topology": ..., "run_count": ...}}}
+
+An entry is reused while its signature matches: the mtimes of the project
+directory (topology.json created or removed), its results/ directory
+(runs added or removed) and project.json, plus project.json's size. The
+projects directory's own mtime tells whether projects were added or
+removed, so a directory listing is only needed when it changed.
+Checking the index costs a few stat() calls per project; only changed
+projects are re-read.
+
+ProjectManager updates entries as it writes projects. Each index write
+goes to a temp file that is renamed over the index, so readers see the
+old or the new index, never a partial one.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+INDEX_FILE = ".project_index.json"
+INDEX_VERSION = 1
+
+
+def _mtime(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def project_signature(project_dir: Path) -> Optional[list]:
+    """Cheap change signature of a project directory (None if it's not a project)."""
+    try:
+        dir_mtime = project_dir.stat().st_mtime_ns
+        meta = (project_dir / "project.json").stat()
+    except OSError:
+        return None
+    return [dir_mtime, _mtime(project_dir / "results"), meta.st_mtime_ns, meta.st_size]
+
+
+def scan_project(project_dir: Path) -> Dict[str, Any]:
+    """Read one project's listing entry from disk (without its path)."""
+    results = project_dir / "results"
+    run_count = len(list(results.glob("run_*"))) if results.exists() else 0
+    has_topology = (project_dir / "topology.json").exists()
+    try:
+        with open(project_dir / "project.json", 'r') as f:
+            metadata = json.load(f).get("metadata", {})
+        return {
+            "name": metadata.get("name", project_dir.name),
+            "description": metadata.get("description", ""),
+            "modified": metadata.get("modified", ""),
+            "has_topology": has_topology,
+            "run_count": run_count,
+        }
+    except Exception as e:
+        # Include project even if metadata is corrupt
+        return {
+            "name": project_dir.name,
+            "description": f"(error reading metadata: {e})",
+            "modified": "",
+            "has_topology": has_topology,
+            "run_count": 0,
+        }
+
+
+class ProjectIndex:
+    """
+    Cached listing of the projects in a projects directory.
+
+    Usage:
+        index = ProjectIndex(workspace / "projects")
+        projects = index.list()              # Validates, re-reads changed projects
+        projects = index.cached()            # Index contents, no validation
+        index.refresh_in_background(callback)
+
+    Safe to use from several threads.
+    """
+
+    def __init__(self, projects_dir: Path, index_path: Optional[Path] = None):
+        self.projects_dir = Path(projects_dir)
+        self.index_path = Path(index_path) if index_path else self.projects_dir.parent / INDEX_FILE
+        self._lock = threading.RLock()
+        self._data: Optional[dict] = None
+
+    # ----- reading -----
+
+    def cached(self) -> List[Dict[str, Any]]:
+        """Listing as last indexed, without touching the project directories."""
+        with self._lock:
+            return self._entries(self._load())
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Validate the index and return the current listing."""
+        return self.refresh()
+
+    def is_stale(self) -> bool:
+        """Whether any project was added, removed or changed since it was indexed."""
+        with self._lock:
+            data = self._load()
+            if data["listing_mtime"] != _mtime(self.projects_dir):
+                return True
+            return any(
+                project_signature(self.projects_dir / name) != entry["signature"]
+                for name, entry in data["projects"].items()
+            )
+
+    # ----- updating -----
+
+    def refresh(self, full: bool = False) -> List[Dict[str, Any]]:
+        """
+        Re-read projects whose signature changed and save the index.
+
+        Args:
+            full: Discard the index and re-read every project
+        """
+        with self._lock:
+            data = self._load()
+            if full:
+                data = self._data = self._empty()
+            projects = data["projects"]
+            listing_mtime = _mtime(self.projects_dir)
+            changed = listing_mtime != data["listing_mtime"]
+
+            if changed:
+                names = [
+                    item.name for item in self.projects_dir.iterdir()
+                    if item.is_dir() and (item / "project.json").exists()
+                ] if self.projects_dir.exists() else []
+            else:
+                names = list(projects)
+
+            current = {}
+            for name in names:
+                signature = project_signature(self.projects_dir / name)
+                if signature is None:
+                    changed = True
+                    continue
+                entry = projects.get(name)
+                if entry is None or entry["signature"] != signature:
+                    entry = dict(scan_project(self.projects_dir / name), signature=signature)
+                    changed = True
+                current[name] = entry
+            if len(current) != len(projects):
+                changed = True
+
+            data["projects"] = current
+            data["listing_mtime"] = listing_mtime
+            if changed:
+                self._save(data)
+            return self._entries(data)
+
+    def refresh_in_background(
+        self, callback: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+    ) -> threading.Thread:
+        """
+        Run refresh() on a worker thread.
+
+        callback(projects) is called on that thread when done; GUI code
+        should forward it through a queued signal.
+        """
+        def run():
+            try:
+                projects = self.refresh()
+            except OSError as e:
+                print(f"Error refreshing project index: {e}")
+                return
+            if callback is not None:
+                callback(projects)
+
+        thread = threading.Thread(target=run, name="project-index", daemon=True)
+        thread.start()
+        return thread
+
+    def update(self, project_dir: Path):
+        """Re-read one project after writing it."""
+        project_dir = Path(project_dir)
+        if project_dir.parent != self.projects_dir:
+            return  # Opened by path from outside the workspace
+        with self._lock:
+            data = self._load()
+            signature = project_signature(project_dir)
+            if signature is None:
+                data["projects"].pop(project_dir.name, None)
+            else:
+                data["projects"][project_dir.name] = dict(scan_project(project_dir), signature=signature)
+            self._save(data)
+
+    def remove(self, project_dir: Path):
+        """Drop a deleted project."""
+        with self._lock:
+            data = self._load()
+            if data["projects"].pop(Path(project_dir).name, None) is not None:
+                self._save(data)
+
+    # ----- storage -----
+
+    @staticmethod
+    def _empty() -> dict:
+        return {"version": INDEX_VERSION, "listing_mtime": 0, "projects": {}}
+
+    def _load(self) -> dict:
+        if self._data is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") != INDEX_VERSION or not isinstance(data.get("projects"), dict):
+                    data = self._empty()
+            except (OSError, ValueError):
+                data = self._empty()  # Missing or corrupt: rebuilt on refresh
+            self._data = data
+        return self._data
+
+    def _save(self, data: dict):
+        self._data = data
+        tmp = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            # Read-only workspace: the index stays in memory
+            print(f"Could not write project index: {e}")
+            tmp.unlink(missing_ok=True)
+
+    def _entries(self, data: dict) -> List[Dict[str, Any]]:
+        projects = []
+        for name, entry in data["projects"].items():
+            info = {key: value for key, value in entry.items() if key != "signature"}
+            info["path"] = str(self.projects_dir / name)
+            projects.append(info)
+        # Sort by modified date (newest first)
+        projects.sort(key=lambda p: p.get("modified", ""), reverse=True)
+        return projects
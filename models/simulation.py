@@ -7,7 +7,8 @@ Tracks simulation execution state, traffic flows, and results.
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Optional
-import uuid
+
+from .ids import FLOW_ID_PREFIX, new_id, reserve_id, short_id
 
 # Try to import PyQt6, but make it optional for testing
 try:
@@ -52,7 +53,7 @@ class TrafficFlow:
     Represents an ns-3 application configuration for traffic generation.
     Can model OnOff, UdpEcho, BulkSend, and other application types.
     """
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=lambda: new_id(FLOW_ID_PREFIX))
     name: str = ""
     
     # Endpoints
@@ -89,8 +90,55 @@ class TrafficFlow:
     app_node_id: str = ""                  # ID of the APPLICATION node to use
     
     def __post_init__(self):
+        reserve_id(self.id)
         if not self.name:
-            self.name = f"flow_{self.id[:4]}"
+            self.name = f"flow_{short_id(self.id)}"
+
+
+class TraceFormat(Enum):
+    """Output format for a traced link or node."""
+    ASCII = "ascii"     # ns-3 ASCII trace (.tr)
+    PCAP = "pcap"       # Packet capture (.pcap)
+    PKT = "pkt"         # Compact PKT| records for playback
+
+
+@dataclass
+class TraceConfig:
+    """
+    Selects which devices are traced and how.
+    
+    With no links, nodes or roles selected, tracing falls back to the
+    global enable_ascii_trace / enable_pcap switches on every device.
+    """
+    link_formats: dict[str, TraceFormat] = field(default_factory=dict)  # link_id -> format
+    node_formats: dict[str, TraceFormat] = field(default_factory=dict)  # node_id -> format (all its devices)
+    grid_role_formats: dict[str, TraceFormat] = field(default_factory=dict)  # GridNodeRole name -> format
+    sample_rate: float = 1.0     # Fraction of packets kept in PKT records (0-1]
+    snap_length: int = 0         # PCAP bytes captured per packet (0 = whole packet)
+    
+    @property
+    def is_selective(self) -> bool:
+        """Check if any links, nodes or roles are selected."""
+        return bool(self.link_formats or self.node_formats or self.grid_role_formats)
+    
+    def clear(self):
+        """Remove all selections."""
+        self.link_formats.clear()
+        self.node_formats.clear()
+        self.grid_role_formats.clear()
+
+
+class ResultsFormat(Enum):
+    """How the generated script writes flow results."""
+    AUTO = "auto"       # XML for small runs, BINARY for large ones
+    XML = "xml"         # FlowMonitor XML plus per-flow console blocks
+    CSV = "csv"         # One row per flow (flowstats.csv)
+    BINARY = "binary"   # Columnar arrays (flowstats.bin)
+
+
+# Runs with at least this many nodes or flows count as large for ResultsFormat.AUTO
+LARGE_RUN_NODE_COUNT = 100
+LARGE_RUN_FLOW_COUNT = 50
 
 
 @dataclass
@@ -102,6 +150,20 @@ class SimulationConfig:
     enable_ascii_trace: bool = True
     enable_flow_monitor: bool = True
     random_seed: int = 1
+    trace: TraceConfig = field(default_factory=TraceConfig)
+    metrics_interval: float = 1.0  # Seconds of simulated time between METRICS| snapshots (0 = off)
+    results_format: ResultsFormat = ResultsFormat.AUTO
+    delay_histogram_bins: int = 0        # Fixed-width delay histogram per flow (0 = off)
+    delay_histogram_bin_ms: float = 1.0  # Width of each histogram bin; last bin collects overflow
+    mpi_ranks: int = 1  # > 1 runs a distributed simulation under mpirun
+    
+    def resolve_results_format(self, node_count: int) -> ResultsFormat:
+        """Resolve AUTO to a concrete format for a topology size."""
+        if self.results_format != ResultsFormat.AUTO:
+            return self.results_format
+        if node_count >= LARGE_RUN_NODE_COUNT or len(self.flows) >= LARGE_RUN_FLOW_COUNT:
+            return ResultsFormat.BINARY
+        return ResultsFormat.XML
     
     def add_flow(self, flow: TrafficFlow):
         """Add a traffic flow."""
@@ -138,6 +200,9 @@ class FlowStats:
     times_forwarded: int = 0
     first_tx_time_ns: int = 0
     last_rx_time_ns: int = 0
+    delay_histogram: list[int] = field(default_factory=list)  # Packet counts per fixed-width bin
+    delay_histogram_bin_ms: float = 0.0
+    partial: bool = False  # Crossed MPI ranks and no rank saw it received: rx side unknown
     
     @property
     def throughput_mbps(self) -> float:
@@ -174,6 +239,26 @@ class FlowStats:
     def protocol_name(self) -> str:
         """Get protocol name."""
         return {6: "TCP", 17: "UDP"}.get(self.protocol, f"Proto-{self.protocol}")
+    
+    def delay_percentile_ms(self, q: float) -> Optional[float]:
+        """
+        Estimate a delay percentile (q in 0..1) from the delay histogram.
+        
+        Interpolates linearly within the bin holding the percentile, so
+        the error is at most one bin width; values in the overflow (last)
+        bin are reported as if that bin had the same width. None without
+        a histogram.
+        """
+        total = sum(self.delay_histogram)
+        if not total or self.delay_histogram_bin_ms <= 0:
+            return None
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(self.delay_histogram):
+            if count and seen + count >= rank:
+                return (index + (rank - seen) / count) * self.delay_histogram_bin_ms
+            seen += count
+        return len(self.delay_histogram) * self.delay_histogram_bin_ms
 
 
 @dataclass
@@ -186,6 +271,7 @@ class SimulationResults:
     console_output: str = ""
     trace_file_path: str = ""
     pcap_files: list[str] = field(default_factory=list)
+    run_id: str = ""  # "run_YYYYMMDD_HHMMSS"; names the project's results directory and run store entry
     
     @property
     def total_tx_packets(self) -> int:
@@ -201,9 +287,10 @@ class SimulationResults:
     
     @property
     def average_throughput_mbps(self) -> float:
-        if not self.flow_stats:
+        flows = [f for f in self.flow_stats if not f.partial]
+        if not flows:
             return 0.0
-        return sum(f.throughput_mbps for f in self.flow_stats) / len(self.flow_stats)
+        return sum(f.throughput_mbps for f in flows) / len(flows)
     
     @property
     def average_delay_ms(self) -> float:
@@ -13,13 +13,29 @@ from .simulation_runner import (
     wsl_to_windows_path,
     wsl_unc_path_to_linux,
 )
-from .results_parser import ResultsParser, AsciiTraceParser, TraceEvent
+from .results_parser import (
+    ResultsParser,
+    AsciiTraceParser,
+    TraceEvent,
+    MetricsSnapshot,
+    FlowMetricsDelta,
+)
 from .trace_player import (
     TraceParser,
     TracePlayer,
     PacketEvent,
     PacketEventType,
     TraceStats,
+    TraceMap,
+    LinkCounters,
+    TRACE_MAP_FILE,
+)
+from .link_load import (
+    HeatmapMetric,
+    LinkLoad,
+    LiveLinkLoad,
+    parse_data_rate,
+    trace_link_loads,
 )
 from .settings_manager import (
     SettingsManager,
@@ -45,8 +61,45 @@ from .topology_converter import (
 )
 from .shape_manager import (
     ShapeManager,
+    ShapeGeometryCache,
+    PathLookup,
     get_shape_manager,
 )
+from .topology_partitioner import (
+    TopologyPartitioner,
+    TopologyPartition,
+    partition_network,
+)
+from .topology_generator import (
+    TopologyGenerator,
+    GeneratedTopology,
+    generate_topology,
+    TOPOLOGY_KINDS,
+)
+from .compact_project import (
+    CompactProjectReader,
+    write_compact_project,
+    is_compact_file,
+    COMPACT_SUFFIX,
+)
+from .topology_validator import (
+    TopologyValidator,
+    AddressIndex,
+    ValidationReport,
+    ValidationIssue,
+    IssueSeverity,
+    validate_topology,
+)
+from .run_store import (
+    RunStore,
+    FLOW_METRICS,
+    flow_key,
+)
+from .autosave import (
+    AutosaveManager,
+    ChangeJournal,
+    autosave_dir_for,
+)
 
 __all__ = [
     "ProjectManager",
@@ -66,11 +119,22 @@ __all__ = [
     "ResultsParser",
     "AsciiTraceParser",
     "TraceEvent",
+    "MetricsSnapshot",
+    "FlowMetricsDelta",
     "TraceParser",
     "TracePlayer",
     "PacketEvent",
     "PacketEventType",
     "TraceStats",
+    "TraceMap",
+    "LinkCounters",
+    "TRACE_MAP_FILE",
+    # Link heatmap
+    "HeatmapMetric",
+    "LinkLoad",
+    "LiveLinkLoad",
+    "parse_data_rate",
+    "trace_link_loads",
     "SettingsManager",
     "AppSettings",
     "NS3Settings",
@@ -91,5 +155,36 @@ __all__ = [
     "NS3ExampleProcessor",
     # Shape management
     "ShapeManager",
+    "ShapeGeometryCache",
+    "PathLookup",
     "get_shape_manager",
+    # Distributed simulation
+    "TopologyPartitioner",
+    "TopologyPartition",
+    "partition_network",
+    # Synthetic topologies
+    "TopologyGenerator",
+    "GeneratedTopology",
+    "generate_topology",
+    "TOPOLOGY_KINDS",
+    # Compact project container
+    "CompactProjectReader",
+    "write_compact_project",
+    "is_compact_file",
+    "COMPACT_SUFFIX",
+    # Pre-run validation
+    "TopologyValidator",
+    "AddressIndex",
+    "ValidationReport",
+    "ValidationIssue",
+    "IssueSeverity",
+    "validate_topology",
+    # Run history
+    "RunStore",
+    "FLOW_METRICS",
+    "flow_key",
+    # Autosave
+    "AutosaveManager",
+    "ChangeJournal",
+    "autosave_dir_for",
 ]
@@ -0,0 +1,525 @@
+"""
+Journaled background autosave.
+
+Saving a large model on the GUI thread means serializing every node on
+each Ctrl+S. Autosave instead records edits as small operations and
+hands them to a writer thread:
+
+    GUI thread                          writer thread
+    ----------                          -------------
+    NetworkModel change listeners  ->   apply ops to a serialized mirror
+    ChangeJournal (dirty IDs)           append ops to journal.jsonl (fsync)
+    flush(): serialize dirty objects    compact: mirror -> snapshot.ns3z
+                                        (atomic rename), start a new journal
+                                        save_to(path): write the mirror out
+
+Only the objects edited since the last flush are serialized on the GUI
+thread. The writer never reads the live model, so it needs no locking.
+
+Files live next to the saved file, in ".<name>.autosave/":
+
+    snapshot.ns3z   Compact container of the whole document (see compact_project)
+    journal.jsonl   One line per flush: {"seq": n, "ops": [...]}
+
+The snapshot records the last journal sequence number it contains, so
+after a crash between writing a snapshot and truncating the journal the
+old lines are skipped on replay. A torn last line is ignored.
+
+Usage:
+    autosave = AutosaveManager()
+    autosave.attach(network, Path("topology.json"))
+    ...                                   # Edits are recorded automatically
+    autosave.flush()                      # From a timer on the GUI thread
+    future = autosave.save_to(Path("topology.json"))
+
+    if AutosaveManager.has_recovery(path):
+        network = AutosaveManager.recover(path)
+"""
+
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from models import NetworkModel
+from .compact_project import (
+    COMPACT_SUFFIX, CompactProjectReader, write_compact_project
+)
+from .project_manager import ProjectManager
+
+
+AUTOSAVE_SUFFIX = ".autosave"
+SNAPSHOT_FILE = "snapshot" + COMPACT_SUFFIX
+JOURNAL_FILE = "journal.jsonl"
+
+# Rewrite the snapshot after this many journaled ops or seconds
+DEFAULT_COMPACT_AFTER_OPS = 5000
+DEFAULT_COMPACT_INTERVAL = 300.0
+
+
+def autosave_dir_for(path: Path) -> Path:
+    """Autosave directory for a topology file (".<name>.autosave" beside it)."""
+    path = Path(path)
+    return path.parent / f".{path.name}{AUTOSAVE_SUFFIX}"
+
+
+def _atomic_write(path: Path, write):
+    """Write via a temp file in the same directory and rename over path."""
+    tmp = path.with_name(path.name + ".tmp")
+    write(tmp)
+    with open(tmp, "rb+") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def write_document(document: dict, path: Path):
+    """Write a project document as JSON or compact, by file suffix, atomically."""
+    path = Path(path)
+    if path.suffix.lower() == COMPACT_SUFFIX:
+        _atomic_write(path, lambda tmp: write_compact_project(document, tmp))
+    else:
+        def write_json(tmp):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(document, f, indent=2, ensure_ascii=False)
+        _atomic_write(path, write_json)
+
+
+class DocumentMirror:
+    """
+    A project document keyed by node and link ID, so ops apply in O(1).
+
+    Built from and converted back to the ProjectManager JSON document.
+    """
+
+    def __init__(self, document: dict):
+        topology = document.get("topology", {})
+        self.base = {key: value for key, value in document.items() if key != "topology"}
+        self.nodes = {node["id"]: node for node in topology.get("nodes", [])}
+        self.links = {link["id"]: link for link in topology.get("links", [])}
+        self.seq = 0  # Last journal sequence applied
+
+    def apply(self, ops: list[dict]):
+        """Apply put/delete ops from a ChangeJournal."""
+        for op in ops:
+            kind = op["op"]
+            if kind == "put_node":
+                self.nodes[op["id"]] = op["data"]
+            elif kind == "del_node":
+                self.nodes.pop(op["id"], None)
+            elif kind == "put_link":
+                self.links[op["id"]] = op["data"]
+            elif kind == "del_link":
+                self.links.pop(op["id"], None)
+            elif kind == "put_simulation":
+                self.base["simulation"] = op["data"]
+            elif kind == "reset":
+                seq = self.seq
+                self.__init__(op["document"])
+                self.seq = seq
+
+    def to_document(self) -> dict:
+        document = dict(self.base)
+        document["topology"] = {
+            "nodes": list(self.nodes.values()),
+            "links": list(self.links.values()),
+        }
+        order = ("schema", "metadata", "simulation", "topology", "todos", "warnings")
+        return {key: document[key] for key in order if key in document} | document
+
+
+class ChangeJournal:
+    """
+    Records which model objects changed (GUI thread).
+
+    Edits are coalesced by ID: a node dragged across the canvas produces
+    one op per flush, serialized from its state at flush time.
+    """
+
+    def __init__(self, network: NetworkModel, serializer: Optional[ProjectManager] = None):
+        self.network = network
+        self.serializer = serializer or ProjectManager()
+        self._dirty: dict[tuple[str, str], None] = {}
+        self._full = False
+        network.add_change_listener(self._on_change)
+        network.add_topology_listener(self._on_replaced)
+
+    def detach(self):
+        self.network.remove_change_listener(self._on_change)
+        self.network.remove_topology_listener(self._on_replaced)
+
+    @property
+    def has_changes(self) -> bool:
+        return self._full or bool(self._dirty)
+
+    def _on_change(self, kind: str, object_id: str, obj):
+        self._dirty[(kind, object_id)] = None
+        if kind == "link" and obj is not None:
+            # Binding or releasing ports changes both end nodes
+            self._dirty[("node", obj.source_node_id)] = None
+            self._dirty[("node", obj.target_node_id)] = None
+
+    def _on_replaced(self, network: NetworkModel):
+        self._full = True
+
+    def collect(self) -> list[dict]:
+        """Serialize pending changes into ops and clear them."""
+        network, serializer = self.network, self.serializer
+        if self._full:
+            self._full = False
+            self._dirty.clear()
+            return [{"op": "reset", "document": serializer._serialize_network(network)}]
+
+        ops = []
+        links_done = set()
+        for kind, object_id in self._dirty:
+            if kind == "node":
+                node = network.nodes.get(object_id)
+                if node is None:
+                    ops.append({"op": "del_node", "id": object_id})
+                    continue
+                ops.append({"op": "put_node", "id": object_id, "data": serializer._serialize_node(node)})
+                # Links store their end nodes' and ports' names
+                for link in network.get_links_for_node(object_id):
+                    if link.id not in links_done:
+                        links_done.add(link.id)
+                        ops.append({"op": "put_link", "id": link.id, "data": serializer._serialize_link(link, network)})
+            elif kind == "link":
+                if object_id in links_done:
+                    continue
+                links_done.add(object_id)
+                link = network.links.get(object_id)
+                if link is None:
+                    ops.append({"op": "del_link", "id": object_id})
+                else:
+                    ops.append({"op": "put_link", "id": object_id, "data": serializer._serialize_link(link, network)})
+            elif kind == "flows":
+                ops.append({"op": "put_simulation", "data": {
+                    "duration": network.simulation_duration,
+                    "units": "seconds",
+                    "flows": [serializer._serialize_flow(flow) for flow in network.saved_flows],
+                }})
+        self._dirty.clear()
+        return ops
+
+
+class AutosaveWriter(threading.Thread):
+    """
+    Background thread that journals ops and writes snapshots and saves.
+
+    All file I/O and whole-document encoding happen here; methods called
+    from other threads only enqueue work.
+    """
+
+    def __init__(
+        self,
+        compact_after_ops: int = DEFAULT_COMPACT_AFTER_OPS,
+        compact_interval: float = DEFAULT_COMPACT_INTERVAL,
+    ):
+        super().__init__(name="autosave-writer", daemon=True)
+        self.compact_after_ops = compact_after_ops
+        self.compact_interval = compact_interval
+        self.error: Optional[Exception] = None  # Last autosave failure
+        self._tasks: queue.Queue = queue.Queue()
+        self._mirror: Optional[DocumentMirror] = None
+        self._directory: Optional[Path] = None
+        self._journal = None
+        self._ops_since_snapshot = 0
+        self._snapshot_time = 0.0
+        self._has_snapshot = False
+
+    # ----- called from the GUI thread -----
+
+    def reset(self, document: dict, directory: Path, snapshot: bool = False):
+        """
+        Start mirroring a new document into directory.
+        
+        Existing autosave files there are replaced; snapshot writes the
+        new document straight away (e.g. for a recovered model).
+        """
+        self._tasks.put(("reset", document, Path(directory), snapshot))
+
+    def submit(self, ops: list[dict]):
+        self._tasks.put(("ops", ops))
+
+    def save(self, path: Path, discard_after: bool = False) -> Future:
+        """
+        Write the mirrored document to path; the future resolves to path.
+        
+        discard_after deletes the autosave files once the save succeeded.
+        """
+        future = Future()
+        self._tasks.put(("save", Path(path), discard_after, future))
+        return future
+
+    def discard(self) -> Future:
+        """Delete the autosave files (after a full save)."""
+        future = Future()
+        self._tasks.put(("discard", future))
+        return future
+
+    def stop(self, timeout: Optional[float] = None):
+        """Finish queued work and exit."""
+        self._tasks.put(("stop",))
+        self.join(timeout)
+
+    # ----- writer thread -----
+
+    def run(self):
+        while True:
+            try:
+                task = self._tasks.get(timeout=max(self.compact_interval, 0.05))
+            except queue.Empty:
+                self._compact_if_due()
+                continue
+            name = task[0]
+            if name == "stop":
+                self._close_journal()
+                return
+            try:
+                if name == "reset":
+                    self._reset(task[1], task[2], task[3])
+                elif name == "ops":
+                    self._append(task[1])
+                elif name == "save":
+                    self._save(task[1], task[2], task[3])
+                elif name == "discard":
+                    self._discard()
+                    task[1].set_result(None)
+            except Exception as e:
+                self.error = e
+                if name in ("save", "discard") and not task[-1].done():
+                    task[-1].set_exception(e)
+
+    def _reset(self, document: dict, directory: Path, snapshot: bool):
+        self._close_journal()
+        self._mirror = DocumentMirror(document)
+        self._directory = directory
+        # An older session's recovery data; this session starts over
+        self._discard()
+        if snapshot:
+            self._write_snapshot()
+
+    def _append(self, ops: list[dict]):
+        if self._mirror is None or not ops:
+            return
+        self._mirror.apply(ops)
+        self._mirror.seq += 1
+        if not self._has_snapshot or any(op["op"] == "reset" for op in ops):
+            self._write_snapshot()
+            return
+        if self._journal is None:
+            self._journal = open(self._directory / JOURNAL_FILE, "a", encoding="utf-8")
+        self._journal.write(json.dumps({"seq": self._mirror.seq, "ops": ops}, separators=(",", ":")) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._ops_since_snapshot += len(ops)
+        if (self._ops_since_snapshot >= self.compact_after_ops
+                or time.monotonic() - self._snapshot_time >= self.compact_interval):
+            self._write_snapshot()
+
+    def _compact_if_due(self):
+        if self._ops_since_snapshot and time.monotonic() - self._snapshot_time >= self.compact_interval:
+            try:
+                self._write_snapshot()
+            except Exception as e:
+                self.error = e
+
+    def _write_snapshot(self):
+        """Write the mirror as the new snapshot, then start an empty journal."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+        document = self._mirror.to_document()
+        document["autosave"] = {"seq": self._mirror.seq}
+        _atomic_write(
+            self._directory / SNAPSHOT_FILE, lambda tmp: write_compact_project(document, tmp)
+        )
+        self._close_journal()
+        self._journal = open(self._directory / JOURNAL_FILE, "w", encoding="utf-8")
+        self._has_snapshot = True
+        self._ops_since_snapshot = 0
+        self._snapshot_time = time.monotonic()
+
+    def _save(self, path: Path, discard_after: bool, future: Future):
+        if self._mirror is None:
+            raise RuntimeError("Autosave has no document to save")
+        document = self._mirror.to_document()
+        document["metadata"] = dict(document.get("metadata", {}), created=datetime.now().isoformat())
+        write_document(document, path)
+        if discard_after:
+            self._discard()
+        future.set_result(path)
+
+    def _discard(self):
+        self._close_journal()
+        if self._directory is not None and self._directory.exists():
+            shutil.rmtree(self._directory, ignore_errors=True)
+        self._has_snapshot = False
+        self._ops_since_snapshot = 0
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+class AutosaveManager:
+    """
+    Crash-safe autosave and background saving for one NetworkModel.
+
+    Args:
+        compact_interval: Seconds between snapshot rewrites while editing
+        compact_after_ops: Journaled ops that force a snapshot rewrite
+    """
+
+    def __init__(
+        self,
+        compact_interval: float = DEFAULT_COMPACT_INTERVAL,
+        compact_after_ops: int = DEFAULT_COMPACT_AFTER_OPS,
+    ):
+        self.compact_interval = compact_interval
+        self.compact_after_ops = compact_after_ops
+        self.network: Optional[NetworkModel] = None
+        self.target: Optional[Path] = None
+        self._journal: Optional[ChangeJournal] = None
+        self._writer: Optional[AutosaveWriter] = None
+        self._unsaved = False
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """Last failure of the writer thread, if any."""
+        return self._writer.error if self._writer else None
+
+    def pop_error(self) -> Optional[Exception]:
+        """Return and clear the writer's last failure."""
+        error = self.error
+        if error is not None:
+            self._writer.error = None
+        return error
+    
+    @property
+    def has_unsaved_changes(self) -> bool:
+        """Edits made since attach() or the last mark_saved()."""
+        return self._unsaved or bool(self._journal and self._journal.has_changes)
+
+    def attach(self, network: NetworkModel, target: Path, recovered: bool = False):
+        """
+        Start autosaving a model whose file is (or will be) target.
+
+        Serializes the model once; after that only edits are serialized.
+        Existing autosave data for target is replaced, so offer recovery
+        first. Pass recovered=True for a model from recover() so it is
+        snapshotted right away and counts as unsaved.
+        """
+        self.detach()
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = AutosaveWriter(self.compact_after_ops, self.compact_interval)
+            self._writer.start()
+        self.network = network
+        self.target = Path(target)
+        self._journal = ChangeJournal(network)
+        self._writer.reset(
+            self._journal.serializer._serialize_network(network), autosave_dir_for(target), recovered
+        )
+        self._unsaved = recovered
+
+    def detach(self):
+        """Stop recording the current model (queued writes still finish)."""
+        if self._journal is not None:
+            self.flush()
+            self._journal.detach()
+        self._journal = None
+        self.network = None
+
+    def flush(self):
+        """Hand pending edits to the writer (call from a GUI timer)."""
+        if self._journal is None or not self._journal.has_changes:
+            return
+        self._writer.submit(self._journal.collect())
+        self._unsaved = True
+
+    def save_to(self, path: Path) -> Future:
+        """
+        Save the model to path in the background.
+
+        The document is written from the writer's mirror, so the GUI
+        thread only serializes edits not yet flushed. The autosave files
+        are removed once the save succeeds.
+        """
+        if self._writer is None:
+            raise RuntimeError("AutosaveManager is not attached")
+        self.flush()
+        saving_target = Path(path) == self.target
+        future = self._writer.save(path, discard_after=saving_target)
+        if saving_target:
+            self._unsaved = False
+        return future
+
+    def mark_saved(self):
+        """The model was saved another way; drop the recovery files."""
+        self.flush()
+        if self._writer is not None:
+            self._writer.discard()
+        self._unsaved = False
+
+    def close(self, keep_recovery: Optional[bool] = None, timeout: float = 10.0):
+        """
+        Flush, stop the writer and keep or delete the recovery files.
+
+        Args:
+            keep_recovery: Default keeps them only if there are unsaved edits
+        """
+        if keep_recovery is None:
+            keep_recovery = self.has_unsaved_changes
+        self.detach()
+        if self._writer is not None:
+            if not keep_recovery:
+                self._writer.discard()
+            self._writer.stop(timeout)
+            self._writer = None
+
+    # ----- recovery -----
+
+    @staticmethod
+    def has_recovery(target: Path) -> bool:
+        """Whether a previous session left autosave data for target."""
+        return (autosave_dir_for(target) / SNAPSHOT_FILE).exists()
+
+    @staticmethod
+    def recover_document(target: Path) -> dict:
+        """
+        Rebuild the document from the snapshot plus the journal.
+
+        Raises:
+            FileNotFoundError: If there is no snapshot
+            ValueError: If the snapshot is corrupt
+        """
+        directory = autosave_dir_for(target)
+        document = CompactProjectReader(directory / SNAPSHOT_FILE).read_document()
+        snapshot_seq = document.pop("autosave", {}).get("seq", 0)
+        mirror = DocumentMirror(document)
+        journal = directory / JOURNAL_FILE
+        if journal.exists():
+            with open(journal, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Torn write at crash time
+                    if entry.get("seq", 0) > snapshot_seq:
+                        mirror.apply(entry.get("ops", []))
+        return mirror.to_document()
+
+    @staticmethod
+    def recover(target: Path) -> NetworkModel:
+        """Load the autosaved model for target."""
+        return ProjectManager()._deserialize_network(AutosaveManager.recover_document(target))
+
+    @staticmethod
+    def discard_recovery(target: Path):
+        """Delete autosave data for target."""
+        shutil.rmtree(autosave_dir_for(target), ignore_errors=True)
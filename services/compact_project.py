@@ -0,0 +1,342 @@
+"""
+Compact binary container for topology files.
+
+Holds the same document as the JSON project format, split into
+independently compressed sections so large projects open quickly:
+
+    magic (8 bytes) | version, flags, section count | table of contents | sections
+
+Each table-of-contents entry gives a section's name, offset, compressed
+and raw size and a CRC32. Sections are zlib-compressed JSON. Record
+lists (nodes, links, flows) are stored column by column: one value list
+per field instead of one dict per record, with repetitive string columns
+(speeds, masks, port types) dictionary-encoded. Nested record lists such
+as a node's ports and routes become child tables.
+
+Decoding rebuilds the exact dicts the JSON format holds (same keys, key
+order and values), so a project converts losslessly in both directions.
+A small "flow_ids" index section lists the flow IDs so a loader can
+reserve them while the flows section itself stays compressed.
+
+Usage:
+    write_compact_project(document, "big.ns3z")
+    reader = CompactProjectReader("big.ns3z")
+    nodes = reader.read("nodes")  # Other sections stay compressed
+"""
+
+import json
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Iterable, Union
+
+
+COMPACT_MAGIC = b"NS3GUIZ\x00"
+COMPACT_FORMAT_VERSION = 1
+COMPACT_SUFFIX = ".ns3z"
+
+# Sections holding record lists (stored as column tables)
+TABLE_SECTIONS = ("nodes", "links", "flows")
+
+# Sections the loader may leave compressed until first use
+LAZY_SECTIONS = ("flows", "metadata", "todos", "warnings")
+
+# Derived from other sections; not part of the document
+FLOW_IDS_SECTION = "flow_ids"
+
+_HEADER = struct.Struct("<HHI")          # version, flags, section count
+_TOC_ENTRY = struct.Struct("<QQQI")      # offset, compressed size, raw size, crc32
+_PATH_SEP = "\x1f"                       # Joins nested keys in column names
+
+# Dictionary-encode string columns with at most this share of distinct values
+_DICT_RATIO = 0.25
+_DICT_MIN_ROWS = 16
+
+
+# ----------------------------------------------------------------------
+# Column tables
+# ----------------------------------------------------------------------
+
+def _is_record_list(value) -> bool:
+    return isinstance(value, list) and bool(value) and all(isinstance(item, dict) for item in value)
+
+
+def encode_table(records: Iterable[dict]) -> dict:
+    """
+    Encode a list of dicts column by column.
+
+    Each record is flattened depth-first into (key path, value) pairs;
+    the ordered list of paths is its shape, stored once and referenced by
+    index. Non-empty nested dicts are flattened, lists of dicts become
+    child tables and everything else is a column value.
+    """
+    shapes: list[list] = []
+    shape_ids: dict[tuple, int] = {}
+    rows: list[int] = []
+    columns: dict[str, list] = {}
+    children: dict[str, list] = {}
+
+    def flatten(record: dict, prefix: tuple, shape: list):
+        for key, value in record.items():
+            path = prefix + (key,)
+            if isinstance(value, dict) and value:
+                flatten(value, path, shape)
+            elif _is_record_list(value):
+                name = _PATH_SEP.join(path)
+                shape.append([name, 1])
+                columns.setdefault(name, []).append(len(value))
+                children.setdefault(name, []).extend(value)
+            else:
+                name = _PATH_SEP.join(path)
+                shape.append([name, 0])
+                columns.setdefault(name, []).append(value)
+
+    for record in records:
+        shape: list = []
+        flatten(record, (), shape)
+        key = tuple(name for name, _ in shape) + tuple(kind for _, kind in shape)
+        shape_id = shape_ids.get(key)
+        if shape_id is None:
+            shape_id = shape_ids[key] = len(shapes)
+            shapes.append(shape)
+        rows.append(shape_id)
+
+    return {
+        "shapes": shapes,
+        "rows": rows,
+        "columns": {name: _encode_column(values) for name, values in columns.items()},
+        "children": {name: encode_table(items) for name, items in children.items()},
+    }
+
+
+def _encode_column(values: list):
+    if len(values) >= _DICT_MIN_ROWS and all(type(value) is str for value in values):
+        distinct = list(dict.fromkeys(values))
+        if len(distinct) <= len(values) * _DICT_RATIO:
+            code_of = {value: code for code, value in enumerate(distinct)}
+            return {"dict": distinct, "codes": [code_of[value] for value in values]}
+    return values
+
+
+def _decode_column(column) -> list:
+    if isinstance(column, dict):
+        distinct = column["dict"]
+        return [distinct[code] for code in column["codes"]]
+    return column
+
+
+def decode_table(table: dict) -> list[dict]:
+    """Rebuild the records passed to encode_table()."""
+    columns = {name: iter(_decode_column(values)).__next__ for name, values in table["columns"].items()}
+    children = {name: iter(decode_table(child)).__next__ for name, child in table["children"].items()}
+    shapes = []
+    for shape in table["shapes"]:
+        entries = []
+        for name, kind in shape:
+            *parents, key = name.split(_PATH_SEP)
+            entries.append((tuple(parents), key, columns[name], children[name] if kind else None))
+        shapes.append(entries)
+
+    records = []
+    for shape_id in table["rows"]:
+        record: dict = {}
+        for parents, key, next_value, next_child in shapes[shape_id]:
+            target = record
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            if next_child is None:
+                target[key] = next_value()
+            else:
+                target[key] = [next_child() for _ in range(next_value())]
+        records.append(record)
+    return records
+
+
+# ----------------------------------------------------------------------
+# Document <-> sections
+# ----------------------------------------------------------------------
+
+def split_document(document: dict) -> dict[str, Any]:
+    """
+    Split a JSON project document into named sections.
+
+    "header" keeps everything not moved to its own section, so unknown
+    top-level keys survive a round trip.
+    """
+    header = dict(document)
+    topology = dict(header.pop("topology", {}))
+    simulation = dict(header.get("simulation", {}))
+    flows = simulation.pop("flows", None)
+    if "simulation" in header:
+        header["simulation"] = simulation
+
+    sections: dict[str, Any] = {
+        "header": header,
+        "nodes": topology.pop("nodes", []),
+        "links": topology.pop("links", []),
+    }
+    if topology:
+        header["topology_extra"] = topology
+    if flows is not None:
+        sections["flows"] = flows
+    for name in ("metadata", "todos", "warnings"):
+        if name in header:
+            sections[name] = header.pop(name)
+    return sections
+
+
+def join_document(sections: dict[str, Any], order: Iterable[str] = ()) -> dict:
+    """
+    Reassemble the document split by split_document().
+
+    Args:
+        sections: Decoded sections; missing lazy sections are left out
+        order: Top-level key order of the original document
+    """
+    header = dict(sections["header"])
+    topology = {"nodes": sections["nodes"], "links": sections["links"]}
+    topology.update(header.pop("topology_extra", {}))
+    parts = dict(header)
+    parts["topology"] = topology
+    if "flows" in sections and "simulation" in parts:
+        parts["simulation"] = dict(parts["simulation"], flows=sections["flows"])
+    for name in ("metadata", "todos", "warnings"):
+        if name in sections:
+            parts[name] = sections[name]
+
+    document = {key: parts.pop(key) for key in order if key in parts}
+    document.update(parts)
+    return document
+
+
+def write_compact_project(document: dict, filepath: Union[str, Path], level: int = 6):
+    """Write a JSON project document as a compact container."""
+    sections = split_document(document)
+    sections["header"] = dict(sections["header"], key_order=list(document))
+    if sections.get("flows"):
+        sections[FLOW_IDS_SECTION] = [flow.get("id", "") for flow in sections["flows"]]
+
+    payloads = []
+    for name, content in sections.items():
+        if name in TABLE_SECTIONS:
+            content = encode_table(content)
+        raw = json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        payloads.append((name.encode("utf-8"), zlib.compress(raw, level), len(raw)))
+
+    toc_size = sum(1 + len(name) + _TOC_ENTRY.size for name, _, _ in payloads)
+    offset = len(COMPACT_MAGIC) + _HEADER.size + toc_size
+    toc = bytearray()
+    for name, data, raw_size in payloads:
+        toc += bytes([len(name)]) + name
+        toc += _TOC_ENTRY.pack(offset, len(data), raw_size, zlib.crc32(data))
+        offset += len(data)
+
+    with open(filepath, "wb") as f:
+        f.write(COMPACT_MAGIC)
+        f.write(_HEADER.pack(COMPACT_FORMAT_VERSION, 0, len(payloads)))
+        f.write(toc)
+        for _, data, _ in payloads:
+            f.write(data)
+
+
+def is_compact_file(filepath: Union[str, Path]) -> bool:
+    """Check a file's magic bytes."""
+    try:
+        with open(filepath, "rb") as f:
+            return f.read(len(COMPACT_MAGIC)) == COMPACT_MAGIC
+    except OSError:
+        return False
+
+
+class CompactProjectReader:
+    """
+    Reads sections of a compact container on demand.
+
+    The file is read once; sections stay compressed in memory until
+    read() decodes them, so deferred sections don't depend on the file
+    still being there.
+
+    Raises:
+        ValueError: If the file isn't a compact container, was written
+            by a newer format version or is truncated
+    """
+
+    def __init__(self, filepath: Union[str, Path]):
+        with open(filepath, "rb") as f:
+            self._data = f.read()
+        data = self._data
+        if not data.startswith(COMPACT_MAGIC):
+            raise ValueError("Invalid file format: not a compact topology file")
+        try:
+            version, _flags, count = _HEADER.unpack_from(data, len(COMPACT_MAGIC))
+            if version > COMPACT_FORMAT_VERSION:
+                raise ValueError(
+                    f"Compact format version {version} is newer than supported ({COMPACT_FORMAT_VERSION})"
+                )
+            self.version = version
+            self._toc: dict[str, tuple[int, int, int, int]] = {}
+            pos = len(COMPACT_MAGIC) + _HEADER.size
+            for _ in range(count):
+                length = data[pos]
+                name = data[pos + 1:pos + 1 + length].decode("utf-8")
+                pos += 1 + length
+                self._toc[name] = _TOC_ENTRY.unpack_from(data, pos)
+                pos += _TOC_ENTRY.size
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid file format: corrupt table of contents ({e})")
+        for name, (offset, size, _, _) in self._toc.items():
+            if offset + size > len(data):
+                raise ValueError(f"Invalid file format: section '{name}' is truncated")
+
+    @property
+    def sections(self) -> list[str]:
+        """Section names in file order."""
+        return list(self._toc)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._toc
+
+    def section_size(self, name: str) -> tuple[int, int]:
+        """(compressed, raw) byte size of a section."""
+        _, size, raw_size, _ = self._toc[name]
+        return size, raw_size
+
+    def read(self, name: str) -> Any:
+        """
+        Decompress and decode one section.
+
+        Raises:
+            KeyError: If the section doesn't exist
+            ValueError: If the section fails its checksum
+        """
+        content = self._read_raw(name)
+        if name in TABLE_SECTIONS:
+            content = decode_table(content)
+        return content
+
+    def _read_raw(self, name: str) -> Any:
+        offset, size, _, crc = self._toc[name]
+        payload = self._data[offset:offset + size]
+        if zlib.crc32(payload) != crc:
+            raise ValueError(f"Invalid file format: section '{name}' is corrupt")
+        return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+    def flow_ids(self) -> list[str]:
+        """
+        IDs of the flows section without building the flow records.
+
+        Files written without the ID index decode only the flows
+        table's id column.
+        """
+        if FLOW_IDS_SECTION in self._toc:
+            return self.read(FLOW_IDS_SECTION)
+        if "flows" not in self._toc:
+            return []
+        return _decode_column(self._read_raw("flows")["columns"].get("id", []))
+
+    def read_document(self, skip: Iterable[str] = ()) -> dict:
+        """Decode all sections (except skip) into a JSON project document."""
+        skip = set(skip) | {FLOW_IDS_SECTION}
+        sections = {name: self.read(name) for name in self._toc if name not in skip}
+        order = sections["header"].pop("key_order", ())
+        return join_document(sections, order)
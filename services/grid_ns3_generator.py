@@ -105,9 +105,12 @@ class GridNS3Generator(NS3ScriptGenerator):
         self._node_index_map = {
             node_id: idx for idx, (node_id, node) in enumerate(real_nodes)
         }
+        self._partition = self._partition_network(network, sim_config)
         
         # Initialize tracking
         self._link_device_map = {}
+        self._link_node_indices = {}
+        self._csma_link_ids = set()
         self._wifi_link_ids = set()
         self._wired_device_count = 0
         self._wifi_sta_devices_var = None
@@ -126,7 +129,7 @@ class GridNS3Generator(NS3ScriptGenerator):
             self._generate_grid_routing(network),  # Extended version
             self._generate_grid_applications(network, sim_config),  # Extended version
             self._generate_failure_injection(),  # NEW: failure scenarios
-            self._generate_tracing(sim_config, output_dir),
+            self._generate_tracing(sim_config, output_dir, network),
             self._generate_simulation_run(sim_config, output_dir),
             self._generate_main_function_end(),
             self._generate_main_call(),
@@ -204,6 +207,7 @@ Simulation Duration: {sim_config.duration} seconds
             
             # Store mapping
             self._link_device_map[link_id] = device_idx
+            self._link_node_indices[link_id] = (source_idx, target_idx)
             
             # Check if this is a GridLinkModel
             if isinstance(link, GridLinkModel):
@@ -270,6 +274,7 @@ Simulation Duration: {sim_config.duration} seconds
         
         elif link_type == GridLinkType.ETHERNET_LAN:
             # CSMA for LAN segments
+            self._csma_link_ids.add(link.id)
             lines.extend([
                 f"    csma.SetChannelAttribute('DataRate', ns.StringValue('{link.data_rate}'))",
                 f"    csma.SetChannelAttribute('Delay', ns.StringValue('{link.delay}'))",
@@ -355,6 +360,7 @@ Simulation Duration: {sim_config.duration} seconds
         lines.append(f"    # Link {device_idx}: {source_name} <-> {target_name}")
         
         if use_csma:
+            self._csma_link_ids.add(link.id)
             lines.extend([
                 f"    csma.SetChannelAttribute('DataRate', ns.StringValue('{link.data_rate}'))",
                 f"    csma.SetChannelAttribute('Delay', ns.StringValue('{link.delay}'))",
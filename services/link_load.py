@@ -0,0 +1,163 @@
+"""
+Per-link load over a sliding window of simulation time.
+
+Feeds the canvas heatmap from one of two sources:
+
+    trace   TracePlayer.link_counters(): bytes each way, packets and
+            drops per link, binned by simulation time
+    live    METRICS| snapshots of a running simulation, which carry each
+            link's queue depth but no per-link byte counts
+
+Both yield a LinkLoad per busy link with values in 0..1. Utilization is
+the bit rate over the link's data rate (the busier direction of a
+point-to-point link, both directions of a shared medium); live runs use
+queue occupancy in its place. Drop rate is the share of packets dropped
+and is only known from traces.
+
+Usage:
+    counters = player.link_counters(trace_map)
+    loads = trace_link_loads(counters, network, player.current_time)
+    heat = {link_id: load.value(HeatmapMetric.UTILIZATION) for link_id, load in loads.items()}
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Deque, Dict, Tuple
+
+from models import ChannelType, NetworkModel
+
+from .results_parser import MetricsSnapshot
+from .trace_player import LinkCounters
+
+
+DEFAULT_WINDOW_S = 0.5        # Simulation seconds a load is averaged over
+LIVE_QUEUE_PACKETS = 100      # Queued packets read as saturated (ns-3's default device DropTail limit)
+
+_RATE_PATTERN = re.compile(r"^\s*([0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)\s*([kKmMgG]i?)?(b|B)(ps|/s)?\s*$")
+_RATE_PREFIXES = {
+    "": 1.0, "k": 1e3, "m": 1e6, "g": 1e9,
+    "ki": 1024.0, "mi": 1024.0 ** 2, "gi": 1024.0 ** 3,
+}
+
+
+class HeatmapMetric(Enum):
+    """What the link heatmap shows."""
+    UTILIZATION = "utilization"
+    DROP_RATE = "drop_rate"
+
+
+@dataclass
+class LinkLoad:
+    """Load of one link over a window (fractions, 0..1)."""
+    utilization: float = 0.0
+    drop_rate: float = 0.0
+
+    def value(self, metric: HeatmapMetric) -> float:
+        if metric == HeatmapMetric.DROP_RATE:
+            return self.drop_rate
+        return self.utilization
+
+
+@lru_cache(maxsize=256)
+def parse_data_rate(rate: str) -> float:
+    """
+    ns-3 data rate string ("100Mbps", "5Mb/s", "1KiBps") in bits per second.
+
+    Returns 0.0 if the string can't be parsed.
+    """
+    match = _RATE_PATTERN.match(rate or "")
+    if match is None:
+        return 0.0
+    value, prefix, unit, _ = match.groups()
+    bits = float(value) * _RATE_PREFIXES[(prefix or "").lower()]
+    return bits * 8 if unit == "B" else bits
+
+
+def trace_link_loads(
+    counters: LinkCounters,
+    network: NetworkModel,
+    time_s: float,
+    window_s: float = DEFAULT_WINDOW_S,
+) -> Dict[str, LinkLoad]:
+    """
+    Load of each link over the window ending at a playback time.
+
+    Args:
+        counters: Binned traffic of the trace
+        network: Model the links' data rates come from
+        time_s: Simulation time the window ends at (TracePlayer.current_time)
+        window_s: Window length in simulation seconds
+    """
+    end_ns = int(round(time_s * 1e9))
+    covered_ns, totals = counters.window(end_ns, int(window_s * 1e9))
+    if covered_ns <= 0:
+        return {}
+    seconds = covered_ns / 1e9
+
+    loads = {}
+    for link_id, (forward, backward, packets, drops) in totals.items():
+        link = network.links.get(link_id)
+        if link is None:
+            continue
+        capacity = parse_data_rate(link.data_rate)
+        if link.channel_type == ChannelType.POINT_TO_POINT:
+            sent = max(forward, backward)  # Full duplex: each way has the whole rate
+        else:
+            sent = forward + backward
+        utilization = sent * 8 / seconds / capacity if capacity > 0 else 0.0
+        attempts = packets + drops
+        loads[link_id] = LinkLoad(
+            utilization=min(1.0, utilization),
+            drop_rate=drops / attempts if attempts else 0.0,
+        )
+    return loads
+
+
+class LiveLinkLoad:
+    """
+    Sliding window over the METRICS| snapshots of a running simulation.
+
+    Utilization is the mean queue depth of each link over the snapshots
+    in the window, relative to LIVE_QUEUE_PACKETS: a link whose queue
+    stays full is saturated. The latest snapshot is always included, so
+    intervals longer than the window still show something.
+    """
+
+    def __init__(self, window_s: float = DEFAULT_WINDOW_S):
+        self.window_s = window_s
+        self._snapshots: Deque[Tuple[float, Dict[str, int]]] = deque()
+
+    def add_snapshot(self, snapshot: MetricsSnapshot):
+        self._snapshots.append((snapshot.time, snapshot.queues))
+        self._trim()
+
+    def clear(self):
+        self._snapshots.clear()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def _trim(self):
+        if not self._snapshots:
+            return
+        oldest = self._snapshots[-1][0] - self.window_s
+        while len(self._snapshots) > 1 and self._snapshots[0][0] <= oldest:
+            self._snapshots.popleft()
+
+    def loads(self) -> Dict[str, LinkLoad]:
+        """Load of each link with a queue in the window."""
+        self._trim()  # The window may have been shortened
+        count = len(self._snapshots)
+        if not count:
+            return {}
+        depths: Dict[str, int] = {}
+        for _, queues in self._snapshots:
+            for link_id, depth in queues.items():
+                depths[link_id] = depths.get(link_id, 0) + depth
+        return {
+            link_id: LinkLoad(utilization=min(1.0, total / count / LIVE_QUEUE_PACKETS))
+            for link_id, total in depths.items()
+        }
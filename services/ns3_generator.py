@@ -8,8 +8,196 @@ from datetime import datetime
 from typing import Optional, Dict, Set, Tuple, List
 from models import (
     NetworkModel, NodeModel, LinkModel, NodeType, ChannelType,
-    SimulationConfig, TrafficFlow, TrafficApplication, TrafficProtocol
+    SimulationConfig, TrafficFlow, TrafficApplication, TrafficProtocol,
+    TraceFormat, ResultsFormat
 )
+from models.ipam import ip_to_int, int_to_ip, network_address, netmask_to_prefix
+from services.results_parser import (
+    FLOWSTATS_MAGIC, FLOWSTATS_COLUMNS, FLOWSTATS_BINARY_FILE, FLOWSTATS_CSV_FILE, ADDRESS_RANKS_FILE,
+    RANK_RX_FILE, RANK_RX_COLUMNS
+)
+from services.topology_partitioner import TopologyPartition, partition_network
+from services.trace_player import TraceMap, TRACE_MAP_FILE
+
+
+# Reception counters for distributed runs (compiled into the script via
+# cppyy). Senders stamp each packet with its send time in a packet tag,
+# which travels with the packet between ranks; the destination rank
+# counts receptions, delay and jitter per 5-tuple at LocalDeliver.
+RANK_RX_COUNTER_CPP = r"""
+#include <cstdlib>
+#include <fstream>
+#include <map>
+#include <tuple>
+#include "ns3/core-module.h"
+#include "ns3/network-module.h"
+#include "ns3/internet-module.h"
+
+namespace gui_rank_rx {
+using namespace ns3;
+
+class TxTimeTag : public Tag {
+public:
+    static TypeId GetTypeId() {
+        static TypeId tid = TypeId("gui_rank_rx::TxTimeTag").SetParent<Tag>().AddConstructor<TxTimeTag>();
+        return tid;
+    }
+    TypeId GetInstanceTypeId() const override { return GetTypeId(); }
+    uint32_t GetSerializedSize() const override { return 8; }
+    void Serialize(TagBuffer buffer) const override { buffer.WriteU64(txNs); }
+    void Deserialize(TagBuffer buffer) override { txNs = buffer.ReadU64(); }
+    void Print(std::ostream &os) const override { os << "tx=" << txNs; }
+    uint64_t txNs = 0;
+};
+
+struct Counter {
+    uint64_t packets = 0, bytes = 0;
+    int64_t delaySum = 0, jitterSum = 0, lastDelay = -1, lastRx = 0;
+};
+std::map<std::tuple<uint32_t, uint32_t, uint16_t, uint16_t, uint8_t>, Counter> counters;
+
+void Sent(const Ipv4Header &header, Ptr<const Packet> packet, uint32_t interface) {
+    TxTimeTag tag;
+    if (!packet->PeekPacketTag(tag)) {
+        tag.txNs = Simulator::Now().GetNanoSeconds();
+        packet->AddPacketTag(tag);
+    }
+}
+
+void Delivered(const Ipv4Header &header, Ptr<const Packet> packet, uint32_t interface) {
+    uint16_t sourcePort = 0, destinationPort = 0;
+    if (header.GetProtocol() == UdpL4Protocol::PROT_NUMBER) {
+        UdpHeader udp;
+        if (packet->PeekHeader(udp)) { sourcePort = udp.GetSourcePort(); destinationPort = udp.GetDestinationPort(); }
+    } else if (header.GetProtocol() == TcpL4Protocol::PROT_NUMBER) {
+        TcpHeader tcp;
+        if (packet->PeekHeader(tcp)) { sourcePort = tcp.GetSourcePort(); destinationPort = tcp.GetDestinationPort(); }
+    }
+    Counter &c = counters[std::make_tuple(header.GetSource().Get(), header.GetDestination().Get(),
+                                          sourcePort, destinationPort, header.GetProtocol())];
+    int64_t now = Simulator::Now().GetNanoSeconds();
+    c.packets += 1;
+    c.bytes += packet->GetSize() + header.GetSerializedSize();  // Sized like FlowMonitor
+    TxTimeTag tag;
+    if (packet->PeekPacketTag(tag)) {
+        int64_t delay = now - static_cast<int64_t>(tag.txNs);
+        c.delaySum += delay;
+        if (c.lastDelay >= 0) c.jitterSum += std::llabs(delay - c.lastDelay);
+        c.lastDelay = delay;
+    }
+    c.lastRx = now;
+}
+
+void Install(NodeContainer nodes) {
+    TxTimeTag::GetTypeId();  // Register the tag so ranks can deserialize it
+    for (uint32_t i = 0; i < nodes.GetN(); ++i) {
+        Ptr<Ipv4L3Protocol> ipv4 = nodes.Get(i)->GetObject<Ipv4L3Protocol>();
+        if (!ipv4) continue;
+        ipv4->TraceConnectWithoutContext("SendOutgoing", MakeCallback(&Sent));
+        ipv4->TraceConnectWithoutContext("LocalDeliver", MakeCallback(&Delivered));
+    }
+}
+
+void Write(std::string path, std::string header) {
+    std::ofstream out(path);
+    out << header << "\n";
+    for (const auto &[key, c] : counters) {
+        out << Ipv4Address(std::get<0>(key)) << "," << Ipv4Address(std::get<1>(key)) << ","
+            << std::get<2>(key) << "," << std::get<3>(key) << "," << unsigned(std::get<4>(key)) << ","
+            << c.packets << "," << c.bytes << "," << c.delaySum << "," << c.jitterSum << "," << c.lastRx << "\n";
+    }
+}
+}
+"""
+
+# PKT| record writer (compiled into the script via cppyy). Trace sinks on
+# the selected devices sample each event as it happens and write kept
+# records straight to packets.pkt, so no full trace is ever written.
+# Sampling hashes the IPv4 id and endpoints, so every hop of a sampled
+# packet is kept together.
+PKT_SAMPLER_CPP = r"""
+#include <fstream>
+#include <string>
+#include "ns3/core-module.h"
+#include "ns3/network-module.h"
+#include "ns3/internet-module.h"
+#include "ns3/point-to-point-module.h"
+#include "ns3/csma-module.h"
+
+namespace gui_pkt {
+using namespace ns3;
+
+struct Device {
+    uint32_t node, dev;
+    int64_t peer;
+    std::string link;
+};
+
+std::ofstream out;
+uint64_t threshold = 10000;  // Kept out of every 10000 packets
+uint64_t kept = 0;
+
+bool FindIpv4(Ptr<const Packet> packet, Ipv4Header &ip) {
+    PacketMetadata::ItemIterator items = packet->BeginItem();
+    while (items.HasNext()) {
+        PacketMetadata::Item item = items.Next();
+        if (item.type == PacketMetadata::Item::HEADER && !item.isFragment
+            && item.tid == Ipv4Header::GetTypeId()) {
+            ip.Deserialize(item.current);
+            return true;
+        }
+    }
+    return false;
+}
+
+void Record(Device *device, std::string event, Ptr<const Packet> packet) {
+    Ipv4Header ip;
+    bool isIpv4 = FindIpv4(packet, ip);
+    uint64_t h = isIpv4 ? (uint64_t(ip.GetIdentification()) << 32)
+                              ^ (uint64_t(ip.GetSource().Get()) * 0x9E3779B1u) ^ ip.GetDestination().Get()
+                        : packet->GetUid();
+    h ^= h >> 33;
+    h *= 0xff51afd7ed558ccdULL;
+    h ^= h >> 33;
+    if (h % 10000 >= threshold) return;
+
+    bool rx = event == "RX";
+    int64_t source = rx ? device->peer : device->node, destination = rx ? device->node : device->peer;
+    uint8_t protocol = isIpv4 ? ip.GetProtocol() : 0;
+    const char *name = protocol == 1 ? "ICMP" : protocol == 6 ? "TCP" : protocol == 17 ? "UDP" : "";
+    uint32_t size = isIpv4 ? ip.GetPayloadSize() + ip.GetSerializedSize() : packet->GetSize();
+    out << "PKT|" << Simulator::Now().GetNanoSeconds() << "|" << event << "|" << device->node << "|"
+        << device->dev << "|" << size << "|" << source << "|" << destination << "|" << device->link
+        << "|" << name << "\n";
+    kept += 1;
+}
+
+void Open(std::string path, double sampleRate) {
+    Packet::EnablePrinting();  // Packet metadata locates the IPv4 header on any device
+    out.open(path);
+    threshold = uint64_t(sampleRate * 10000 + 0.5);
+}
+
+void Watch(Ptr<NetDevice> dev, std::string link, int64_t peer) {
+    Device *device = new Device{dev->GetNode()->GetId(), dev->GetIfIndex(), peer, link};
+    Ptr<Queue<Packet>> queue;
+    if (Ptr<PointToPointNetDevice> p2p = DynamicCast<PointToPointNetDevice>(dev)) queue = p2p->GetQueue();
+    else if (Ptr<CsmaNetDevice> csma = DynamicCast<CsmaNetDevice>(dev)) queue = csma->GetQueue();
+    if (queue) {
+        queue->TraceConnectWithoutContext("Enqueue", MakeBoundCallback(&Record, device, std::string("ENQ")));
+        queue->TraceConnectWithoutContext("Dequeue", MakeBoundCallback(&Record, device, std::string("TX")));
+        queue->TraceConnectWithoutContext("Drop", MakeBoundCallback(&Record, device, std::string("DROP")));
+    }
+    dev->TraceConnectWithoutContext("MacRx", MakeBoundCallback(&Record, device, std::string("RX")));
+    dev->TraceConnectWithoutContext("PhyRxDrop", MakeBoundCallback(&Record, device, std::string("DROP")));
+}
+
+uint64_t Close() {
+    out.close();
+    return kept;
+}
+}
+"""
 
 
 class NS3ScriptGenerator:
@@ -21,8 +209,14 @@ class NS3ScriptGenerator:
     """
     
     def __init__(self):
+        self._ipam = None
+        self._pkt_trace_enabled = False
+        self._metrics_enabled = False
+        self._rank_rx_enabled = False
         self._node_index_map: dict[str, int] = {}
         self._link_index_map: dict[str, int] = {}
+        self._link_node_indices: dict[str, tuple[int, int]] = {}
+        self._partition: Optional[TopologyPartition] = None
     
     def _get_port_ip(self, node: NodeModel, port_id: str) -> Tuple[Optional[str], Optional[str]]:
         """Get IP address and netmask for a port, if configured.
@@ -90,10 +284,11 @@ class NS3ScriptGenerator:
                 ip, mask = self._get_port_ip(node, port_id)
                 if ip:
                     # Extract subnet from this IP
-                    parts = ip.split('.')
-                    if len(parts) == 4:
-                        subnet = f"{parts[0]}.{parts[1]}.{parts[2]}.0"
-                        return (subnet, mask or "255.255.255.0")
+                    try:
+                        mask = mask or "255.255.255.0"
+                        return (network_address(ip, mask), mask)
+                    except ValueError:
+                        continue
         
         # No configured IPs found, will use auto-assignment
         return (None, "255.255.255.0")
@@ -128,8 +323,13 @@ class NS3ScriptGenerator:
             for idx, (node_id, node) in enumerate(real_nodes)
         }
         
+        # Assign nodes to MPI ranks for distributed runs
+        self._partition = self._partition_network(network, sim_config)
+        
         # Initialize link tracking (will be populated in _generate_channels)
         self._link_device_map = {}    # link_id -> device_idx
+        self._link_node_indices = {}  # link_id -> (source_idx, target_idx)
+        self._csma_link_ids = set()   # Wired links built with CsmaHelper
         self._wifi_link_ids = set()   # Track WiFi links that are skipped
         self._wired_device_count = 0  # Count of wired devices created
         
@@ -155,7 +355,7 @@ class NS3ScriptGenerator:
             self._generate_ip_addresses(network),
             self._generate_routing(network),
             self._generate_applications(network, sim_config),
-            self._generate_tracing(sim_config, output_dir),
+            self._generate_tracing(sim_config, output_dir, network),
             self._generate_simulation_run(sim_config, output_dir),
             self._generate_main_function_end(),
             self._generate_main_call(),
@@ -210,24 +410,90 @@ def main():
     # ns.LogComponentEnable("UdpEchoServerApplication", ns.LOG_LEVEL_INFO)
 '''
     
-    def _generate_nodes(self, network: NetworkModel) -> str:
-        """Generate node creation code."""
-        # Count only real network nodes (not APPLICATION nodes)
-        real_node_count = len(self._node_index_map)
+    def _partition_network(self, network: NetworkModel, sim_config: SimulationConfig) -> Optional[TopologyPartition]:
+        """Partition the topology across MPI ranks (None for sequential runs)."""
+        if sim_config.mpi_ranks <= 1:
+            return None
+        return partition_network(network, sim_config.mpi_ranks)
+    
+    def _output_path(self, output_dir: str, filename: str) -> str:
+        """Python expression for an output file path in the generated script.
         
-        lines = [
+        In distributed runs every rank other than 0 writes into its own
+        rank<N> subdirectory so ranks don't overwrite each other's files.
+        """
+        if self._partition is not None:
+            return f"rank_output_dir + '/{filename}'"
+        return f"'{output_dir}/{filename}'"
+    
+    def _generate_distributed_setup(self) -> list[str]:
+        """Generate MPI initialisation for a distributed simulation."""
+        partition = self._partition
+        lookahead = (
+            f"{partition.lookahead_s * 1000:g} ms lookahead"
+            if partition.lookahead_s is not None else "no cut links"
+        )
+        return [
             "    # ============================================",
-            "    # Create Nodes",
+            "    # Distributed Simulation (MPI)",
             "    # ============================================",
-            f"    nodes = ns.NodeContainer()",
-            f"    nodes.Create({real_node_count})",
+            f"    # Run with: mpirun -np {partition.ranks} python3 <script>",
+            f"    # Partition: {partition.ranks} ranks of {partition.rank_sizes} nodes, "
+            f"{len(partition.cut_links)} cut link(s), {lookahead}",
+            "    import ctypes",
+            "    ns.GlobalValue.Bind('SimulatorImplementationType', ns.StringValue('ns3::DistributedSimulatorImpl'))",
+            "    mpi_argv = [arg.encode() for arg in sys.argv]",
+            "    mpi_argc = ctypes.c_int(len(mpi_argv))",
+            "    mpi_args = (ctypes.c_char_p * (len(mpi_argv) + 1))(*mpi_argv, None)",
+            "    ns.MpiInterface.Enable(ctypes.byref(mpi_argc), ctypes.pointer(ctypes.cast(mpi_args, ctypes.POINTER(ctypes.c_char_p))))",
+            "    system_id = ns.MpiInterface.GetSystemId()",
+            f"    if ns.MpiInterface.GetSize() != {partition.ranks}:",
+            f"        print(f'Script is partitioned for {partition.ranks} ranks, running on {{ns.MpiInterface.GetSize()}}', file=sys.stderr)",
+            "        ns.MpiInterface.Disable()",
+            "        return 1",
             "",
-            "    # Node mapping:",
         ]
+    
+    def _generate_nodes(self, network: NetworkModel) -> str:
+        """Generate node creation code."""
+        # Count only real network nodes (not APPLICATION nodes)
+        real_node_count = len(self._node_index_map)
+        
+        if self._partition is not None:
+            node_ranks = [self._partition.rank_of(node_id) for node_id in self._node_index_map]
+            lines = self._generate_distributed_setup() + [
+                "    # ============================================",
+                "    # Create Nodes",
+                "    # ============================================",
+                "    # Each node is created on the rank (systemId) that simulates it",
+                "    nodes = ns.NodeContainer()",
+                f"    node_ranks = {node_ranks}",
+                "    for rank in node_ranks:",
+                "        nodes.Create(1, rank)",
+                "    local_nodes = ns.NodeContainer()",
+                "    for i, rank in enumerate(node_ranks):",
+                "        if rank == system_id:",
+                "            local_nodes.Add(nodes.Get(i))",
+                "",
+                "    # Node mapping:",
+            ]
+        else:
+            lines = [
+                "    # ============================================",
+                "    # Create Nodes",
+                "    # ============================================",
+                f"    nodes = ns.NodeContainer()",
+                f"    nodes.Create({real_node_count})",
+                "",
+                "    # Node mapping:",
+            ]
         
         for node_id, idx in self._node_index_map.items():
             node = network.nodes[node_id]
-            lines.append(f"    # Node {idx}: {node.name} ({node.node_type.name})")
+            if self._partition is not None:
+                lines.append(f"    # Node {idx}: {node.name} ({node.node_type.name}) on rank {self._partition.rank_of(node_id)}")
+            else:
+                lines.append(f"    # Node {idx}: {node.name} ({node.node_type.name})")
         
         # Note nodes with application scripts
         app_script_nodes = [n for n in network.nodes.values() if n.has_app_script]
@@ -272,6 +538,7 @@ def main():
         # Track which links are actually created (non-WiFi) and their mapping
         # This maps original link_id to the device index used in generated code
         self._link_device_map = {}  # link_id -> device_idx
+        self._csma_link_ids = set()  # Links whose devices are CsmaNetDevices
         self._wifi_link_ids = set()  # Track WiFi links that are skipped
         
         device_idx = 0  # Counter for created devices
@@ -310,6 +577,7 @@ def main():
             
             # Store the mapping from link_id to device index
             self._link_device_map[link_id] = device_idx
+            self._link_node_indices[link_id] = (source_idx, target_idx)
             
             # Check if either end is a switch - must use CSMA for bridging
             source_is_switch = source_node and source_node.node_type == NodeType.SWITCH
@@ -320,6 +588,7 @@ def main():
             
             if use_csma:
                 # CSMA required for switch bridging (P2P doesn't support SendFrom)
+                self._csma_link_ids.add(link_id)
                 lines.extend([
                     f"    csma.SetChannelAttribute('DataRate', ns.StringValue('{link.data_rate}'))",
                     f"    csma.SetChannelAttribute('Delay', ns.StringValue('{link.delay}'))",
@@ -527,7 +796,8 @@ def main():
                 
                 # Find all links connected to this switch
                 connected_link_info = []
-                for link_id, link in network.links.items():
+                for link in network.get_links_for_node(switch_id):
+                    link_id = link.id
                     # Skip WiFi links (they don't go through switches)
                     if link_id in self._wifi_link_ids:
                         continue
@@ -588,8 +858,10 @@ def main():
         # Track which links have been processed (for switch segments)
         processed_links = set()
         
-        # Use a subnet counter for auto-assignment
-        auto_subnet_counter = 1
+        # Subnets for auto-assignment come from a copy of the model's IPAM,
+        # so links already addressed in the GUI keep their subnets
+        ipam = network.ipam.copy()
+        self._ipam = ipam
         
         # First, handle switch segments - all hosts on same switch should be on same subnet
         if has_switches:
@@ -606,16 +878,17 @@ def main():
                 segment_subnet, segment_mask = self._determine_switch_subnet(network, connected_nodes)
                 
                 if not segment_subnet:
-                    # Auto-assign subnet for this switch segment
-                    segment_subnet = f"10.1.{auto_subnet_counter}.0"
-                    auto_subnet_counter += 1
+                    # Auto-assign a subnet sized for this switch segment
+                    subnet = ipam.allocate_lan(switch_id, len(connected_nodes))
+                    segment_subnet, segment_mask = subnet.network_address, subnet.netmask
                 
+                segment_prefix = netmask_to_prefix(segment_mask)
                 lines.extend([
                     f"    # ----------------------------------------",
                     f"    # Switch segment: {switch_name}",
-                    f"    # All hosts on this switch share subnet {segment_subnet}/24",
+                    f"    # All hosts on this switch share subnet {segment_subnet}/{segment_prefix}",
                     f"    # ----------------------------------------",
-                    f"    ipv4.SetBase(ns.Ipv4Address('{segment_subnet}'), ns.Ipv4Mask('255.255.255.0'))",
+                    f"    ipv4.SetBase(ns.Ipv4Address('{segment_subnet}'), ns.Ipv4Mask('{segment_mask}'))",
                     "",
                 ])
                 
@@ -656,11 +929,12 @@ def main():
                     
                     if user_ip:
                         # Check if user IP is on the same subnet as segment
-                        parts = user_ip.split('.')
-                        user_subnet = f"{parts[0]}.{parts[1]}.{parts[2]}.0"
-                        if user_subnet == segment_subnet:
-                            use_user_ip = True
-                            host_octet = parts[3]
+                        try:
+                            if network_address(user_ip, segment_mask) == segment_subnet:
+                                use_user_ip = True
+                                host_offset = int_to_ip(ip_to_int(user_ip) - ip_to_int(segment_subnet))
+                        except ValueError:
+                            pass
                     
                     if use_user_ip:
                         # Use user IP (already on correct subnet)
@@ -668,14 +942,14 @@ def main():
                             f"    # {host_node.name}: using configured IP {user_ip}",
                             f"    host_dev{device_idx} = ns.NetDeviceContainer()",
                             f"    host_dev{device_idx}.Add(devices{device_idx}.Get({dev_idx}))",
-                            f"    ipv4.SetBase(ns.Ipv4Address('{segment_subnet}'), ns.Ipv4Mask('255.255.255.0'), ns.Ipv4Address('0.0.0.{host_octet}'))",
+                            f"    ipv4.SetBase(ns.Ipv4Address('{segment_subnet}'), ns.Ipv4Mask('{segment_mask}'), ns.Ipv4Address('{host_offset}'))",
                             f"    interfaces{device_idx} = ipv4.Assign(host_dev{device_idx})",
                             f"    all_interfaces.append(interfaces{device_idx})",
                         ])
                     else:
                         # Auto-assign IP on switch segment (incrementing)
                         lines.extend([
-                            f"    # {host_node.name}: auto-assigned IP {segment_subnet.rsplit('.', 1)[0]}.{host_counter}",
+                            f"    # {host_node.name}: auto-assigned IP {int_to_ip(ip_to_int(segment_subnet) + host_counter)}",
                             f"    host_dev{device_idx} = ns.NetDeviceContainer()",
                             f"    host_dev{device_idx}.Add(devices{device_idx}.Get({dev_idx}))",
                             f"    interfaces{device_idx} = ipv4.Assign(host_dev{device_idx})",
@@ -716,8 +990,7 @@ def main():
             
             if source_ip and target_ip:
                 # Both have user-defined IPs - use source's subnet
-                parts = source_ip.split('.')
-                subnet = f"{parts[0]}.{parts[1]}.{parts[2]}.0"
+                subnet = network_address(source_ip, source_mask)
                 lines.extend([
                     f"    # Link {idx}: Using user-configured IPs: {source_ip} <-> {target_ip}",
                     f"    ipv4.SetBase(ns.Ipv4Address('{subnet}'), ns.Ipv4Mask('{source_mask}'))",
@@ -725,8 +998,7 @@ def main():
                     f"    all_interfaces.append(interfaces{idx})",
                 ])
             elif source_ip:
-                parts = source_ip.split('.')
-                subnet = f"{parts[0]}.{parts[1]}.{parts[2]}.0"
+                subnet = network_address(source_ip, source_mask)
                 lines.extend([
                     f"    # Link {idx}: Source has configured IP: {source_ip}",
                     f"    ipv4.SetBase(ns.Ipv4Address('{subnet}'), ns.Ipv4Mask('{source_mask}'))",
@@ -734,8 +1006,7 @@ def main():
                     f"    all_interfaces.append(interfaces{idx})",
                 ])
             elif target_ip:
-                parts = target_ip.split('.')
-                subnet = f"{parts[0]}.{parts[1]}.{parts[2]}.0"
+                subnet = network_address(target_ip, target_mask)
                 lines.extend([
                     f"    # Link {idx}: Target has configured IP: {target_ip}",
                     f"    ipv4.SetBase(ns.Ipv4Address('{subnet}'), ns.Ipv4Mask('{target_mask}'))",
@@ -744,11 +1015,10 @@ def main():
                 ])
             else:
                 # No user-defined IPs, auto-assign
-                subnet = f"10.1.{auto_subnet_counter}.0"
-                auto_subnet_counter += 1
+                subnet = ipam.allocate_p2p(link_id)
                 lines.extend([
-                    f"    # Link {idx}: Auto-assign subnet {subnet}/24",
-                    f"    ipv4.SetBase(ns.Ipv4Address('{subnet}'), ns.Ipv4Mask('255.255.255.0'))",
+                    f"    # Link {idx}: Auto-assign subnet {subnet.cidr}",
+                    f"    ipv4.SetBase(ns.Ipv4Address('{subnet.network_address}'), ns.Ipv4Mask('{subnet.netmask}'))",
                     f"    interfaces{idx} = ipv4.Assign(devices{idx})",
                     f"    all_interfaces.append(interfaces{idx})",
                 ])
@@ -762,15 +1032,18 @@ def main():
         )
         
         if has_wifi:
-            wifi_subnet = f"10.1.{auto_subnet_counter}.0"
-            auto_subnet_counter += 1
+            wifi_count = sum(
+                1 for node in network.nodes.values()
+                if node.node_type in (NodeType.STATION, NodeType.ACCESS_POINT)
+            )
+            wifi_subnet = ipam.allocate_lan("wifi", wifi_count)
             
             lines.extend([
                 "    # ----------------------------------------",
                 "    # WiFi Network IP Assignment",
-                f"    # All WiFi devices share subnet {wifi_subnet}/24",
+                f"    # All WiFi devices share subnet {wifi_subnet.cidr}",
                 "    # ----------------------------------------",
-                f"    ipv4.SetBase(ns.Ipv4Address('{wifi_subnet}'), ns.Ipv4Mask('255.255.255.0'))",
+                f"    ipv4.SetBase(ns.Ipv4Address('{wifi_subnet.network_address}'), ns.Ipv4Mask('{wifi_subnet.netmask}'))",
                 "",
             ])
             
@@ -972,7 +1245,7 @@ def main():
                     node_idx = self._node_index_map.get(node_id, 0)
                     
                     # Find the router this host is connected to
-                    for link_idx, (link_id, link) in enumerate(network.links.items()):
+                    for link in network.get_links_for_node(node_id):
                         connected_node_id = None
                         host_port_id = None
                         router_port_id = None
@@ -1043,6 +1316,7 @@ def main():
             ])
             
             # Print routing info for each node
+            link_positions = {link_id: i for i, link_id in enumerate(network.links)}
             for node_id, node in network.nodes.items():
                 node_idx = self._node_index_map.get(node_id, 0)
                 
@@ -1061,7 +1335,9 @@ def main():
                     lines.append(f"    print('  [Auto Routing Mode]')")
                     
                     # Find all links connected to this node and get their subnets
-                    for link_idx, (link_id, link) in enumerate(network.links.items()):
+                    for link in network.get_links_for_node(node_id):
+                        link_id = link.id
+                        link_idx = link_positions[link_id]
                         is_source = link.source_node_id == node_id
                         is_target = link.target_node_id == node_id
                         
@@ -1082,12 +1358,13 @@ def main():
                         
                         if ip:
                             # Use the actual IP subnet
-                            parts = ip.split('.')
-                            subnet = f"{parts[0]}.{parts[1]}.{parts[2]}.0"
-                            lines.append(f"    print('  {subnet}/24 via direct (interface {link_idx})')")
+                            subnet = network_address(ip, mask)
+                            lines.append(f"    print('  {subnet}/{netmask_to_prefix(mask)} via direct (interface {link_idx})')")
                         else:
-                            # Use auto-assigned subnet
-                            lines.append(f"    print(f'  10.1.{link_idx + 1}.0/24 via direct (interface {link_idx})')")
+                            # Use the subnet auto-assigned in the IP section
+                            subnet = self._ipam.get(link_id) if self._ipam else None
+                            if subnet:
+                                lines.append(f"    print('  {subnet.cidr} via direct (interface {link_idx})')")
                 
                 lines.append("")
             
@@ -2354,8 +2631,18 @@ def main():
         
         return lines
 
-    def _generate_tracing(self, sim_config: SimulationConfig, output_dir: str) -> str:
-        """Generate tracing/logging code."""
+    def _generate_tracing(
+        self,
+        sim_config: SimulationConfig,
+        output_dir: str,
+        network: Optional[NetworkModel] = None
+    ) -> str:
+        """Generate tracing/logging code.
+        
+        When the trace config selects links, nodes or grid roles, only
+        those devices are traced; otherwise every device is traced
+        according to enable_ascii_trace / enable_pcap.
+        """
         lines = [
             "    # ============================================",
             "    # Setup Tracing and Monitoring",
@@ -2363,36 +2650,324 @@ def main():
             "",
         ]
         
-        if sim_config.enable_ascii_trace:
+        trace = sim_config.trace
+        self._pkt_trace_enabled = False
+        self._metrics_enabled = False
+        self._rank_rx_enabled = False
+        
+        if self._partition is not None:
+            lines.extend([
+                "    # Ranks other than 0 write their output files to a rank<N> subdirectory",
+                "    import os",
+                f"    rank_output_dir = '{output_dir}' if system_id == 0 else f'{output_dir}/rank{{system_id}}'",
+                "    os.makedirs(rank_output_dir, exist_ok=True)",
+                "",
+            ])
+        
+        if trace.snap_length > 0:
+            lines.extend([
+                "    # Limit bytes captured per packet",
+                f"    ns.Config.SetDefault('ns3::PcapFileWrapper::CaptureSize', ns.UintegerValue({trace.snap_length}))",
+                "",
+            ])
+        
+        if network is not None and trace.is_selective:
+            lines.extend(self._generate_selective_tracing(network, trace, output_dir))
+        elif sim_config.enable_ascii_trace:
             lines.extend([
                 "    # ASCII Trace for packet-level details",
                 "    ascii_trace = ns.AsciiTraceHelper()",
-                f"    p2p.EnableAsciiAll(ascii_trace.CreateFileStream('{output_dir}/trace.tr'))",
-                f"    csma.EnableAsciiAll(ascii_trace.CreateFileStream('{output_dir}/csma-trace.tr'))",
+                f"    p2p.EnableAsciiAll(ascii_trace.CreateFileStream({self._output_path(output_dir, 'trace.tr')}))",
+                f"    csma.EnableAsciiAll(ascii_trace.CreateFileStream({self._output_path(output_dir, 'csma-trace.tr')}))",
                 "",
             ])
         
-        if sim_config.enable_pcap:
+        if sim_config.enable_pcap and not (network is not None and trace.is_selective):
             lines.extend([
                 "    # PCAP Trace (packet capture)",
-                f"    p2p.EnablePcapAll('{output_dir}/p2p-capture')",
-                f"    csma.EnablePcapAll('{output_dir}/csma-capture')",
+                f"    p2p.EnablePcapAll({self._output_path(output_dir, 'p2p-capture')})",
+                f"    csma.EnablePcapAll({self._output_path(output_dir, 'csma-capture')})",
                 "",
             ])
         
+        if network is not None:
+            lines.extend(self._generate_trace_map_writer(output_dir))
+        
         if sim_config.enable_flow_monitor:
             lines.extend([
                 "    # Flow Monitor for statistics",
                 "    flow_helper = ns.FlowMonitorHelper()",
-                "    flow_monitor = flow_helper.InstallAll()",
+                # Distributed ranks only monitor the nodes they simulate
+                "    flow_monitor = flow_helper.Install(local_nodes)" if self._partition is not None
+                else "    flow_monitor = flow_helper.InstallAll()",
                 "",
             ])
+            if self._partition is not None:
+                lines.extend(self._generate_address_rank_writer(output_dir))
+                lines.extend(self._generate_rank_rx_counter())
+            
+            if sim_config.delay_histogram_bins > 0:
+                lines.extend([
+                    f"    flow_monitor.SetAttribute('DelayBinWidth', ns.DoubleValue({sim_config.delay_histogram_bin_ms / 1000}))",
+                    "",
+                ])
+            
+            if sim_config.metrics_interval > 0:
+                lines.extend(self._generate_metrics_sampler(sim_config, network))
         
         return "\n".join(lines)
     
+    def _generate_metrics_sampler(self, sim_config: SimulationConfig, network: Optional[NetworkModel]) -> list[str]:
+        """Generate the periodic METRICS| snapshot sampler.
+        
+        The run loop calls sample_metrics() between simulator steps; each
+        call past the next interval boundary prints one compact JSON line
+        with per-flow counter deltas and per-link queue depths.
+        
+        A link's queue depth is the packets in its devices' transmit queues
+        plus their root traffic-control queue discs, where the IP stack
+        holds packets once the device queue is stopped. The device queue is
+        only on the concrete PointToPointNetDevice/CsmaNetDevice type, so
+        each device is cast to the type its link was built with.
+        """
+        self._metrics_enabled = True
+        interval = sim_config.metrics_interval
+        
+        queue_devices = []
+        if network is not None:
+            for link_id in network.links:
+                idx = self._link_device_map.get(link_id)
+                if idx is not None:
+                    device_type = "CsmaNetDevice" if link_id in self._csma_link_ids else "PointToPointNetDevice"
+                    queue_devices.append(f"('{link_id}', devices{idx}, ns.{device_type})")
+        
+        return [
+            "    # Periodic metric snapshots (JSON lines prefixed with METRICS|)",
+            "    import json",
+            f"    metrics_interval = {interval}",
+            f"    metrics_times = [round(metrics_interval * i, 6) for i in range(1, int({sim_config.duration} / metrics_interval) + 1)",
+            f"                     if metrics_interval * i < {sim_config.duration}]",
+            f"    metrics_queue_devices = [{', '.join(queue_devices)}]",
+            "    metrics_last = {}  # flow_id -> cumulative counters",
+            "    metrics_state = {'next': metrics_interval, 'last_time': 0.0, 'queue_error': False}",
+            "",
+            "    def sample_metrics(force=False):",
+            "        now = ns.Simulator.Now().GetSeconds()",
+            "        if now <= metrics_state['last_time'] + 1e-9:",
+            "            return  # Nothing new since the previous snapshot",
+            "        if not force and now + 1e-9 < metrics_state['next']:",
+            "            return",
+            "        while metrics_state['next'] <= now + 1e-9:",
+            "            metrics_state['next'] += metrics_interval",
+            *([
+                "        if system_id != 0:",
+                "            return  # Only rank 0 streams snapshots",
+            ] if self._partition is not None else []),
+            "        flow_monitor.CheckForLostPackets()",
+            "        flows = {}",
+            "        for flow_id, st in flow_monitor.GetFlowStats():",
+            "            current = (int(st.txPackets), int(st.rxPackets), int(st.txBytes), int(st.rxBytes),",
+            "                       st.delaySum.GetSeconds() * 1000, int(st.lostPackets))",
+            "            previous = metrics_last.get(flow_id, (0, 0, 0, 0, 0.0, 0))",
+            "            delta = [c - p for c, p in zip(current, previous)]",
+            "            if any(delta):",
+            "                delta[4] = round(delta[4], 3)",
+            "                flows[str(flow_id)] = delta",
+            "            metrics_last[flow_id] = current",
+            "        queues = {}",
+            "        for link_id, devs, device_type in metrics_queue_devices:",
+            "            depth = 0",
+            "            for i in range(devs.GetN()):",
+            "                try:",
+            "                    dev = devs.Get(i)",
+            "                    depth += dev.GetObject[device_type]().GetQueue().GetNPackets()",
+            "                    tc = dev.GetNode().GetObject[ns.TrafficControlLayer]()",
+            "                    queue_disc = tc.GetRootQueueDiscOnDevice(dev) if tc else None",
+            "                    if queue_disc:",
+            "                        depth += queue_disc.GetNPackets()",
+            "                except Exception as e:",
+            "                    if not metrics_state['queue_error']:",
+            "                        metrics_state['queue_error'] = True",
+            "                        print(f'WARNING: Queue depth unavailable for link {link_id}: {e}', file=sys.stderr)",
+            "            if depth:",
+            "                queues[link_id] = depth",
+            "        snapshot = {'t': round(now, 6), 'dt': round(now - metrics_state['last_time'], 6),",
+            "                    'flows': flows, 'queues': queues}",
+            "        metrics_state['last_time'] = now",
+            "        print('METRICS|' + json.dumps(snapshot, separators=(',', ':')), flush=True)",
+            "",
+        ]
+    
+    def _trace_device_formats(self, network: NetworkModel, trace) -> Dict[Tuple[int, int], Tuple[str, Set[TraceFormat]]]:
+        """Resolve trace selections to individual devices.
+        
+        Returns:
+            Dict mapping (device_idx, endpoint) to (link_id, formats), where
+            endpoint 0 is the link's source device and 1 its target device
+        """
+        device_formats = {}
+        
+        for link_id, link in network.links.items():
+            idx = self._link_device_map.get(link_id)
+            if idx is None:
+                continue  # WiFi links have no per-link device container
+            
+            for endpoint, node_id in enumerate((link.source_node_id, link.target_node_id)):
+                formats = set()
+                if link_id in trace.link_formats:
+                    formats.add(trace.link_formats[link_id])
+                if node_id in trace.node_formats:
+                    formats.add(trace.node_formats[node_id])
+                
+                role = getattr(network.nodes.get(node_id), 'grid_role', None)
+                if role is not None and role.name in trace.grid_role_formats:
+                    formats.add(trace.grid_role_formats[role.name])
+                
+                if formats:
+                    device_formats[(idx, endpoint)] = (link_id, formats)
+        
+        return device_formats
+    
+    def trace_map(self) -> TraceMap:
+        """Node and link numbering of the last generated script.
+        
+        Device indices are only known once ns-3 creates the devices; the
+        script writes the complete map to trace_map.json.
+        """
+        node_ids = sorted(self._node_index_map, key=self._node_index_map.get)
+        return TraceMap(node_ids=node_ids, link_ends=dict(self._link_node_indices))
+    
+    def _generate_trace_map_writer(self, output_dir: str) -> list[str]:
+        """Generate code writing the trace map with ns-3's device indices."""
+        lines = [
+            "    # Trace map: ns-3 node/device indices -> GUI node and link IDs",
+            "    import json",
+            f"    trace_map = {self.trace_map().to_dict()!r}",
+            "    trace_link_devices = [",
+        ]
+        for link_id, idx in self._link_device_map.items():
+            lines.append(f"        ({link_id!r}, devices{idx}),")
+        lines.extend([
+            "    ]",
+            "    for link_id, link_devices in trace_link_devices:",
+            "        for i in range(link_devices.GetN()):",
+            "            dev = link_devices.Get(i)",
+            "            trace_map['devices'].append([dev.GetNode().GetId(), dev.GetIfIndex(), link_id])",
+            f"    with open({self._output_path(output_dir, TRACE_MAP_FILE)}, 'w') as f:",
+            "        json.dump(trace_map, f)",
+            "",
+        ])
+        return lines
+    
+    def _generate_address_rank_writer(self, output_dir: str) -> list[str]:
+        """Generate code recording which rank simulates each local address.
+        
+        Merging the ranks' flow results needs to know which flows cross
+        ranks, since no rank's FlowMonitor sees both of their ends.
+        """
+        return [
+            "    # Addresses simulated on this rank (merged flow results mark cross-rank flows)",
+            "    import json",
+            "    address_ranks = {}",
+            "    for i in range(local_nodes.GetN()):",
+            "        ipv4 = local_nodes.Get(i).GetObject[ns.Ipv4]()",
+            "        for interface in range(1, ipv4.GetNInterfaces()):",
+            "            for k in range(ipv4.GetNAddresses(interface)):",
+            "                address_ranks[str(ipv4.GetAddress(interface, k).GetLocal())] = system_id",
+            f"    with open({self._output_path(output_dir, ADDRESS_RANKS_FILE)}, 'w') as f:",
+            "        json.dump(address_ranks, f)",
+            "",
+        ]
+    
+    def _generate_rank_rx_counter(self) -> list[str]:
+        """Generate the reception counters of a distributed run.
+        
+        A rank's FlowMonitor ignores packets first sent on another rank,
+        so each rank counts what its own nodes receive and writes
+        rank_rx.csv after the run for merge_flow_stats().
+        """
+        self._rank_rx_enabled = True
+        return [
+            "    # Count receptions where they happen (FlowMonitor misses packets sent on other ranks)",
+            "    ns.cppyy.cppdef(r'''",
+            *RANK_RX_COUNTER_CPP.strip("\n").splitlines(),
+            "''')",
+            "    ns.cppyy.gbl.gui_rank_rx.Install(local_nodes)",
+            "",
+        ]
+    
+    def _generate_selective_tracing(self, network: NetworkModel, trace, output_dir: str) -> list[str]:
+        """Generate targeted EnableAscii/EnablePcap calls for selected devices."""
+        device_formats = self._trace_device_formats(network, trace)
+        if not device_formats:
+            return ["    # Trace selection matched no wired devices", ""]
+        
+        used = set().union(*(formats for _, formats in device_formats.values()))
+        
+        lines = [
+            f"    # Selective tracing: {len(device_formats)} device(s)",
+            "    def trace_helper(dev):",
+            "        # CSMA and P2P devices are traced through their own helper",
+            "        return csma if str(dev.GetInstanceTypeId().GetName()) == 'ns3::CsmaNetDevice' else p2p",
+            "",
+        ]
+        
+        if TraceFormat.ASCII in used:
+            lines.extend([
+                "    ascii_trace = ns.AsciiTraceHelper()",
+                f"    ascii_stream = ascii_trace.CreateFileStream({self._output_path(output_dir, 'trace.tr')})",
+                "",
+            ])
+        if TraceFormat.PKT in used:
+            lines.extend(self._generate_pkt_sampler(trace, output_dir))
+        
+        for (idx, endpoint), (link_id, formats) in device_formats.items():
+            dev = f"devices{idx}.Get({endpoint})"
+            if TraceFormat.ASCII in formats:
+                lines.append(f"    trace_helper({dev}).EnableAscii(ascii_stream, {dev})")
+            if TraceFormat.PCAP in formats:
+                lines.append(f"    trace_helper({dev}).EnablePcap({self._output_path(output_dir, 'capture')}, {dev}, False, False)")
+            if TraceFormat.PKT in formats:
+                lines.append(
+                    f"    ns.cppyy.gbl.gui_pkt.Watch({dev}, '{link_id}', "
+                    f"devices{idx}.Get({1 - endpoint}).GetNode().GetId())"
+                )
+        lines.append("")
+        
+        return lines
+    
+    def _generate_pkt_sampler(self, trace, output_dir: str) -> list[str]:
+        """Generate the trace-time PKT| record sampler (see PKT_SAMPLER_CPP).
+        
+        Devices are attached with gui_pkt.Watch(); the run code closes
+        packets.pkt once the simulation ends.
+        """
+        self._pkt_trace_enabled = True
+        sample_rate = min(max(trace.sample_rate, 0.0), 1.0)
+        return [
+            "    # PKT records: sampled in the trace sinks, written only to packets.pkt",
+            "    ns.cppyy.cppdef(r'''",
+            *PKT_SAMPLER_CPP.strip("\n").splitlines(),
+            "''')",
+            f"    ns.cppyy.gbl.gui_pkt.Open({self._output_path(output_dir, 'packets.pkt')}, {sample_rate})",
+            "",
+        ]
+    
     def _generate_simulation_run(self, sim_config: SimulationConfig, output_dir: str) -> str:
         """Generate simulation run code."""
-        lines = [
+        lines = []
+        if self._partition is not None:
+            lines.extend([
+                "    # Applications only run on the rank that simulates their node",
+                "    for i, rank in enumerate(node_ranks):",
+                "        if rank != system_id:",
+                "            node = nodes.Get(i)",
+                "            for j in range(node.GetNApplications()):",
+                f"                node.GetApplication(j).SetStartTime(ns.Seconds({sim_config.duration + 1}))",
+                "                node.GetApplication(j).SetStopTime(ns.Seconds(0))",
+                "",
+            ])
+        lines += [
             "    # ============================================",
             "    # Run Simulation",
             "    # ============================================",
@@ -2437,6 +3012,9 @@ def main():
             "",
             "        # Add simulation end time",
             "        event_times.add(end_time)",
+            *([
+                "        event_times.update(metrics_times)",
+            ] if self._metrics_enabled else []),
             "",
             "        # Sort event times",
             "        event_times = sorted(event_times)",
@@ -2461,6 +3039,9 @@ def main():
             "                    poll_func()",
             "                except Exception as e:",
             "                    print(f'[{current_time:.3f}s] Receiver poll error: {e}')",
+            *([
+                "            sample_metrics()",
+            ] if self._metrics_enabled else []),
             "",
             "            # Process events for each app at this time",
             "            for i, app in enumerate(custom_apps):",
@@ -2507,13 +3088,54 @@ def main():
             "                        poll_func()",
             "                    except:",
             "                        pass",
+            *([
+                "                sample_metrics()",
+            ] if self._metrics_enabled else []),
             "        else:",
-            "            # No custom apps or receivers, run normally",
-            "            ns.Simulator.Run()",
-            "",
         ]
         
-        if sim_config.enable_flow_monitor:
+        if self._metrics_enabled:
+            lines.extend([
+                "            # No custom apps or receivers - step in metric intervals",
+                "            # so snapshots stream while the simulation runs",
+                "            for metrics_time in metrics_times:",
+                "                ns.Simulator.Stop(ns.Seconds(metrics_time - ns.Simulator.Now().GetSeconds()))",
+                "                ns.Simulator.Run()",
+                "                sample_metrics()",
+                "            ns.Simulator.Run()",
+                "",
+                "    # Final snapshot covers the tail of the run",
+                "    sample_metrics(force=True)",
+                "",
+            ])
+        else:
+            lines.extend([
+                "            # No custom apps or receivers, run normally",
+                "            ns.Simulator.Run()",
+                "",
+            ])
+        
+        if self._pkt_trace_enabled:
+            lines.extend([
+                "    # Flush the sampled PKT| records of selected devices",
+                f"    print(f'Wrote {{ns.cppyy.gbl.gui_pkt.Close()}} PKT records to', "
+                f"{self._output_path(output_dir, 'packets.pkt')})",
+                "",
+            ])
+        
+        if self._rank_rx_enabled:
+            lines.extend([
+                "    # Receptions counted on this rank, merged with the other ranks' flow results",
+                f"    ns.cppyy.gbl.gui_rank_rx.Write({self._output_path(output_dir, RANK_RX_FILE)}, "
+                f"'{','.join(RANK_RX_COLUMNS)}')",
+                "",
+            ])
+        
+        results_format = sim_config.resolve_results_format(len(self._node_index_map))
+        
+        if sim_config.enable_flow_monitor and results_format in (ResultsFormat.CSV, ResultsFormat.BINARY):
+            lines.extend(self._generate_compact_results(sim_config, output_dir, results_format))
+        elif sim_config.enable_flow_monitor:
             lines.extend([
                 "    # ============================================",
                 "    # Collect and Print Statistics",
@@ -2566,19 +3188,118 @@ def main():
                 "        print()",
                 "",
                 "    # Save flow monitor results to XML",
-                f"    flow_monitor.SerializeToXmlFile('{output_dir}/flowmon-results.xml', True, True)",
-                f"    print('Flow monitor results saved to: {output_dir}/flowmon-results.xml')",
+                f"    flow_monitor.SerializeToXmlFile({self._output_path(output_dir, 'flowmon-results.xml')}, True, True)",
+                f"    print('Flow monitor results saved to:', {self._output_path(output_dir, 'flowmon-results.xml')})",
                 "",
             ])
         
+        lines.append("    ns.Simulator.Destroy()")
+        if self._partition is not None:
+            lines.append("    ns.MpiInterface.Disable()")
         lines.extend([
-            "    ns.Simulator.Destroy()",
             "    print('\\nSimulation completed successfully.')",
             "",
         ])
         
         return "\n".join(lines)
     
+    def _generate_compact_results(
+        self,
+        sim_config: SimulationConfig,
+        output_dir: str,
+        results_format: ResultsFormat
+    ) -> list[str]:
+        """Generate compact one-row-per-flow result export.
+        
+        Replaces the per-flow console blocks and the FlowMonitor XML,
+        which dominate output time and size on large runs. The layout
+        matches what ResultsParser.parse_flowstats_binary / _csv read.
+        """
+        bins = max(sim_config.delay_histogram_bins, 0)
+        bin_ms = sim_config.delay_histogram_bin_ms
+        
+        lines = [
+            "    # ============================================",
+            "    # Write Compact Flow Results",
+            "    # ============================================",
+            "    import array, json, struct",
+            "    flow_monitor.CheckForLostPackets()",
+            "    classifier = flow_helper.GetClassifier()",
+            f"    flow_columns = {FLOWSTATS_COLUMNS!r}",
+            "    columns = {name: array.array(code) for name, code in flow_columns}",
+            "    histogram = array.array('q')",
+            f"    hist_bins, hist_bin_ms = {bins}, {bin_ms}",
+            "",
+            "    for flow_id, st in flow_monitor.GetFlowStats():",
+            "        t = classifier.FindFlow(flow_id)",
+            "        row = (",
+            "            int(flow_id), t.sourceAddress.Get(), t.destinationAddress.Get(),",
+            "            t.sourcePort, t.destinationPort, t.protocol,",
+            "            st.txPackets, st.rxPackets, st.txBytes, st.rxBytes,",
+            "            st.delaySum.GetNanoSeconds(), st.jitterSum.GetNanoSeconds(),",
+            "            st.lostPackets, st.timesForwarded,",
+            "            st.timeFirstTxPacket.GetNanoSeconds(), st.timeLastRxPacket.GetNanoSeconds(),",
+            "        )",
+            "        for (name, _), value in zip(flow_columns, row):",
+            "            columns[name].append(int(value))",
+            "        if hist_bins:",
+            "            # Re-bin into fixed-width bins; the last bin collects overflow",
+            "            counts = [0] * hist_bins",
+            "            h = st.delayHistogram",
+            "            for i in range(h.GetNBins()):",
+            "                counts[min(int(h.GetBinStart(i) * 1000 / hist_bin_ms), hist_bins - 1)] += h.GetBinCount(i)",
+            "            histogram.extend(counts)",
+            "",
+            "    flow_count = len(columns['flow_id'])",
+        ]
+        
+        if results_format == ResultsFormat.BINARY:
+            path = self._output_path(output_dir, FLOWSTATS_BINARY_FILE)
+            lines.extend([
+                "    if sys.byteorder == 'big':",
+                "        for values in list(columns.values()) + [histogram]:",
+                "            values.byteswap()",
+                "    header = json.dumps({",
+                "        'rows': flow_count,",
+                "        'columns': [[name, code, columns[name].itemsize] for name, code in flow_columns],",
+                "        'histogram_bins': hist_bins,",
+                "        'histogram_bin_ms': hist_bin_ms,",
+                "    }).encode('utf-8')",
+                f"    with open({path}, 'wb') as f:",
+                f"        f.write({FLOWSTATS_MAGIC!r})",
+                "        f.write(struct.pack('<I', len(header)))",
+                "        f.write(header)",
+                "        for name, _ in flow_columns:",
+                "            columns[name].tofile(f)",
+                "        histogram.tofile(f)",
+            ])
+        else:
+            path = self._output_path(output_dir, FLOWSTATS_CSV_FILE)
+            lines.extend([
+                "    import csv",
+                "    def dotted(value):",
+                "        return '.'.join(str((value >> shift) & 0xFF) for shift in (24, 16, 8, 0))",
+                f"    with open({path}, 'w', newline='') as f:",
+                "        writer = csv.writer(f)",
+                "        hist_header = ['hist_bin_ms'] + [f'hist_{i}' for i in range(hist_bins)] if hist_bins else []",
+                "        writer.writerow([name for name, _ in flow_columns] + hist_header)",
+                "        for row in range(flow_count):",
+                "            values = [",
+                "                dotted(columns[name][row]) if code == 'I' else columns[name][row]",
+                "                for name, code in flow_columns",
+                "            ]",
+                "            if hist_bins:",
+                "                values += [hist_bin_ms] + histogram[row * hist_bins:(row + 1) * hist_bins].tolist()",
+                "            writer.writerow(values)",
+            ])
+        
+        lines.extend([
+            "",
+            f"    print(f'Flow results for {{flow_count}} flow(s) saved to:', {path})",
+            "",
+        ])
+        return lines
+    
     def _generate_main_function_end(self) -> str:
         """Generate main function end."""
         return '''
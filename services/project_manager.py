@@ -2,10 +2,14 @@
 Project manager for saving and loading network topologies.
 
 Uses a JSON format inspired by common network topology standards
-like GNS3, Mininet, and YANG models.
+like GNS3, Mininet, and YANG models. Large projects can be saved in the
+compact container (.ns3z, see compact_project), which holds the same
+document compressed and column-encoded, and loads flows, metadata and
+todos only when they are first used.
 """
 
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -15,12 +19,21 @@ from models import (
     NetworkModel, NodeModel, LinkModel, NodeType, ChannelType,
     Position, PortConfig, PortType, VlanMode
 )
+from models.ids import PORT_ID_PREFIX, LINK_ID_PREFIX, new_id, reserve_id
+from .compact_project import (
+    COMPACT_SUFFIX, LAZY_SECTIONS, CompactProjectReader, is_compact_file, write_compact_project
+)
 
 
 # Schema version for future compatibility
 SCHEMA_VERSION = "1.0"
 
 
+def _shared(value):
+    """Intern strings that repeat across many ports/links (speeds, masks)."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 class ProjectManager:
     """
     Handles saving and loading network topology projects.
@@ -44,22 +57,29 @@ class ProjectManager:
         """Check if a file is currently open."""
         return self._current_file is not None
     
-    def save(self, network: NetworkModel, filepath: Path) -> bool:
+    def save(self, network: NetworkModel, filepath: Path, compact: Optional[bool] = None) -> bool:
         """
         Save network topology to a JSON file.
         
         Args:
             network: The NetworkModel to save
             filepath: Path to save the file
+            compact: Write the compact container instead of JSON
+                (default: if the file name ends in .ns3z)
             
         Returns:
             True if successful, False otherwise
         """
+        if compact is None:
+            compact = Path(filepath).suffix.lower() == COMPACT_SUFFIX
         try:
             data = self._serialize_network(network)
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            if compact:
+                write_compact_project(data, filepath)
+            else:
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
             
             self._current_file = filepath
             return True
@@ -78,7 +98,10 @@ class ProjectManager:
     
     def load(self, filepath: Path) -> Optional[NetworkModel]:
         """
-        Load network topology from a JSON file.
+        Load network topology from a JSON or compact (.ns3z) file.
+        
+        Compact files are recognised by their magic bytes, whatever
+        the extension.
         
         Args:
             filepath: Path to the file to load
@@ -95,6 +118,11 @@ class ProjectManager:
             if not filepath.exists():
                 raise FileNotFoundError(f"File not found: {filepath}")
             
+            if is_compact_file(filepath):
+                network = self._load_compact(filepath)
+                self._current_file = filepath
+                return network
+            
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
@@ -122,6 +150,32 @@ class ProjectManager:
             traceback.print_exc()
             raise ValueError(f"Error loading file: {e}")
     
+    def _load_compact(self, filepath: Path) -> NetworkModel:
+        """
+        Load a compact container, deferring the lazy sections.
+        
+        Nodes and links are decoded now; flows, import metadata, todos
+        and warnings are decoded when the model attribute is first read.
+        """
+        reader = CompactProjectReader(filepath)
+        network = self._deserialize_network(reader.read_document(skip=LAZY_SECTIONS))
+        
+        if "flows" in reader:
+            # New flows must not take an ID the deferred ones already hold
+            for flow_id in reader.flow_ids():
+                reserve_id(flow_id)
+            network.defer_section("saved_flows", lambda: self._valid_flows(
+                network, (self._deserialize_flow(item) for item in reader.read("flows"))
+            ))
+        if "metadata" in reader:
+            network.defer_section(
+                "import_metadata", lambda: reader.read("metadata").get("import_info", {})
+            )
+        for name in ("todos", "warnings"):
+            if name in reader:
+                network.defer_section(name, lambda name=name: reader.read(name))
+        return network
+    
     def _serialize_network(self, network: NetworkModel) -> dict:
         """Convert NetworkModel to JSON-serializable dictionary."""
         return {
@@ -329,6 +383,7 @@ class ProjectManager:
         
         # Load topology
         topology = data.get("topology", {})
+        self._repair_duplicate_ids(topology)
         
         # First pass: create all nodes
         for node_data in topology.get("nodes", []):
@@ -340,18 +395,63 @@ class ProjectManager:
             link = self._deserialize_link(link_data)
             network.links[link.id] = link
         
-        # Update subnet counter based on loaded links
-        network._next_subnet = len(network.links) + 1
+        # Register loaded subnets so new links get fresh addresses
+        network.rebuild_ip_allocations()
         
         # Validate flows - remove any that reference deleted nodes
-        valid_node_ids = set(network.nodes.keys())
-        network.saved_flows = [
-            f for f in network.saved_flows
-            if f.source_node_id in valid_node_ids and f.target_node_id in valid_node_ids
-        ]
+        network.saved_flows = self._valid_flows(network, network.saved_flows)
         
         return network
     
+    @staticmethod
+    def _valid_flows(network: NetworkModel, flows) -> list:
+        """Drop flows whose endpoints aren't in the network."""
+        return [
+            f for f in flows
+            if f and f.source_node_id in network.nodes and f.target_node_id in network.nodes
+        ]
+    
+    def _repair_duplicate_ids(self, topology: dict):
+        """
+        Give fresh IDs to ports and links whose saved IDs collide.
+        
+        Files written with random 8-character IDs can contain the same
+        port ID on two nodes, or two links with one ID. References are
+        (node, port) pairs, so each duplicate can be renamed unambiguously.
+        """
+        seen_ports = set()
+        renamed_ports = {}  # (node_id, old_port_id) -> new_port_id
+        ports_by_key = {}
+        for node_data in topology.get("nodes", []):
+            node_id = node_data.get("id", "")
+            for port_data in node_data.get("ports", []):
+                port_id = port_data.get("id", "")
+                if port_id in seen_ports:
+                    port_data["id"] = new_id(PORT_ID_PREFIX)
+                    renamed_ports[(node_id, port_id)] = port_data["id"]
+                seen_ports.add(port_data["id"])
+                ports_by_key[(node_id, port_data["id"])] = port_data
+        
+        seen_links = set()
+        for link_data in topology.get("links", []):
+            endpoints = [
+                link_data.get("endpoints", {}).get(end, {})
+                for end in ("source", "target")
+            ]
+            for end in endpoints:
+                key = (end.get("node_id", ""), end.get("port_id", ""))
+                if key in renamed_ports:
+                    end["port_id"] = renamed_ports[key]
+            
+            link_id = link_data.get("id", "")
+            if link_id in seen_links:
+                link_data["id"] = new_id(LINK_ID_PREFIX)
+                for end in endpoints:
+                    port_data = ports_by_key.get((end.get("node_id", ""), end.get("port_id", "")))
+                    if port_data and port_data.get("connected_link_id") == link_id:
+                        port_data["connected_link_id"] = link_data["id"]
+            seen_links.add(link_data["id"])
+    
     def _deserialize_flow(self, data: dict):
         """Convert dictionary to TrafficFlow."""
         from models import TrafficFlow, TrafficProtocol, TrafficApplication
@@ -420,11 +520,8 @@ class ProjectManager:
         # Load ports from data (replace auto-generated defaults)
         saved_ports = data.get("ports", [])
         if saved_ports:
-            # Clear auto-generated ports and load saved ones
-            node.ports.clear()
-            for port_data in saved_ports:
-                port = self._deserialize_port(port_data)
-                node.ports.append(port)
+            # Replace the defaults (never materialised) with the saved ones
+            node.ports = [self._deserialize_port(port_data) for port_data in saved_ports]
         
         # Load routing configuration
         routing_data = data.get("routing", {})
@@ -507,18 +604,18 @@ class ProjectManager:
         return PortConfig(
             id=data.get("id", ""),
             port_number=data.get("port_number", 0),
-            port_name=data.get("port_name", ""),
+            port_name=_shared(data.get("port_name", "")),
             port_type=port_type,
-            speed=data.get("speed", "1Gbps"),
-            duplex=data.get("duplex", "full"),
+            speed=_shared(data.get("speed", "1Gbps")),
+            duplex=_shared(data.get("duplex", "full")),
             enabled=data.get("enabled", True),
             mtu=data.get("mtu", 1500),
             mac_address=data.get("mac_address", ""),
             vlan_id=data.get("vlan_id", 1),
             vlan_mode=vlan_mode,
-            trunk_allowed_vlans=data.get("trunk_allowed_vlans", "1-4094"),
+            trunk_allowed_vlans=_shared(data.get("trunk_allowed_vlans", "1-4094")),
             ip_address=data.get("ip_address", ""),
-            netmask=data.get("netmask", "255.255.255.0"),
+            netmask=_shared(data.get("netmask", "255.255.255.0")),
             connected_link_id=data.get("connected_link_id"),
             angle=data.get("angle")  # Port position on node perimeter (radians)
         )
@@ -542,8 +639,8 @@ class ProjectManager:
             target_node_id=endpoints.get("target", {}).get("node_id", ""),
             source_port_id=endpoints.get("source", {}).get("port_id", ""),
             target_port_id=endpoints.get("target", {}).get("port_id", ""),
-            data_rate=properties.get("data_rate", "100Mbps"),
-            delay=properties.get("delay", "2ms")
+            data_rate=_shared(properties.get("data_rate", "100Mbps")),
+            delay=_shared(properties.get("delay", "2ms"))
         )
 
 
@@ -4,10 +4,56 @@ NS-3 Results Parser.
 Parses simulation output files (FlowMonitor XML, ASCII traces, etc.)
 """
 
+import csv
+import json
+import struct
+import sys
 import xml.etree.ElementTree as ET
-from typing import List, Optional
-from dataclasses import dataclass
+from array import array
+from typing import Dict, List, Optional
+from dataclasses import dataclass, field
 from models import FlowStats
+from models.ipam import int_to_ip
+
+
+# Prefix of the periodic metric snapshot lines printed by generated scripts
+METRICS_PREFIX = "METRICS|"
+
+# Compact flow results written by generated scripts.
+# Binary layout (little-endian):
+#   FLOWSTATS_MAGIC | uint32 header length | JSON header |
+#   one packed array per column | int64 histogram array (rows x bins)
+FLOWSTATS_MAGIC = b"NS3FLOWS"
+FLOWSTATS_BINARY_FILE = "flowstats.bin"
+FLOWSTATS_CSV_FILE = "flowstats.csv"
+ADDRESS_RANKS_FILE = "address_ranks.json"  # Distributed runs: IPv4 address -> MPI rank, one file per rank
+
+# Distributed runs: receptions each rank counted at its own destination
+# addresses (one CSV per rank), since FlowMonitor drops packets that were
+# first sent on another rank
+RANK_RX_FILE = "rank_rx.csv"
+RANK_RX_COLUMNS = [
+    "source_address", "destination_address", "source_port", "destination_port", "protocol",
+    "rx_packets", "rx_bytes", "delay_sum_ns", "jitter_sum_ns", "last_rx_time_ns",
+]
+FLOWSTATS_COLUMNS = [
+    ("flow_id", "q"),
+    ("source_address", "I"),        # IPv4 as uint32
+    ("destination_address", "I"),
+    ("source_port", "H"),
+    ("destination_port", "H"),
+    ("protocol", "B"),
+    ("tx_packets", "q"),
+    ("rx_packets", "q"),
+    ("tx_bytes", "q"),
+    ("rx_bytes", "q"),
+    ("delay_sum_ns", "q"),
+    ("jitter_sum_ns", "q"),
+    ("lost_packets", "q"),
+    ("times_forwarded", "q"),
+    ("first_tx_time_ns", "q"),
+    ("last_rx_time_ns", "q"),
+]
 
 
 class ResultsParser:
@@ -100,6 +146,262 @@ class ResultsParser:
         
         return flows
     
+    def read_flowstats_columns(self, file_path: str) -> Dict[str, array]:
+        """
+        Load a flowstats.bin file as one array per column.
+        
+        Columns are copied straight from the file, so this costs little
+        more than the read itself. The per-flow delay histogram is
+        returned under "delay_histogram" (rows x bins, row-major) with
+        its shape in "histogram_bins" / "histogram_bin_ms".
+        
+        Raises:
+            ValueError: If the file is not a flowstats file
+        """
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        
+        if data[:len(FLOWSTATS_MAGIC)] != FLOWSTATS_MAGIC:
+            raise ValueError(f"Not a flowstats file: {file_path}")
+        
+        offset = len(FLOWSTATS_MAGIC)
+        (header_len,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+        header = json.loads(data[offset:offset + header_len].decode('utf-8'))
+        offset += header_len
+        
+        rows = header["rows"]
+        columns = {}
+        for name, typecode, itemsize in header["columns"]:
+            values = array(typecode)
+            if values.itemsize != itemsize:
+                raise ValueError(f"Column {name} has item size {itemsize}, expected {values.itemsize}")
+            size = rows * itemsize
+            values.frombytes(data[offset:offset + size])
+            offset += size
+            columns[name] = values
+        
+        histogram = array('q')
+        histogram.frombytes(data[offset:offset + rows * header["histogram_bins"] * histogram.itemsize])
+        
+        if sys.byteorder == 'big':
+            for values in list(columns.values()) + [histogram]:
+                values.byteswap()
+        
+        columns["delay_histogram"] = histogram
+        columns["histogram_bins"] = header["histogram_bins"]
+        columns["histogram_bin_ms"] = header["histogram_bin_ms"]
+        return columns
+    
+    def parse_flowstats_binary(self, file_path: str) -> List[FlowStats]:
+        """
+        Parse a compact flowstats.bin file.
+        
+        Args:
+            file_path: Path to flowstats.bin
+            
+        Returns:
+            List of FlowStats for each flow
+        """
+        try:
+            columns = self.read_flowstats_columns(file_path)
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            print(f"Error parsing flow stats: {e}")
+            return []
+        
+        bins = columns.pop("histogram_bins")
+        bin_ms = columns.pop("histogram_bin_ms")
+        histogram = columns.pop("delay_histogram")
+        names = [name for name, _ in FLOWSTATS_COLUMNS]
+        
+        flows = []
+        for row, values in enumerate(zip(*(columns[name] for name in names))):
+            stats = FlowStats(**dict(zip(names, values)))
+            stats.source_address = int_to_ip(stats.source_address)
+            stats.destination_address = int_to_ip(stats.destination_address)
+            if bins:
+                stats.delay_histogram = histogram[row * bins:(row + 1) * bins].tolist()
+                stats.delay_histogram_bin_ms = bin_ms
+            flows.append(stats)
+        
+        return flows
+    
+    def parse_flowstats_csv(self, file_path: str) -> List[FlowStats]:
+        """
+        Parse a compact flowstats.csv file (one row per flow).
+        
+        Histogram counts, when present, follow a hist_bin_ms column
+        as hist_0 .. hist_N-1.
+        
+        Args:
+            file_path: Path to flowstats.csv
+            
+        Returns:
+            List of FlowStats for each flow
+        """
+        flows = []
+        
+        try:
+            with open(file_path, newline='', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                header = next(reader)
+                hist_columns = [
+                    i for i, name in enumerate(header)
+                    if name.startswith("hist_") and name != "hist_bin_ms"
+                ]
+                
+                for row in reader:
+                    values = dict(zip(header, row))
+                    stats = FlowStats()
+                    for name, typecode in FLOWSTATS_COLUMNS:
+                        if typecode == 'I':
+                            setattr(stats, name, values[name])
+                        else:
+                            setattr(stats, name, int(values[name]))
+                    if hist_columns:
+                        stats.delay_histogram = [int(row[i]) for i in hist_columns]
+                        stats.delay_histogram_bin_ms = float(values["hist_bin_ms"])
+                    flows.append(stats)
+        except (OSError, ValueError, KeyError, StopIteration) as e:
+            print(f"Error parsing flow stats CSV: {e}")
+        
+        return flows
+    
+    def merge_flow_stats(
+        self,
+        flow_lists: List[List[FlowStats]],
+        address_ranks: Optional[Dict[str, int]] = None,
+        rank_rx: Optional[List[FlowStats]] = None,
+    ) -> List[FlowStats]:
+        """
+        Merge per-rank results of a distributed (MPI) run.
+        
+        Each rank's FlowMonitor only tracks packets first sent on that
+        rank: the source rank counts a flow's transmissions, and a rank
+        that receives a packet it never saw sent ignores it. So a
+        cross-rank flow only has a sender-side record, and its receptions
+        come from the counters the destination rank kept itself
+        (rank_rx). Flows are matched by their 5-tuple; the tx side
+        (packets, bytes, first tx) comes from the rank that sent most, the
+        rx side (packets, bytes, delay, jitter, histogram, last rx) from
+        whichever record received most, and loss is what was sent but not
+        received. Receptions taken from rank_rx have no delay histogram.
+        
+        Without rank_rx (older scripts), a flow whose endpoints are on
+        different ranks (per address_ranks) or that several ranks
+        reported, and that no rank saw received, is marked partial: its
+        rx side and loss are unknown, not zero and 100%.
+        
+        Args:
+            flow_lists: Flow stats read from each rank's result file
+            address_ranks: IPv4 address -> rank (see parse_address_ranks)
+            rank_rx: Receptions counted on each rank (see parse_rank_rx)
+            
+        Returns:
+            One FlowStats per distinct flow, numbered from 1
+        """
+        grouped: Dict[tuple, List[FlowStats]] = {}
+        for flows in flow_lists:
+            for flow in flows:
+                grouped.setdefault(self._flow_key(flow), []).append(flow)
+        
+        counted = {self._flow_key(flow): flow for flow in rank_rx or []}
+        address_ranks = address_ranks or {}
+        merged = []
+        for key, records in grouped.items():
+            sender = max(records, key=lambda f: f.tx_packets)
+            receiver = max(records, key=lambda f: f.rx_packets)
+            if key in counted and counted[key].rx_packets > receiver.rx_packets:
+                receiver = counted[key]
+            total = FlowStats(
+                flow_id=len(merged) + 1,
+                source_address=sender.source_address,
+                destination_address=sender.destination_address,
+                source_port=sender.source_port,
+                destination_port=sender.destination_port,
+                protocol=sender.protocol,
+                tx_packets=sender.tx_packets,
+                tx_bytes=sender.tx_bytes,
+                first_tx_time_ns=sender.first_tx_time_ns,
+                rx_packets=receiver.rx_packets,
+                rx_bytes=receiver.rx_bytes,
+                delay_sum_ns=receiver.delay_sum_ns,
+                jitter_sum_ns=receiver.jitter_sum_ns,
+                last_rx_time_ns=receiver.last_rx_time_ns,
+                delay_histogram=list(receiver.delay_histogram),
+                delay_histogram_bin_ms=receiver.delay_histogram_bin_ms,
+                times_forwarded=sum(f.times_forwarded for f in records),
+            )
+            source_rank = address_ranks.get(total.source_address)
+            destination_rank = address_ranks.get(total.destination_address)
+            split = len(records) > 1 or (
+                source_rank is not None and destination_rank is not None
+                and source_rank != destination_rank
+            )
+            if not split:
+                total.lost_packets = sender.lost_packets
+            elif rank_rx is None and total.rx_packets == 0 and total.tx_packets > 0:
+                total.partial = True  # Sent here, received where nobody was tracking it
+            else:
+                total.lost_packets = max(0, total.tx_packets - total.rx_packets)
+            merged.append(total)
+        
+        return merged
+    
+    @staticmethod
+    def _flow_key(flow: FlowStats) -> tuple:
+        return (flow.source_address, flow.destination_address,
+                flow.source_port, flow.destination_port, flow.protocol)
+    
+    def parse_rank_rx(self, file_paths: List[str]) -> List[FlowStats]:
+        """
+        Combine the rank_rx.csv files the ranks of a distributed run wrote.
+        
+        Returns:
+            One FlowStats per 5-tuple with only its rx side filled in;
+            unreadable files are skipped
+        """
+        flows: Dict[tuple, FlowStats] = {}
+        for path in file_paths:
+            try:
+                with open(path, newline='', encoding='utf-8') as f:
+                    for values in csv.DictReader(f):
+                        flow = FlowStats(
+                            source_address=values["source_address"],
+                            destination_address=values["destination_address"],
+                            **{name: int(values[name]) for name in RANK_RX_COLUMNS[2:]}
+                        )
+                        key = self._flow_key(flow)
+                        if key not in flows:
+                            flows[key] = flow
+                            continue
+                        # A flow is normally delivered on one rank only
+                        total = flows[key]
+                        total.rx_packets += flow.rx_packets
+                        total.rx_bytes += flow.rx_bytes
+                        total.delay_sum_ns += flow.delay_sum_ns
+                        total.jitter_sum_ns += flow.jitter_sum_ns
+                        total.last_rx_time_ns = max(total.last_rx_time_ns, flow.last_rx_time_ns)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error reading rank receptions: {e}")
+        return list(flows.values())
+    
+    def parse_address_ranks(self, file_paths: List[str]) -> Dict[str, int]:
+        """
+        Combine the address_ranks.json files the ranks of a distributed run wrote.
+        
+        Returns:
+            IPv4 address -> rank; unreadable files are skipped
+        """
+        address_ranks: Dict[str, int] = {}
+        for path in file_paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    address_ranks.update({address: int(rank) for address, rank in json.load(f).items()})
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                print(f"Error reading address ranks: {e}")
+        return address_ranks
+    
     def parse_console_output(self, output: str) -> List[FlowStats]:
         """
         Parse flow statistics from console output.
@@ -206,6 +508,71 @@ class ResultsParser:
         return flows
 
 
+@dataclass
+class FlowMetricsDelta:
+    """Change in one flow's counters since the previous snapshot."""
+    flow_id: int
+    tx_packets: int = 0
+    rx_packets: int = 0
+    tx_bytes: int = 0
+    rx_bytes: int = 0
+    delay_sum_ms: float = 0.0
+    lost_packets: int = 0
+
+
+@dataclass
+class MetricsSnapshot:
+    """
+    Periodic in-simulation metric snapshot.
+    
+    Generated scripts print one per interval of simulated time as
+    METRICS|{"t":..,"dt":..,"flows":{id:[tx,rx,txB,rxB,delay_ms,lost]},"queues":{link_id:n}}
+    """
+    time: float                 # Simulated time of the snapshot (seconds)
+    interval: float             # Simulated time since the previous snapshot
+    flows: List[FlowMetricsDelta] = field(default_factory=list)
+    queues: Dict[str, int] = field(default_factory=dict)  # link_id -> queued packets
+    
+    @classmethod
+    def parse_line(cls, line: str) -> Optional['MetricsSnapshot']:
+        """Parse a METRICS| line, or return None for any other line."""
+        if not line.startswith(METRICS_PREFIX):
+            return None
+        try:
+            data = json.loads(line[len(METRICS_PREFIX):])
+            flows = [
+                FlowMetricsDelta(int(flow_id), *values)
+                for flow_id, values in data.get("flows", {}).items()
+            ]
+            return cls(
+                time=float(data["t"]),
+                interval=float(data.get("dt", 0.0)),
+                flows=flows,
+                queues={k: int(v) for k, v in data.get("queues", {}).items()},
+            )
+        except (ValueError, KeyError, TypeError):
+            return None
+    
+    @property
+    def throughput_kbps(self) -> float:
+        """Aggregate received throughput over the interval."""
+        if self.interval <= 0:
+            return 0.0
+        return sum(f.rx_bytes for f in self.flows) * 8 / self.interval / 1000
+    
+    @property
+    def mean_delay_ms(self) -> float:
+        """Mean delay of packets received in the interval."""
+        rx = sum(f.rx_packets for f in self.flows)
+        return sum(f.delay_sum_ms for f in self.flows) / rx if rx else 0.0
+    
+    @property
+    def loss_percent(self) -> float:
+        """Packets lost in the interval as a percentage of those sent."""
+        tx = sum(f.tx_packets for f in self.flows)
+        return sum(f.lost_packets for f in self.flows) / tx * 100 if tx else 0.0
+
+
 @dataclass
 class TraceEvent:
     """A single event from an ASCII trace file."""
@@ -0,0 +1,303 @@
+"""
+Per-project run history in SQLite.
+
+Flow results otherwise live only in each run's XML, binary or console
+output, so comparing runs meant re-parsing all of them. The store keeps
+one row per run, its parameters, and per-flow statistics including
+percentiles summarized from the FlowMonitor delay histogram:
+
+    runs            id, timestamp, status, duration, counts
+    run_parameters  (run_id, name) -> JSON value
+    flows           a flow's identity across runs (5-tuple key)
+    flow_stats      (run_id, flow_ref) -> counters, throughput, delay
+                    mean/p50/p95/p99, loss, raw histogram
+
+flow_stats is indexed by (flow_ref, run_id), so "p99 delay of flow X
+over the last 50 runs" reads only that flow's rows.
+
+Usage:
+    with RunStore(project.run_store_path) as store:
+        store.record_run(results.run_id, results, {"duration": 10.0})
+        history = store.flow_history(key, "p99_delay_ms", last=50)
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from models import SimulationResults, FlowStats
+
+
+SCHEMA_VERSION = 1
+
+# Per-flow metrics that can be queried across runs (column name -> label)
+FLOW_METRICS = {
+    "throughput_mbps": "Throughput (Mbps)",
+    "mean_delay_ms": "Mean delay (ms)",
+    "p50_delay_ms": "p50 delay (ms)",
+    "p95_delay_ms": "p95 delay (ms)",
+    "p99_delay_ms": "p99 delay (ms)",
+    "mean_jitter_ms": "Mean jitter (ms)",
+    "loss_percent": "Packet loss (%)",
+    "rx_packets": "Rx packets",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error_message TEXT NOT NULL DEFAULT '',
+    duration_actual REAL NOT NULL DEFAULT 0,
+    flow_count INTEGER NOT NULL DEFAULT 0,
+    tx_packets INTEGER NOT NULL DEFAULT 0,
+    rx_packets INTEGER NOT NULL DEFAULT 0,
+    lost_packets INTEGER NOT NULL DEFAULT 0,
+    throughput_mbps REAL NOT NULL DEFAULT 0,
+    mean_delay_ms REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (timestamp);
+
+CREATE TABLE IF NOT EXISTS run_parameters (
+    run_id TEXT NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS flows (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    source_address TEXT NOT NULL,
+    destination_address TEXT NOT NULL,
+    source_port INTEGER NOT NULL,
+    destination_port INTEGER NOT NULL,
+    protocol INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS flow_stats (
+    run_id TEXT NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    flow_ref INTEGER NOT NULL REFERENCES flows (id),
+    flow_id INTEGER NOT NULL,
+    tx_packets INTEGER NOT NULL,
+    rx_packets INTEGER NOT NULL,
+    tx_bytes INTEGER NOT NULL,
+    rx_bytes INTEGER NOT NULL,
+    lost_packets INTEGER NOT NULL,
+    throughput_mbps REAL NOT NULL,
+    loss_percent REAL NOT NULL,
+    mean_delay_ms REAL NOT NULL,
+    mean_jitter_ms REAL NOT NULL,
+    p50_delay_ms REAL,
+    p95_delay_ms REAL,
+    p99_delay_ms REAL,
+    histogram_bin_ms REAL NOT NULL DEFAULT 0,
+    histogram TEXT NOT NULL DEFAULT '[]',
+    PRIMARY KEY (run_id, flow_ref)
+);
+CREATE INDEX IF NOT EXISTS flow_stats_by_flow ON flow_stats (flow_ref, run_id);
+"""
+
+
+def flow_key(flow: FlowStats) -> str:
+    """Identity of a flow across runs, e.g. "UDP 10.1.1.1:49153 -> 10.1.1.2:9"."""
+    return (
+        f"{flow.protocol_name} {flow.source_address}:{flow.source_port}"
+        f" -> {flow.destination_address}:{flow.destination_port}"
+    )
+
+
+class RunStore:
+    """
+    SQLite run history of one project.
+
+    Each call commits on its own; record_run() writes a run and all its
+    flows in one transaction. Use from one thread (open one store per
+    thread).
+
+    Raises:
+        sqlite3.Error: If the database can't be opened or was written by
+            a newer schema version
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            self._conn.close()
+            raise sqlite3.DatabaseError(
+                f"Run store schema {version} is newer than supported ({SCHEMA_VERSION})"
+            )
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self) -> "RunStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----- writing -----
+
+    def record_run(
+        self,
+        run_id: str,
+        results: SimulationResults,
+        parameters: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None,
+    ) -> str:
+        """
+        Store a finished run (replacing a run with the same ID).
+
+        Args:
+            run_id: Usually results.run_id
+            results: Parsed results; failed runs are stored without flows
+            parameters: Run settings to compare by (JSON-serializable values)
+            timestamp: ISO time of the run (default: now)
+
+        Returns:
+            run_id
+        """
+        conn = self._conn
+        with conn:
+            conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+            conn.execute(
+                "INSERT INTO runs (id, timestamp, status, error_message, duration_actual, flow_count,"
+                " tx_packets, rx_packets, lost_packets, throughput_mbps, mean_delay_ms)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id, timestamp or datetime.now().isoformat(),
+                    "success" if results.success else "failed", results.error_message,
+                    results.duration_actual, len(results.flow_stats),
+                    results.total_tx_packets, results.total_rx_packets, results.total_lost_packets,
+                    results.average_throughput_mbps, results.average_delay_ms,
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO run_parameters (run_id, name, value) VALUES (?, ?, ?)",
+                [(run_id, name, json.dumps(value)) for name, value in (parameters or {}).items()],
+            )
+            rows = []
+            for flow in results.flow_stats:
+                rows.append((
+                    run_id, self._flow_ref(flow), flow.flow_id,
+                    flow.tx_packets, flow.rx_packets, flow.tx_bytes, flow.rx_bytes, flow.lost_packets,
+                    flow.throughput_mbps, flow.packet_loss_percent, flow.mean_delay_ms, flow.mean_jitter_ms,
+                    flow.delay_percentile_ms(0.50), flow.delay_percentile_ms(0.95), flow.delay_percentile_ms(0.99),
+                    flow.delay_histogram_bin_ms, json.dumps(flow.delay_histogram),
+                ))
+            conn.executemany(
+                "INSERT OR REPLACE INTO flow_stats (run_id, flow_ref, flow_id, tx_packets, rx_packets,"
+                " tx_bytes, rx_bytes, lost_packets, throughput_mbps, loss_percent, mean_delay_ms,"
+                " mean_jitter_ms, p50_delay_ms, p95_delay_ms, p99_delay_ms, histogram_bin_ms, histogram)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return run_id
+
+    def _flow_ref(self, flow: FlowStats) -> int:
+        key = flow_key(flow)
+        row = self._conn.execute("SELECT id FROM flows WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            return row[0]
+        return self._conn.execute(
+            "INSERT INTO flows (key, source_address, destination_address, source_port, destination_port, protocol)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (key, flow.source_address, flow.destination_address,
+             flow.source_port, flow.destination_port, flow.protocol),
+        ).lastrowid
+
+    def delete_run(self, run_id: str):
+        with self._conn:
+            self._conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+    # ----- queries -----
+
+    def list_runs(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Runs, newest first."""
+        sql = "SELECT * FROM runs ORDER BY timestamp DESC"
+        params: tuple = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (limit,)
+        return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def get_parameters(self, run_id: str) -> Dict[str, Any]:
+        rows = self._conn.execute("SELECT name, value FROM run_parameters WHERE run_id = ?", (run_id,))
+        return {name: json.loads(value) for name, value in rows}
+
+    def flow_keys(self) -> List[str]:
+        """All flows seen in any run."""
+        return [row[0] for row in self._conn.execute("SELECT key FROM flows ORDER BY id")]
+
+    def run_flow_stats(self, run_id: str) -> List[Dict[str, Any]]:
+        """Per-flow rows of one run, with the flow key and decoded histogram."""
+        rows = self._conn.execute(
+            "SELECT f.key, s.* FROM flow_stats s JOIN flows f ON f.id = s.flow_ref"
+            " WHERE s.run_id = ? ORDER BY s.flow_id",
+            (run_id,),
+        )
+        stats = []
+        for row in rows:
+            entry = dict(row)
+            entry["histogram"] = json.loads(entry["histogram"])
+            stats.append(entry)
+        return stats
+
+    def flow_history(
+        self, key: str, metric: str = "p99_delay_ms", last: int = 50
+    ) -> List[Tuple[str, str, Optional[float]]]:
+        """
+        A flow's metric over its most recent runs, oldest first.
+
+        Returns:
+            (run_id, timestamp, value) per run the flow appeared in
+        """
+        column = self._metric_column(metric)
+        rows = self._conn.execute(
+            f"SELECT r.id, r.timestamp, s.{column} FROM flow_stats s"
+            " JOIN flows f ON f.id = s.flow_ref JOIN runs r ON r.id = s.run_id"
+            " WHERE f.key = ? ORDER BY r.timestamp DESC LIMIT ?",
+            (key, last),
+        ).fetchall()
+        return [tuple(row) for row in reversed(rows)]
+
+    def compare_runs(
+        self, run_ids: Iterable[str], metric: str = "throughput_mbps"
+    ) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        One metric for every flow in the given runs.
+
+        Returns:
+            {flow key: {run_id: value}}; runs a flow didn't appear in are missing
+        """
+        column = self._metric_column(metric)
+        run_ids = list(run_ids)
+        if not run_ids:
+            return {}
+        placeholders = ", ".join("?" * len(run_ids))
+        rows = self._conn.execute(
+            f"SELECT f.key, s.run_id, s.{column} FROM flow_stats s JOIN flows f ON f.id = s.flow_ref"
+            f" WHERE s.run_id IN ({placeholders}) ORDER BY f.id",
+            run_ids,
+        )
+        table: Dict[str, Dict[str, Optional[float]]] = {}
+        for key, run_id, value in rows:
+            table.setdefault(key, {})[run_id] = value
+        return table
+
+    @staticmethod
+    def _metric_column(metric: str) -> str:
+        if metric not in FLOW_METRICS:
+            raise ValueError(f"Unknown flow metric '{metric}' (expected one of {', '.join(FLOW_METRICS)})")
+        return metric
@@ -18,6 +18,7 @@ class NS3Settings:
     use_wsl: bool = True
     wsl_distribution: str = "Ubuntu"
     auto_detect: bool = True
+    mpirun_path: str = "mpirun"  # Launcher for distributed (MPI) simulations
 
 
 @dataclass 
@@ -41,6 +42,10 @@ class UISettings:
     recent_files_max: int = 10
     animation_speed: float = 1.0
     show_packet_animations: bool = True
+    lod_reduced_scale: float = 0.6  # Zoom below which labels and ports are hidden
+    lod_minimal_scale: float = 0.3  # Zoom below which nodes and links are batch-drawn
+    show_fps: bool = False
+    heatmap_window: float = 0.5  # Simulation seconds the link heatmap averages over
 
 
 @dataclass
@@ -282,6 +287,15 @@ class SettingsManager:
         self._settings.ns3.wsl_distribution = value
         self.save()
     
+    @property
+    def mpirun_path(self) -> str:
+        return self._settings.ns3.mpirun_path
+    
+    @mpirun_path.setter
+    def mpirun_path(self, value: str):
+        self._settings.ns3.mpirun_path = value
+        self.save()
+    
     # Path convenience methods
     def get_topologies_dir(self) -> Path:
         """Get the active topologies directory."""
@@ -14,8 +14,10 @@ Usage:
 
 import math
 import os
+from array import array
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Set
 from PyQt6.QtCore import QObject, pyqtSignal
 from PyQt6.QtGui import QPainterPath, QTransform
 from PyQt6.QtCore import QRectF, QPointF
@@ -29,6 +31,192 @@ from models.network import NodeType
 from models.grid_nodes import GridNodeType
 
 
+class ShapeGeometryCache:
+    """
+    Bounded LRU cache of per-shape geometry (paths, connector positions).
+
+    Entries are keyed by (shape_id, kind, *detail); sizes are quantized to
+    SIZE_QUANTUM pixels with quantize() so continuous resizing reuses a
+    bounded set of entries. A per-shape sub-index of keys makes
+    invalidate(shape_id) cost only that shape's entries.
+
+    Usage:
+        key = (shape_id, "path", cache.quantize(width), cache.quantize(height))
+        path = cache.get(key)
+        if path is None:
+            path = cache.put(key, compute())
+    """
+
+    MAX_ENTRIES = 2048
+    SIZE_QUANTUM = 0.5  # Pixels
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._by_shape: Dict[str, Set[tuple]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def quantize(cls, size: float) -> int:
+        """Size bucket of a dimension (multiply by SIZE_QUANTUM for pixels)."""
+        return round(size / cls.SIZE_QUANTUM)
+
+    def get(self, key: tuple) -> Any:
+        """Cached value for key (marking it recently used), or None."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: tuple, value: Any) -> Any:
+        """Store value under key (key[0] is the shape ID) and return it."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._by_shape.setdefault(key[0], set()).add(key)
+        while len(self._entries) > self.max_entries:
+            old_key, _ = self._entries.popitem(last=False)
+            self._unindex(old_key)
+            self.evictions += 1
+        return value
+
+    def _unindex(self, key: tuple):
+        keys = self._by_shape.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_shape[key[0]]
+
+    def invalidate(self, shape_id: str):
+        """Drop all entries of one shape."""
+        for key in self._by_shape.pop(shape_id, ()):
+            del self._entries[key]
+
+    def clear(self):
+        """Drop all entries (counters are kept)."""
+        self._entries.clear()
+        self._by_shape.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PathLookup:
+    """
+    Arc-length lookup table for point queries on a QPainterPath.
+
+    The path is sampled at SAMPLES uniform percents (Qt percents are
+    fractions of arc length), stored as coordinate arrays, and the
+    segments between samples are indexed in a grid of buckets. nearest()
+    only examines segments in the buckets around the query and projects
+    onto them, instead of walking the path with pointAtPercent() per
+    candidate. Segments jumping between subpaths are left out.
+
+    Usage:
+        lookup = PathLookup(path)
+        t, x, y = lookup.nearest(pos.x(), pos.y())
+        x, y = lookup.point_at(t)
+    """
+
+    SAMPLES = 256
+    SEGMENTS_PER_CELL = 4  # Cell size in sample spacings
+    MAX_GRID_SIZE = 64  # Cells per side
+
+    def __init__(self, path: QPainterPath, samples: int = SAMPLES):
+        self.samples = samples
+        self.xs = array('d')
+        self.ys = array('d')
+        for i in range(samples + 1):
+            pt = path.pointAtPercent(i / samples)
+            self.xs.append(pt.x())
+            self.ys.append(pt.y())
+        step = path.length() / samples
+        
+        xs, ys = self.xs, self.ys
+        self.left, self.top = min(xs), min(ys)
+        width, height = max(xs) - self.left, max(ys) - self.top
+        self.cell = max(step * self.SEGMENTS_PER_CELL, max(width, height) / self.MAX_GRID_SIZE, 1e-6)
+        self.cols = int(width / self.cell) + 1
+        self.rows = int(height / self.cell) + 1
+        
+        # Bucket -> indices i of segments (sample i to i + 1) overlapping it
+        self._buckets: Dict[tuple, List[int]] = {}
+        max_chord_sq = (1.5 * step) ** 2 if step > 0 else 0.0
+        for i in range(samples):
+            x0, y0, x1, y1 = xs[i], ys[i], xs[i + 1], ys[i + 1]
+            if (x1 - x0) ** 2 + (y1 - y0) ** 2 > max_chord_sq:
+                continue  # Jump to the next subpath
+            c0, c1 = sorted((self._col(x0), self._col(x1)))
+            r0, r1 = sorted((self._row(y0), self._row(y1)))
+            for col in range(c0, c1 + 1):
+                for row in range(r0, r1 + 1):
+                    self._buckets.setdefault((col, row), []).append(i)
+
+    def _col(self, x: float) -> int:
+        return min(max(int((x - self.left) / self.cell), 0), self.cols - 1)
+
+    def _row(self, y: float) -> int:
+        return min(max(int((y - self.top) / self.cell), 0), self.rows - 1)
+
+    def point_at(self, t: float) -> tuple:
+        """(x, y) at percent t, interpolated between samples."""
+        f = min(max(t, 0.0), 1.0) * self.samples
+        i = min(int(f), self.samples - 1)
+        u = f - i
+        xs, ys = self.xs, self.ys
+        return (xs[i] + (xs[i + 1] - xs[i]) * u, ys[i] + (ys[i + 1] - ys[i]) * u)
+
+    def nearest(self, x: float, y: float) -> tuple:
+        """
+        Nearest point on the path to (x, y).
+
+        Returns:
+            Tuple of (percent, x, y)
+        """
+        xs, ys = self.xs, self.ys
+        col, row = self._col(x), self._row(y)
+        best = (0.0, xs[0], ys[0])
+        best_dist = float('inf')
+        
+        # Search rings of buckets around the query. Buckets in ring r + 1
+        # are at least r cells away, so stop once nothing there can win.
+        for ring in range(max(self.cols, self.rows)):
+            for c in range(col - ring, col + ring + 1):
+                for r in range(row - ring, row + ring + 1):
+                    if max(abs(c - col), abs(r - row)) != ring:
+                        continue
+                    for i in self._buckets.get((c, r), ()):
+                        x0, y0 = xs[i], ys[i]
+                        dx, dy = xs[i + 1] - x0, ys[i + 1] - y0
+                        length_sq = dx * dx + dy * dy
+                        u = ((x - x0) * dx + (y - y0) * dy) / length_sq if length_sq else 0.0
+                        u = min(max(u, 0.0), 1.0)
+                        px, py = x0 + dx * u, y0 + dy * u
+                        dist = (px - x) ** 2 + (py - y) ** 2
+                        if dist < best_dist:
+                            best_dist = dist
+                            best = ((i + u) / self.samples, px, py)
+            if best_dist <= (ring * self.cell) ** 2:
+                break
+        return best
+
+
 class ShapeManager(QObject):
     """
     Singleton service managing shape definitions.
@@ -70,7 +258,7 @@ class ShapeManager(QObject):
     def __init__(self):
         super().__init__()
         self._shapes: Dict[str, ShapeDefinition] = {}
-        self._path_cache: Dict[str, QPainterPath] = {}
+        self._geometry_cache = ShapeGeometryCache()
         self._shapes_dir_override: Path = None  # Optional override for testing
         self._initialized = False
     
@@ -258,6 +446,7 @@ class ShapeManager(QObject):
         shape.is_default = False
         shape.modified = True
         self._shapes[shape.id] = shape
+        self._invalidate_cache(shape.id)
         self._save_user_shapes()
         self.shapeAdded.emit(shape.id)
     
@@ -289,7 +478,11 @@ class ShapeManager(QObject):
         Get the unified QPainterPath for a shape, scaled to given dimensions.
         
         Uses caching for performance. The path is computed by unioning all
-        primitives in the shape definition.
+        primitives in the shape definition. The union only depends on the
+        aspect ratio, so other sizes with the same aspect are scaled from
+        the first one computed instead of re-running the CSG union.
+        Sizes are quantized to ShapeGeometryCache.SIZE_QUANTUM, and the
+        path is built at the quantized size.
         
         Args:
             shape_id: Shape identifier
@@ -302,24 +495,54 @@ class ShapeManager(QObject):
         if not self._initialized:
             self.initialize()
         
-        cache_key = f"{shape_id}_{width:.1f}_{height:.1f}"
-        if cache_key not in self._path_cache:
-            shape = self._shapes.get(shape_id)
-            if shape:
-                self._path_cache[cache_key] = self._compute_unified_path(shape, width, height)
-            else:
-                self._path_cache[cache_key] = self._default_ellipse_path(width, height)
-        return self._path_cache[cache_key]
+        cache = self._geometry_cache
+        qw, qh = cache.quantize(width), cache.quantize(height)
+        key = (shape_id, "path", qw, qh)
+        path = cache.get(key)
+        if path is not None:
+            return path
+        
+        width, height = qw * cache.SIZE_QUANTUM, qh * cache.SIZE_QUANTUM
+        shape = self._shapes.get(shape_id)
+        if shape and width > 0 and height > 0:
+            union_key = (shape_id, "union", round(width / height, 4))
+            union = cache.get(union_key)
+            if union is None:
+                union = cache.put(union_key, (width, self._compute_unified_path(shape, width, height)))
+            base_width, base = union
+            scale = width / base_width
+            path = QTransform.fromScale(scale, scale).map(base)
+        elif shape:
+            path = self._compute_unified_path(shape, width, height)
+        else:
+            path = self._default_ellipse_path(width, height)
+        return cache.put(key, path)
+    
+    def get_path_lookup(self, shape_id: str, width: float, height: float) -> PathLookup:
+        """
+        Get the arc-length lookup table of a shape's unified path.
+        
+        Cached alongside the path, so repeated snapping while dragging
+        only pays for table lookups.
+        """
+        cache = self._geometry_cache
+        key = (shape_id, "lookup", cache.quantize(width), cache.quantize(height))
+        lookup = cache.get(key)
+        if lookup is None:
+            lookup = cache.put(key, PathLookup(self.get_unified_path(shape_id, width, height)))
+        return lookup
     
     def _invalidate_cache(self, shape_id: str):
-        """Clear cached paths for a shape."""
-        keys_to_remove = [k for k in self._path_cache if k.startswith(f"{shape_id}_")]
-        for k in keys_to_remove:
-            del self._path_cache[k]
+        """Clear cached paths and connector positions for a shape."""
+        self._geometry_cache.invalidate(shape_id)
     
     def clear_cache(self):
-        """Clear all cached paths."""
-        self._path_cache.clear()
+        """Clear all cached paths and connector positions."""
+        self._geometry_cache.clear()
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Geometry cache size and hit/miss counters (see ShapeGeometryCache.stats)."""
+        return self._geometry_cache.stats()
     
     def _compute_unified_path(self, shape: ShapeDefinition, w: float, h: float) -> QPainterPath:
         """
@@ -373,34 +596,10 @@ class ShapeManager(QObject):
             return 0.0
         
         # Find the point closest to right-center (3 o'clock position)
-        # For a shape centered at (w/2, h/2), right-center is at (w, h/2)
-        target_x = w
-        target_y = h / 2
-        
-        best_t = 0.0
-        best_dist = float('inf')
-        
-        # Coarse search
-        for i in range(100):
-            t = i / 100.0
-            pt = path.pointAtPercent(t)
-            dist = (pt.x() - target_x)**2 + (pt.y() - target_y)**2
-            if dist < best_dist:
-                best_dist = dist
-                best_t = t
-        
-        # Fine search around best_t
-        for i in range(-10, 11):
-            t = (best_t + i / 1000.0) % 1.0
-            if t < 0:
-                t += 1.0
-            pt = path.pointAtPercent(t)
-            dist = (pt.x() - target_x)**2 + (pt.y() - target_y)**2
-            if dist < best_dist:
-                best_dist = dist
-                best_t = t
-        
-        return best_t
+        # For a shape centered at (w/2, h/2), right-center is at (w, h/2).
+        # The path is used once, so a coarser table is enough.
+        best_t, _, _ = PathLookup(path, samples=128).nearest(w, h / 2)
+        return best_t % 1.0
     
     def update_shape_path_offset(self, shape: ShapeDefinition):
         """
@@ -549,11 +748,9 @@ class ShapeManager(QObject):
         if not shape:
             return (width / 2, 0, 270)  # Default top center
         
-        path = self.get_unified_path(shape_id, width, height)
-        
-        for conn in shape.connectors:
-            if conn.id == connector_id:
-                return self._compute_connector_position(path, conn.edge_position)
+        for conn_id, _label, x, y, angle in self.get_all_connector_positions(shape_id, width, height):
+            if conn_id == connector_id:
+                return (x, y, angle)
         
         return (width / 2, 0, 270)
     
@@ -567,20 +764,23 @@ class ShapeManager(QObject):
             height: Shape height in pixels
             
         Returns:
-            List of (connector_id, x, y, angle_degrees) tuples
+            List of (connector_id, label, x, y, angle_degrees) tuples
         """
         shape = self._shapes.get(shape_id)
         if not shape:
             return []
         
-        path = self.get_unified_path(shape_id, width, height)
-        
-        result = []
-        for conn in shape.connectors:
-            x, y, angle = self._compute_connector_position(path, conn.edge_position)
-            result.append((conn.id, conn.label, x, y, angle))
-        
-        return result
+        cache = self._geometry_cache
+        key = (shape_id, "connectors", cache.quantize(width), cache.quantize(height))
+        positions = cache.get(key)
+        if positions is None:
+            path = self.get_unified_path(shape_id, width, height)
+            positions = []
+            for conn in shape.connectors:
+                x, y, angle = self._compute_connector_position(path, conn.edge_position)
+                positions.append((conn.id, conn.label, x, y, angle))
+            positions = cache.put(key, tuple(positions))
+        return list(positions)
     
     def edge_to_qt_percent(self, edge_position: float, path_start_offset: float) -> float:
         """Convert edge_position (angular) to Qt path percent.
@@ -660,36 +860,14 @@ class ShapeManager(QObject):
         shape = self._shapes.get(shape_id)
         path_start_offset = shape.path_start_offset if shape else 0.0
         
-        path = self.get_unified_path(shape_id, width, height)
-        
-        # Binary search for closest point on path (in Qt percent)
-        best_qt_t = 0.0
-        best_dist = float('inf')
-        
-        # Coarse search
-        for i in range(101):
-            t = i / 100.0
-            pt = path.pointAtPercent(t)
-            dist = (pt.x() - x) ** 2 + (pt.y() - y) ** 2
-            if dist < best_dist:
-                best_dist = dist
-                best_qt_t = t
-        
-        # Fine search around best_qt_t
-        for i in range(-10, 11):
-            t = max(0, min(1, best_qt_t + i / 1000.0))
-            pt = path.pointAtPercent(t)
-            dist = (pt.x() - x) ** 2 + (pt.y() - y) ** 2
-            if dist < best_dist:
-                best_dist = dist
-                best_qt_t = t
-        
-        final_pt = path.pointAtPercent(best_qt_t)
+        # Closest point on path (in Qt percent)
+        lookup = self.get_path_lookup(shape_id, width, height)
+        best_qt_t, snapped_x, snapped_y = lookup.nearest(x, y)
         
         # Convert Qt percent to our edge_position
         edge_position = self.qt_percent_to_edge(best_qt_t, path_start_offset)
         
-        return (edge_position, final_pt.x(), final_pt.y())
+        return (edge_position, snapped_x, snapped_y)
     
     # =========================================================================
     # Export/Import
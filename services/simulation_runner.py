@@ -8,11 +8,18 @@ Supports both native Linux/macOS and Windows WSL execution.
 import os
 import platform
 import shutil
+import sqlite3
 import subprocess
+from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Tuple
 from PyQt6.QtCore import QObject, QProcess, pyqtSignal, QTimer
 
+from services.results_parser import (
+    METRICS_PREFIX, MetricsSnapshot, FLOWSTATS_BINARY_FILE, FLOWSTATS_CSV_FILE, ADDRESS_RANKS_FILE,
+    RANK_RX_FILE
+)
+
 
 def is_windows() -> bool:
     """Check if running on Windows."""
@@ -383,15 +390,19 @@ class SimulationRunner(QObject):
     error = pyqtSignal(str)
     output_line = pyqtSignal(str)
     progress = pyqtSignal(int)  # percentage (0-100)
+    metrics = pyqtSignal(object)  # MetricsSnapshot
     
     def __init__(self, ns3_path: str = "", parent: Optional[QObject] = None):
         super().__init__(parent)
         self._ns3_path = ns3_path
         self._process: Optional[QProcess] = None
         self._output_buffer: List[str] = []
+        self._stdout_partial = ""  # Incomplete last line of the previous read
         self._script_path: Optional[str] = None
         self._output_dir: Optional[str] = None
         self._use_wsl = False
+        self._mpi_ranks = 1
+        self._mpirun_path = "mpirun"
         
     @property
     def ns3_path(self) -> str:
@@ -411,6 +422,23 @@ class SimulationRunner(QObject):
     def use_wsl(self, value: bool):
         self._use_wsl = value
     
+    @property
+    def mpi_ranks(self) -> int:
+        """Number of MPI ranks; scripts are launched with mpirun when > 1."""
+        return self._mpi_ranks
+    
+    @mpi_ranks.setter
+    def mpi_ranks(self, value: int):
+        self._mpi_ranks = max(1, int(value))
+    
+    @property
+    def mpirun_path(self) -> str:
+        return self._mpirun_path
+    
+    @mpirun_path.setter
+    def mpirun_path(self, value: str):
+        self._mpirun_path = value or "mpirun"
+    
     @property
     def is_running(self) -> bool:
         return self._process is not None and self._process.state() == QProcess.ProcessState.Running
@@ -446,6 +474,7 @@ class SimulationRunner(QObject):
         
         # Clear output buffer
         self._output_buffer = []
+        self._stdout_partial = ""
         
         # Store required files for later writing
         self._required_files = required_files or []
@@ -533,7 +562,11 @@ class SimulationRunner(QObject):
         
         # Determine command
         ns3_script = os.path.join(self._ns3_path, "ns3")
-        if os.path.isfile(ns3_script):
+        if self._mpi_ranks > 1:
+            # Distributed run: one Python process per rank under mpirun
+            program = self._mpirun_path
+            args = ["-np", str(self._mpi_ranks), "python3", "scratch/gui_simulation.py"]
+        elif os.path.isfile(ns3_script):
             program = ns3_script
             args = ["run", "scratch/gui_simulation.py"]
         else:
@@ -615,14 +648,16 @@ class SimulationRunner(QObject):
         
         copy_cmd = '\n'.join(copy_commands)
         
-        # Create the bash command to run
-        bash_cmd = f'''
-set -e
-cd {ns3_path_expanded}
-echo "NS-3 Directory: $(pwd)"
-echo "Copying files..."
-{copy_cmd}
-
+        if self._mpi_ranks > 1:
+            run_cmd = f'''
+# Distributed run: one Python process per rank under mpirun
+echo "Running simulation on {self._mpi_ranks} MPI ranks..."
+export PYTHONPATH="$(pwd)/build/bindings/python:$PYTHONPATH"
+export LD_LIBRARY_PATH="$(pwd)/build/lib:$LD_LIBRARY_PATH"
+{self._mpirun_path} -np {self._mpi_ranks} python3 scratch/gui_simulation.py 2>&1
+'''
+        else:
+            run_cmd = '''
 # Try running with ns3 run first
 echo "Attempting to run simulation..."
 if ./ns3 run scratch/gui_simulation.py 2>&1; then
@@ -636,6 +671,15 @@ else
 fi
 '''
         
+        # Create the bash command to run
+        bash_cmd = f'''
+set -e
+cd {ns3_path_expanded}
+echo "NS-3 Directory: $(pwd)"
+echo "Copying files..."
+{copy_cmd}
+{run_cmd}'''
+        
         # Create process
         self._process = QProcess(self)
         
@@ -666,10 +710,31 @@ fi
         """Handle stdout from process."""
         if self._process:
             data = self._process.readAllStandardOutput().data().decode("utf-8", errors="replace")
-            for line in data.splitlines():
-                self._output_buffer.append(line)
-                self.output_line.emit(line)
-                self._parse_progress(line)
+            
+            # Reads can end mid-line; hold the tail back until it's complete
+            lines = (self._stdout_partial + data).split("\n")
+            self._stdout_partial = lines.pop()
+            for line in lines:
+                self._handle_stdout_line(line.rstrip("\r"))
+    
+    def _handle_stdout_line(self, line: str):
+        """Dispatch one complete line of stdout."""
+        # Metric snapshots feed the dashboard, not the console
+        if line.startswith(METRICS_PREFIX):
+            snapshot = MetricsSnapshot.parse_line(line)
+            if snapshot:
+                self.metrics.emit(snapshot)
+            return
+        
+        self._output_buffer.append(line)
+        self.output_line.emit(line)
+        self._parse_progress(line)
+    
+    def _flush_stdout(self):
+        """Handle a final stdout line that had no trailing newline."""
+        if self._stdout_partial:
+            self._handle_stdout_line(self._stdout_partial)
+            self._stdout_partial = ""
     
     def _on_stderr(self):
         """Handle stderr from process."""
@@ -681,6 +746,7 @@ fi
     
     def _on_finished(self, exit_code: int, exit_status: QProcess.ExitStatus):
         """Handle process completion (native)."""
+        self._flush_stdout()
         output = "\n".join(self._output_buffer)
         self.finished.emit(exit_code, output)
         self._process = None
@@ -689,6 +755,7 @@ fi
         """Handle process completion (WSL)."""
         # Copy results from WSL output location if needed
         # The script should have written to the shared folder already
+        self._flush_stdout()
         output = "\n".join(self._output_buffer)
         self.finished.emit(exit_code, output)
         self._process = None
@@ -741,6 +808,7 @@ class NS3SimulationManager(QObject):
     simulationError = pyqtSignal(str)
     outputReceived = pyqtSignal(str)
     progressUpdated = pyqtSignal(int)
+    metricsReceived = pyqtSignal(object)  # MetricsSnapshot
     
     def __init__(self, parent: Optional[QObject] = None):
         super().__init__(parent)
@@ -748,6 +816,8 @@ class NS3SimulationManager(QObject):
         self._use_wsl = False
         self._runner: Optional[SimulationRunner] = None
         self._output_dir = ""
+        self._run_store_path: Optional[str] = None
+        self._run_parameters: dict = {}
         
         # Try to auto-detect ns-3
         detected = NS3Detector.find_ns3_path()
@@ -802,7 +872,10 @@ class NS3SimulationManager(QObject):
         self, 
         script_content: str, 
         output_dir: str,
-        required_files: list = None
+        required_files: list = None,
+        mpi_ranks: int = 1,
+        run_store_path: Optional[str] = None,
+        run_parameters: Optional[dict] = None
     ) -> bool:
         """
         Run a simulation with generated script.
@@ -811,6 +884,9 @@ class NS3SimulationManager(QObject):
             script_content: Generated ns-3 Python script
             output_dir: Directory for output files (always Windows path on Windows)
             required_files: List of additional files to write (from get_required_files)
+            mpi_ranks: Rank count for scripts generated with SimulationConfig.mpi_ranks
+            run_store_path: Run history database to record the results in (see RunStore)
+            run_parameters: Settings stored with the run for comparisons
             
         Returns:
             True if started successfully
@@ -824,15 +900,22 @@ class NS3SimulationManager(QObject):
             return False
         
         self._output_dir = output_dir
+        self._run_store_path = run_store_path
+        self._run_parameters = dict(run_parameters or {})
         
         # Create runner
         self._runner = SimulationRunner(self._ns3_path, self)
         self._runner.use_wsl = self._use_wsl
+        self._runner.mpi_ranks = mpi_ranks
+        if mpi_ranks > 1:
+            from services.settings_manager import get_settings
+            self._runner.mpirun_path = get_settings().mpirun_path
         self._runner.started.connect(self._on_started)
         self._runner.finished.connect(self._on_finished)
         self._runner.error.connect(self._on_error)
         self._runner.output_line.connect(self.outputReceived)
         self._runner.progress.connect(self.progressUpdated)
+        self._runner.metrics.connect(self.metricsReceived)
         
         return self._runner.run_script(script_content, output_dir, required_files)
     
@@ -880,10 +963,54 @@ class NS3SimulationManager(QObject):
                     print(f"Found flowmon at: {path}")
                     break
             
-            if flowmon_path:
+            # Compact flow results (written instead of XML on large runs);
+            # use whichever result file this run wrote most recently
+            compact_path = None
+            for name in (FLOWSTATS_BINARY_FILE, FLOWSTATS_CSV_FILE):
+                path = os.path.join(self._output_dir, name)
+                if os.path.isfile(path) and (
+                    compact_path is None or os.path.getmtime(path) > os.path.getmtime(compact_path)
+                ):
+                    compact_path = path
+            if compact_path and flowmon_path and os.path.getmtime(flowmon_path) > os.path.getmtime(compact_path):
+                compact_path = None
+            
+            result_path = compact_path or flowmon_path
+            if result_path:
                 parser = ResultsParser()
-                results.flow_stats = parser.parse_flow_monitor_xml(flowmon_path)
-                print(f"Parsed {len(results.flow_stats)} flows from XML")
+                if result_path.endswith(FLOWSTATS_BINARY_FILE):
+                    parse = parser.parse_flowstats_binary
+                elif result_path.endswith(FLOWSTATS_CSV_FILE):
+                    parse = parser.parse_flowstats_csv
+                else:
+                    parse = parser.parse_flow_monitor_xml
+                results.flow_stats = parse(result_path)
+                print(f"Parsed {len(results.flow_stats)} flows from {result_path}")
+                
+                # Distributed runs: ranks other than 0 write to rank<N>/ subdirectories
+                import glob
+                rank_paths = sorted(glob.glob(os.path.join(
+                    os.path.dirname(result_path), "rank*", os.path.basename(result_path)
+                )))
+                if rank_paths:
+                    result_dir = os.path.dirname(result_path)
+                    address_ranks = parser.parse_address_ranks(
+                        glob.glob(os.path.join(result_dir, ADDRESS_RANKS_FILE))
+                        + sorted(glob.glob(os.path.join(result_dir, "rank*", ADDRESS_RANKS_FILE)))
+                    )
+                    rank_rx_paths = (
+                        glob.glob(os.path.join(result_dir, RANK_RX_FILE))
+                        + sorted(glob.glob(os.path.join(result_dir, "rank*", RANK_RX_FILE)))
+                    )
+                    results.flow_stats = parser.merge_flow_stats(
+                        [results.flow_stats] + [parse(path) for path in rank_paths], address_ranks,
+                        parser.parse_rank_rx(rank_rx_paths) if rank_rx_paths else None,
+                    )
+                    print(f"Merged results from {len(rank_paths) + 1} ranks")
+                    partial = sum(1 for flow in results.flow_stats if flow.partial)
+                    if partial:
+                        print(f"{partial} flow(s) cross ranks and were not seen received; "
+                              "their rx side and loss are unknown")
             else:
                 # Try parsing from console output as fallback
                 print("Flowmon XML not found, parsing from console output...")
@@ -910,8 +1037,21 @@ class NS3SimulationManager(QObject):
                         results.error_message += f"\n{line}"
                         break
         
+        results.run_id = f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        if self._run_store_path:
+            self._record_run(results)
+        
         self.simulationFinished.emit(results)
     
+    def _record_run(self, results):
+        """Add the run to the run history database; failures don't fail the run."""
+        from services.run_store import RunStore
+        try:
+            with RunStore(self._run_store_path) as store:
+                store.record_run(results.run_id, results, self._run_parameters)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Could not record run in {self._run_store_path}: {e}")
+    
     def _on_error(self, error_msg: str):
         """Handle simulation error."""
         self.simulationError.emit(error_msg)
@@ -13,7 +13,6 @@ Also handles saving to workspace with mirrored directory structure.
 """
 
 import math
-import uuid
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -35,11 +34,6 @@ from services.ns3_script_parser import (
 )
 
 
-def generate_id() -> str:
-    """Generate a short unique ID."""
-    return uuid.uuid4().hex[:8]
-
-
 class TopologyConverter:
     """
     Convert ExtractedTopology to NetworkModel.
@@ -207,7 +201,6 @@ class TopologyConverter:
         """
         # NodeModel.__post_init__ will create default 8 ports for SWITCH type
         node = NodeModel(
-            id=generate_id(),
             name=f"csma_hub_{segment_key}",
             node_type=NodeType.SWITCH,
             description=f"Virtual hub representing CSMA shared medium '{segment_key}' (not a real ns-3 node)",
@@ -234,7 +227,6 @@ class TopologyConverter:
         
         # Create node - NodeModel.__post_init__ will create default ports
         node = NodeModel(
-            id=generate_id(),
             name=name,
             node_type=node_type,
             medium_type=medium_type,
@@ -298,7 +290,6 @@ class TopologyConverter:
         delay = ext_link.delay or "1ms"
         
         link = LinkModel(
-            id=generate_id(),
             source_node_id=source_id,
             target_node_id=target_id,
             source_port_id=source_port.id,
@@ -372,18 +363,13 @@ class TopologyConverter:
                     return
                 
                 # Check if already connected
-                already_connected = any(
-                    (l.source_node_id == host_id and l.target_node_id == switch_id) or
-                    (l.target_node_id == host_id and l.source_node_id == switch_id)
-                    for l in network.links.values()
-                )
+                already_connected = network.find_link_between(host_id, switch_id) is not None
                 
                 if not already_connected:
                     host_port = self._find_available_port(host_node, network) or self._add_port(host_node)
                     switch_port = self._find_available_port(switch_node, network) or self._add_port(switch_node)
                     
                     link = LinkModel(
-                        id=generate_id(),
                         source_node_id=host_id,
                         target_node_id=switch_id,
                         source_port_id=host_port.id,
@@ -408,11 +394,7 @@ class TopologyConverter:
                         continue
                     
                     # Check if already connected to this switch
-                    already_connected = any(
-                        (l.source_node_id == node_id and l.target_node_id == switch_id) or
-                        (l.target_node_id == node_id and l.source_node_id == switch_id)
-                        for l in network.links.values()
-                    )
+                    already_connected = network.find_link_between(node_id, switch_id) is not None
                     
                     if already_connected:
                         continue
@@ -422,7 +404,6 @@ class TopologyConverter:
                     switch_port = self._find_available_port(switch_node, network) or self._add_port(switch_node)
                     
                     link = LinkModel(
-                        id=generate_id(),
                         source_node_id=node_id,
                         target_node_id=switch_id,
                         source_port_id=node_port.id,
@@ -480,14 +461,8 @@ class TopologyConverter:
     
     def _add_port(self, node: NodeModel) -> PortConfig:
         """Add a new port to a node."""
-        port_num = len(node.ports)
-        port = PortConfig(
-            id=generate_id(),
-            port_number=port_num,
-            port_name=f"gi{port_num}",
-            port_type=PortType.GIGABIT_ETHERNET,
-        )
-        node.ports.append(port)
+        port = node.add_port(PortType.GIGABIT_ETHERNET)
+        port.port_name = f"gi{port.port_number}"
         return port
     
     def _apply_layout(self, network: NetworkModel, extracted: ExtractedTopology):
@@ -563,8 +538,6 @@ class TopologyConverter:
         # This is a simplified implementation
         # In practice, we'd need to track which devices correspond to which links
         
-        subnet_counter = 1
-        
         for link in network.links.values():
             source_node = network.nodes.get(link.source_node_id)
             target_node = network.nodes.get(link.target_node_id)
@@ -587,16 +560,18 @@ class TopologyConverter:
                     break
             
             if source_port and target_port:
+                if source_port.ip_address and target_port.ip_address:
+                    continue
+                
                 # Assign IPs if not already set
+                subnet = network.ipam.allocate_p2p(link.id)
                 if not source_port.ip_address:
-                    source_port.ip_address = f"10.1.{subnet_counter}.1"
-                    source_port.netmask = "255.255.255.0"
+                    source_port.ip_address = subnet.host(1)
+                    source_port.netmask = subnet.netmask
                 
                 if not target_port.ip_address:
-                    target_port.ip_address = f"10.1.{subnet_counter}.2"
-                    target_port.netmask = "255.255.255.0"
-                
-                subnet_counter += 1
+                    target_port.ip_address = subnet.host(2)
+                    target_port.netmask = subnet.netmask
     
     def _convert_applications_to_flows(
         self,
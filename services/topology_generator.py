@@ -0,0 +1,419 @@
+"""
+Parametric synthetic topology generators.
+
+Builds large, realistic networks directly as NetworkModels for scale
+testing, capacity planning and benchmarks, using the bulk-build path
+(NetworkModel.batch()). Every generator is deterministic for a given seed.
+
+Topologies:
+- fat_tree(k): k-ary data-center fat-tree (core / aggregation / edge / hosts)
+- leaf_spine(spines, leaves, hosts_per_leaf): two-tier Clos fabric
+- mesh(rows, cols, torus): 2-D grid, optionally with wrap-around links
+- barabasi_albert(n, m): scale-free graph by preferential attachment
+- waxman(n, alpha, beta): random geometric graph (Waxman 1988)
+- utility_grid(...): control center -> regional WAN -> substations -> RTUs/IEDs
+"""
+
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Optional
+
+from models import (
+    NetworkModel, NodeModel, NodeType, Position,
+    GridNodeModel, GridNodeType, GridLinkModel, GridLinkType, SubstationModel
+)
+
+
+# Canvas spacing between neighbouring nodes in generated layouts
+LAYOUT_SPACING = 80.0
+
+# Default mix of substation WAN link types for utility_grid (weights)
+DEFAULT_WAN_MIX = {
+    GridLinkType.FIBER: 0.6,
+    GridLinkType.MICROWAVE: 0.25,
+    GridLinkType.CELLULAR_LTE: 0.1,
+    GridLinkType.SATELLITE_GEO: 0.05,
+}
+
+
+@dataclass
+class GeneratedTopology:
+    """A generated network plus the parameters that produced it."""
+    kind: str
+    network: NetworkModel
+    params: dict = field(default_factory=dict)
+    substations: list[SubstationModel] = field(default_factory=list)  # utility_grid only
+
+    @property
+    def node_count(self) -> int:
+        return len(self.network.nodes)
+
+    @property
+    def link_count(self) -> int:
+        return len(self.network.links)
+
+
+class TopologyGenerator:
+    """
+    Generates synthetic topologies.
+
+    Usage:
+        topo = TopologyGenerator(seed=7).fat_tree(k=8)
+        network = topo.network
+
+    Each call builds a fresh NetworkModel; pass assign_ips=False to skip
+    address assignment when only the graph matters.
+    """
+
+    def __init__(self, seed: int = 0, assign_ips: bool = True):
+        self.seed = seed
+        self.assign_ips = assign_ips
+
+    def _rng(self) -> random.Random:
+        # Fresh per call so each topology depends only on (seed, params)
+        return random.Random(self.seed)
+
+    # ------------------------------------------------------------------
+    # Data-center fabrics
+    # ------------------------------------------------------------------
+
+    def fat_tree(self, k: int, data_rate: str = "10Gbps", delay: str = "0.01ms") -> GeneratedTopology:
+        """
+        k-ary fat-tree: (k/2)^2 core, k pods of k/2 aggregation + k/2 edge
+        routers, and k/2 hosts per edge router (k^3/4 hosts).
+        """
+        if k < 2 or k % 2:
+            raise ValueError(f"Fat-tree k must be even and >= 2, got {k}")
+        half = k // 2
+        network = NetworkModel()
+        with network.batch(assign_ips=self.assign_ips) as batch:
+            width = k * half * half  # hosts per row
+            core = [
+                batch.add_node(NodeType.ROUTER, self._tier(i, (half * half), width, 0), name=f"core{i}")
+                for i in range(half * half)
+            ]
+            for pod in range(k):
+                aggs = [
+                    batch.add_node(NodeType.ROUTER, self._tier(pod * half + i, k * half, width, 1),
+                                   name=f"agg{pod}_{i}")
+                    for i in range(half)
+                ]
+                edges = [
+                    batch.add_node(NodeType.ROUTER, self._tier(pod * half + i, k * half, width, 2),
+                                   name=f"edge{pod}_{i}")
+                    for i in range(half)
+                ]
+                for i, agg in enumerate(aggs):
+                    for j in range(half):
+                        batch.add_link(agg.id, core[i * half + j].id, data_rate=data_rate, delay=delay)
+                    for edge in edges:
+                        batch.add_link(agg.id, edge.id, data_rate=data_rate, delay=delay)
+                for i, edge in enumerate(edges):
+                    for h in range(half):
+                        index = (pod * half + i) * half + h
+                        host = batch.add_node(NodeType.HOST, self._tier(index, width, width, 3),
+                                              name=f"host{pod}_{i}_{h}")
+                        batch.add_link(edge.id, host.id, data_rate=data_rate, delay=delay)
+        return GeneratedTopology("fat_tree", network, {"k": k})
+
+    def leaf_spine(
+        self,
+        spines: int,
+        leaves: int,
+        hosts_per_leaf: int = 0,
+        data_rate: str = "40Gbps",
+        delay: str = "0.01ms"
+    ) -> GeneratedTopology:
+        """Two-tier Clos: every leaf connects to every spine."""
+        if spines < 1 or leaves < 1 or hosts_per_leaf < 0:
+            raise ValueError("Leaf-spine needs at least one spine and one leaf")
+        network = NetworkModel()
+        width = max(leaves * max(hosts_per_leaf, 1), spines)
+        with network.batch(assign_ips=self.assign_ips) as batch:
+            spine_nodes = [
+                batch.add_node(NodeType.ROUTER, self._tier(i, spines, width, 0), name=f"spine{i}")
+                for i in range(spines)
+            ]
+            for i in range(leaves):
+                leaf = batch.add_node(NodeType.ROUTER, self._tier(i, leaves, width, 1), name=f"leaf{i}")
+                for spine in spine_nodes:
+                    batch.add_link(leaf.id, spine.id, data_rate=data_rate, delay=delay)
+                for h in range(hosts_per_leaf):
+                    host = batch.add_node(
+                        NodeType.HOST, self._tier(i * hosts_per_leaf + h, width, width, 2),
+                        name=f"host{i}_{h}"
+                    )
+                    batch.add_link(leaf.id, host.id, data_rate=data_rate, delay=delay)
+        return GeneratedTopology(
+            "leaf_spine", network,
+            {"spines": spines, "leaves": leaves, "hosts_per_leaf": hosts_per_leaf}
+        )
+
+    # ------------------------------------------------------------------
+    # Regular and random graphs
+    # ------------------------------------------------------------------
+
+    def mesh(
+        self,
+        rows: int,
+        cols: int,
+        torus: bool = False,
+        data_rate: str = "1Gbps",
+        delay: str = "1ms"
+    ) -> GeneratedTopology:
+        """2-D grid of routers; torus adds wrap-around links."""
+        if rows < 1 or cols < 1:
+            raise ValueError("Mesh needs at least one row and column")
+        network = NetworkModel()
+        with network.batch(assign_ips=self.assign_ips) as batch:
+            grid = [
+                [
+                    batch.add_node(NodeType.ROUTER, Position(c * LAYOUT_SPACING, r * LAYOUT_SPACING),
+                                   name=f"r{r}_{c}")
+                    for c in range(cols)
+                ]
+                for r in range(rows)
+            ]
+            for r in range(rows):
+                for c in range(cols):
+                    right = (c + 1) % cols if torus else c + 1
+                    down = (r + 1) % rows if torus else r + 1
+                    # Wrap links on a 1- or 2-wide axis would duplicate existing ones
+                    if right < cols and right != c and (cols > 2 or right > c):
+                        batch.add_link(grid[r][c].id, grid[r][right].id, data_rate=data_rate, delay=delay)
+                    if down < rows and down != r and (rows > 2 or down > r):
+                        batch.add_link(grid[r][c].id, grid[down][c].id, data_rate=data_rate, delay=delay)
+        return GeneratedTopology("torus" if torus else "mesh", network,
+                                 {"rows": rows, "cols": cols, "torus": torus})
+
+    def barabasi_albert(self, n: int, m: int = 2, data_rate: str = "1Gbps", delay: str = "2ms") -> GeneratedTopology:
+        """
+        Scale-free graph: each new node links to m existing nodes chosen
+        with probability proportional to their degree.
+        """
+        if m < 1 or n <= m:
+            raise ValueError(f"Barabasi-Albert needs n > m >= 1, got n={n}, m={m}")
+        rng = self._rng()
+        network = NetworkModel()
+        with network.batch(assign_ips=self.assign_ips) as batch:
+            nodes = [batch.add_node(NodeType.ROUTER, name=f"r{i}") for i in range(n)]
+            # Each endpoint appears once per incident link (degree-weighted sampling)
+            endpoints: list[int] = []
+            for i in range(1, m + 1):  # Seed star so every early node has degree > 0
+                batch.add_link(nodes[0].id, nodes[i].id, data_rate=data_rate, delay=delay)
+                endpoints += [0, i]
+            for i in range(m + 1, n):
+                targets: set[int] = set()
+                while len(targets) < m:
+                    targets.add(endpoints[rng.randrange(len(endpoints))])
+                for t in sorted(targets):
+                    batch.add_link(nodes[i].id, nodes[t].id, data_rate=data_rate, delay=delay)
+                    endpoints += [i, t]
+            self._circle_layout(nodes)
+        return GeneratedTopology("barabasi_albert", network, {"n": n, "m": m, "seed": self.seed})
+
+    def waxman(
+        self,
+        n: int,
+        alpha: float = 0.15,
+        beta: float = 0.4,
+        connect: bool = True,
+        data_rate: str = "1Gbps",
+        ms_per_unit: float = 20.0
+    ) -> GeneratedTopology:
+        """
+        Waxman random graph on the unit square: u and v are linked with
+        probability beta * exp(-d(u,v) / (alpha * L)), L = max distance.
+
+        Link delay is proportional to distance. With connect=True,
+        components are joined by their shortest possible link. Checks
+        all pairs, so it is meant for up to a few thousand nodes.
+        """
+        if n < 1 or not 0 < alpha or not 0 < beta <= 1:
+            raise ValueError("Waxman needs n >= 1, alpha > 0 and 0 < beta <= 1")
+        rng = self._rng()
+        points = [(rng.random(), rng.random()) for _ in range(n)]
+        scale = alpha * math.sqrt(2)
+
+        def delay(a, b):
+            return f"{max(math.dist(points[a], points[b]) * ms_per_unit, 0.001):.3f}ms"
+
+        pairs = []
+        for a in range(n):
+            for b in range(a + 1, n):
+                if rng.random() < beta * math.exp(-math.dist(points[a], points[b]) / scale):
+                    pairs.append((a, b))
+        if connect:
+            pairs += self._join_components(n, pairs, points)
+
+        network = NetworkModel()
+        with network.batch(assign_ips=self.assign_ips) as batch:
+            size = math.sqrt(n) * LAYOUT_SPACING
+            nodes = [
+                batch.add_node(NodeType.ROUTER, Position(x * size, y * size), name=f"r{i}")
+                for i, (x, y) in enumerate(points)
+            ]
+            for a, b in pairs:
+                batch.add_link(nodes[a].id, nodes[b].id, data_rate=data_rate, delay=delay(a, b))
+        return GeneratedTopology("waxman", network,
+                                 {"n": n, "alpha": alpha, "beta": beta, "seed": self.seed})
+
+    # ------------------------------------------------------------------
+    # Utility grid
+    # ------------------------------------------------------------------
+
+    def utility_grid(
+        self,
+        substations: int,
+        rtus_per_substation: int = 2,
+        ieds_per_substation: int = 4,
+        regions: int = 4,
+        wan_mix: Optional[dict[GridLinkType, float]] = None,
+        backup_control_center: bool = True
+    ) -> GeneratedTopology:
+        """
+        SCADA network: control center(s) on a core router, regional
+        routers in a fiber ring, and substations hanging off their region.
+
+        Each substation has a gateway router and a LAN switch with its
+        RTUs and IEDs (Ethernet LAN). The gateway's WAN link type is drawn
+        from wan_mix (weights per GridLinkType).
+        """
+        if substations < 1 or regions < 1:
+            raise ValueError("Utility grid needs at least one substation and region")
+        rng = self._rng()
+        mix = wan_mix or DEFAULT_WAN_MIX
+        wan_types, wan_weights = list(mix), list(mix.values())
+        regions = min(regions, substations)
+        per_region = math.ceil(substations / regions)
+        devices = rtus_per_substation + ieds_per_substation
+        column = (devices + 2) * LAYOUT_SPACING * 0.5  # Width of one substation column
+
+        network = NetworkModel()
+        subs: list[SubstationModel] = []
+        with network.batch(assign_ips=self.assign_ips) as batch:
+            def grid_node(grid_type, position, name):
+                return batch.add_nodes([GridNodeModel(grid_type=grid_type, position=position, name=name)])[0]
+
+            def grid_link(a, b, link_type):
+                return batch.add_links([GridLinkModel(
+                    source_node_id=a.id, target_node_id=b.id, grid_link_type=link_type
+                )])[0]
+
+            center_x = substations * column / 2
+            core = grid_node(GridNodeType.COMM_ROUTER, Position(center_x, LAYOUT_SPACING), "core_router")
+            control = grid_node(GridNodeType.CONTROL_CENTER, Position(center_x - LAYOUT_SPACING, 0), "control_center")
+            grid_link(control, core, GridLinkType.FIBER)
+            if backup_control_center:
+                backup = grid_node(GridNodeType.BACKUP_CONTROL_CENTER,
+                                   Position(center_x + LAYOUT_SPACING, 0), "backup_control_center")
+                grid_link(backup, core, GridLinkType.FIBER)
+
+            region_routers = []
+            for r in range(regions):
+                x = (r * per_region + per_region / 2) * column
+                router = grid_node(GridNodeType.COMM_ROUTER, Position(x, 3 * LAYOUT_SPACING), f"region{r}_router")
+                grid_link(router, core, GridLinkType.FIBER)
+                region_routers.append(router)
+            ring = list(zip(region_routers, region_routers[1:]))
+            if regions > 2:
+                ring.append((region_routers[-1], region_routers[0]))
+            for a, b in ring:
+                grid_link(a, b, GridLinkType.FIBER)
+
+            for s in range(substations):
+                x = s * column
+                sub = SubstationModel(name=f"substation{s}", region=f"region{s // per_region}",
+                                      position_x=x, position_y=5 * LAYOUT_SPACING)
+                gateway = grid_node(GridNodeType.GATEWAY, Position(x, 5 * LAYOUT_SPACING), f"sub{s}_gateway")
+                switch = grid_node(GridNodeType.COMM_SWITCH, Position(x, 6 * LAYOUT_SPACING), f"sub{s}_switch")
+                wan_type = rng.choices(wan_types, wan_weights)[0]
+                grid_link(gateway, region_routers[s // per_region], wan_type)
+                grid_link(gateway, switch, GridLinkType.ETHERNET_LAN)
+                sub.add_device(gateway)
+                sub.primary_comm_path = wan_type.name.lower()
+
+                kinds = [GridNodeType.RTU] * rtus_per_substation + [GridNodeType.IED] * ieds_per_substation
+                for d, grid_type in enumerate(kinds):
+                    position = Position(x + (d - devices / 2) * LAYOUT_SPACING * 0.5, 7 * LAYOUT_SPACING)
+                    device = grid_node(grid_type, position, f"sub{s}_{grid_type.name.lower()}{d}")
+                    grid_link(device, switch, GridLinkType.ETHERNET_LAN)
+                    sub.add_device(device)
+                subs.append(sub)
+
+        return GeneratedTopology(
+            "utility_grid", network,
+            {"substations": substations, "rtus_per_substation": rtus_per_substation,
+             "ieds_per_substation": ieds_per_substation, "regions": regions, "seed": self.seed},
+            substations=subs
+        )
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _tier(index: int, count: int, width: int, row: int) -> Position:
+        """Center `count` nodes of a tier under a row `width` nodes wide."""
+        step = width / max(count, 1) * LAYOUT_SPACING
+        return Position((index + 0.5) * step, row * LAYOUT_SPACING * 3)
+
+    @staticmethod
+    def _circle_layout(nodes: list[NodeModel]):
+        radius = max(len(nodes) * LAYOUT_SPACING / (2 * math.pi), LAYOUT_SPACING)
+        for i, node in enumerate(nodes):
+            angle = 2 * math.pi * i / len(nodes)
+            node.position = Position(radius * math.cos(angle), radius * math.sin(angle))
+
+    @staticmethod
+    def _join_components(n: int, pairs: list[tuple[int, int]], points) -> list[tuple[int, int]]:
+        """Extra pairs linking every component to the one containing node 0."""
+        parent = list(range(n))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for a, b in pairs:
+            parent[find(a)] = find(b)
+        components: dict[int, list[int]] = {}
+        for i in range(n):
+            components.setdefault(find(i), []).append(i)
+
+        groups = list(components.values())
+        joined, extra = list(groups[0]), []
+        for group in groups[1:]:
+            a, b = min(
+                ((u, v) for u in group for v in joined),
+                key=lambda uv: math.dist(points[uv[0]], points[uv[1]])
+            )
+            extra.append((a, b))
+            joined += group
+        return extra
+
+
+# Registry for benchmarks and scripted use: name -> generator method
+TOPOLOGY_KINDS = {
+    "fat_tree": TopologyGenerator.fat_tree,
+    "leaf_spine": TopologyGenerator.leaf_spine,
+    "mesh": TopologyGenerator.mesh,
+    "torus": lambda gen, rows, cols, **kw: gen.mesh(rows, cols, torus=True, **kw),
+    "barabasi_albert": TopologyGenerator.barabasi_albert,
+    "waxman": TopologyGenerator.waxman,
+    "utility_grid": TopologyGenerator.utility_grid,
+}
+
+
+def generate_topology(kind: str, seed: int = 0, **params) -> GeneratedTopology:
+    """
+    Generate a topology by name, e.g. generate_topology("fat_tree", k=4).
+
+    Raises:
+        ValueError: For an unknown kind or invalid parameters
+    """
+    if kind not in TOPOLOGY_KINDS:
+        raise ValueError(f"Unknown topology kind: {kind} (choose from {', '.join(TOPOLOGY_KINDS)})")
+    return TOPOLOGY_KINDS[kind](TopologyGenerator(seed=seed), **params)
@@ -0,0 +1,323 @@
+"""
+Topology partitioning for distributed (MPI) simulation.
+
+Splits a NetworkModel into balanced ranks for ns-3's
+DistributedSimulatorImpl. Only point-to-point links can span ranks
+(ns-3 replaces them with PointToPointRemoteChannel), so CSMA segments,
+switch connections and the shared WiFi channel are kept on one rank.
+
+Ranks synchronise once per lookahead window, which equals the smallest
+delay of any cut link, so high-delay links (satellite, long-haul WAN)
+are preferred as cut points.
+
+Algorithm:
+1. Contract nodes joined by links that can't be cut (union-find)
+2. Grow each rank from a seed by strongest connection (greedy graph growing)
+3. Refine with boundary moves that lower the cut cost (Fiduccia-Mattheyses style)
+"""
+
+import heapq
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from models import NetworkModel, LinkModel, NodeType, ChannelType, GridLinkModel, GridLinkType
+
+
+# Relative cost of cutting a high-latency link versus its delay-based cost
+HIGH_LATENCY_CUT_DISCOUNT = 0.1
+
+# Allowed rank size above the ideal (total / ranks)
+DEFAULT_IMBALANCE = 0.1
+
+_TIME_UNITS = {"s": 1.0, "ms": 1e-3, "us": 1e-6, "ns": 1e-9, "ps": 1e-12}
+_TIME_PATTERN = re.compile(r"^\s*([0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)\s*(s|ms|us|ns|ps)?\s*$")
+
+
+def parse_time_seconds(value: str) -> float:
+    """Convert an ns-3 time string ("2ms", "0.5s", "100us") to seconds."""
+    match = _TIME_PATTERN.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid time value: {value}")
+    return float(match.group(1)) * _TIME_UNITS[match.group(2) or "s"]
+
+
+def link_is_cuttable(network: NetworkModel, link: LinkModel) -> bool:
+    """
+    Check if a link may connect nodes on different ranks.
+
+    Mirrors the channel choice of the script generators: only links
+    generated with PointToPointHelper can become remote channels.
+    """
+    source = network.nodes.get(link.source_node_id)
+    target = network.nodes.get(link.target_node_id)
+    if source is None or target is None:
+        return False
+
+    wireless = (NodeType.STATION, NodeType.ACCESS_POINT)
+    if link.channel_type == ChannelType.WIFI or (
+        source.node_type in wireless and target.node_type in wireless
+    ):
+        return False
+
+    if isinstance(link, GridLinkModel):
+        return link.grid_link_type != GridLinkType.ETHERNET_LAN
+
+    if NodeType.SWITCH in (source.node_type, target.node_type):
+        return False
+    return link.channel_type != ChannelType.CSMA
+
+
+def link_cut_cost(link: LinkModel) -> float:
+    """
+    Cost of cutting a link; lower for links that give more lookahead.
+
+    Links with unparseable delays are treated as zero-delay (expensive).
+    """
+    try:
+        delay_ms = parse_time_seconds(link.delay) * 1000
+    except ValueError:
+        delay_ms = 0.0
+    cost = 1.0 / (1.0 + delay_ms)
+    if isinstance(link, GridLinkModel) and link.is_high_latency:
+        cost *= HIGH_LATENCY_CUT_DISCOUNT
+    return cost
+
+
+@dataclass
+class TopologyPartition:
+    """Assignment of nodes to MPI ranks."""
+    ranks: int
+    node_ranks: dict[str, int] = field(default_factory=dict)
+    cut_links: list[str] = field(default_factory=list)
+    cut_cost: float = 0.0
+    lookahead_s: Optional[float] = None  # Smallest cut link delay (None if nothing is cut)
+
+    def rank_of(self, node_id: str) -> int:
+        """Get the rank that owns a node."""
+        return self.node_ranks.get(node_id, 0)
+
+    @property
+    def rank_sizes(self) -> list[int]:
+        """Number of nodes on each rank."""
+        sizes = [0] * self.ranks
+        for rank in self.node_ranks.values():
+            sizes[rank] += 1
+        return sizes
+
+    @property
+    def imbalance(self) -> float:
+        """Largest rank size relative to a perfect split (1.0 = perfect)."""
+        if not self.node_ranks:
+            return 1.0
+        return max(self.rank_sizes) * self.ranks / len(self.node_ranks)
+
+
+class _UnionFind:
+    def __init__(self, items):
+        self._parent = {item: item for item in items}
+
+    def find(self, item):
+        parent = self._parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self._parent[rb] = ra
+
+
+class TopologyPartitioner:
+    """
+    Partitions a NetworkModel into MPI ranks.
+
+    Usage:
+        partition = TopologyPartitioner().partition(network, ranks=4)
+        rank = partition.rank_of(node.id)
+    """
+
+    def __init__(self, imbalance: float = DEFAULT_IMBALANCE, refine_passes: int = 8):
+        self.imbalance = imbalance
+        self.refine_passes = refine_passes
+
+    def partition(self, network: NetworkModel, ranks: int) -> TopologyPartition:
+        """
+        Assign every node to one of `ranks` ranks.
+
+        Raises:
+            ValueError: If there are fewer indivisible node groups than ranks
+        """
+        if ranks < 1:
+            raise ValueError(f"Rank count must be at least 1, got {ranks}")
+
+        node_ids = list(network.nodes)
+        if ranks == 1 or not node_ids:
+            return self._result(network, ranks, {node_id: 0 for node_id in node_ids})
+
+        groups, weights, edges = self._contract(network)
+        if len(groups) < ranks:
+            raise ValueError(
+                f"Cannot split {len(node_ids)} nodes into {ranks} ranks: "
+                f"only {len(groups)} group(s) are joined by point-to-point links"
+            )
+
+        assignment = self._grow(weights, edges, ranks)
+        self._refine(weights, edges, assignment, ranks)
+
+        node_ranks = {}
+        for group, members in groups.items():
+            for node_id in members:
+                node_ranks[node_id] = assignment[group]
+        return self._result(network, ranks, node_ranks)
+
+    def _contract(self, network: NetworkModel):
+        """Merge nodes that must share a rank; build the weighted group graph."""
+        uf = _UnionFind(network.nodes)
+
+        wireless = [
+            node_id for node_id, node in network.nodes.items()
+            if node.node_type in (NodeType.STATION, NodeType.ACCESS_POINT)
+        ]
+        for node_id in wireless[1:]:
+            uf.union(wireless[0], node_id)  # All WiFi nodes share one channel
+
+        cuttable = []
+        for link in network.links.values():
+            if link.source_node_id not in network.nodes or link.target_node_id not in network.nodes:
+                continue
+            if link_is_cuttable(network, link):
+                cuttable.append(link)
+            else:
+                uf.union(link.source_node_id, link.target_node_id)
+
+        groups: dict[str, list[str]] = {}
+        for node_id in network.nodes:
+            groups.setdefault(uf.find(node_id), []).append(node_id)
+        weights = {group: len(members) for group, members in groups.items()}
+
+        edges: dict[str, dict[str, float]] = {group: {} for group in groups}
+        for link in cuttable:
+            a, b = uf.find(link.source_node_id), uf.find(link.target_node_id)
+            if a == b:
+                continue
+            cost = link_cut_cost(link)
+            edges[a][b] = edges[a].get(b, 0.0) + cost
+            edges[b][a] = edges[b].get(a, 0.0) + cost
+
+        return groups, weights, edges
+
+    def _grow(self, weights, edges, ranks) -> dict[str, int]:
+        """Grow ranks one at a time from unassigned seeds."""
+        total = sum(weights.values())
+        assignment: dict[str, int] = {}
+        order = list(weights)  # Deterministic seed order
+        assigned_weight = 0
+
+        for rank in range(ranks - 1):
+            remaining_ranks = ranks - rank
+            target = (total - assigned_weight) / remaining_ranks
+
+            seed = self._peripheral(next(g for g in order if g not in assignment), edges, assignment)
+            size = 0
+            pushes = 0  # FIFO tie-break keeps equal-cost growth breadth-first
+            frontier = [(0.0, pushes, seed)]
+            connection: dict[str, float] = {}
+            # Leave at least one group for each later rank
+            while frontier and size < target and len(order) - len(assignment) > remaining_ranks - 1:
+                _, _, group = heapq.heappop(frontier)
+                if group in assignment:
+                    continue
+                if size and size + weights[group] > target * (1 + self.imbalance):
+                    continue
+                assignment[group] = rank
+                size += weights[group]
+                assigned_weight += weights[group]
+                for neighbor, cost in edges[group].items():
+                    if neighbor not in assignment:
+                        connection[neighbor] = connection.get(neighbor, 0.0) + cost
+                        pushes += 1
+                        heapq.heappush(frontier, (-connection[neighbor], pushes, neighbor))
+                if not frontier and size < target:
+                    # Disconnected component: continue from the next unassigned group
+                    rest = [g for g in order if g not in assignment]
+                    if len(rest) > remaining_ranks - 1:
+                        frontier.append((0.0, pushes, rest[0]))
+
+        for group in order:
+            assignment.setdefault(group, ranks - 1)
+        return assignment
+
+    def _peripheral(self, start, edges, assignment):
+        """Find a group far from start (last one reached by BFS) to seed a rank."""
+        seen = {start}
+        queue = [start]
+        for group in queue:
+            for neighbor in edges[group]:
+                if neighbor not in seen and neighbor not in assignment:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        return queue[-1]
+
+    def _refine(self, weights, edges, assignment, ranks):
+        """Move boundary groups to neighbouring ranks while that lowers the cut."""
+        total = sum(weights.values())
+        limit = total / ranks * (1 + self.imbalance)
+        sizes = [0] * ranks
+        counts = [0] * ranks
+        for group, rank in assignment.items():
+            sizes[rank] += weights[group]
+            counts[rank] += 1
+
+        for _ in range(self.refine_passes):
+            moved = False
+            for group, rank in list(assignment.items()):
+                if counts[rank] == 1:
+                    continue  # Never empty a rank
+                links = {}
+                for neighbor, cost in edges[group].items():
+                    other = assignment[neighbor]
+                    links[other] = links.get(other, 0.0) + cost
+                internal = links.get(rank, 0.0)
+                best, best_gain = rank, 1e-12
+                for other, external in links.items():
+                    if other == rank or sizes[other] + weights[group] > limit:
+                        continue
+                    gain = external - internal
+                    if gain > best_gain:
+                        best, best_gain = other, gain
+                if best != rank:
+                    assignment[group] = best
+                    sizes[rank] -= weights[group]
+                    sizes[best] += weights[group]
+                    counts[rank] -= 1
+                    counts[best] += 1
+                    moved = True
+            if not moved:
+                break
+
+    def _result(self, network: NetworkModel, ranks: int, node_ranks: dict[str, int]) -> TopologyPartition:
+        partition = TopologyPartition(ranks=ranks, node_ranks=node_ranks)
+        for link_id, link in network.links.items():
+            a = node_ranks.get(link.source_node_id)
+            b = node_ranks.get(link.target_node_id)
+            if a is None or b is None or a == b:
+                continue
+            partition.cut_links.append(link_id)
+            partition.cut_cost += link_cut_cost(link)
+            try:
+                delay = parse_time_seconds(link.delay)
+            except ValueError:
+                delay = 0.0
+            if partition.lookahead_s is None or delay < partition.lookahead_s:
+                partition.lookahead_s = delay
+        return partition
+
+
+def partition_network(network: NetworkModel, ranks: int) -> TopologyPartition:
+    """Partition a network with default settings."""
+    return TopologyPartitioner().partition(network, ranks)
@@ -0,0 +1,420 @@
+"""
+Pre-run topology validation.
+
+Finds misconfigurations that would otherwise only show up after a full
+ns-3 run fails or reports zero throughput:
+
+- Islands: nodes not connected to the rest of the topology
+- Flows whose endpoints were deleted or can't reach each other
+- The same IP address on two interfaces
+- The same subnet on two separate segments
+- Malformed addresses
+
+Connectivity comes from NetworkModel's union-find component index, so
+a reachability check costs O(α(n)) and the index is only rebuilt after
+deletions. Listing the members of each island costs O(n), so live
+validation only counts islands (list_islands=False). Addresses come from an AddressIndex: by-IP and by-subnet hash
+maps kept current from the model's change listeners, so an edit costs
+the ports of the nodes it touched and a check only visits conflicts.
+"""
+
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Hashable, Iterable, Iterator, Optional
+
+from models import LinkModel, NetworkModel, NodeType
+from models.connectivity import DisjointSet
+from models.ipam import ip_to_int, netmask_to_prefix, int_to_ip
+
+
+# Island members listed in a message before "and N more"
+MAX_LISTED_NODES = 5
+
+
+class IssueSeverity(Enum):
+    """How serious a validation issue is."""
+    ERROR = "error"      # Blocks the simulation run
+    WARNING = "warning"  # Shown, but the run may proceed
+
+
+@dataclass
+class ValidationIssue:
+    """A single problem found in the topology."""
+    severity: IssueSeverity
+    code: str  # "island", "unreachable_flow", "missing_endpoint", "duplicate_ip", ...
+    message: str
+    node_ids: list[str] = field(default_factory=list)
+    link_ids: list[str] = field(default_factory=list)
+    flow_id: Optional[str] = None
+
+
+@dataclass
+class ValidationReport:
+    """Result of TopologyValidator.validate()."""
+    issues: list[ValidationIssue] = field(default_factory=list)
+
+    @property
+    def errors(self) -> list[ValidationIssue]:
+        return [issue for issue in self.issues if issue.severity == IssueSeverity.ERROR]
+
+    @property
+    def warnings(self) -> list[ValidationIssue]:
+        return [issue for issue in self.issues if issue.severity == IssueSeverity.WARNING]
+
+    @property
+    def has_errors(self) -> bool:
+        return any(issue.severity == IssueSeverity.ERROR for issue in self.issues)
+
+    def summary(self) -> str:
+        """One-line status text, e.g. "2 errors, 1 warning"."""
+        if not self.issues:
+            return "Topology OK"
+        parts = []
+        for label, count in (("error", len(self.errors)), ("warning", len(self.warnings))):
+            if count:
+                parts.append(f"{count} {label}{'s' if count != 1 else ''}")
+        return ", ".join(parts)
+
+    def details(self) -> str:
+        """All issue messages, one per line, errors first."""
+        return "\n".join(f"• {issue.message}" for issue in self.errors + self.warnings)
+
+
+class AddressIndex:
+    """
+    Interface addresses of a NetworkModel by IP and by subnet.
+
+    Listens to the model's change notifications and re-reads only the
+    ports of nodes that were edited (or sit at the end of an edited
+    link) before the next query; a replaced topology is re-read once.
+    Subnets are grouped by layer-2 segment: links through switches share
+    the segment of their group of connected switches, kept in a
+    union-find over switch-to-switch links.
+
+    Usage:
+        addresses = AddressIndex(network)
+        TopologyValidator(network, addresses).check_addresses()
+        addresses.detach()  # Stop listening to edits
+    """
+
+    def __init__(self, network: NetworkModel, track_changes: bool = True):
+        self.network = network
+        self._tracking = track_changes
+        # (node ID, port ID) keys, with the link each port is on
+        self._by_ip: dict[int, dict[tuple[str, str], str]] = {}
+        self._by_subnet: dict[tuple[int, int], dict[Hashable, dict[tuple[str, str], str]]] = {}
+        self._invalid: dict[tuple[str, str], str] = {}
+        self._duplicate_ips: dict[int, None] = {}     # Addresses with 2+ users
+        self._shared_subnets: dict[tuple[int, int], None] = {}  # Subnets on 2+ segment keys
+        # Node ID -> [(key, address, subnet, segment key)] for removal
+        self._entries: dict[str, list[tuple[tuple[str, str], Optional[int], tuple[int, int], Hashable]]] = {}
+        self._types: dict[str, NodeType] = {}
+        # Switch groups (union-find can't split, so removals mark it stale)
+        self._switch_links: dict[str, tuple[str, str]] = {}
+        self._switch_groups = DisjointSet()
+        self._groups_stale = False
+        # Pending work, applied before the next query
+        self._dirty_nodes: dict[str, None] = {}
+        self._dirty_links: dict[str, LinkModel] = {}
+        self._full = True
+        if track_changes:
+            network.add_change_listener(self._on_change)
+            network.add_topology_listener(self._on_replaced)
+
+    def detach(self):
+        if self._tracking:
+            self.network.remove_change_listener(self._on_change)
+            self.network.remove_topology_listener(self._on_replaced)
+            self._tracking = False
+
+    def _on_change(self, kind: str, object_id: str, obj):
+        if kind == "node":
+            self._dirty_nodes[object_id] = None
+        elif kind == "link":
+            link = obj if obj is not None else self.network.links.get(object_id)
+            if link is None:
+                self._full = True  # Removed, endpoints unknown
+                return
+            self._dirty_links[object_id] = link
+            self._dirty_nodes[link.source_node_id] = None
+            self._dirty_nodes[link.target_node_id] = None
+
+    def _on_replaced(self, network: NetworkModel):
+        self._full = True
+
+    # ----- queries -----
+
+    def invalid_ports(self) -> list[tuple[str, str, str]]:
+        """(node ID, port ID, link ID) of ports with malformed addresses."""
+        self._update()
+        return [(node_id, port_id, link_id) for (node_id, port_id), link_id in self._invalid.items()]
+
+    def duplicate_ips(self) -> Iterator[tuple[int, list[tuple[str, str]]]]:
+        """Addresses on more than one interface, with their (node ID, link ID) users."""
+        self._update()
+        for address in self._duplicate_ips:
+            users = self._by_ip[address]
+            yield address, [(node_id, link_id) for (node_id, _), link_id in users.items()]
+
+    def shared_subnets(self) -> Iterator[tuple[tuple[int, int], list[str]]]:
+        """(network, prefix) used on separate segments, with one link ID per segment."""
+        self._update()
+        for subnet in self._shared_subnets:
+            segments: dict[Hashable, str] = {}
+            for key, members in self._by_subnet[subnet].items():
+                segments.setdefault(self._resolve_segment(key), next(iter(members.values())))
+            if len(segments) > 1:
+                yield subnet, list(segments.values())
+
+    # ----- maintenance -----
+
+    def _update(self):
+        if self._full:
+            self._rebuild()
+        while self._dirty_nodes or self._dirty_links:
+            links, self._dirty_links = self._dirty_links, {}
+            for link_id, link in links.items():
+                self._update_switch_link(link_id, link)
+            nodes, self._dirty_nodes = self._dirty_nodes, {}
+            for node_id in nodes:
+                self._reindex_node(node_id)
+
+    def _rebuild(self):
+        self._full = False
+        self._dirty_nodes.clear()
+        self._dirty_links.clear()
+        for index in (self._by_ip, self._by_subnet, self._invalid, self._duplicate_ips,
+                      self._shared_subnets, self._entries, self._types, self._switch_links):
+            index.clear()
+        for link_id, link in self.network.links.items():
+            if self._joins_switches(link):
+                self._switch_links[link_id] = (link.source_node_id, link.target_node_id)
+        self._groups_stale = True
+        for node_id in self.network.nodes:
+            self._reindex_node(node_id)
+
+    def _joins_switches(self, link: LinkModel) -> bool:
+        nodes = self.network.nodes
+        source, target = nodes.get(link.source_node_id), nodes.get(link.target_node_id)
+        return bool(source and target and source.node_type == target.node_type == NodeType.SWITCH)
+
+    def _update_switch_link(self, link_id: str, link: LinkModel):
+        current = self.network.links.get(link_id)
+        if current is not None and self._joins_switches(current):
+            ends = (current.source_node_id, current.target_node_id)
+            if self._switch_links.get(link_id) != ends:
+                if link_id in self._switch_links:
+                    self._groups_stale = True  # Rewired between switches
+                self._switch_links[link_id] = ends
+                if not self._groups_stale:
+                    self._switch_groups.union(*ends)
+        elif self._switch_links.pop(link_id, None) is not None:
+            self._groups_stale = True
+
+    def _resolve_segment(self, key: Hashable) -> Hashable:
+        if not isinstance(key, tuple):
+            return key  # A link ID
+        if self._groups_stale:
+            self._groups_stale = False
+            self._switch_groups.clear()
+            for ends in self._switch_links.values():
+                self._switch_groups.union(*ends)
+        return ("switch", self._switch_groups.find(key[1]))
+
+    def _segment_key(self, node_id: str, link_id: str) -> Hashable:
+        network = self.network
+        link = network.links.get(link_id)
+        if link is None:
+            return link_id
+        peer_id = link.target_node_id if link.source_node_id == node_id else link.source_node_id
+        for end_id in (node_id, peer_id):
+            end = network.nodes.get(end_id)
+            if end is not None and end.node_type == NodeType.SWITCH:
+                return ("switch", end_id)
+        return link_id
+
+    def _reindex_node(self, node_id: str):
+        self._unindex_node(node_id)
+        network = self.network
+        node = network.nodes.get(node_id)
+        old_type = self._types.pop(node_id, None)
+        if node is None:
+            return
+        self._types[node_id] = node.node_type
+        if old_type is not None and old_type != node.node_type and NodeType.SWITCH in (old_type, node.node_type):
+            # Peers' segments and switch links depend on this node's type
+            for link in network.get_links_for_node(node_id):
+                self._dirty_links[link.id] = link
+                peer_id = link.target_node_id if link.source_node_id == node_id else link.source_node_id
+                self._dirty_nodes[peer_id] = None
+        if not node.has_ports_materialized:
+            return  # Default ports have no addresses
+
+        entries = []
+        for port in node.ports:
+            link_id = port.connected_link_id
+            if not port.ip_address or not link_id:
+                continue
+            key = (node_id, port.id)
+            try:
+                address = ip_to_int(port.ip_address)
+                prefix = netmask_to_prefix(port.netmask)
+            except ValueError:
+                self._invalid[key] = link_id
+                entries.append((key, None, (0, 0), None))
+                continue
+            mask = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF if prefix else 0
+            subnet = (address & mask, prefix)
+            segment = self._segment_key(node_id, link_id)
+            users = self._by_ip.setdefault(address, {})
+            users[key] = link_id
+            if len(users) > 1:
+                self._duplicate_ips[address] = None
+            segments = self._by_subnet.setdefault(subnet, {})
+            segments.setdefault(segment, {})[key] = link_id
+            if len(segments) > 1:
+                self._shared_subnets[subnet] = None
+            entries.append((key, address, subnet, segment))
+        if entries:
+            self._entries[node_id] = entries
+
+    def _unindex_node(self, node_id: str):
+        for key, address, subnet, segment in self._entries.pop(node_id, ()):
+            if address is None:
+                self._invalid.pop(key, None)
+                continue
+            users = self._by_ip[address]
+            del users[key]
+            if len(users) < 2:
+                self._duplicate_ips.pop(address, None)
+                if not users:
+                    del self._by_ip[address]
+            segments = self._by_subnet[subnet]
+            members = segments[segment]
+            del members[key]
+            if not members:
+                del segments[segment]
+                if len(segments) < 2:
+                    self._shared_subnets.pop(subnet, None)
+                    if not segments:
+                        del self._by_subnet[subnet]
+
+
+class TopologyValidator:
+    """
+    Checks a NetworkModel (and optionally its traffic flows) before a run.
+
+    Pass an AddressIndex that outlives the validator to keep address
+    checks incremental across edits; without one, addresses are indexed
+    in one pass per validator.
+
+    Usage:
+        validator = TopologyValidator(network)
+        report = validator.validate(sim_config.flows)
+        if report.has_errors:
+            print(report.details())
+    """
+
+    def __init__(self, network: NetworkModel, addresses: Optional[AddressIndex] = None):
+        self.network = network
+        self.addresses = addresses or AddressIndex(network, track_changes=False)
+
+    def validate(self, flows: Iterable = (), list_islands: bool = True) -> ValidationReport:
+        """Run all checks (see check_connectivity for list_islands)."""
+        report = ValidationReport()
+        report.issues.extend(self.check_connectivity(list_islands))
+        report.issues.extend(self.check_flows(flows))
+        report.issues.extend(self.check_addresses())
+        return report
+
+    def check_connectivity(self, list_islands: bool = True) -> list[ValidationIssue]:
+        """
+        Report every component other than the largest as an island.
+
+        With list_islands=False, only the component count is read and a
+        single "islands" warning without node IDs stands in for them.
+        """
+        network = self.network
+        if len(network.nodes) < 2:
+            return []
+        count = network.component_count()
+        if count < 2:
+            return []
+        if not list_islands:
+            islands = count - 1
+            return [ValidationIssue(
+                IssueSeverity.WARNING, "islands",
+                f"{islands} island{'s' if islands != 1 else ''} not connected to the rest of the topology",
+            )]
+        issues = []
+        for component in network.get_components()[1:]:
+            names = [network.nodes[node_id].name for node_id in component[:MAX_LISTED_NODES]]
+            if len(component) > MAX_LISTED_NODES:
+                names.append(f"and {len(component) - MAX_LISTED_NODES} more")
+            noun = "Node" if len(component) == 1 else "Nodes"
+            issues.append(ValidationIssue(
+                IssueSeverity.WARNING, "island",
+                f"{noun} {', '.join(names)} not connected to the rest of the topology",
+                node_ids=list(component),
+            ))
+        return issues
+
+    def check_flows(self, flows: Iterable) -> list[ValidationIssue]:
+        """Report flows whose endpoints are missing or unreachable."""
+        network = self.network
+        issues = []
+        for flow in flows:
+            label = flow.name or flow.id
+            endpoints = (flow.source_node_id, flow.target_node_id)
+            missing = [node_id for node_id in endpoints if node_id not in network.nodes]
+            if missing:
+                issues.append(ValidationIssue(
+                    IssueSeverity.ERROR, "missing_endpoint",
+                    f"Flow {label} uses a node that no longer exists",
+                    node_ids=missing, flow_id=flow.id,
+                ))
+            elif flow.source_node_id != flow.target_node_id and not network.are_connected(*endpoints):
+                source, target = (network.nodes[node_id].name for node_id in endpoints)
+                issues.append(ValidationIssue(
+                    IssueSeverity.ERROR, "unreachable_flow",
+                    f"Flow {label}: {target} is unreachable from {source}",
+                    node_ids=list(endpoints), flow_id=flow.id,
+                ))
+        return issues
+
+    def check_addresses(self) -> list[ValidationIssue]:
+        """Report duplicate IPs, subnets reused across segments and bad addresses."""
+        network = self.network
+        issues = []
+
+        for node_id, port_id, link_id in self.addresses.invalid_ports():
+            node = network.nodes[node_id]
+            port = node.get_port(port_id)
+            issues.append(ValidationIssue(
+                IssueSeverity.WARNING, "invalid_address",
+                f"{node.name} {port.display_name}: invalid address "
+                f"{port.ip_address}/{port.netmask}",
+                node_ids=[node_id], link_ids=[link_id],
+            ))
+
+        for address, users in self.addresses.duplicate_ips():
+            names = ", ".join(network.nodes[node_id].name for node_id, _ in users)
+            issues.append(ValidationIssue(
+                IssueSeverity.ERROR, "duplicate_ip",
+                f"IP {int_to_ip(address)} is assigned to more than one interface ({names})",
+                node_ids=[node_id for node_id, _ in users],
+                link_ids=[link_id for _, link_id in users],
+            ))
+
+        for (subnet, prefix), link_ids in self.addresses.shared_subnets():
+            issues.append(ValidationIssue(
+                IssueSeverity.WARNING, "duplicate_subnet",
+                f"Subnet {int_to_ip(subnet)}/{prefix} is used on {len(link_ids)} separate links",
+                link_ids=link_ids,
+            ))
+        return issues
+
+
+def validate_topology(network: NetworkModel, flows: Iterable = ()) -> ValidationReport:
+    """Convenience wrapper for TopologyValidator(network).validate(flows)."""
+    return TopologyValidator(network).validate(flows)
@@ -5,10 +5,14 @@ Parses ns-3 trace output and provides playback functionality
 for animating packets in the GUI.
 """
 
+import json
 import re
+from array import array
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import List, Optional, Dict, Callable
+from pathlib import Path
+from typing import List, Optional, Dict, Callable, Tuple, Union
 from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 
 
@@ -63,6 +67,244 @@ class TraceStats:
         return self.duration_ns / 1e9
 
 
+TRACE_MAP_FILE = "trace_map.json"
+
+
+@dataclass
+class TraceMap:
+    """
+    Mapping from ns-3 node/device indices to GUI node and link IDs.
+    
+    The script generator numbers nodes in NetworkModel order and creates
+    one device container per wired link. Generated scripts write this
+    mapping to trace_map.json in the output directory, including the
+    (node, device) pairs ns-3 actually assigned, so trace events map to a
+    link with a dict lookup instead of a search over the topology.
+    
+    Usage:
+        trace_map = TraceMap.load(output_dir / TRACE_MAP_FILE) or TraceMap.from_network(network)
+        resolved = trace_map.resolve(event)    # (link_id, 'forward'/'backward') or None
+    """
+    node_ids: List[str] = field(default_factory=list)                 # ns-3 index -> node ID
+    link_ends: Dict[str, Tuple[int, int]] = field(default_factory=dict)  # link ID -> (source, target) index
+    devices: Dict[Tuple[int, int], str] = field(default_factory=dict)  # (node, device) -> link ID
+    
+    def __post_init__(self):
+        self._node_index = {node_id: idx for idx, node_id in enumerate(self.node_ids)}
+        # Without device info an event on a node goes to its first link
+        self._first_link: Dict[int, str] = {}
+        for link_id, (source, target) in self.link_ends.items():
+            self._first_link.setdefault(source, link_id)
+            self._first_link.setdefault(target, link_id)
+    
+    @classmethod
+    def from_network(cls, network, link_ids: Optional[List[str]] = None) -> "TraceMap":
+        """
+        Mapping numbered the way the script generator numbers a network.
+        
+        Args:
+            network: The NetworkModel the script was generated from
+            link_ids: Links that got a device container (default: all links)
+        """
+        node_ids = list(network.nodes)
+        node_index = {node_id: idx for idx, node_id in enumerate(node_ids)}
+        link_ends = {}
+        for link_id in (network.links if link_ids is None else link_ids):
+            link = network.links.get(link_id)
+            if link is None:
+                continue
+            link_ends[link_id] = (
+                node_index.get(link.source_node_id, 0), node_index.get(link.target_node_id, 0)
+            )
+        return cls(node_ids=node_ids, link_ends=link_ends)
+    
+    def node_id(self, index: int) -> Optional[str]:
+        """GUI node ID of an ns-3 node index."""
+        if 0 <= index < len(self.node_ids):
+            return self.node_ids[index]
+        return None
+    
+    def node_index(self, node_id: str) -> Optional[int]:
+        """ns-3 node index of a GUI node ID."""
+        return self._node_index.get(node_id)
+    
+    def link_for(self, event: PacketEvent) -> Optional[str]:
+        """Link an event happened on, or None if it can't be mapped."""
+        if event.link_id in self.link_ends:
+            return event.link_id
+        link_id = self.devices.get((event.node_id, event.device_id))
+        if link_id is None:
+            link_id = self._first_link.get(event.node_id)
+        return link_id
+    
+    def resolve(self, event: PacketEvent) -> Optional[Tuple[str, str]]:
+        """
+        Link and direction to animate an event on.
+        
+        Returns:
+            (link_id, 'forward' or 'backward'), where forward means from
+            the link's source node to its target node; None if unmapped
+        """
+        link_id = self.link_for(event)
+        if link_id is None:
+            return None
+        source, target = self.link_ends[link_id]
+        if event.event_type == PacketEventType.RX:
+            # Received at event.node_id, so it came from the other end
+            sender = event.source_node if event.source_node >= 0 else (
+                target if event.node_id == source else source
+            )
+        else:
+            sender = event.node_id
+        return link_id, ('forward' if sender == source else 'backward')
+    
+    def to_dict(self) -> dict:
+        return {
+            "version": 1,
+            "nodes": list(self.node_ids),
+            "links": {link_id: list(ends) for link_id, ends in self.link_ends.items()},
+            "devices": [[node, device, link_id] for (node, device), link_id in self.devices.items()],
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "TraceMap":
+        return cls(
+            node_ids=list(data.get("nodes", [])),
+            link_ends={link_id: tuple(ends) for link_id, ends in data.get("links", {}).items()},
+            devices={(node, device): link_id for node, device, link_id in data.get("devices", [])},
+        )
+    
+    def save(self, path: Union[str, Path]):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+    
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["TraceMap"]:
+        """Read a trace map (None if missing or unreadable)."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            if Path(path).exists():
+                print(f"Error reading trace map: {e}")
+            return None
+
+
+class LinkCounters:
+    """
+    Per-link traffic of a trace, binned by simulation time.
+    
+    Each TX event adds its bytes to the link's forward or backward count
+    and one packet; each DROP event adds one drop. A link keeps only its
+    non-empty bins: their indices and running totals of the four counts
+    in packed arrays, so memory grows with busy (link, bin) pairs rather
+    than links x bins, and any window is summed with two bisects per link.
+    
+    Usage:
+        counters = LinkCounters.from_events(events, trace_map)
+        covered_ns, totals = counters.window(end_ns, 500_000_000)
+        forward_bytes, backward_bytes, packets, drops = totals[link_id]
+    """
+    
+    DEFAULT_BINS = 1000    # Bins over the whole trace
+    MIN_BIN_NS = 1000      # 1 us
+    
+    def __init__(self, start_ns: int = 0, bin_ns: int = MIN_BIN_NS):
+        self.start_ns = start_ns
+        self.bin_ns = max(1, bin_ns)
+        self._bins: Dict[str, array] = {}           # link ID -> non-empty bin indices
+        self._totals: Dict[str, List[array]] = {}   # link ID -> 4 running totals (leading 0)
+    
+    @classmethod
+    def from_events(
+        cls, events: List[PacketEvent], trace_map: TraceMap, bin_ns: Optional[int] = None
+    ) -> "LinkCounters":
+        """
+        Bin events (sorted by time) onto the links trace_map resolves them to.
+        
+        Args:
+            bin_ns: Bin width (default: the trace's duration over DEFAULT_BINS)
+        """
+        start_ns = events[0].time_ns if events else 0
+        if bin_ns is None:
+            duration = events[-1].time_ns - start_ns if events else 0
+            bin_ns = max(cls.MIN_BIN_NS, -(-duration // cls.DEFAULT_BINS))
+        counters = cls(start_ns, bin_ns)
+        bin_ns = counters.bin_ns
+        
+        bins: Dict[str, array] = {}
+        counts: Dict[str, List[array]] = {}
+        for event in events:
+            if event.event_type == PacketEventType.TX:
+                resolved = trace_map.resolve(event)
+                if resolved is None:
+                    continue
+                link_id, direction = resolved
+                slot = 0 if direction == 'forward' else 1
+            elif event.event_type == PacketEventType.DROP:
+                link_id = trace_map.link_for(event)
+                if link_id is None:
+                    continue
+                slot = 3
+            else:
+                continue
+            index = (event.time_ns - start_ns) // bin_ns
+            link_bins = bins.get(link_id)
+            if link_bins is None:
+                link_bins = bins[link_id] = array('q')
+                counts[link_id] = [array('d') for _ in range(4)]
+            link_counts = counts[link_id]
+            if not link_bins or link_bins[-1] != index:
+                link_bins.append(index)
+                for column in link_counts:
+                    column.append(0.0)
+            if slot == 3:
+                link_counts[3][-1] += 1
+            else:
+                link_counts[slot][-1] += event.packet_size
+                link_counts[2][-1] += 1
+        
+        for link_id, link_counts in counts.items():
+            totals = []
+            for column in link_counts:
+                running = array('d', [0.0])
+                total = 0.0
+                for value in column:
+                    total += value
+                    running.append(total)
+                totals.append(running)
+            counters._totals[link_id] = totals
+        counters._bins = bins
+        return counters
+    
+    @property
+    def link_ids(self) -> List[str]:
+        """Links with any traffic."""
+        return list(self._bins)
+    
+    def window(self, end_ns: int, span_ns: int) -> Tuple[int, Dict[str, Tuple[float, float, float, float]]]:
+        """
+        Traffic per link in the bins covering (end_ns - span_ns, end_ns].
+        
+        Returns:
+            (covered_ns, {link_id: (forward_bytes, backward_bytes, packets, drops)}),
+            where covered_ns is the whole-bin time the totals are over;
+            links without traffic in the window are left out
+        """
+        last = (end_ns - self.start_ns) // self.bin_ns
+        if last < 0:
+            return 0, {}
+        first = max(0, last - max(1, -(-span_ns // self.bin_ns)) + 1)
+        result = {}
+        for link_id, link_bins in self._bins.items():
+            i = bisect_left(link_bins, first)
+            j = bisect_right(link_bins, last)
+            if i == j:
+                continue
+            result[link_id] = tuple(column[j] - column[i] for column in self._totals[link_id])
+        return (last - first + 1) * self.bin_ns, result
+
+
 class TraceParser:
     """
     Parse ns-3 trace output.
@@ -246,6 +488,10 @@ class TracePlayer(QObject):
         
         self._parser = TraceParser()
         self._stats = TraceStats()
+        
+        # Binned per-link traffic, built on first use per trace map
+        self._link_counters: Optional[LinkCounters] = None
+        self._link_counters_map: Optional[TraceMap] = None
     
     @property
     def is_loaded(self) -> bool:
@@ -311,6 +557,7 @@ class TracePlayer(QObject):
     
     def _finalize_load(self) -> bool:
         """Finalize loading of events."""
+        self._link_counters = self._link_counters_map = None
         if not self._events:
             self._is_loaded = False
             return False
@@ -413,6 +660,13 @@ class TracePlayer(QObject):
             self.pause()
             self.playback_finished.emit()
     
+    def link_counters(self, trace_map: TraceMap) -> LinkCounters:
+        """Per-link counters of the loaded trace (cached until the trace or map changes)."""
+        if self._link_counters is None or self._link_counters_map is not trace_map:
+            self._link_counters = LinkCounters.from_events(self._events, trace_map)
+            self._link_counters_map = trace_map
+        return self._link_counters
+    
     def get_events_in_range(self, start_ns: int, end_ns: int) -> List[PacketEvent]:
         """Get all events in a time range."""
         start_idx = self._find_event_index(start_ns)
@@ -7,8 +7,12 @@ Tests:
 - Save project with all components
 - Load topology, flows, and app scripts
 - Run history management
+- Workspace project index
 """
 
+import os
+import shutil
+
 import pytest
 import json
 from pathlib import Path
@@ -319,3 +323,83 @@ class TestListProjects:
         assert "proj1" in names
         assert "proj2" in names
         assert "proj3" in names
+    
+    def test_list_uses_index(self, project_manager, monkeypatch):
+        """Test unchanged projects are served from the index without re-reading."""
+        from models import project_index
+        project_manager.create_project("proj1")
+        project_manager.create_project("proj2")
+        project_manager.list_projects()
+        
+        scanned = []
+        original = project_index.scan_project
+        monkeypatch.setattr(project_index, "scan_project", lambda path: scanned.append(path) or original(path))
+        
+        fresh = ProjectManager(project_manager.workspace_root)
+        assert {p["name"] for p in fresh.list_projects()} == {"proj1", "proj2"}
+        assert scanned == []
+        assert not fresh.project_index.is_stale()
+
+
+class TestProjectIndex:
+    """Tests for keeping the workspace project index current."""
+    
+    def _bump(self, path: Path):
+        """Advance a path's mtime (file systems may have coarse timestamps)."""
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+    
+    def test_external_changes_are_picked_up(self, project_manager):
+        """Test edits, new runs and removals made outside the manager."""
+        project = project_manager.create_project("proj1", "old")
+        other = project_manager.create_project("proj2")
+        project_manager.list_projects()
+        
+        project_file = project.path / "project.json"
+        data = json.loads(project_file.read_text())
+        data["metadata"]["description"] = "new"
+        project_file.write_text(json.dumps(data))
+        self._bump(project_file)
+        (project.results_dir / "run_20240101_000000").mkdir()
+        self._bump(project.results_dir)
+        shutil.rmtree(other.path)
+        self._bump(project_manager.projects_dir)
+        
+        projects = project_manager.list_projects()
+        
+        assert [p["name"] for p in projects] == ["proj1"]
+        assert projects[0]["description"] == "new"
+        assert projects[0]["run_count"] == 1
+    
+    def test_manager_updates_index(self, project_manager, simple_network):
+        """Test create, save, run and delete update the cached listing."""
+        project = project_manager.create_project("proj1")
+        project_manager.save_project(project, network_model=simple_network)
+        project.create_run_dir()
+        project_manager.add_simulation_run(project, SimulationRun(
+            id="run_1", timestamp=datetime.now().isoformat(), duration=1.0, status="success"
+        ))
+        
+        cached = project_manager.list_projects(refresh=False)
+        assert cached[0]["has_topology"] and cached[0]["run_count"] == 1
+        
+        project_manager.delete_project(str(project.path))
+        assert project_manager.list_projects(refresh=False) == []
+    
+    def test_corrupt_index_is_rebuilt(self, project_manager):
+        """Test a damaged index file is replaced by a rescan."""
+        project_manager.create_project("proj1")
+        project_manager.project_index.index_path.write_text("{not json")
+        
+        fresh = ProjectManager(project_manager.workspace_root)
+        assert fresh.list_projects(refresh=False) == []
+        assert [p["name"] for p in fresh.list_projects()] == ["proj1"]
+    
+    def test_background_refresh(self, project_manager):
+        """Test the background refresh reports the current listing."""
+        project_manager.create_project("proj1")
+        results = []
+        
+        project_manager.project_index.refresh_in_background(results.append).join(10)
+        
+        assert [p["name"] for p in results[0]] == ["proj1"]
@@ -0,0 +1,251 @@
+"""
+Unit tests for journaled background autosave.
+
+Tests:
+- Change listeners on NetworkModel
+- Journal coalescing of repeated edits
+- Recovery from snapshot plus journal (torn lines, stale entries)
+- Background saves match synchronous saves
+- In-place edits reported with notify_changed() reach saves
+- NetworkModel mutators report their changes (Apply Subnet)
+- Recovery files are removed after a save
+"""
+
+import json
+
+from models import MediumType, NetworkModel, NodeType, Position, RouteEntry, RoutingMode
+from services.autosave import (
+    AutosaveManager, ChangeJournal, autosave_dir_for, JOURNAL_FILE, SNAPSHOT_FILE
+)
+from services.project_manager import ProjectManager
+
+
+def _drop_created(document):
+    document["metadata"].pop("created", None)
+    return document
+
+
+class TestChangeListeners:
+    """Tests for NetworkModel change notifications."""
+
+    def test_add_remove_and_notify(self, empty_network):
+        """Test adds, removals and in-place edits reach listeners."""
+        events = []
+        listener = lambda kind, object_id, obj: events.append((kind, object_id))
+        empty_network.add_change_listener(listener)
+
+        a = empty_network.add_node(NodeType.HOST, Position(0, 0))
+        b = empty_network.add_node(NodeType.HOST, Position(100, 0))
+        link = empty_network.add_link(a.id, b.id)
+        empty_network.notify_changed("node", a.id)
+        empty_network.remove_link(link.id)
+
+        assert ("node", a.id) in events and ("node", b.id) in events
+        assert events.count(("link", link.id)) == 2
+
+        empty_network.remove_change_listener(listener)
+        empty_network.notify_changed("flows")
+        assert ("flows", "") not in events
+
+
+class TestChangeJournal:
+    """Tests for coalescing edits into ops."""
+
+    def test_repeated_edits_coalesce(self, simple_network):
+        """Test a node moved many times yields one put_node per flush."""
+        journal = ChangeJournal(simple_network)
+        node = simple_network.nodes["host1"]
+        for x in range(50):
+            node.position.x = x
+            simple_network.notify_changed("node", node.id)
+
+        ops = journal.collect()
+
+        puts = [op for op in ops if op["op"] == "put_node"]
+        assert len(puts) == 1
+        assert puts[0]["data"]["position"]["x"] == 49
+        # Incident links carry the node's name, so they're rewritten too
+        assert {op["id"] for op in ops if op["op"] == "put_link"} == {
+            link.id for link in simple_network.get_links_for_node("host1")
+        }
+        assert journal.collect() == []
+
+    def test_removal_and_batch(self, simple_network):
+        """Test deletions become del ops and batches a full reset."""
+        journal = ChangeJournal(simple_network)
+        simple_network.remove_node("host2")
+
+        kinds = {op["op"] for op in journal.collect()}
+        assert {"del_node", "del_link"} <= kinds
+
+        with simple_network.batch() as batch:
+            batch.add_node(NodeType.ROUTER, Position(0, 0))
+        assert [op["op"] for op in journal.collect()] == ["reset"]
+
+        journal.detach()
+        simple_network.notify_changed("node", "host1")
+        assert not journal.has_changes
+
+
+class TestAutosaveManager:
+    """Tests for journaling, recovery and background saves."""
+
+    def _grid(self, count=6):
+        network = NetworkModel()
+        nodes = [network.add_node(NodeType.ROUTER, Position(i * 100, 0)) for i in range(count)]
+        for a, b in zip(nodes, nodes[1:]):
+            network.add_link(a.id, b.id)
+        return network, nodes
+
+    def test_recovery_replays_journal(self, temp_dir):
+        """Test edits after the snapshot are recovered from the journal."""
+        network, nodes = self._grid()
+        target = temp_dir / "grid.json"
+        autosave = AutosaveManager()
+        autosave.attach(network, target)
+
+        nodes[0].name = "edge"
+        network.notify_changed("node", nodes[0].id)
+        autosave.flush()
+        network.remove_node(nodes[-1].id)
+        autosave.flush()
+        autosave.close()
+
+        assert AutosaveManager.has_recovery(target)
+        recovered = AutosaveManager.recover(target)
+        assert recovered.nodes[nodes[0].id].name == "edge"
+        assert nodes[-1].id not in recovered.nodes
+        assert len(recovered.links) == len(network.links)
+
+    def test_torn_and_stale_journal_lines(self, temp_dir):
+        """Test replay skips entries in the snapshot and stops at a torn line."""
+        network, nodes = self._grid()
+        target = temp_dir / "grid.json"
+        autosave = AutosaveManager(compact_after_ops=1)  # Every flush rewrites the snapshot
+        autosave.attach(network, target)
+        nodes[0].name = "kept"
+        network.notify_changed("node", nodes[0].id)
+        autosave.flush()
+        autosave.close()
+
+        journal = autosave_dir_for(target) / JOURNAL_FILE
+        stale = {"seq": 1, "ops": [{"op": "del_node", "id": nodes[0].id}]}
+        newer = {"seq": 99, "ops": [{"op": "del_node", "id": nodes[1].id}]}
+        journal.write_text(json.dumps(stale) + "\n" + json.dumps(newer) + "\n" + '{"seq": 100, "op')
+
+        document = AutosaveManager.recover_document(target)
+
+        ids = {node["id"]: node["name"] for node in document["topology"]["nodes"]}
+        assert ids[nodes[0].id] == "kept"
+        assert nodes[1].id not in ids
+
+    def test_background_save_matches_sync_save(self, temp_dir):
+        """Test save_to() writes the same document as ProjectManager.save()."""
+        network, nodes = self._grid()
+        target = temp_dir / "grid.json"
+        autosave = AutosaveManager()
+        autosave.attach(network, target)
+        nodes[2].position.y = 250
+        network.notify_changed("node", nodes[2].id)
+
+        assert autosave.save_to(target).result(timeout=10) == target
+        assert not autosave_dir_for(target).exists()
+        assert not autosave.has_unsaved_changes
+        autosave.close()
+
+        expected = temp_dir / "expected.json"
+        ProjectManager().save(network, expected)
+        saved = json.loads(target.read_text(encoding="utf-8"))
+        assert _drop_created(saved) == _drop_created(json.loads(expected.read_text(encoding="utf-8")))
+
+    def test_in_place_edits_reach_background_save(self, temp_dir):
+        """Test edits made outside the property panel survive save_to() and reload."""
+        network, nodes = self._grid()
+        target = temp_dir / "grid.json"
+        autosave = AutosaveManager()
+        autosave.attach(network, target)
+
+        # Canvas medium menu, script editor and routing dialog edit in place, then notify
+        nodes[1].medium_type = MediumType.WIFI_STATION
+        network.notify_changed("node", nodes[1].id)
+        nodes[2].app_script = "print('hello')"
+        network.notify_changed("node", nodes[2].id)
+        nodes[3].routing_mode = RoutingMode.MANUAL
+        nodes[3].routing_table.append(RouteEntry(destination="10.9.0.0", gateway="10.0.0.1"))
+        network.notify_changed("node", nodes[3].id)
+
+        autosave.save_to(target).result(timeout=10)
+        autosave.close()
+
+        loaded = ProjectManager().load(target)
+        assert loaded.nodes[nodes[1].id].medium_type == MediumType.WIFI_STATION
+        assert loaded.nodes[nodes[2].id].app_script_file
+        assert loaded.nodes[nodes[3].id].routing_mode == RoutingMode.MANUAL
+        assert [route.destination for route in loaded.nodes[nodes[3].id].routing_table] == ["10.9.0.0"]
+
+        expected = temp_dir / "expected.json"
+        ProjectManager().save(network, expected)
+        saved = json.loads(target.read_text(encoding="utf-8"))
+        assert _drop_created(saved) == _drop_created(json.loads(expected.read_text(encoding="utf-8")))
+
+    def _assert_save_matches_model(self, autosave, network, temp_dir):
+        """save_to() output equals a full synchronous serialization of the model."""
+        target = autosave.target
+        autosave.save_to(target).result(timeout=10)
+        expected = temp_dir / "expected.json"
+        ProjectManager().save(network, expected)
+        saved = json.loads(target.read_text(encoding="utf-8"))
+        assert _drop_created(saved) == _drop_created(json.loads(expected.read_text(encoding="utf-8")))
+
+    def test_apply_subnet_reaches_background_save(self, temp_dir):
+        """Test hosts readdressed by Apply Subnet keep their IPs in the saved file."""
+        network = NetworkModel()
+        switch = network.add_node(NodeType.SWITCH, Position(0, 0))
+        hosts = [network.add_node(NodeType.HOST, Position(i * 100, 100)) for i in range(2)]
+        for host in hosts:
+            network.add_link(host.id, switch.id)
+        autosave = AutosaveManager()
+        autosave.attach(network, temp_dir / "lan.json")
+
+        switch.subnet_base = "192.168.7.0"
+        network.notify_changed("node", switch.id)  # Property panel edit
+        network.reassign_switch_ips(switch.id)     # Apply Subnet
+
+        self._assert_save_matches_model(autosave, network, temp_dir)
+        autosave.close()
+        loaded = ProjectManager().load(temp_dir / "lan.json")
+        assert [port.ip_address for port in loaded.nodes[hosts[0].id].ports if port.is_connected] == ["192.168.7.1"]
+
+    def test_model_mutators_reach_background_save(self, temp_dir):
+        """Test every NetworkModel mutator reports what it changes to the save mirror."""
+        network, nodes = self._grid()
+        autosave = AutosaveManager()
+        autosave.attach(network, temp_dir / "grid.json")
+        switch = network.add_node(NodeType.SWITCH, Position(0, 200))
+        switch.subnet_base = "192.168.9.0"
+        network.notify_changed("node", switch.id)
+
+        link = network.add_link(nodes[0].id, switch.id)
+        network.rewire_link(link.id, source_node_id=nodes[1].id)
+        network.reassign_switch_ips(switch.id)
+        network.remove_link(network.find_link_between(nodes[2].id, nodes[3].id).id)
+        network.remove_node(nodes[-1].id)
+        self._assert_save_matches_model(autosave, network, temp_dir)
+
+        with network.batch() as batch:
+            batch.add_link(switch.id, batch.add_node(NodeType.HOST).id)
+        self._assert_save_matches_model(autosave, network, temp_dir)
+        autosave.close()
+
+    def test_compact_save_and_clean_close(self, temp_dir):
+        """Test .ns3z saves load back and a clean close leaves no recovery."""
+        network, _ = self._grid()
+        target = temp_dir / "grid.ns3z"
+        autosave = AutosaveManager()
+        autosave.attach(network, target)
+        autosave.save_to(target).result(timeout=10)
+        autosave.close()
+
+        loaded = ProjectManager().load(target)
+        assert set(loaded.nodes) == set(network.nodes)
+        assert not (autosave_dir_for(target) / SNAPSHOT_FILE).exists()
@@ -0,0 +1,117 @@
+"""
+Unit tests for model ID allocation.
+
+Tests:
+- Monotonic prefixed IDs and reservation of loaded IDs
+- Legacy 8-character IDs
+- Model objects use compact IDs
+- Duplicate IDs in old files are repaired on load
+"""
+
+import json
+
+from models.ids import IdAllocator, short_id, new_id, NODE_ID_PREFIX
+from models.network import NetworkModel, NodeModel, LinkModel, NodeType, Position
+from models.simulation import TrafficFlow
+from services.project_manager import ProjectManager
+
+
+class TestIdAllocator:
+    """Tests for IdAllocator."""
+
+    def test_allocate_is_monotonic(self):
+        """Test IDs count up per prefix."""
+        allocator = IdAllocator()
+        assert [allocator.allocate("n") for _ in range(3)] == ["n1", "n2", "n3"]
+        assert allocator.allocate("p") == "p1"
+
+    def test_reserve_skips_loaded_ids(self):
+        """Test allocation continues after reserved IDs."""
+        allocator = IdAllocator()
+        allocator.reserve("n41")
+        allocator.reserve("n7")
+        assert allocator.allocate("n") == "n42"
+
+    def test_legacy_ids_ignored(self):
+        """Test uuid-style and custom IDs don't affect the counters."""
+        allocator = IdAllocator()
+        for legacy in ("3f9a0c1e", "host1", "", "n"):
+            allocator.reserve(legacy)
+        assert allocator.allocate("n") == "n1"
+
+    def test_bulk_unique(self):
+        """Test many allocations never repeat."""
+        ids = [new_id(NODE_ID_PREFIX) for _ in range(100_000)]
+        assert len(set(ids)) == len(ids)
+
+    def test_short_id(self):
+        """Test display suffixes for compact and legacy IDs."""
+        assert short_id("n42") == "42"
+        assert short_id("3f9a0c1e") == "3f9a"
+
+
+class TestModelIds:
+    """Tests for IDs on model objects."""
+
+    def test_compact_defaults(self):
+        """Test nodes, ports, links and flows get prefixed IDs."""
+        node = NodeModel(node_type=NodeType.ROUTER)
+        assert node.id.startswith("n")
+        assert all(port.id.startswith("p") for port in node.ports)
+        assert LinkModel().id.startswith("l")
+        assert TrafficFlow().id.startswith("t")
+        assert node.name == f"router_{node.id[1:]}"
+
+    def test_inserted_ids_are_reserved(self):
+        """Test IDs written into a network are never handed out again."""
+        network = NetworkModel()
+        loaded = NodeModel(id=f"n{10**9}")
+        network.nodes[loaded.id] = loaded
+
+        node = network.add_node(NodeType.HOST, Position(0, 0))
+
+        assert int(node.id[1:]) > 10**9
+
+
+class TestLegacyLoad:
+    """Tests for loading files with legacy IDs."""
+
+    def test_duplicate_port_and_link_ids_repaired(self, temp_dir):
+        """Test colliding port and link IDs get fresh IDs on load."""
+        network = NetworkModel()
+        routers = [NodeModel(id=node_id, node_type=NodeType.ROUTER) for node_id in ("aaaa0001", "aaaa0002", "aaaa0003")]
+        for router in routers:
+            network.nodes[router.id] = router
+        for a, b in ((0, 1), (1, 2)):
+            network.add_link(routers[a].id, routers[b].id)
+        pm = ProjectManager()
+        filepath = temp_dir / "legacy.json"
+        pm.save(network, filepath)
+
+        # Simulate uuid collisions: router 2 reuses router 1's port ID, both links share an ID
+        data = json.loads(filepath.read_text())
+        nodes, links = data["topology"]["nodes"], data["topology"]["links"]
+        clash_port = nodes[0]["ports"][0]["id"]
+        old_port = links[1]["endpoints"]["source"]["port_id"]
+        for port in nodes[1]["ports"]:
+            if port["id"] == old_port:
+                port["id"] = clash_port
+        links[1]["endpoints"]["source"]["port_id"] = clash_port
+        old_link = links[1]["id"]
+        links[1]["id"] = links[0]["id"]
+        for node in nodes[1:]:
+            for port in node["ports"]:
+                if port.get("connected_link_id") == old_link:
+                    port["connected_link_id"] = links[0]["id"]
+        filepath.write_text(json.dumps(data))
+
+        loaded = pm.load(filepath)
+
+        assert len(loaded.links) == 2
+        port_ids = [port.id for node in loaded.nodes.values() for port in node.ports]
+        assert len(set(port_ids)) == len(port_ids)
+        for link in loaded.links.values():
+            source = loaded.nodes[link.source_node_id].get_port(link.source_port_id)
+            target = loaded.nodes[link.target_node_id].get_port(link.target_port_id)
+            assert source.connected_link_id == link.id
+            assert target.connected_link_id == link.id
@@ -0,0 +1,287 @@
+"""
+Unit tests for IP address management.
+
+Tests:
+- Subnet helpers
+- Buddy allocation, reservation and release
+- IPAddressManager owner tracking and LAN host leases
+- NetworkModel auto-assignment through the IPAM (links and switch LANs)
+- Generator and IPAM agree on addressing
+"""
+
+import pytest
+from models.ipam import (
+    Subnet, AddressPool, IPAddressManager,
+    network_address, netmask_to_prefix, prefix_for_hosts
+)
+from models.network import NetworkModel, NodeType, Position
+from services.ns3_generator import NS3ScriptGenerator
+from services.project_manager import ProjectManager as LegacyProjectManager
+from models.simulation import SimulationConfig
+
+
+class TestSubnet:
+    """Tests for Subnet and helper functions."""
+
+    def test_from_cidr_masks_host_bits(self):
+        """Test parsing CIDR notation."""
+        subnet = Subnet.from_cidr("10.0.0.7/30")
+        assert subnet.cidr == "10.0.0.4/30"
+        assert subnet.netmask == "255.255.255.252"
+        assert subnet.num_hosts == 2
+
+    def test_hosts(self):
+        """Test host address lookup."""
+        subnet = Subnet.from_cidr("10.0.0.4/30")
+        assert subnet.host(1) == "10.0.0.5"
+        assert subnet.host(2) == "10.0.0.6"
+        with pytest.raises(ValueError):
+            subnet.host(3)
+        assert subnet.host_index("10.0.0.6") == 2
+        with pytest.raises(ValueError):
+            subnet.host_index("10.0.0.7")  # Broadcast
+
+    def test_slash_31_hosts(self):
+        """Test RFC 3021 point-to-point subnets use both addresses."""
+        subnet = Subnet.from_cidr("10.0.0.8/31")
+        assert subnet.host(1) == "10.0.0.8"
+        assert subnet.host(2) == "10.0.0.9"
+
+    def test_helpers(self):
+        """Test address helper functions."""
+        assert network_address("10.1.2.130", "255.255.255.128") == "10.1.2.128"
+        assert netmask_to_prefix("255.255.252.0") == 22
+        assert prefix_for_hosts(2) == 30
+        assert prefix_for_hosts(5) == 29
+        assert prefix_for_hosts(300) == 23
+
+
+class TestAddressPool:
+    """Tests for the buddy allocator."""
+
+    def test_allocates_lowest_first(self):
+        """Test allocations are deterministic and non-overlapping."""
+        pool = AddressPool("10.0.0.0/24")
+        first = pool.allocate(30)
+        second = pool.allocate(30)
+        assert first.cidr == "10.0.0.0/30"
+        assert second.cidr == "10.0.0.4/30"
+
+    def test_release_merges_buddies(self):
+        """Test released blocks merge back into larger blocks."""
+        pool = AddressPool("10.0.0.0/24")
+        blocks = [pool.allocate(26) for _ in range(4)]
+        assert pool.allocate(26) is None
+
+        for block in blocks:
+            pool.release(block)
+
+        assert pool.allocate(24).cidr == "10.0.0.0/24"
+
+    def test_reserve(self):
+        """Test reserving a specific block."""
+        pool = AddressPool("10.0.0.0/24")
+        assert pool.reserve(Subnet.from_cidr("10.0.0.0/30"))
+        assert not pool.reserve(Subnet.from_cidr("10.0.0.0/29"))
+        assert pool.allocate(30).cidr == "10.0.0.4/30"
+
+
+class TestIPAddressManager:
+    """Tests for IPAddressManager."""
+
+    def test_allocate_and_release_reuses(self):
+        """Test a released link subnet is handed out again."""
+        ipam = IPAddressManager()
+        first = ipam.allocate_p2p("link1")
+        ipam.allocate_p2p("link2")
+
+        assert ipam.allocate_p2p("link1") == first  # Idempotent
+        assert ipam.release("link1")
+        assert ipam.allocate_p2p("link3") == first
+
+    def test_many_links_are_unique(self):
+        """Test thousands of links get distinct subnets."""
+        ipam = IPAddressManager()
+        subnets = ipam.allocate_p2p_many(f"link{i}" for i in range(5000))
+        assert len({s.network for s in subnets}) == 5000
+
+    def test_lan_sizing(self):
+        """Test LAN subnets are sized for their host count."""
+        ipam = IPAddressManager()
+        subnet = ipam.allocate_lan("switch1", 100)
+        assert subnet.prefix_length == 25
+        assert ipam.find_owner(subnet.host(50)) == "switch1"
+
+    def test_exhaustion_raises(self):
+        """Test allocation fails loudly when a pool is full."""
+        ipam = IPAddressManager(p2p_pool="10.0.0.0/29")
+        ipam.allocate_p2p("a")
+        ipam.allocate_p2p("b")
+        with pytest.raises(ValueError):
+            ipam.allocate_p2p("c")
+
+    def test_copy_is_independent(self):
+        """Test copies keep allocations but don't share state."""
+        ipam = IPAddressManager()
+        subnet = ipam.allocate_p2p("link1")
+        clone = ipam.copy()
+        clone.allocate_p2p("link2")
+
+        assert clone.get("link1") == subnet
+        assert ipam.get("link2") is None
+
+    def test_host_leases(self):
+        """Test LAN hosts lease the lowest free address and give it back."""
+        ipam = IPAddressManager()
+        ipam.reserve("switch1", "192.168.1.0/30")
+        assert ipam.allocate_host("switch1", "link1") == "192.168.1.1"
+        assert ipam.allocate_host("switch1", "link2") == "192.168.1.2"
+        assert ipam.allocate_host("switch1", "link1") == "192.168.1.1"  # Idempotent
+        with pytest.raises(ValueError):
+            ipam.allocate_host("switch1", "link3")  # Only two hosts in a /30
+
+        assert ipam.release("link1")
+        assert ipam.allocate_host("switch1", "link3") == "192.168.1.1"
+
+    def test_forced_reserve_stays_out_of_pools(self):
+        """Test an overlapping user subnet is recorded without corrupting the pool."""
+        ipam = IPAddressManager()
+        link_subnet = ipam.allocate_p2p("link1")
+        assert not ipam.reserve("switch1", f"{link_subnet.network_address}/24")
+        assert ipam.reserve("switch1", f"{link_subnet.network_address}/24", force=True)
+
+        ipam.release("switch1")
+        assert ipam.allocate_p2p("link2") != link_subnet
+
+
+class TestNetworkModelAddressing:
+    """Tests for NetworkModel auto-assignment via the IPAM."""
+
+    def _host_pairs(self, network: NetworkModel, count: int):
+        links = []
+        for _ in range(count):
+            a = network.add_node(NodeType.HOST, Position(0, 0))
+            b = network.add_node(NodeType.HOST, Position(100, 0))
+            links.append(network.add_link(a.id, b.id))
+        return links
+
+    def test_more_than_255_links(self):
+        """Test addresses stay valid and unique beyond 255 links."""
+        network = NetworkModel()
+        self._host_pairs(network, 300)
+
+        addresses = set()
+        for node in network.nodes.values():
+            ip = node.ports[0].ip_address
+            assert all(0 <= int(octet) <= 255 for octet in ip.split('.'))
+            addresses.add(ip)
+        assert len(addresses) == 600
+
+    def test_remove_link_releases_subnet(self):
+        """Test removing a link frees its subnet for the next link."""
+        network = NetworkModel()
+        first, _ = self._host_pairs(network, 2)
+        subnet = network.ipam.get(first.id)
+
+        network.remove_link(first.id)
+        assert network.ipam.get(first.id) is None
+
+        (replacement,) = self._host_pairs(network, 1)
+        assert network.ipam.get(replacement.id) == subnet
+
+    def test_load_rebuilds_allocations(self, temp_dir):
+        """Test a loaded project doesn't reuse existing subnets."""
+        network = NetworkModel()
+        self._host_pairs(network, 3)
+
+        manager = LegacyProjectManager()
+        path = temp_dir / "topology.json"
+        manager.save(network, path)
+        loaded = manager.load(path)
+
+        existing = {s.network for s in loaded.ipam.allocations.values()}
+        assert len(existing) == 3
+
+        (new_link,) = self._host_pairs(loaded, 1)
+        assert loaded.ipam.get(new_link.id).network not in existing
+
+    def test_generator_uses_model_subnets(self):
+        """Test the generated script addresses links like the GUI does."""
+        network = NetworkModel()
+        (link,) = self._host_pairs(network, 1)
+        subnet = network.ipam.get(link.id)
+
+        script = NS3ScriptGenerator().generate(network, SimulationConfig())
+        assert f"ns.Ipv4Address('{subnet.network_address}'), ns.Ipv4Mask('{subnet.netmask}')" in script
+
+    def _switch_lan(self, network: NetworkModel, hosts: int, subnet_base: str, mask: str):
+        switch = network.add_node(NodeType.SWITCH, Position(0, 0))
+        switch.subnet_base = subnet_base
+        switch.subnet_mask = mask
+        network.notify_changed("node", switch.id)
+        links = []
+        for _ in range(hosts):
+            host = network.add_node(NodeType.HOST, Position(100, 0))
+            links.append(network.add_link(host.id, switch.id))
+        return switch, links
+
+    def _host_ip(self, network: NetworkModel, link):
+        return network.nodes[link.source_node_id].get_port(link.source_port_id).ip_address
+
+    def test_switch_lan_honours_mask(self):
+        """Test a /23 switch LAN addresses more than 254 hosts without overflow."""
+        network = NetworkModel()
+        switch, _ = self._switch_lan(network, 0, "192.168.0.0", "255.255.254.0")
+        with network.batch() as batch:
+            hosts = [batch.add_node(NodeType.HOST) for _ in range(300)]
+            links = batch.add_links((host.id, switch.id) for host in hosts)
+
+        addresses = [self._host_ip(network, link) for link in links]
+        assert len(set(addresses)) == 300
+        assert addresses[0] == "192.168.0.1"
+        assert addresses[255] == "192.168.1.0"
+        assert all(0 <= int(octet) <= 255 for ip in addresses for octet in ip.split('.'))
+
+    def test_full_switch_lan_raises(self):
+        """Test a switch LAN refuses more hosts than its mask allows."""
+        network = NetworkModel()
+        switch, _ = self._switch_lan(network, 2, "192.168.0.0", "255.255.255.252")
+        host = network.add_node(NodeType.HOST, Position(100, 0))
+        with pytest.raises(ValueError):
+            network.add_link(host.id, switch.id)
+
+    def test_remove_link_releases_host_address(self):
+        """Test a host address on a switch LAN is reused after its link goes."""
+        network = NetworkModel()
+        switch, links = self._switch_lan(network, 3, "192.168.5.0", "255.255.255.0")
+        freed = self._host_ip(network, links[0])
+
+        network.remove_link(links[0].id)
+        host = network.add_node(NodeType.HOST, Position(100, 0))
+        link = network.add_link(host.id, switch.id)
+        assert self._host_ip(network, link) == freed
+
+    def test_subnet_base_reserved_immediately(self):
+        """Test p2p links can't take addresses from a freshly set switch subnet."""
+        network = NetworkModel()
+        self._switch_lan(network, 0, "10.0.0.0", "255.255.255.0")
+
+        links = self._host_pairs(network, 70)
+        lan = Subnet.from_cidr("10.0.0.0/24")
+        for link in links:
+            assert not lan.contains(network.ipam.get(link.id).network_address)
+
+    def test_load_keeps_host_leases(self, temp_dir):
+        """Test a loaded switch LAN doesn't hand out an address already in use."""
+        network = NetworkModel()
+        _, links = self._switch_lan(network, 2, "192.168.9.0", "255.255.255.0")
+
+        manager = LegacyProjectManager()
+        path = temp_dir / "topology.json"
+        manager.save(network, path)
+        loaded = manager.load(path)
+
+        switch = next(n for n in loaded.nodes.values() if n.node_type == NodeType.SWITCH)
+        host = loaded.add_node(NodeType.HOST, Position(100, 0))
+        link = loaded.add_link(host.id, switch.id)
+        assert self._host_ip(loaded, link) == "192.168.9.3"
@@ -0,0 +1,113 @@
+"""
+Unit tests for the link load heatmap data.
+
+Tests:
+- Binned per-link trace counters and window sums
+- Utilization and drop rate from trace counters
+- Sliding window over live metric snapshots
+- ns-3 data rate strings
+"""
+
+import pytest
+
+from services.link_load import (
+    HeatmapMetric, LiveLinkLoad, LIVE_QUEUE_PACKETS, parse_data_rate, trace_link_loads
+)
+from services.results_parser import MetricsSnapshot
+from services.trace_player import LinkCounters, PacketEvent, PacketEventType, TraceMap, TracePlayer
+
+MS = 1_000_000
+
+
+def _events(start_ns=0):
+    """100 x 1250-byte packets host1 -> host2 over 100 ms, then 10 drops."""
+    events = [
+        PacketEvent(time_ns=start_ns + i * MS, event_type=PacketEventType.TX,
+                    node_id=0, packet_size=1250)
+        for i in range(100)
+    ]
+    events += [
+        PacketEvent(time_ns=start_ns + (90 + i) * MS, event_type=PacketEventType.DROP, node_id=1)
+        for i in range(10)
+    ]
+    return sorted(events, key=lambda e: e.time_ns)
+
+
+def _trace_map():
+    return TraceMap(node_ids=["host1", "host2"], link_ends={"link1": (0, 1)})
+
+
+class TestLinkCounters:
+    """Tests for time-binned per-link trace counters."""
+
+    def test_window_sums(self):
+        """Test windows add up whole bins per link and direction."""
+        counters = LinkCounters.from_events(_events(), _trace_map(), bin_ns=10 * MS)
+
+        covered, totals = counters.window(99 * MS, 100 * MS)
+        assert covered == 100 * MS
+        assert totals == {"link1": (125000, 0, 100, 10)}
+
+        covered, totals = counters.window(19 * MS, 10 * MS)
+        assert covered == 10 * MS
+        assert totals["link1"][:3] == (12500, 0, 10)
+
+        # Before the trace there is nothing; early windows are clipped
+        assert counters.window(-1, 10 * MS) == (0, {})
+        assert counters.window(5 * MS, 100 * MS)[0] == 10 * MS
+
+    def test_player_caches_per_map(self):
+        """Test the player bins once per trace map and rebins on reload."""
+        player = TracePlayer()
+        player.load_events(_events())
+        trace_map = _trace_map()
+
+        counters = player.link_counters(trace_map)
+        assert player.link_counters(trace_map) is counters
+        assert counters.link_ids == ["link1"]
+
+        player.load_events(_events(start_ns=5 * MS))
+        assert player.link_counters(trace_map) is not counters
+
+
+class TestLinkLoads:
+    """Tests for utilization and drop rate over a window."""
+
+    def test_trace_loads(self, simple_network):
+        """Test utilization against the link rate and drop share."""
+        simple_network.links["link1"].data_rate = "100Mbps"
+        counters = LinkCounters.from_events(_events(), _trace_map(), bin_ns=10 * MS)
+
+        loads = trace_link_loads(counters, simple_network, 0.099, window_s=0.1)
+
+        # 1 Mbit in 0.1 s on a 100 Mbps link
+        assert loads["link1"].utilization == pytest.approx(0.1)
+        assert loads["link1"].value(HeatmapMetric.DROP_RATE) == pytest.approx(10 / 110)
+
+        simple_network.links["link1"].data_rate = "5Mbps"
+        loads = trace_link_loads(counters, simple_network, 0.099, window_s=0.1)
+        assert loads["link1"].utilization == 1.0  # Clamped
+
+    def test_live_window(self):
+        """Test live loads average queue depth over the sliding window."""
+        live = LiveLinkLoad(window_s=0.25)
+        for i, depth in enumerate([100, 50, 50, 0]):
+            queues = {"link1": depth} if depth else {}
+            live.add_snapshot(MetricsSnapshot(time=0.1 * (i + 1), interval=0.1, queues=queues))
+
+        # 0.4 s: the 0.2 s and 0.3 s snapshots are still in the window
+        assert len(live) == 3
+        assert live.loads()["link1"].utilization == pytest.approx(100 / 3 / LIVE_QUEUE_PACKETS)
+
+        live.window_s = 0.01
+        assert live.loads() == {}  # Only the latest snapshot, which had no queue
+        live.clear()
+        assert live.loads() == {}
+
+    def test_parse_data_rate(self):
+        """Test ns-3 rate strings in bits per second."""
+        assert parse_data_rate("100Mbps") == 100e6
+        assert parse_data_rate("5Mb/s") == 5e6
+        assert parse_data_rate("19200bps") == 19200
+        assert parse_data_rate("1KiBps") == 8192
+        assert parse_data_rate("fast") == 0.0
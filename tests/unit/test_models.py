@@ -7,6 +7,7 @@ Tests:
 - NetworkModel operations (add/remove nodes/links)
 - Port configuration
 - Routing table management
+- Cached shortest-path trees
 """
 
 import pytest
@@ -14,6 +15,8 @@ from models.network import (
     NetworkModel, NodeModel, LinkModel, NodeType, Position, 
     PortConfig, PortType, MediumType, RouteEntry, RoutingMode
 )
+from models.connectivity import ShortestPathTrees
+from models.ipam import IPAddressManager
 
 
 class TestNodeModel:
@@ -205,6 +208,320 @@ class TestNetworkModel:
         assert simple_network.get_link("nonexistent") is None
 
 
+class TestNetworkIndexes:
+    """Tests for NetworkModel adjacency, port and name indexes."""
+
+    def _star(self, network, spokes=3):
+        hub = network.add_node(NodeType.ROUTER, Position(0, 0))
+        hosts = [network.add_node(NodeType.HOST, Position(i * 50, 100)) for i in range(spokes)]
+        links = [network.add_link(hub.id, host.id) for host in hosts]
+        return hub, hosts, links
+
+    def test_links_and_neighbors(self, empty_network):
+        """Test adjacency queries follow add_link."""
+        hub, hosts, links = self._star(empty_network)
+
+        assert [l.id for l in empty_network.get_links_for_node(hub.id)] == [l.id for l in links]
+        assert empty_network.get_neighbors(hub.id) == [h.id for h in hosts]
+        assert empty_network.get_degree(hosts[0].id) == 1
+        assert empty_network.find_link_between(hosts[1].id, hub.id) is links[1]
+        assert empty_network.find_link_between(hosts[0].id, hosts[1].id) is None
+
+    def test_find_link_by_ports(self, simple_network):
+        """Test port-pair lookup and duplicate rejection."""
+        link = simple_network.links["link1"]
+
+        assert simple_network.find_link_by_ports(link.target_port_id, link.source_port_id) is link
+        assert simple_network.add_link(
+            "host1", "host2", link.source_port_id, link.target_port_id
+        ) is None
+
+    def test_direct_dict_writes(self, simple_network):
+        """Test indexes stay consistent when loaders write the dicts directly."""
+        assert simple_network.get_neighbors("host1") == ["host2"]
+
+        del simple_network.links["link1"]
+        assert simple_network.get_links_for_node("host1") == []
+
+        host3 = NodeModel(id="host3", node_type=NodeType.HOST, name="Host 3")
+        simple_network.nodes.update({host3.id: host3})
+        simple_network.links["link2"] = LinkModel(
+            id="link2", source_node_id="host1", target_node_id="host3"
+        )
+        assert simple_network.get_neighbors("host3") == ["host1"]
+        assert simple_network.find_node_by_name("Host 3") is host3
+
+    def test_remove_node_removes_links(self, empty_network):
+        """Test removing a node drops its incident links from the indexes."""
+        hub, hosts, _ = self._star(empty_network)
+
+        empty_network.remove_node(hub.id)
+
+        assert len(empty_network.links) == 0
+        assert all(empty_network.get_degree(h.id) == 0 for h in hosts)
+
+    def test_in_place_changes(self, empty_network):
+        """Test lookups follow reported renames and ports added later."""
+        node = empty_network.add_node(NodeType.ROUTER, Position(0, 0))
+        old_name = node.name
+        node.name = "core"
+        empty_network.notify_changed("node", node.id)
+        port = node.add_port()
+
+        assert empty_network.find_node_by_name("core") is node
+        assert empty_network.find_node_by_name(old_name) is None
+        assert empty_network.find_node_by_name("edge") is None
+        assert empty_network.find_port(port.id) == (node, port)
+        assert node.get_port(port.id) is port
+        assert empty_network.find_port("missing") is None
+
+    def test_repeated_names(self, empty_network):
+        """Test a rename hands a shared name to the next node that has it."""
+        first = NodeModel(node_type=NodeType.HOST, name="edge")
+        second = NodeModel(node_type=NodeType.HOST, name="edge")
+        empty_network.nodes[first.id] = first
+        empty_network.nodes[second.id] = second
+
+        assert empty_network.find_node_by_name("edge") is first
+        first.name = "core"
+        empty_network.notify_changed("node", first.id)
+        assert empty_network.find_node_by_name("edge") is second
+        del empty_network.nodes[second.id]
+        assert empty_network.find_node_by_name("edge") is None
+
+    def test_find_port_keeps_ports_lazy(self, empty_network):
+        """Test port lookups don't create other nodes' default ports."""
+        lazy = empty_network.add_node(NodeType.ROUTER, Position(0, 0))
+        node = empty_network.add_node(NodeType.HOST, Position(100, 0))
+        port = node.ports[0]
+
+        assert empty_network.find_port(port.id) == (node, port)
+        assert empty_network.find_port("missing") is None
+        assert not lazy.has_ports_materialized
+
+    def test_rewire_link(self, empty_network):
+        """Test moving a link end updates ports and adjacency."""
+        hub, hosts, links = self._star(empty_network)
+        link = links[0]
+        old_port = hosts[0].get_port(link.target_port_id)
+        spare = empty_network.add_node(NodeType.HOST, Position(0, 200))
+
+        assert empty_network.rewire_link(link.id, target_node_id=spare.id)
+
+        assert link.target_node_id == spare.id
+        assert not old_port.is_connected
+        assert spare.get_port_for_link(link.id) is not None
+        assert empty_network.get_degree(hosts[0].id) == 0
+        assert empty_network.find_link_between(hub.id, spare.id) is link
+        assert not empty_network.rewire_link(link.id, target_node_id="missing")
+
+    def test_wifi_type_change(self, empty_network):
+        """Test a notified switch to a WiFi type joins the shared channel."""
+        ap = empty_network.add_node(NodeType.ACCESS_POINT, Position(0, 0))
+        host = empty_network.add_node(NodeType.HOST, Position(100, 0))
+        assert not empty_network.are_connected(ap.id, host.id)
+
+        host.node_type = NodeType.STATION
+        empty_network.notify_changed("node", host.id)
+        assert empty_network.are_connected(ap.id, host.id)
+
+        host.node_type = NodeType.HOST
+        empty_network.notify_changed("node", host.id)
+        assert not empty_network.are_connected(ap.id, host.id)
+
+    def test_rewire_keeps_adjacency_order(self, empty_network):
+        """Test a rewired link keeps its interface position on the node it stays on."""
+        hub, hosts, links = self._star(empty_network)
+        spare = empty_network.add_node(NodeType.HOST, Position(0, 200))
+        changed = []
+        empty_network.add_change_listener(lambda kind, object_id, obj: changed.append((kind, object_id)))
+
+        assert empty_network.rewire_link(links[0].id, target_node_id=spare.id)
+
+        assert empty_network.get_links_for_node(hub.id) == links
+        assert ("link", links[0].id) in changed
+        assert ("node", hosts[0].id) in changed
+        assert empty_network.are_connected(hub.id, spare.id)
+        assert not empty_network.are_connected(hub.id, hosts[0].id)
+
+    def test_components(self, empty_network):
+        """Test connectivity follows link adds, removals and the WiFi channel."""
+        hub, hosts, links = self._star(empty_network)
+        lone = empty_network.add_node(NodeType.HOST, Position(0, 300))
+
+        assert empty_network.are_connected(hosts[0].id, hosts[2].id)
+        assert not empty_network.are_connected(hub.id, lone.id)
+        assert empty_network.component_count() == 2
+
+        empty_network.remove_link(links[1].id)
+        assert not empty_network.are_connected(hub.id, hosts[1].id)
+        assert empty_network.get_components()[0] == [hub.id, hosts[0].id, hosts[2].id]
+
+        station = empty_network.add_node(NodeType.STATION, Position(0, 400))
+        ap = empty_network.add_node(NodeType.ACCESS_POINT, Position(50, 400))
+        assert empty_network.are_connected(station.id, ap.id)
+
+    def test_shortest_path_trees(self, empty_network):
+        """Test cached paths to a target and their invalidation on link edits."""
+        routers = [empty_network.add_node(NodeType.ROUTER, Position(i * 100, 0)) for i in range(4)]
+        a, b, c, d = (node.id for node in routers)
+        chain = [empty_network.add_link(x.id, y.id) for x, y in zip(routers, routers[1:])]
+        paths = ShortestPathTrees(empty_network)
+
+        assert paths.path_links(a, d) == [link.id for link in chain]
+        assert paths.path_nodes(a, d) == [a, b, c, d]
+        assert paths.tree_links(b) == {link.id for link in chain}
+        assert paths.tree(d) is paths.tree(d)  # Memoized
+
+        shortcut = empty_network.add_link(a, d)
+        assert paths.path_links(a, d) == [shortcut.id]
+
+        empty_network.remove_link(shortcut.id)
+        empty_network.remove_link(chain[1].id)
+        assert paths.path_links(a, d) == []
+        assert paths.path_links(a, a) == []
+
+        paths.detach()
+
+    def test_clear_resets_indexes(self, empty_network):
+        """Test clear() empties the indexes."""
+        hub, _, _ = self._star(empty_network)
+
+        empty_network.clear()
+
+        assert empty_network.get_links_for_node(hub.id) == []
+        assert empty_network.find_node_by_name(hub.name) is None
+
+
+class TestNetworkBatch:
+    """Tests for NetworkModel.batch() bulk building."""
+
+    def test_batch_builds_and_indexes(self, empty_network):
+        """Test batched nodes and links are indexed and addressed on commit."""
+        with empty_network.batch() as batch:
+            core = batch.add_node(NodeType.ROUTER)
+            hosts = [batch.add_node(NodeType.HOST, Position(i, 0)) for i in range(10)]
+            links = batch.add_links((core.id, host.id) for host in hosts)
+
+        assert len(empty_network.nodes) == 11
+        assert empty_network.get_degree(core.id) == 10
+        assert empty_network.find_link_between(hosts[3].id, core.id) is links[3]
+        port = hosts[0].get_port(links[0].target_port_id)
+        assert port.connected_link_id == links[0].id
+        assert port.ip_address
+
+    def test_ports_grow_on_demand(self, empty_network):
+        """Test nodes get extra ports when a batch runs out."""
+        router = empty_network.add_node(NodeType.ROUTER, Position(0, 0))
+        default_ports = len(router.ports)
+
+        with empty_network.batch() as batch:
+            for _ in range(default_ports + 3):
+                batch.add_link(router.id, batch.add_node(NodeType.HOST).id)
+
+        assert len(router.ports) == default_ports + 3
+        assert empty_network.find_port(router.ports[-1].id) == (router, router.ports[-1])
+
+    def test_no_growth_raises(self, empty_network):
+        """Test grow_ports=False rejects links beyond the port count."""
+        with pytest.raises(ValueError):
+            with empty_network.batch(grow_ports=False) as batch:
+                host = batch.add_node(NodeType.HOST)
+                for _ in range(len(host.ports) + 1):
+                    batch.add_link(host.id, batch.add_node(NodeType.HOST).id)
+
+    def test_rollback_on_error(self, simple_network):
+        """Test a failing batch leaves the model unchanged."""
+        router = NodeModel(id="router1", node_type=NodeType.ROUTER)
+        simple_network.nodes[router.id] = router
+        with pytest.raises(ValueError):
+            with simple_network.batch() as batch:
+                node = batch.add_node(NodeType.ROUTER)
+                batch.add_link(node.id, router.id)
+                batch.add_link(node.id, "missing")
+
+        assert set(simple_network.nodes) == {"host1", "host2", "router1"}
+        assert list(simple_network.links) == ["link1"]
+        assert all(not port.is_connected for port in router.ports)
+        assert simple_network.get_degree(router.id) == 0
+
+    def test_rollback_on_commit_error(self, empty_network):
+        """Test running out of addresses on commit rolls the whole batch back."""
+        empty_network.ipam = IPAddressManager(p2p_pool="10.0.0.0/29")  # Two /30 subnets
+        router = empty_network.add_node(NodeType.ROUTER, Position(0, 0))
+        calls = []
+        empty_network.add_topology_listener(calls.append)
+
+        with pytest.raises(ValueError, match="exhausted"):
+            with empty_network.batch() as batch:
+                hosts = [batch.add_node(NodeType.HOST) for _ in range(3)]
+                batch.add_links((router.id, host.id) for host in hosts)
+
+        assert list(empty_network.nodes) == [router.id]
+        assert not empty_network.links
+        assert empty_network.ipam.allocations == {}
+        assert all(not port.is_connected and not port.ip_address for port in router.ports)
+        assert empty_network.get_degree(router.id) == 0
+        assert empty_network.find_port(hosts[0].ports[0].id) is None
+        assert calls == []
+
+        # The released subnets are available again
+        host = empty_network.add_node(NodeType.HOST, Position(100, 0))
+        link = empty_network.add_link(router.id, host.id)
+        assert host.get_port(link.target_port_id).ip_address == "10.0.0.2"
+
+    def test_single_notification(self, empty_network):
+        """Test listeners hear about a batch once."""
+        calls = []
+        empty_network.add_topology_listener(calls.append)
+
+        with empty_network.batch() as batch:
+            nodes = [batch.add_node(NodeType.ROUTER) for _ in range(5)]
+            batch.add_links((a.id, b.id) for a, b in zip(nodes, nodes[1:]))
+
+        assert calls == [empty_network]
+        with pytest.raises(RuntimeError):
+            with empty_network.batch():
+                with empty_network.batch():
+                    pass
+
+
+class TestCompactModels:
+    """Tests for memory-compact model objects."""
+
+    def test_slotted(self):
+        """Test model objects have no per-instance __dict__."""
+        node = NodeModel(node_type=NodeType.ROUTER)
+        for obj in (node, node.ports[0], LinkModel(), node.position, RouteEntry()):
+            assert not hasattr(obj, "__dict__")
+
+    def test_default_ports_are_lazy(self, empty_network):
+        """Test default ports are created on first access only."""
+        node = empty_network.add_node(NodeType.SWITCH, Position(0, 0))
+        assert not node.has_ports_materialized
+
+        ports = node.ports
+
+        assert node.has_ports_materialized
+        assert len(ports) == 8 and node.ports is ports
+        assert empty_network.find_port(ports[3].id) == (node, ports[3])
+
+    def test_port_names_shared(self):
+        """Test default port names are interned across nodes."""
+        a, b = NodeModel(node_type=NodeType.ROUTER), NodeModel(node_type=NodeType.ROUTER)
+        assert a.ports[1].port_name is b.ports[1].port_name
+
+    def test_benchmark_budget(self):
+        """Test the memory benchmark runs and stays within budget."""
+        from benchmark_memory import run_benchmark
+
+        results = run_benchmark(count=500)
+
+        assert results["node host (ports unused)"] < 700
+        assert results["node router"] < 2000
+        assert results["link p2p"] < 1500
+
+
 class TestPortConfig:
     """Tests for PortConfig class."""
     
@@ -0,0 +1,277 @@
+"""
+Unit tests for simulation output parsing.
+
+Tests:
+- METRICS| snapshot line parsing
+- Snapshot aggregate properties
+- SimulationRunner routing of snapshot lines
+- Compact CSV/binary flow result round trips
+- Merging per-rank results of distributed runs
+"""
+
+import pytest
+from models.simulation import SimulationConfig, ResultsFormat, LARGE_RUN_NODE_COUNT
+from services.ns3_generator import NS3ScriptGenerator
+from models import FlowStats
+from services.results_parser import (
+    MetricsSnapshot, METRICS_PREFIX, ResultsParser,
+    FLOWSTATS_BINARY_FILE, FLOWSTATS_CSV_FILE, ADDRESS_RANKS_FILE, RANK_RX_FILE, RANK_RX_COLUMNS
+)
+from services.simulation_runner import SimulationRunner
+
+
+SAMPLE_LINE = (
+    'METRICS|{"t":2.0,"dt":1.0,'
+    '"flows":{"1":[10,8,10240,8192,40.0,2],"2":[5,4,500,400,8.0,0]},'
+    '"queues":{"link1":3}}'
+)
+
+
+class TestMetricsSnapshot:
+    """Tests for MetricsSnapshot parsing."""
+    
+    def test_parse_line(self):
+        """Test parsing a snapshot line."""
+        snapshot = MetricsSnapshot.parse_line(SAMPLE_LINE)
+        
+        assert snapshot.time == 2.0
+        assert snapshot.interval == 1.0
+        assert len(snapshot.flows) == 2
+        assert snapshot.flows[0].flow_id == 1
+        assert snapshot.flows[0].rx_bytes == 8192
+        assert snapshot.queues == {"link1": 3}
+    
+    def test_aggregates(self):
+        """Test interval throughput, delay and loss."""
+        snapshot = MetricsSnapshot.parse_line(SAMPLE_LINE)
+        
+        assert snapshot.throughput_kbps == pytest.approx((8192 + 400) * 8 / 1000)
+        assert snapshot.mean_delay_ms == pytest.approx(48.0 / 12)
+        assert snapshot.loss_percent == pytest.approx(2 / 15 * 100)
+    
+    def test_ignores_other_lines(self):
+        """Test non-metric and malformed lines return None."""
+        assert MetricsSnapshot.parse_line("Flow 1 (UDP)") is None
+        assert MetricsSnapshot.parse_line(METRICS_PREFIX + "{not json") is None
+    
+    def test_empty_interval(self):
+        """Test a snapshot with no flow activity."""
+        snapshot = MetricsSnapshot.parse_line('METRICS|{"t":1.0,"dt":1.0,"flows":{},"queues":{}}')
+        
+        assert snapshot.throughput_kbps == 0.0
+        assert snapshot.mean_delay_ms == 0.0
+        assert snapshot.loss_percent == 0.0
+
+
+class TestRunnerMetrics:
+    """Tests for SimulationRunner handling of snapshot lines."""
+    
+    def test_snapshot_lines_emit_metrics(self):
+        """Test snapshot lines go to the metrics signal, not the console."""
+        runner = SimulationRunner()
+        snapshots, lines = [], []
+        runner.metrics.connect(snapshots.append)
+        runner.output_line.connect(lines.append)
+        
+        runner._handle_stdout_line(SAMPLE_LINE)
+        runner._handle_stdout_line("Simulation completed successfully.")
+        
+        assert len(snapshots) == 1
+        assert lines == ["Simulation completed successfully."]
+
+
+class _FakeTime:
+    def __init__(self, ns):
+        self._ns = ns
+    
+    def GetNanoSeconds(self):
+        return self._ns
+
+
+class _FakeAddress:
+    def __init__(self, value):
+        self._value = value
+    
+    def Get(self):
+        return self._value
+
+
+class _FakeHistogram:
+    def __init__(self, bins):
+        self._bins = bins  # [(start_seconds, count)]
+    
+    def GetNBins(self):
+        return len(self._bins)
+    
+    def GetBinStart(self, i):
+        return self._bins[i][0]
+    
+    def GetBinCount(self, i):
+        return self._bins[i][1]
+
+
+class _FakeFlowStats:
+    txPackets, rxPackets, txBytes, rxBytes = 100, 90, 102400, 92160
+    delaySum = _FakeTime(450_000_000)
+    jitterSum = _FakeTime(9_000_000)
+    lostPackets, timesForwarded = 10, 90
+    timeFirstTxPacket = _FakeTime(1_000_000_000)
+    timeLastRxPacket = _FakeTime(9_000_000_000)
+    delayHistogram = _FakeHistogram([(0.0005, 40), (0.0025, 45), (0.050, 5)])
+
+
+class _FakeTuple:
+    sourceAddress = _FakeAddress(0x0A000001)       # 10.0.0.1
+    destinationAddress = _FakeAddress(0x0A000002)  # 10.0.0.2
+    sourcePort, destinationPort, protocol = 49153, 9, 17
+
+
+class _FakeClassifier:
+    def FindFlow(self, flow_id):
+        return _FakeTuple()
+
+
+class _FakeFlowMonitor:
+    def CheckForLostPackets(self):
+        pass
+    
+    def GetFlowStats(self):
+        return [(1, _FakeFlowStats())]
+
+
+class _FakeFlowHelper:
+    def GetClassifier(self):
+        return _FakeClassifier()
+
+
+def _write_compact_results(output_dir, results_format):
+    """Run the generated compact results block against a fake FlowMonitor."""
+    config = SimulationConfig(results_format=results_format, delay_histogram_bins=4)
+    lines = NS3ScriptGenerator()._generate_compact_results(config, str(output_dir), results_format)
+    code = "import sys\n" + "\n".join(line[4:] for line in lines)
+    exec(code, {"flow_monitor": _FakeFlowMonitor(), "flow_helper": _FakeFlowHelper()})
+
+
+class TestCompactFlowResults:
+    """Tests for reading compact flow result files."""
+    
+    def _check_flow(self, flows):
+        assert len(flows) == 1
+        flow = flows[0]
+        assert flow.flow_id == 1
+        assert flow.source_address == "10.0.0.1"
+        assert flow.destination_address == "10.0.0.2"
+        assert flow.protocol_name == "UDP"
+        assert flow.rx_packets == 90
+        assert flow.lost_packets == 10
+        assert flow.delay_sum_ns == 450_000_000
+        assert flow.delay_histogram == [40, 0, 45, 5]  # 50 ms overflows into the last bin
+    
+    def test_binary_round_trip(self, temp_dir):
+        """Test the generated binary writer and the parser agree."""
+        _write_compact_results(temp_dir, ResultsFormat.BINARY)
+        path = temp_dir / FLOWSTATS_BINARY_FILE
+        
+        self._check_flow(ResultsParser().parse_flowstats_binary(str(path)))
+    
+    def test_binary_columns(self, temp_dir):
+        """Test columnar access without building FlowStats objects."""
+        _write_compact_results(temp_dir, ResultsFormat.BINARY)
+        columns = ResultsParser().read_flowstats_columns(str(temp_dir / FLOWSTATS_BINARY_FILE))
+        
+        assert list(columns["rx_bytes"]) == [92160]
+        assert columns["histogram_bins"] == 4
+    
+    def test_csv_round_trip(self, temp_dir):
+        """Test the generated CSV writer and the parser agree."""
+        _write_compact_results(temp_dir, ResultsFormat.CSV)
+        path = temp_dir / FLOWSTATS_CSV_FILE
+        
+        self._check_flow(ResultsParser().parse_flowstats_csv(str(path)))
+    
+    def test_rejects_other_files(self, temp_dir):
+        """Test a non-flowstats file yields no flows."""
+        path = temp_dir / FLOWSTATS_BINARY_FILE
+        path.write_bytes(b"<xml/>")
+        
+        assert ResultsParser().parse_flowstats_binary(str(path)) == []
+    
+    def test_auto_format_resolution(self):
+        """Test AUTO picks binary only for large runs."""
+        config = SimulationConfig()
+        assert config.resolve_results_format(10) == ResultsFormat.XML
+        assert config.resolve_results_format(LARGE_RUN_NODE_COUNT) == ResultsFormat.BINARY
+
+
+class TestMergeFlowStats:
+    """Tests for merging the flow results of MPI ranks."""
+    
+    def _flow(self, **counters):
+        return FlowStats(
+            flow_id=1, source_address="10.1.1.1", destination_address="10.2.2.2",
+            source_port=49153, destination_port=9, protocol=17, **counters
+        )
+    
+    def test_two_rank_split_flow(self, temp_dir):
+        """Test a cross-rank flow takes its rx side from the destination rank's counters."""
+        # Rank 0 sent everything and, never seeing receptions, counts it all lost;
+        # rank 1's FlowMonitor ignores packets it never saw sent, so it has no record
+        source_rank = self._flow(tx_packets=100, tx_bytes=102400, lost_packets=100,
+                                 first_tx_time_ns=1_000_000_000)
+        (temp_dir / "rank1").mkdir()
+        (temp_dir / RANK_RX_FILE).write_text(",".join(RANK_RX_COLUMNS) + "\n")
+        (temp_dir / "rank1" / RANK_RX_FILE).write_text(
+            ",".join(RANK_RX_COLUMNS) + "\n"
+            + "10.1.1.1,10.2.2.2,49153,9,17,95,97280,950000000,19000000,2000000000\n"
+        )
+        parser = ResultsParser()
+        rank_rx = parser.parse_rank_rx([
+            str(temp_dir / RANK_RX_FILE), str(temp_dir / "rank1" / RANK_RX_FILE)
+        ])
+        
+        merged = parser.merge_flow_stats(
+            [[source_rank], []], {"10.1.1.1": 0, "10.2.2.2": 1}, rank_rx
+        )
+        
+        assert len(merged) == 1
+        flow = merged[0]
+        assert (flow.tx_packets, flow.rx_packets, flow.lost_packets) == (100, 95, 5)
+        assert flow.tx_bytes == 102400 and flow.rx_bytes == 97280
+        assert flow.mean_delay_ms == pytest.approx(10.0)
+        assert flow.jitter_sum_ns == 19_000_000
+        assert flow.last_rx_time_ns == 2_000_000_000
+        assert flow.throughput_mbps > 0
+        assert not flow.partial
+    
+    def test_counted_cross_rank_loss_is_real(self):
+        """Test a cross-rank flow with reception counters but no receptions is 100% loss."""
+        sent_only = self._flow(tx_packets=100, tx_bytes=102400, lost_packets=100)
+        merged = ResultsParser().merge_flow_stats(
+            [[sent_only], []], {"10.1.1.1": 0, "10.2.2.2": 1}, rank_rx=[]
+        )
+        
+        assert not merged[0].partial
+        assert merged[0].lost_packets == 100
+    
+    def test_unseen_receptions_are_partial(self, temp_dir):
+        """Test a cross-rank flow nobody saw received isn't reported as 100% loss."""
+        (temp_dir / "rank1").mkdir()
+        (temp_dir / ADDRESS_RANKS_FILE).write_text('{"10.1.1.1": 0}')
+        (temp_dir / "rank1" / ADDRESS_RANKS_FILE).write_text('{"10.2.2.2": 1}')
+        parser = ResultsParser()
+        address_ranks = parser.parse_address_ranks([
+            str(temp_dir / ADDRESS_RANKS_FILE), str(temp_dir / "rank1" / ADDRESS_RANKS_FILE)
+        ])
+        assert address_ranks == {"10.1.1.1": 0, "10.2.2.2": 1}
+        
+        # Scripts without reception counters (no rank_rx.csv)
+        sent_only = self._flow(tx_packets=100, tx_bytes=102400, lost_packets=100)
+        merged = parser.merge_flow_stats([[sent_only], []], address_ranks)
+        
+        assert merged[0].partial
+        assert merged[0].lost_packets == 0
+        
+        # Both ends on one rank: its loss is real
+        local = parser.merge_flow_stats([[sent_only], []], {"10.1.1.1": 0, "10.2.2.2": 0})
+        assert not local[0].partial
+        assert local[0].lost_packets == 100
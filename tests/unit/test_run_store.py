@@ -0,0 +1,99 @@
+"""
+Unit tests for the SQLite run history store.
+
+Tests:
+- Delay percentiles from FlowMonitor histograms
+- Recording runs with parameters and per-flow stats
+- Cross-run flow history and comparison queries
+"""
+
+import pytest
+
+from models import FlowStats, SimulationResults
+from services.run_store import RunStore, flow_key
+
+
+def _flow(flow_id=1, rx_packets=100, delay_ms=2.0, histogram=None, dst_port=9):
+    return FlowStats(
+        flow_id=flow_id,
+        source_address="10.1.1.1", destination_address="10.1.1.2",
+        source_port=49153, destination_port=dst_port, protocol=17,
+        tx_packets=rx_packets, rx_packets=rx_packets,
+        tx_bytes=rx_packets * 512, rx_bytes=rx_packets * 512,
+        delay_sum_ns=int(delay_ms * 1e6) * rx_packets,
+        first_tx_time_ns=1_000_000_000, last_rx_time_ns=2_000_000_000,
+        delay_histogram=histogram or [], delay_histogram_bin_ms=1.0 if histogram else 0.0,
+    )
+
+
+def _results(*flows, success=True):
+    return SimulationResults(success=success, flow_stats=list(flows))
+
+
+class TestDelayPercentiles:
+    """Tests for FlowStats.delay_percentile_ms()."""
+
+    def test_interpolates_within_bin(self):
+        """Test percentiles land inside the right histogram bin."""
+        flow = _flow(histogram=[0, 50, 40, 10])
+
+        assert flow.delay_percentile_ms(0.5) == pytest.approx(2.0)
+        assert flow.delay_percentile_ms(0.7) == pytest.approx(2.5)
+        assert 3.0 < flow.delay_percentile_ms(0.99) <= 4.0
+
+    def test_no_histogram(self):
+        """Test flows without a histogram have no percentiles."""
+        assert _flow().delay_percentile_ms(0.99) is None
+
+
+class TestRunStore:
+    """Tests for recording and querying runs."""
+
+    def test_record_and_read_back(self, temp_dir):
+        """Test a run's parameters and flow stats round-trip."""
+        with RunStore(temp_dir / "runs.sqlite") as store:
+            store.record_run("run_1", _results(_flow(histogram=[10, 80, 10])), {"duration": 10.0, "seed": 3})
+
+            runs = store.list_runs()
+            assert [run["id"] for run in runs] == ["run_1"]
+            assert runs[0]["status"] == "success" and runs[0]["flow_count"] == 1
+            assert store.get_parameters("run_1") == {"duration": 10.0, "seed": 3}
+
+            stats = store.run_flow_stats("run_1")
+            assert stats[0]["key"] == "UDP 10.1.1.1:49153 -> 10.1.1.2:9"
+            assert stats[0]["histogram"] == [10, 80, 10]
+            assert stats[0]["p50_delay_ms"] == pytest.approx(1.5)
+
+    def test_rerecord_replaces_run(self, temp_dir):
+        """Test recording a run ID again replaces its rows."""
+        with RunStore(temp_dir / "runs.sqlite") as store:
+            store.record_run("run_1", _results(_flow(), _flow(2, dst_port=10)), {"a": 1})
+            store.record_run("run_1", _results(_flow()), {"b": 2})
+
+            assert len(store.run_flow_stats("run_1")) == 1
+            assert store.get_parameters("run_1") == {"b": 2}
+
+    def test_flow_history_and_comparison(self, temp_dir):
+        """Test one flow's metric across runs and a per-run comparison."""
+        path = temp_dir / "runs.sqlite"
+        with RunStore(path) as store:
+            for i in range(5):
+                flows = [_flow(delay_ms=1.0 + i)]
+                if i % 2 == 0:
+                    flows.append(_flow(2, dst_port=10))
+                store.record_run(f"run_{i}", _results(*flows), timestamp=f"2024-01-01T00:00:0{i}")
+            store.record_run("run_failed", _results(success=False), timestamp="2024-01-01T00:00:09")
+
+        with RunStore(path) as store:
+            key = flow_key(_flow())
+            history = store.flow_history(key, "mean_delay_ms", last=3)
+            assert [run_id for run_id, _, _ in history] == ["run_2", "run_3", "run_4"]
+            assert [value for _, _, value in history] == pytest.approx([3.0, 4.0, 5.0])
+
+            table = store.compare_runs(["run_0", "run_1"], "rx_packets")
+            assert table[key] == {"run_0": 100, "run_1": 100}
+            assert table[flow_key(_flow(dst_port=10))] == {"run_0": 100}
+            assert store.list_runs(limit=1)[0]["status"] == "failed"
+
+            with pytest.raises(ValueError):
+                store.flow_history(key, "rx_packets; DROP TABLE runs")
@@ -9,14 +9,18 @@ Tests:
 - IP addressing
 - Traffic flow generation
 - FlowMonitor setup
+- Trace map of ns-3 indices to GUI nodes and links
 """
 
 import pytest
 from tests.conftest import assert_valid_python, assert_contains_all
 
-from models.network import NetworkModel, NodeModel, LinkModel, NodeType, Position
-from models.simulation import SimulationConfig, TrafficFlow, TrafficProtocol, TrafficApplication
+from models.network import NetworkModel, NodeModel, LinkModel, NodeType, Position, ChannelType
+from models.simulation import (
+    SimulationConfig, TrafficFlow, TrafficProtocol, TrafficApplication, TraceFormat, ResultsFormat
+)
 from services.ns3_generator import NS3ScriptGenerator, generate_ns3_script
+from services.trace_player import TraceMap, TRACE_MAP_FILE, PacketEvent, PacketEventType
 
 
 class TestScriptGeneration:
@@ -257,6 +261,181 @@ class TestScriptValidation:
             pass  # Expected behavior
 
 
+class TestSelectiveTracing:
+    """Tests for per-link/node trace scoping."""
+    
+    def test_default_traces_all_devices(self, script_generator, simple_network, basic_sim_config):
+        """Test tracing falls back to EnableAsciiAll with no selection."""
+        script = script_generator.generate(simple_network, basic_sim_config)
+        
+        assert "EnableAsciiAll" in script
+        assert "trace_helper" not in script
+    
+    def test_link_selection(self, script_generator, simple_network, basic_sim_config):
+        """Test a selected link gets targeted pcap calls only."""
+        basic_sim_config.enable_pcap = True
+        basic_sim_config.trace.link_formats["link1"] = TraceFormat.PCAP
+        script = script_generator.generate(simple_network, basic_sim_config)
+        
+        assert_valid_python(script)
+        assert "EnableAsciiAll" not in script
+        assert "EnablePcapAll" not in script
+        assert "EnablePcap('./capture', devices0.Get(0), False, False)" in script
+        assert "EnablePcap('./capture', devices0.Get(1), False, False)" in script
+    
+    def test_node_selection(self, script_generator, simple_network, basic_sim_config):
+        """Test a selected node traces only its own device."""
+        basic_sim_config.trace.node_formats["host2"] = TraceFormat.ASCII
+        script = script_generator.generate(simple_network, basic_sim_config)
+        
+        assert_valid_python(script)
+        assert "EnableAscii(ascii_stream, devices0.Get(1))" in script
+        assert "devices0.Get(0)" not in script.split("Setup Tracing")[1]
+    
+    def test_pkt_records_with_sampling(self, script_generator, simple_network, basic_sim_config):
+        """Test PKT records are sampled in trace sinks and only written to packets.pkt."""
+        basic_sim_config.trace.link_formats["link1"] = TraceFormat.PKT
+        basic_sim_config.trace.sample_rate = 0.25
+        basic_sim_config.trace.snap_length = 128
+        script = script_generator.generate(simple_network, basic_sim_config)
+        
+        assert_valid_python(script)
+        assert "gui_pkt.Open('./packets.pkt', 0.25)" in script
+        assert "ns.cppyy.gbl.gui_pkt.Watch(devices0.Get(0), 'link1', devices0.Get(1).GetNode().GetId())" in script
+        assert "CaptureSize', ns.UintegerValue(128)" in script
+        assert script.index("gui_pkt.Watch(") < script.index("gui_pkt.Close()")
+        # No full trace written first, no records echoed to stdout
+        assert "pkt-trace.tr" not in script
+        assert "print(record)" not in script
+
+
+class TestTraceMap:
+    """Tests for mapping trace events back to GUI nodes and links."""
+    
+    def test_script_writes_trace_map(self, script_generator, simple_network, basic_sim_config, temp_dir):
+        """Test the script records device indices next to the results."""
+        script = script_generator.generate(simple_network, basic_sim_config, str(temp_dir))
+        
+        assert_valid_python(script)
+        assert f"'{temp_dir.as_posix()}/{TRACE_MAP_FILE}'" in script
+        assert "('link1', devices0)" in script
+        trace_map = script_generator.trace_map()
+        assert trace_map.node_ids == ["host1", "host2"]
+        assert trace_map.link_ends == {"link1": (0, 1)}
+    
+    def test_resolve_link_and_direction(self, script_generator, simple_network, basic_sim_config, temp_dir):
+        """Test events map to their link and travel direction."""
+        script_generator.generate(simple_network, basic_sim_config, str(temp_dir))
+        data = script_generator.trace_map().to_dict()
+        data["devices"] = [[0, 1, "link1"], [1, 1, "link1"]]  # As written by the script
+        trace_map = TraceMap.from_dict(data)
+        
+        tx = PacketEvent(time_ns=0, event_type=PacketEventType.TX, node_id=1, device_id=1)
+        rx = PacketEvent(time_ns=0, event_type=PacketEventType.RX, node_id=1, device_id=1)
+        pkt = PacketEvent(time_ns=0, event_type=PacketEventType.DROP, node_id=0, link_id="link1")
+        unknown = PacketEvent(time_ns=0, event_type=PacketEventType.TX, node_id=7, device_id=1)
+        
+        assert trace_map.resolve(tx) == ("link1", "backward")
+        assert trace_map.resolve(rx) == ("link1", "forward")
+        assert trace_map.resolve(pkt) == ("link1", "forward")
+        assert trace_map.resolve(unknown) is None
+        assert trace_map.node_id(1) == "host2"
+    
+    def test_save_and_load(self, simple_network, temp_dir):
+        """Test a trace map round-trips through its file."""
+        trace_map = TraceMap.from_network(simple_network)
+        trace_map.devices[(0, 1)] = "link1"
+        trace_map.save(temp_dir / TRACE_MAP_FILE)
+        
+        loaded = TraceMap.load(temp_dir / TRACE_MAP_FILE)
+        assert loaded == trace_map
+        assert TraceMap.load(temp_dir / "missing.json") is None
+
+
+class TestMetricsSampler:
+    """Tests for periodic METRICS| snapshot generation."""
+    
+    def test_sampler_generated(self, script_generator, simple_network, basic_sim_config):
+        """Test the sampler runs between simulator steps."""
+        basic_sim_config.metrics_interval = 0.5
+        script = script_generator.generate(simple_network, basic_sim_config)
+        
+        assert_valid_python(script)
+        assert "def sample_metrics" in script
+        assert "metrics_interval = 0.5" in script
+        assert "('link1', devices0, ns.PointToPointNetDevice)" in script
+        assert "GetRootQueueDiscOnDevice(dev)" in script
+        assert "sample_metrics(force=True)" in script
+    
+    def test_sampler_casts_csma_devices(self, script_generator, simple_network, basic_sim_config):
+        """Test switch and CSMA links read the CSMA device queue and report failures."""
+        basic_sim_config.metrics_interval = 0.5
+        simple_network.links["link1"].channel_type = ChannelType.CSMA
+        script = script_generator.generate(simple_network, basic_sim_config)
+        
+        assert_valid_python(script)
+        assert "('link1', devices0, ns.CsmaNetDevice)" in script
+        assert "Queue depth unavailable" in script
+    
+    def test_sampler_disabled(self, script_generator, simple_network, basic_sim_config):
+        """Test a zero interval keeps the single Run() call."""
+        basic_sim_config.metrics_interval = 0
+        script = script_generator.generate(simple_network, basic_sim_config)
+        
+        assert_valid_python(script)
+        assert "sample_metrics" not in script
+    
+    def test_sampler_requires_flow_monitor(self, script_generator, simple_network, basic_sim_config):
+        """Test no sampler is emitted without FlowMonitor."""
+        basic_sim_config.enable_flow_monitor = False
+        script = script_generator.generate(simple_network, basic_sim_config)
+        
+        assert_valid_python(script)
+        assert "sample_metrics" not in script
+
+
+class TestCompactResults:
+    """Tests for compact CSV/binary flow result export."""
+    
+    def test_binary_replaces_xml(self, script_generator, simple_network, basic_sim_config):
+        """Test binary export skips the XML file and per-flow printing."""
+        basic_sim_config.results_format = ResultsFormat.BINARY
+        script = script_generator.generate(simple_network, basic_sim_config)
+        
+        assert_valid_python(script)
+        assert "flowstats.bin" in script
+        assert "SerializeToXmlFile" not in script
+    
+    def test_csv_export(self, script_generator, simple_network, basic_sim_config):
+        """Test CSV export with a delay histogram."""
+        basic_sim_config.results_format = ResultsFormat.CSV
+        basic_sim_config.delay_histogram_bins = 10
+        script = script_generator.generate(simple_network, basic_sim_config)
+        
+        assert_valid_python(script)
+        assert "flowstats.csv" in script
+        assert "'DelayBinWidth'" in script
+    
+    def test_auto_small_run_keeps_xml(self, script_generator, simple_network, basic_sim_config):
+        """Test AUTO keeps the XML output on small topologies."""
+        script = script_generator.generate(simple_network, basic_sim_config)
+        
+        assert "SerializeToXmlFile" in script
+        assert "flowstats" not in script
+    
+    def test_auto_large_run_uses_binary(self, script_generator, basic_sim_config):
+        """Test AUTO switches to binary export on large topologies."""
+        network = NetworkModel()
+        nodes = [network.add_node(NodeType.HOST, Position(i, 0)) for i in range(100)]
+        for a, b in zip(nodes, nodes[1:]):
+            network.add_link(a.id, b.id)
+        script = script_generator.generate(network, basic_sim_config)
+        
+        assert_valid_python(script)
+        assert "flowstats.bin" in script
+        assert "SerializeToXmlFile" not in script
+
+
 class TestConvenienceFunction:
     """Tests for generate_ns3_script convenience function."""
     
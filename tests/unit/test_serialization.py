@@ -8,18 +8,24 @@ Tests:
 - Schema validation
 - Flow serialization
 - Routing table serialization
+- Compact container format (lossless round trip, lazy sections)
 """
 
 import pytest
 import json
 from pathlib import Path
 
+from models import ids
+from models.ids import IdAllocator
 from models.network import (
     NetworkModel, NodeModel, LinkModel, NodeType, Position,
     PortConfig, RouteEntry, RoutingMode, MediumType
 )
 from models.simulation import TrafficFlow, TrafficProtocol, TrafficApplication
 from services.project_manager import ProjectManager
+from services.compact_project import (
+    CompactProjectReader, encode_table, decode_table, write_compact_project, COMPACT_MAGIC
+)
 
 
 class TestTopologySerialization:
@@ -317,3 +323,108 @@ class TestComplexTopologies:
                 break
         
         assert router is not None
+
+
+class TestCompactFormat:
+    """Tests for the compact (.ns3z) container."""
+    
+    def _network_with_extras(self, routed_network):
+        ids = list(routed_network.nodes)
+        routed_network.saved_flows.append(
+            TrafficFlow(id="f1", name="Flow", source_node_id=ids[1], target_node_id=ids[2])
+        )
+        routed_network.todos = ["check routes", {"line": 12}]
+        routed_network.warnings = ["imported"]
+        routed_network.import_metadata = {"source": "example.py"}
+        return routed_network
+    
+    def test_table_roundtrip(self):
+        """Test column tables restore mixed record shapes exactly."""
+        records = [
+            {"id": "a", "pos": {"x": 1, "y": 2.5}, "ports": [{"n": 1}, {"n": 2}], "cfg": {}},
+            {"id": "b", "ports": [], "extra": None},
+            {"pos": {"y": 0}, "id": "c", "ports": [{"n": 3, "ip": "10.0.0.1"}]},
+        ] + [{"id": str(i), "speed": "1Gbps"} for i in range(20)]
+        
+        decoded = decode_table(encode_table(records))
+        
+        assert decoded == records
+        assert [list(r) for r in decoded] == [list(r) for r in records]
+    
+    def test_document_is_lossless(self, routed_network, temp_dir):
+        """Test the container holds exactly the JSON document."""
+        network = self._network_with_extras(routed_network)
+        document = ProjectManager()._serialize_network(network)
+        filepath = temp_dir / "routed.ns3z"
+        
+        write_compact_project(document, filepath)
+        decoded = CompactProjectReader(filepath).read_document()
+        
+        assert json.dumps(decoded) == json.dumps(document)
+    
+    def test_json_compact_json(self, routed_network, temp_dir):
+        """Test converting JSON -> compact -> JSON keeps the topology."""
+        pm = ProjectManager()
+        pm.save(self._network_with_extras(routed_network), temp_dir / "a.json")
+        pm.save(pm.load(temp_dir / "a.json"), temp_dir / "b.ns3z")
+        pm.save(pm.load(temp_dir / "b.ns3z"), temp_dir / "c.json")
+        
+        first = json.loads((temp_dir / "a.json").read_text())
+        last = json.loads((temp_dir / "c.json").read_text())
+        for data in (first, last):
+            del data["metadata"]["created"]
+        assert first == last
+        assert (temp_dir / "b.ns3z").read_bytes().startswith(COMPACT_MAGIC)
+    
+    def test_lazy_sections(self, routed_network, temp_dir):
+        """Test flows and todos are decoded on first access."""
+        pm = ProjectManager()
+        filepath = temp_dir / "lazy.ns3z"
+        pm.save(self._network_with_extras(routed_network), filepath)
+        
+        loaded = pm.load(filepath)
+        
+        assert len(loaded.nodes) == 3
+        assert not loaded.is_section_loaded("saved_flows")
+        assert [f.name for f in loaded.saved_flows] == ["Flow"]
+        assert loaded.is_section_loaded("saved_flows")
+        assert loaded.todos == ["check routes", {"line": 12}]
+        assert loaded.import_metadata == {"source": "example.py"}
+    
+    def test_deferred_flow_ids_reserved(self, simple_network, temp_dir, monkeypatch):
+        """Test flows created before the deferred flows are read get new IDs."""
+        pm = ProjectManager()
+        filepath = temp_dir / "flows.ns3z"
+        simple_network.saved_flows = [
+            TrafficFlow(id=f"t{i}", source_node_id="host1", target_node_id="host2") for i in (1, 2, 3)
+        ]
+        pm.save(simple_network, filepath)
+        monkeypatch.setattr(ids, "_allocator", IdAllocator())  # As in a fresh session
+        
+        loaded = pm.load(filepath)
+        new_flow = TrafficFlow(source_node_id="host1", target_node_id="host2")
+        
+        assert not loaded.is_section_loaded("saved_flows")
+        assert new_flow.id not in {flow.id for flow in loaded.saved_flows}
+        assert CompactProjectReader(filepath).flow_ids() == ["t1", "t2", "t3"]
+    
+    def test_detected_by_content(self, simple_network, temp_dir):
+        """Test compact files load whatever their extension."""
+        pm = ProjectManager()
+        filepath = temp_dir / "topology.json"
+        pm.save(simple_network, filepath, compact=True)
+        
+        loaded = pm.load(filepath)
+        
+        assert set(loaded.nodes) == {"host1", "host2"}
+    
+    def test_truncated_file(self, simple_network, temp_dir):
+        """Test truncated files are reported as invalid."""
+        pm = ProjectManager()
+        filepath = temp_dir / "bad.ns3z"
+        pm.save(simple_network, filepath)
+        filepath.write_bytes(filepath.read_bytes()[:-40])
+        
+        with pytest.raises(ValueError):
+            pm.load(filepath)
+
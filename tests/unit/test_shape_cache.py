@@ -0,0 +1,118 @@
+"""
+Unit tests for the shape geometry cache.
+
+Tests:
+- LRU eviction and per-shape invalidation
+- Quantized path and connector lookups in ShapeManager
+- Arc-length lookup tables for nearest-point snapping
+"""
+
+from PyQt6.QtGui import QPainterPath
+
+from services.shape_manager import PathLookup, ShapeGeometryCache, ShapeManager
+
+
+class TestShapeGeometryCache:
+    """Tests for the bounded LRU cache."""
+
+    def test_lru_eviction_and_counters(self):
+        """Test the least recently used entry is evicted first."""
+        cache = ShapeGeometryCache(max_entries=2)
+        cache.put(("A", "path", 1, 1), "a1")
+        cache.put(("A", "path", 2, 2), "a2")
+        assert cache.get(("A", "path", 1, 1)) == "a1"  # a2 is now oldest
+        cache.put(("B", "path", 1, 1), "b1")
+
+        assert cache.get(("A", "path", 2, 2)) is None
+        assert len(cache) == 2
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 1)
+
+    def test_invalidate_only_touches_one_shape(self):
+        """Test invalidation drops only the given shape's entries."""
+        cache = ShapeGeometryCache()
+        for size in range(5):
+            cache.put(("HOST", "path", size, size), size)
+        cache.put(("HOST_2", "path", 1, 1), "other")
+
+        cache.invalidate("HOST")
+
+        assert len(cache) == 1
+        assert cache.get(("HOST_2", "path", 1, 1)) == "other"
+        cache.invalidate("HOST")  # No entries left: no-op
+
+
+class TestShapeManagerCache:
+    """Tests for cached paths and connector positions."""
+
+    def _manager(self, temp_dir):
+        manager = ShapeManager()
+        manager.shapes_directory = temp_dir / "shapes"
+        manager.initialize()
+        return manager
+
+    def test_nearby_sizes_share_an_entry(self, temp_dir):
+        """Test sizes within one quantum reuse the cached path."""
+        manager = self._manager(temp_dir)
+        path = manager.get_unified_path("HOST", 50.0, 50.0)
+        assert manager.get_unified_path("HOST", 50.1, 49.9) is path
+        assert manager.cache_stats()["hits"] == 1
+
+        rect = path.boundingRect()
+        assert abs(rect.width() - 50.0) < 1.0
+
+    def test_connector_positions_cached_and_invalidated(self, temp_dir):
+        """Test connector positions come from the cache until the shape changes."""
+        manager = self._manager(temp_dir)
+        first = manager.get_all_connector_positions("ROUTER", 60, 60)
+        misses = manager.cache_stats()["misses"]
+
+        assert manager.get_all_connector_positions("ROUTER", 60, 60) == first
+        assert manager.cache_stats()["misses"] == misses
+        if first:
+            conn_id, _label, x, y, angle = first[0]
+            assert manager.get_connector_position("ROUTER", conn_id, 60, 60) == (x, y, angle)
+
+        manager._invalidate_cache("ROUTER")
+        manager.get_all_connector_positions("ROUTER", 60, 60)
+        assert manager.cache_stats()["misses"] > misses
+
+
+class TestPathLookup:
+    """Tests for nearest-point and percent lookups."""
+
+    def test_nearest_on_rectangle(self):
+        """Test points snap to the closest edge with a matching percent."""
+        path = QPainterPath()
+        path.addRect(0, 0, 100, 50)
+        lookup = PathLookup(path)
+
+        t, x, y = lookup.nearest(120, 25)
+        assert abs(x - 100) < 1e-6 and abs(y - 25) < 1e-6
+        point = path.pointAtPercent(t)
+        assert abs(point.x() - x) < 0.5 and abs(point.y() - y) < 0.5
+
+        x, y = lookup.point_at(t)
+        assert abs(x - 100) < 0.5 and abs(y - 25) < 0.5
+
+    def test_no_snapping_across_subpaths(self):
+        """Test the jump between two subpaths is not treated as an edge."""
+        path = QPainterPath()
+        path.addRect(0, 0, 10, 10)
+        path.addRect(100, 0, 10, 10)
+        lookup = PathLookup(path)
+
+        _, x, y = lookup.nearest(55, 5)
+        assert x <= 10 or x >= 100  # Not on a chord between the squares
+        assert abs(abs(x - 55) - 45) < 1e-6
+
+    def test_snap_to_edge_uses_cached_lookup(self, temp_dir):
+        """Test snapping returns a point on the shape and reuses the table."""
+        manager = ShapeManager()
+        manager.shapes_directory = temp_dir / "shapes"
+        manager.initialize()
+
+        edge, x, y = manager.snap_to_edge("SWITCH", 200, 30, 60, 60)
+        assert 0.0 <= edge <= 1.0
+        assert abs(x - 60) < 1.0
+        assert manager.get_path_lookup("SWITCH", 60, 60) is manager.get_path_lookup("SWITCH", 60.2, 60)
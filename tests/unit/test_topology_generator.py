@@ -0,0 +1,138 @@
+"""
+Unit tests for synthetic topology generators.
+
+Tests:
+- Node and link counts for each topology family
+- Determinism per seed
+- Utility grid structure (substations, grid link types)
+- Generated networks produce valid ns-3 scripts
+"""
+
+import pytest
+from tests.conftest import assert_valid_python
+
+from models import NodeType, GridNodeType, GridLinkType, SimulationConfig
+from services.ns3_generator import NS3ScriptGenerator
+from services.topology_generator import TopologyGenerator, generate_topology
+
+
+def _signature(topology):
+    """Links by endpoint names (IDs differ between runs)."""
+    nodes = topology.network.nodes
+    return [
+        (nodes[l.source_node_id].name, nodes[l.target_node_id].name, l.delay)
+        for l in topology.network.links.values()
+    ]
+
+
+class TestFabrics:
+    """Tests for data-center topologies."""
+
+    def test_fat_tree_counts(self):
+        """Test a k=4 fat-tree has 20 switches, 16 hosts and 48 links."""
+        topo = TopologyGenerator().fat_tree(4)
+
+        types = [node.node_type for node in topo.network.nodes.values()]
+        assert types.count(NodeType.ROUTER) == 20
+        assert types.count(NodeType.HOST) == 16
+        assert topo.link_count == 48
+        core = topo.network.find_node_by_name("core0")
+        assert topo.network.get_degree(core.id) == 4
+
+    def test_fat_tree_rejects_odd_k(self):
+        """Test k must be even."""
+        with pytest.raises(ValueError):
+            TopologyGenerator().fat_tree(5)
+
+    def test_leaf_spine(self):
+        """Test every leaf connects to every spine."""
+        topo = TopologyGenerator().leaf_spine(spines=3, leaves=5, hosts_per_leaf=2)
+
+        assert topo.node_count == 3 + 5 + 10
+        assert topo.link_count == 3 * 5 + 10
+        leaf = topo.network.find_node_by_name("leaf2")
+        assert topo.network.get_degree(leaf.id) == 5
+
+
+class TestGraphs:
+    """Tests for regular and random graphs."""
+
+    def test_mesh_and_torus(self):
+        """Test grid link counts with and without wrap-around."""
+        assert TopologyGenerator().mesh(3, 4).link_count == 3 * 3 + 2 * 4
+        assert TopologyGenerator().mesh(3, 4, torus=True).link_count == 2 * 12
+        assert TopologyGenerator().mesh(2, 2, torus=True).link_count == 4
+
+    def test_barabasi_albert(self):
+        """Test BA link count and a hub emerging."""
+        topo = generate_topology("barabasi_albert", seed=1, n=500, m=2)
+
+        assert topo.link_count == 2 + 2 * (500 - 3)
+        degrees = [topo.network.get_degree(node_id) for node_id in topo.network.nodes]
+        assert max(degrees) > 5 * (sum(degrees) / len(degrees))
+
+    def test_waxman_connected(self):
+        """Test Waxman graphs are joined into one component."""
+        topo = generate_topology("waxman", seed=2, n=80, alpha=0.05, beta=0.3)
+        network = topo.network
+
+        start = next(iter(network.nodes))
+        seen, stack = {start}, [start]
+        while stack:
+            for neighbor in network.get_neighbors(stack.pop()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        assert len(seen) == 80
+
+    def test_deterministic(self):
+        """Test the same seed gives the same graph and another seed doesn't."""
+        first = generate_topology("waxman", seed=5, n=60)
+        again = generate_topology("waxman", seed=5, n=60)
+        other = generate_topology("waxman", seed=6, n=60)
+
+        assert _signature(first) == _signature(again)
+        assert _signature(first) != _signature(other)
+
+    def test_unknown_kind(self):
+        """Test unknown generator names are rejected."""
+        with pytest.raises(ValueError):
+            generate_topology("ring-of-fire")
+
+
+class TestUtilityGrid:
+    """Tests for the utility grid generator."""
+
+    def test_structure(self):
+        """Test substations, devices and link types."""
+        topo = generate_topology("utility_grid", seed=3, substations=6,
+                                 rtus_per_substation=1, ieds_per_substation=2, regions=2)
+        network = topo.network
+
+        assert len(topo.substations) == 6
+        sub = topo.substations[0]
+        assert len(sub.rtu_ids) == 1 and len(sub.ied_ids) == 2 and len(sub.gateway_ids) == 1
+        rtu = network.nodes[sub.rtu_ids[0]]
+        assert rtu.grid_type == GridNodeType.RTU
+        assert rtu.substation_id == sub.id
+
+        switch = network.find_node_by_name("sub0_switch")
+        assert all(
+            link.grid_link_type == GridLinkType.ETHERNET_LAN
+            for link in network.get_links_for_node(switch.id)
+        )
+        control = network.find_node_by_name("control_center")
+        assert network.get_degree(control.id) == 1
+
+
+class TestGeneratedScripts:
+    """Tests that generated networks can be simulated."""
+
+    def test_fat_tree_script(self):
+        """Test a generated fat-tree produces a valid script."""
+        network = TopologyGenerator(seed=1).fat_tree(4).network
+
+        script = NS3ScriptGenerator().generate(network, SimulationConfig(), "/tmp/out")
+
+        assert_valid_python(script)
+        assert "nodes.Create(36)" in script
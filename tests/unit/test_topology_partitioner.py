@@ -0,0 +1,199 @@
+"""
+Unit tests for distributed simulation partitioning.
+
+Tests:
+- Time parsing and cut costs
+- Balanced partitions with minimal cuts
+- Links that cannot span ranks stay together
+- Distributed script generation
+- Merging per-rank flow results
+"""
+
+import pytest
+from tests.conftest import assert_valid_python
+
+from models import (
+    NetworkModel, LinkModel, NodeType, Position, ChannelType,
+    GridLinkModel, GridLinkType, SimulationConfig, FlowStats
+)
+from services.ns3_generator import NS3ScriptGenerator
+from services.results_parser import ResultsParser
+from services.topology_partitioner import (
+    TopologyPartitioner, partition_network, parse_time_seconds, link_cut_cost
+)
+
+
+def _link(network: NetworkModel, a, b, delay: str = "2ms", cls=LinkModel, **kwargs) -> LinkModel:
+    link = cls(source_node_id=a.id, target_node_id=b.id, delay=delay, **kwargs)
+    network.links[link.id] = link
+    return link
+
+
+def _chain(network: NetworkModel, count: int, node_type=NodeType.ROUTER):
+    nodes = [network.add_node(node_type, Position(i * 50, 0)) for i in range(count)]
+    for a, b in zip(nodes, nodes[1:]):
+        _link(network, a, b)
+    return nodes
+
+
+class TestCutCost:
+    """Tests for delay parsing and link cost."""
+
+    def test_parse_time(self):
+        """Test ns-3 time strings."""
+        assert parse_time_seconds("2ms") == pytest.approx(0.002)
+        assert parse_time_seconds("0.5s") == pytest.approx(0.5)
+        assert parse_time_seconds("100us") == pytest.approx(1e-4)
+        with pytest.raises(ValueError):
+            parse_time_seconds("fast")
+
+    def test_high_latency_is_cheaper(self):
+        """Test satellite links are preferred cut points."""
+        fiber = GridLinkModel(grid_link_type=GridLinkType.FIBER, delay="250ms")
+        satellite = GridLinkModel(grid_link_type=GridLinkType.SATELLITE_GEO, delay="250ms")
+        assert link_cut_cost(satellite) < link_cut_cost(fiber)
+        assert link_cut_cost(LinkModel(delay="50ms")) < link_cut_cost(LinkModel(delay="1ms"))
+
+
+class TestPartitioner:
+    """Tests for TopologyPartitioner."""
+
+    def test_two_clusters_cut_at_bridge(self):
+        """Test two dense clusters split at the long link joining them."""
+        network = NetworkModel()
+        clusters = []
+        for _ in range(2):
+            nodes = [network.add_node(NodeType.ROUTER, Position(0, 0)) for _ in range(10)]
+            for i, a in enumerate(nodes):
+                for b in nodes[i + 1:i + 3]:
+                    _link(network, a, b)
+            clusters.append(nodes)
+        bridge = _link(network, clusters[0][4], clusters[1][6], delay="50ms")
+
+        partition = partition_network(network, 2)
+
+        assert partition.rank_sizes == [10, 10]
+        assert partition.cut_links == [bridge.id]
+        assert partition.lookahead_s == pytest.approx(0.05)
+
+    def test_grid_is_balanced(self):
+        """Test a mesh splits evenly with a small cut."""
+        network = NetworkModel()
+        width = 20
+        grid = [[network.add_node(NodeType.ROUTER, Position(0, 0)) for _ in range(width)] for _ in range(width)]
+        for i in range(width):
+            for j in range(width):
+                if i + 1 < width:
+                    _link(network, grid[i][j], grid[i + 1][j])
+                if j + 1 < width:
+                    _link(network, grid[i][j], grid[i][j + 1])
+
+        partition = partition_network(network, 4)
+
+        assert partition.imbalance <= 1.1
+        assert len(partition.cut_links) <= 3 * width
+
+    def test_switch_segments_stay_together(self):
+        """Test CSMA segments behind a switch are never split."""
+        network = NetworkModel()
+        routers = _chain(network, 4)
+        for router in routers:
+            switch = network.add_node(NodeType.SWITCH, Position(0, 0))
+            _link(network, router, switch)
+            for _ in range(3):
+                _link(network, switch, network.add_node(NodeType.HOST, Position(0, 0)))
+
+        partition = partition_network(network, 2)
+
+        for link in network.links.values():
+            if NodeType.SWITCH in (network.nodes[link.source_node_id].node_type,
+                                   network.nodes[link.target_node_id].node_type):
+                assert link.id not in partition.cut_links
+        assert partition.rank_sizes == [10, 10]
+
+    def test_csma_links_not_cut(self):
+        """Test explicit CSMA links keep both ends on one rank."""
+        network = NetworkModel()
+        a, b, c = _chain(network, 3)
+        csma = _link(network, a, c, channel_type=ChannelType.CSMA)
+
+        partition = partition_network(network, 2)
+
+        assert partition.rank_of(a.id) == partition.rank_of(c.id)
+        assert csma.id not in partition.cut_links
+
+    def test_too_many_ranks(self):
+        """Test requesting more ranks than splittable groups fails."""
+        network = NetworkModel()
+        _chain(network, 2)
+        with pytest.raises(ValueError):
+            partition_network(network, 3)
+
+    def test_disconnected_components(self):
+        """Test every rank gets nodes when the graph is disconnected."""
+        network = NetworkModel()
+        for _ in range(4):
+            _chain(network, 3)
+
+        partition = TopologyPartitioner().partition(network, 4)
+
+        assert partition.rank_sizes == [3, 3, 3, 3]
+        assert partition.cut_links == []
+        assert partition.lookahead_s is None
+
+
+class TestDistributedGeneration:
+    """Tests for distributed script generation."""
+
+    def test_mpi_script(self):
+        """Test nodes are created on their ranks and MPI is set up."""
+        network = NetworkModel()
+        _chain(network, 6)
+        config = SimulationConfig(mpi_ranks=2)
+
+        script = NS3ScriptGenerator().generate(network, config, "/tmp/out")
+
+        assert_valid_python(script)
+        assert "ns3::DistributedSimulatorImpl" in script
+        assert "ns.MpiInterface.Enable(" in script
+        assert "nodes.Create(1, rank)" in script
+        assert "flow_helper.Install(local_nodes)" in script
+        assert "rank_output_dir + '/flowmon-results.xml'" in script
+        assert "rank_output_dir + '/address_ranks.json'" in script
+        assert "ns.cppyy.gbl.gui_rank_rx.Install(local_nodes)" in script
+        assert "gui_rank_rx.Write(rank_output_dir + '/rank_rx.csv'" in script
+        assert "ns.MpiInterface.Disable()" in script
+
+    def test_sequential_script_unchanged(self):
+        """Test a single rank generates the normal script."""
+        network = NetworkModel()
+        _chain(network, 3)
+
+        script = NS3ScriptGenerator().generate(network, SimulationConfig(), "/tmp/out")
+
+        assert "MpiInterface" not in script
+        assert "nodes.Create(3)" in script
+        assert "'/tmp/out/flowmon-results.xml'" in script
+
+
+class TestRankMerge:
+    """Tests for merging per-rank flow results."""
+
+    def test_merge_by_five_tuple(self):
+        """Test a flow split across ranks is summed into one."""
+        sender = FlowStats(flow_id=1, source_address="10.0.0.1", destination_address="10.0.0.6",
+                           source_port=49153, destination_port=9, protocol=17,
+                           tx_packets=10, tx_bytes=10240, first_tx_time_ns=1_000_000_000)
+        receiver = FlowStats(flow_id=3, source_address="10.0.0.1", destination_address="10.0.0.6",
+                             source_port=49153, destination_port=9, protocol=17,
+                             rx_packets=9, rx_bytes=9216, last_rx_time_ns=2_000_000_000)
+        other = FlowStats(flow_id=1, source_address="10.0.0.2", destination_address="10.0.0.5",
+                          protocol=6, tx_packets=4)
+
+        merged = ResultsParser().merge_flow_stats([[sender, other], [receiver]])
+
+        assert len(merged) == 2
+        flow = merged[0]
+        assert (flow.tx_packets, flow.rx_packets) == (10, 9)
+        assert flow.first_tx_time_ns == 1_000_000_000
+        assert flow.last_rx_time_ns == 2_000_000_000
@@ -0,0 +1,207 @@
+"""
+Unit tests for pre-run topology validation.
+
+Tests:
+- Islands and unreachable or deleted flow endpoints
+- Islands counted without listing their members (live validation)
+- Duplicate IP addresses and subnets
+- Switch LANs sharing one subnet are not reported
+- Address index kept current from change notifications
+- Report summary text
+"""
+
+from models import NetworkModel, NodeType, Position, TrafficFlow
+from services.topology_validator import AddressIndex, TopologyValidator, IssueSeverity, validate_topology
+
+
+def _codes(report):
+    return sorted(issue.code for issue in report.issues)
+
+
+class TestConnectivityChecks:
+    """Tests for islands and flow reachability."""
+
+    def test_connected_topology_is_clean(self, empty_network):
+        """Test a linked pair with a flow between them passes."""
+        a = empty_network.add_node(NodeType.HOST, Position(0, 0))
+        b = empty_network.add_node(NodeType.HOST, Position(100, 0))
+        empty_network.add_link(a.id, b.id)
+
+        report = validate_topology(empty_network, [TrafficFlow(source_node_id=a.id, target_node_id=b.id)])
+
+        assert report.issues == []
+        assert report.summary() == "Topology OK"
+
+    def test_unreachable_flow_blocks(self, empty_network):
+        """Test a flow into an island is an error and the island a warning."""
+        a, b, c = (empty_network.add_node(NodeType.ROUTER, Position(i * 100, 0)) for i in range(3))
+        link = empty_network.add_link(a.id, b.id)
+        flows = [TrafficFlow(name="to c", source_node_id=a.id, target_node_id=c.id)]
+
+        report = validate_topology(empty_network, flows)
+
+        assert _codes(report) == ["island", "unreachable_flow"]
+        assert report.has_errors
+        assert report.errors[0].flow_id == flows[0].id
+        assert report.warnings[0].node_ids == [c.id]
+
+        empty_network.add_link(b.id, c.id)
+        assert not validate_topology(empty_network, flows).has_errors
+
+        # Removing a link splits the component again
+        empty_network.remove_link(link.id)
+        assert validate_topology(empty_network, flows).has_errors
+
+    def test_islands_counted_without_listing(self, empty_network):
+        """Test live validation reports islands from the component count alone."""
+        a, b, c, d = (empty_network.add_node(NodeType.ROUTER, Position(i * 100, 0)) for i in range(4))
+        empty_network.add_link(a.id, b.id)
+        validator = TopologyValidator(empty_network)
+
+        issues = validator.check_connectivity(list_islands=False)
+        assert [(issue.code, issue.node_ids) for issue in issues] == [("islands", [])]
+        assert issues[0].message.startswith("2 islands")
+
+        listed = validator.validate(list_islands=True)
+        assert _codes(listed) == ["island", "island"]
+
+        empty_network.add_link(b.id, c.id)
+        empty_network.add_link(c.id, d.id)
+        assert validator.check_connectivity(list_islands=False) == []
+
+    def test_deleted_endpoint(self, simple_network):
+        """Test flows that reference removed nodes are errors."""
+        flow = TrafficFlow(source_node_id="host1", target_node_id="host2")
+        simple_network.remove_node("host2")
+
+        report = validate_topology(simple_network, [flow])
+
+        assert [issue.code for issue in report.errors] == ["missing_endpoint"]
+
+
+class TestAddressChecks:
+    """Tests for IP and subnet conflicts."""
+
+    def _chain(self, network, count):
+        routers = [network.add_node(NodeType.ROUTER, Position(i * 100, 0)) for i in range(count)]
+        links = [network.add_link(a.id, b.id) for a, b in zip(routers, routers[1:])]
+        return routers, links
+
+    def test_auto_assigned_addresses_are_clean(self, empty_network):
+        """Test IPAM-assigned point-to-point subnets don't conflict."""
+        self._chain(empty_network, 4)
+
+        assert validate_topology(empty_network).issues == []
+
+    def test_duplicate_ip_and_subnet(self, empty_network):
+        """Test a copied address is an error and its subnet a warning."""
+        routers, links = self._chain(empty_network, 3)
+        first = routers[0].get_port_for_link(links[0].id)
+        copy = routers[2].get_port_for_link(links[1].id)
+        copy.ip_address = first.ip_address
+        copy.netmask = first.netmask
+
+        report = TopologyValidator(empty_network).validate()
+
+        assert _codes(report) == ["duplicate_ip", "duplicate_subnet"]
+        duplicate = report.errors[0]
+        assert set(duplicate.node_ids) == {routers[0].id, routers[2].id}
+        assert report.summary() == "1 error, 1 warning"
+
+    def test_invalid_address(self, empty_network):
+        """Test malformed addresses are reported, not raised."""
+        routers, links = self._chain(empty_network, 2)
+        routers[0].get_port_for_link(links[0].id).ip_address = "10.0.0.300"
+
+        report = validate_topology(empty_network)
+
+        assert [issue.severity for issue in report.issues] == [IssueSeverity.WARNING]
+        assert report.issues[0].code == "invalid_address"
+
+    def test_switch_lan_shares_subnet(self):
+        """Test hosts on one switch LAN may share a subnet."""
+        network = NetworkModel()
+        switch = network.add_node(NodeType.SWITCH, Position(0, 0))
+        switch.subnet_base = "192.168.5.0"
+        for i in range(3):
+            host = network.add_node(NodeType.HOST, Position(i * 100, 100))
+            network.add_link(host.id, switch.id)
+
+        assert validate_topology(network).issues == []
+
+
+class TestAddressIndex:
+    """Tests for incremental address and subnet indexes."""
+
+    def _lans(self, network):
+        """Two switch LANs on the same subnet, one host each."""
+        switches, hosts = [], []
+        for i in range(2):
+            switch = network.add_node(NodeType.SWITCH, Position(i * 200, 0))
+            switch.subnet_base = "192.168.5.0"
+            host = network.add_node(NodeType.HOST, Position(i * 200, 100))
+            network.add_link(host.id, switch.id)
+            switches.append(switch)
+            hosts.append(host)
+        return switches, hosts
+
+    def test_follows_port_edits(self, empty_network):
+        """Test notified address edits add and clear conflicts."""
+        routers = [empty_network.add_node(NodeType.ROUTER, Position(i * 100, 0)) for i in range(3)]
+        links = [empty_network.add_link(a.id, b.id) for a, b in zip(routers, routers[1:])]
+        addresses = AddressIndex(empty_network)
+        validator = TopologyValidator(empty_network, addresses)
+        assert validator.check_addresses() == []
+
+        port = routers[2].get_port_for_link(links[1].id)
+        original = port.ip_address
+        port.ip_address = routers[0].get_port_for_link(links[0].id).ip_address
+        empty_network.notify_changed("node", routers[2].id)
+        assert sorted(issue.code for issue in validator.check_addresses()) == ["duplicate_ip", "duplicate_subnet"]
+
+        port.ip_address = "10.0.0.300"
+        empty_network.notify_changed("node", routers[2].id)
+        assert [issue.code for issue in validator.check_addresses()] == ["invalid_address"]
+
+        port.ip_address = original
+        empty_network.notify_changed("node", routers[2].id)
+        assert validator.check_addresses() == []
+
+        # Removing a link releases its addresses
+        empty_network.remove_link(links[0].id)
+        assert validator.check_addresses() == []
+        addresses.detach()
+
+    def test_switch_segments(self, empty_network):
+        """Test joining, splitting and retyping switches regroups their LANs."""
+        switches, hosts = self._lans(empty_network)
+        validator = TopologyValidator(empty_network, AddressIndex(empty_network))
+
+        # Both hosts got 192.168.5.1 on separate LANs
+        assert _codes(validator.validate()) == ["duplicate_ip", "duplicate_subnet", "island"]
+
+        trunk = empty_network.add_link(switches[0].id, switches[1].id)
+        assert _codes(validator.validate()) == ["duplicate_ip"]
+
+        empty_network.remove_link(trunk.id)
+        assert "duplicate_subnet" in _codes(validator.validate())
+
+        empty_network.add_link(switches[0].id, switches[1].id)
+        switches[1].node_type = NodeType.ROUTER
+        empty_network.notify_changed("node", switches[1].id)
+        assert "duplicate_subnet" in _codes(validator.validate())
+
+    def test_matches_fresh_index(self, empty_network):
+        """Test the tracked index agrees with a one-pass index after edits and a batch."""
+        switches, hosts = self._lans(empty_network)
+        addresses = AddressIndex(empty_network)
+        addresses.invalid_ports()
+        with empty_network.batch() as batch:
+            extra = batch.add_node(NodeType.HOST)
+            batch.add_link(extra.id, switches[1].id)
+        empty_network.rewire_link(empty_network.get_links_for_node(hosts[0].id)[0].id,
+                                  target_node_id=switches[1].id)
+
+        fresh = AddressIndex(empty_network, track_changes=False)
+        assert list(addresses.duplicate_ips()) == list(fresh.duplicate_ips())
+        assert list(addresses.shared_subnets()) == list(fresh.shared_subnets())
@@ -5,8 +5,10 @@ from .topology_canvas import (
     TopologyScene,
     NodeGraphicsItem,
     LinkGraphicsItem,
-    PacketAnimationItem,
+    PacketLayerItem,
     PacketAnimationManager,
+    OverviewLayerItem,
+    DetailLevel,
 )
 from .property_panel import PropertyPanel
 from .node_palette import NodePalette
@@ -17,6 +19,7 @@ from .ns3_import_dialog import NS3ImportDialog, NS3BatchImportDialog
 from .code_preview_dialog import CodePreviewDialog
 from .help_dialog import HelpDialog
 from .socket_app_editor import SocketAppEditorDialog
+from .trace_scope import TraceScopeModel, TraceFormatDelegate, TraceScopeWidget
 from .project_dialog import (
     NewProjectDialog,
     OpenProjectDialog,
@@ -74,7 +77,9 @@ __all__ = [
     "TopologyScene", 
     "NodeGraphicsItem",
     "LinkGraphicsItem",
-    "PacketAnimationItem",
+    "PacketLayerItem",
+    "OverviewLayerItem",
+    "DetailLevel",
     "PacketAnimationManager",
     "PropertyPanel",
     "NodePalette",
@@ -86,6 +91,9 @@ __all__ = [
     "CodePreviewDialog",
     "HelpDialog",
     "SocketAppEditorDialog",
+    "TraceScopeModel",
+    "TraceFormatDelegate",
+    "TraceScopeWidget",
     "NewProjectDialog",
     "OpenProjectDialog",
     "WorkspaceSettingsDialog",
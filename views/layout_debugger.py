@@ -3,10 +3,11 @@ Layout Debugger Utility.
 
 Provides Ctrl+hover identification of widgets for layout adjustments.
 When enabled, holding Ctrl and hovering over any widget shows its
-identifier in a tooltip overlay.
+identifier in a tooltip overlay, followed by any registered runtime
+statistics (e.g. cache hit rates).
 """
 
-from typing import Optional, Dict, Set
+from typing import Any, Callable, Optional, Dict, Set
 from PyQt6.QtCore import Qt, QObject, QEvent, QPoint, QTimer
 from PyQt6.QtGui import QFont, QColor, QPainter, QPen, QBrush
 from PyQt6.QtWidgets import (
@@ -51,6 +52,9 @@ class LayoutDebugger(QObject):
         
     Or auto-register all children:
         debugger.auto_register(parent_widget, "ParentWidget")
+        
+    Show runtime counters in the overlay:
+        debugger.register_stats("Shape cache", manager.cache_stats)
     """
     
     _instance: Optional['LayoutDebugger'] = None
@@ -65,6 +69,7 @@ class LayoutDebugger(QObject):
     def __init__(self):
         super().__init__()
         self._widget_ids: Dict[int, str] = {}  # widget id() -> identifier string
+        self._stats_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
         self._overlay = LayoutDebugOverlay()
         self._current_widget: Optional[QWidget] = None
         self._ctrl_pressed = False
@@ -79,6 +84,21 @@ class LayoutDebugger(QObject):
         self._widget_ids[id(widget)] = identifier
         widget.setMouseTracking(True)
     
+    def register_stats(self, label: str, provider: Callable[[], Dict[str, Any]]):
+        """Show provider()'s counters under label in every overlay."""
+        self._stats_providers[label] = provider
+    
+    def get_stats_info(self) -> str:
+        """Format the registered statistics, one line per provider."""
+        lines = []
+        for label, provider in self._stats_providers.items():
+            values = ", ".join(
+                f"{name}={value:.3g}" if isinstance(value, float) else f"{name}={value}"
+                for name, value in provider().items()
+            )
+            lines.append(f"{label}: {values}")
+        return "\n".join(lines)
+    
     def auto_register(self, parent: QWidget, prefix: str, max_depth: int = 10):
         """
         Automatically register all child widgets with generated identifiers.
@@ -156,6 +176,10 @@ class LayoutDebugger(QObject):
             if padding_match:
                 lines.append(f"CSS Padding: {padding_match.group(1)}")
         
+        stats = self.get_stats_info()
+        if stats:
+            lines.append(stats)
+        
         return "\n".join(lines)
     
     def eventFilter(self, obj: QObject, event: QEvent) -> bool:
@@ -9,8 +9,8 @@ import sys
 import tempfile
 from pathlib import Path
 from typing import Optional, List
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont, QAction, QKeySequence, QIcon
+from PyQt6.QtCore import Qt, QEvent, QTimer, pyqtSignal
+from PyQt6.QtGui import QFont, QAction, QActionGroup, QKeySequence, QIcon
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
     QToolBar, QPushButton, QLabel, QSplitter,
@@ -19,14 +19,14 @@ from PyQt6.QtWidgets import (
     QDialog, QFormLayout, QLineEdit, QSpinBox,
     QDoubleSpinBox, QComboBox, QDialogButtonBox,
     QGroupBox, QListWidget, QListWidgetItem, QCheckBox,
-    QTabWidget
+    QTabWidget, QProgressBar
 )
 
 from models import (
     NetworkModel, NodeModel, NodeType, PortConfig, 
     SimulationState, SimulationStatus, SimulationConfig,
     TrafficFlow, TrafficApplication, TrafficProtocol,
-    SimulationResults, Project, ProjectManager as ProjectMgr,
+    SimulationResults, Project, short_id, ProjectManager as ProjectMgr,
     # Grid models
     GridNodeModel, GridNodeType, GridTrafficFlow, FailureScenario,
 )
@@ -45,11 +45,17 @@ from views.layout_debugger import LayoutDebugger, enable_layout_debugging
 from services import (
     ProjectManager, export_to_mininet,
     NS3ScriptGenerator, NS3SimulationManager, NS3Detector,
-    TracePlayer, PacketEvent, PacketEventType,
-    get_settings, ShapeManager, get_shape_manager
+    TracePlayer, PacketEvent, PacketEventType, TraceMap, TRACE_MAP_FILE,
+    HeatmapMetric, LiveLinkLoad, trace_link_loads,
+    get_settings, ShapeManager, get_shape_manager,
+    TopologyValidator, ValidationReport, AddressIndex, AutosaveManager
 )
 
 
+# How often pending edits are handed to the autosave writer
+AUTOSAVE_FLUSH_MS = 2000
+
+
 class SimulationToolbar(QToolBar):
     """Toolbar with simulation controls."""
     
@@ -289,6 +295,9 @@ class MainWindow(QMainWindow):
     └─────────────────────────────────────────────────────┘
     """
     
+    # Background save done: (status message, error message or "")
+    backgroundSaveFinished = pyqtSignal(str, str)
+    
     def __init__(self):
         super().__init__()
         
@@ -330,6 +339,11 @@ class MainWindow(QMainWindow):
         
         # Trace player for packet animation
         self.trace_player = TracePlayer()
+        self._trace_map: Optional[TraceMap] = None  # ns-3 indices -> node/link IDs of the last run
+        
+        # Link heatmap from live metric snapshots or the loaded trace
+        self._live_link_load = LiveLinkLoad(self.settings_manager.settings.ui.heatmap_window)
+        self._heatmap_metric: Optional[HeatmapMetric] = None
         
         # Setup
         self._setup_window()
@@ -347,6 +361,9 @@ class MainWindow(QMainWindow):
         
         # Enable layout debugging (Ctrl+hover to identify widgets)
         self._setup_layout_debugger()
+        
+        # Journaled autosave (offers recovery of an unsaved session)
+        self._setup_autosave()
     
     def _load_ns3_settings(self):
         """Load saved ns-3 configuration from settings file."""
@@ -384,6 +401,9 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """Handle window close - save settings."""
         self._save_window_settings()
+        if self.autosave is not None:
+            self._autosave_timer.stop()
+            self.autosave.close()  # Keeps recovery files if there are unsaved edits
         super().closeEvent(event)
     
     def _setup_window(self):
@@ -540,6 +560,12 @@ class MainWindow(QMainWindow):
         reset_view_action.triggered.connect(self._on_reset_view)
         view_menu.addAction(reset_view_action)
         
+        self._show_fps_action = QAction("Show Frame &Rate", self)
+        self._show_fps_action.setCheckable(True)
+        self._show_fps_action.setChecked(self.settings_manager.settings.ui.show_fps)
+        self._show_fps_action.triggered.connect(self._on_toggle_show_fps)
+        view_menu.addAction(self._show_fps_action)
+        
         view_menu.addSeparator()
         
         # Route visualization submenu
@@ -564,6 +590,21 @@ class MainWindow(QMainWindow):
         clear_routes_action.triggered.connect(self._on_clear_route_highlights)
         route_menu.addAction(clear_routes_action)
         
+        # Link heatmap submenu (one metric at a time)
+        heatmap_menu = view_menu.addMenu("Link &Heatmap")
+        heatmap_group = QActionGroup(self)
+        for label, metric in (
+            ("&Off", None),
+            ("&Utilization", HeatmapMetric.UTILIZATION),
+            ("&Drop Rate", HeatmapMetric.DROP_RATE),
+        ):
+            action = QAction(label, self)
+            action.setCheckable(True)
+            action.setChecked(metric is None)
+            action.triggered.connect(lambda checked, m=metric: self._on_set_heatmap(m))
+            heatmap_group.addAction(action)
+            heatmap_menu.addAction(action)
+        
         # Simulation menu
         sim_menu = menubar.addMenu("&Simulation")
         
@@ -640,6 +681,7 @@ class MainWindow(QMainWindow):
                 border: none;
             }
         """)
+        self._apply_canvas_settings()
         center_splitter.addWidget(self.canvas)
         
         # Bottom tabs: Traffic, Failures, Metrics
@@ -758,6 +800,22 @@ class MainWindow(QMainWindow):
         self._count_label.setObjectName("MainWindow_CountLabel")
         status.addWidget(self._count_label)
         
+        # Live validation result (islands, unreachable flows, IP conflicts)
+        self._validation_label = QLabel("")
+        self._validation_label.setObjectName("MainWindow_ValidationLabel")
+        self._validation_label.installEventFilter(self)
+        self._validation_report: Optional[ValidationReport] = None
+        status.addWidget(self._validation_label)
+        self._address_index: Optional[AddressIndex] = None  # Follows edits, see _validator()
+        
+        # Item creation progress while a large topology loads
+        self._load_progress = QProgressBar()
+        self._load_progress.setObjectName("MainWindow_LoadProgress")
+        self._load_progress.setMaximumWidth(160)
+        self._load_progress.setFormat("Loading %p%")
+        self._load_progress.hide()
+        status.addWidget(self._load_progress)
+        
         # Spacer
         status.addWidget(QWidget(), 1)
         
@@ -786,6 +844,9 @@ class MainWindow(QMainWindow):
         debugger.auto_register(self.traffic_editor, "TrafficEditor", max_depth=4)
         debugger.auto_register(self.failure_panel, "FailurePanel", max_depth=4)
         debugger.auto_register(self.metrics_dashboard, "MetricsDash", max_depth=4)
+        
+        # Shape geometry cache counters
+        debugger.register_stats("Shape cache", get_shape_manager().cache_stats)
 
     def _connect_signals(self):
         """Connect all signals."""
@@ -804,12 +865,15 @@ class MainWindow(QMainWindow):
         self.canvas.topology_scene.nodeRemoved.connect(self._update_counts)
         self.canvas.topology_scene.linkAdded.connect(self._update_counts)
         self.canvas.topology_scene.linkRemoved.connect(self._update_counts)
+        self.canvas.topology_scene.topologyReplaced.connect(self._update_counts)
+        self.canvas.topology_scene.loadProgress.connect(self._on_scene_load_progress)
         
         # Scene changes -> Update grid editors
         self.canvas.topology_scene.nodeAdded.connect(self._update_grid_editors)
         self.canvas.topology_scene.nodeRemoved.connect(self._update_grid_editors)
         self.canvas.topology_scene.linkAdded.connect(self._update_grid_editors)
         self.canvas.topology_scene.linkRemoved.connect(self._update_grid_editors)
+        self.canvas.topology_scene.topologyReplaced.connect(self._update_grid_editors)
         
         # Scene medium type change -> property panel update
         self.canvas.topology_scene.mediumTypeChanged.connect(self._on_scene_medium_type_changed)
@@ -848,11 +912,16 @@ class MainWindow(QMainWindow):
         self.sim_manager.simulationError.connect(self._on_simulation_error)
         self.sim_manager.outputReceived.connect(self._on_simulation_output)
         self.sim_manager.progressUpdated.connect(self._on_simulation_progress)
+        self.sim_manager.metricsReceived.connect(self.metrics_dashboard.add_metrics_snapshot)
+        self.sim_manager.metricsReceived.connect(self._on_metrics_snapshot)
     
     def _connect_trace_player_signals(self):
         """Connect trace player signals for packet animation."""
         self.trace_player.packet_event.connect(self._on_packet_event)
         self.trace_player.playback_finished.connect(self._on_playback_finished)
+        self.trace_player.time_changed.connect(
+            lambda _: self.canvas.topology_scene.refresh_heatmap()
+        )
         
         # Playback controls visibility toggle
         self.playback_controls.visibility_requested.connect(
@@ -865,45 +934,63 @@ class MainWindow(QMainWindow):
     
     def _on_packet_event(self, event: PacketEvent):
         """Handle packet event from trace player - animate packet."""
-        # Map node indices to node IDs
-        node_ids = list(self.network_model.nodes.keys())
-        
-        if event.event_type == PacketEventType.TX:
-            # Find the link for this transmission
-            node_idx = event.node_id
-            if node_idx < len(node_ids):
-                source_id = node_ids[node_idx]
-                # Find a link from this node
-                for link_id, link in self.network_model.links.items():
-                    if link.source_node_id == source_id:
-                        self.canvas.topology_scene.animation_manager.animate_packet_on_link(
-                            link_id, 'forward', 'tx', 
-                            int(200 / self.trace_player.speed)
-                        )
-                        break
-                    elif link.target_node_id == source_id:
-                        self.canvas.topology_scene.animation_manager.animate_packet_on_link(
-                            link_id, 'backward', 'tx',
-                            int(200 / self.trace_player.speed)
-                        )
-                        break
+        if event.event_type not in (PacketEventType.TX, PacketEventType.DROP):
+            return  # Receives could get their own animation
         
-        elif event.event_type == PacketEventType.RX:
-            # Could show a receive animation if desired
-            pass
+        resolved = self._get_trace_map().resolve(event)
+        if resolved is None:
+            return
+        link_id, direction = resolved
         
-        elif event.event_type == PacketEventType.DROP:
-            # Show drop animation
-            node_idx = event.node_id
-            if node_idx < len(node_ids):
-                source_id = node_ids[node_idx]
-                for link_id, link in self.network_model.links.items():
-                    if link.source_node_id == source_id or link.target_node_id == source_id:
-                        # Just show a brief flash for dropped packet
-                        self.canvas.topology_scene.animation_manager.animate_packet_on_link(
-                            link_id, 'forward', 'drop', 100
-                        )
-                        break
+        if event.event_type == PacketEventType.TX:
+            self.canvas.topology_scene.animation_manager.animate_packet_on_link(
+                link_id, direction, 'tx',
+                int(200 / self.trace_player.speed)
+            )
+        else:
+            # Just show a brief flash for dropped packet
+            self.canvas.topology_scene.animation_manager.animate_packet_on_link(
+                link_id, direction, 'drop', 100
+            )
+    
+    def _get_trace_map(self) -> TraceMap:
+        """Trace map of the last run, or one numbered from the current model."""
+        if self._trace_map is None:
+            self._trace_map = TraceMap.from_network(self.network_model)
+        return self._trace_map
+    
+    def _on_metrics_snapshot(self, snapshot):
+        """Feed a live metric snapshot to the link heatmap."""
+        self._live_link_load.add_snapshot(snapshot)
+        self.canvas.topology_scene.refresh_heatmap()
+    
+    def _on_set_heatmap(self, metric: Optional[HeatmapMetric]):
+        """Show link load as a heatmap, or turn it off (metric None)."""
+        self._heatmap_metric = metric
+        scene = self.canvas.topology_scene
+        scene.set_heatmap(self._heatmap_values if metric is not None else None)
+        if metric == HeatmapMetric.DROP_RATE and self.sim_manager.is_running:
+            self.statusBar().showMessage("Drop rates are shown from traces; live runs report queue depth only", 5000)
+    
+    def _heatmap_values(self) -> dict:
+        """Load of each busy link for the heatmap (live run, else the loaded trace)."""
+        window = self.settings_manager.settings.ui.heatmap_window
+        if self.sim_manager.is_running or not self.trace_player.is_loaded:
+            self._live_link_load.window_s = window
+            loads = self._live_link_load.loads()
+        else:
+            counters = self.trace_player.link_counters(self._get_trace_map())
+            loads = trace_link_loads(
+                counters, self.network_model, self.trace_player.current_time, window
+            )
+        metric = self._heatmap_metric or HeatmapMetric.UTILIZATION
+        return {link_id: load.value(metric) for link_id, load in loads.items()}
+    
+    def _load_trace_map(self):
+        """Use the trace map the finished run wrote, if any."""
+        written = TraceMap.load(Path(self._sim_output_dir) / TRACE_MAP_FILE) if self._sim_output_dir else None
+        if written is not None:
+            self._trace_map = written
     
     def _on_playback_finished(self):
         """Handle trace playback finished."""
@@ -992,6 +1079,7 @@ class MainWindow(QMainWindow):
     
     def _on_properties_changed(self, node_id: str):
         """Handle property changes."""
+        self._update_validation()  # Addresses may have been edited
         if not node_id:
             # Link properties changed, nothing to update visually
             return
@@ -1010,6 +1098,9 @@ class MainWindow(QMainWindow):
         if node_item:
             node_item.update_appearance()
             node_item.update_label()
+        # WiFi membership and switch segments are re-indexed from the notification
+        self.network_model.notify_changed("node", node_id)
+        self._update_validation()
         self.statusBar().showMessage(f"Changed node type to {new_type.name.lower()}", 2000)
     
     def _on_medium_type_changed(self, node_id: str, new_medium):
@@ -1060,6 +1151,7 @@ class MainWindow(QMainWindow):
         if node:
             # Store script content in node model
             node.app_script = script_content
+            self.network_model.notify_changed("node", node_id)
             self._update_node_app_indicator(node_id)
             
             # Also save to project scripts directory if project is open
@@ -1098,11 +1190,57 @@ class MainWindow(QMainWindow):
         # Refresh property panel to show updated IPs
         self.property_panel.refresh()
     
+    def _on_scene_load_progress(self, done: int, total: int):
+        """Show progress of a chunked canvas load in the status bar."""
+        if done >= total:
+            self._load_progress.hide()
+            return
+        self._load_progress.setRange(0, total)
+        self._load_progress.setValue(done)
+        self._load_progress.show()
+    
     def _update_counts(self):
         """Update node/link count in status bar."""
         num_nodes = len(self.network_model.nodes)
         num_links = len(self.network_model.links)
         self._count_label.setText(f"Nodes: {num_nodes}  Links: {num_links}")
+        self._update_validation()
+    
+    def _validator(self) -> TopologyValidator:
+        """Validator for the current model, reusing its incremental address index."""
+        addresses = self._address_index
+        if addresses is None or addresses.network is not self.network_model:
+            if addresses is not None:
+                addresses.detach()
+            addresses = self._address_index = AddressIndex(self.network_model)
+        return TopologyValidator(self.network_model, addresses)
+    
+    def _update_validation(self, report: Optional[ValidationReport] = None):
+        """Re-check the topology and show the result in the status bar."""
+        if report is None:
+            # Island members are only listed when the tooltip is shown
+            report = self._validator().validate(self.sim_config.flows, list_islands=False)
+        self._validation_report = report
+        if report.has_errors:
+            color = "#DC2626"
+        elif report.issues:
+            color = "#D97706"
+        else:
+            color = "#059669"
+        self._validation_label.setText(report.summary())
+        self._validation_label.setStyleSheet(f"color: {color};")
+        self._validation_label.setToolTip(report.details())
+    
+    def eventFilter(self, obj, event) -> bool:
+        if obj is self._validation_label and event.type() == QEvent.Type.ToolTip:
+            report = self._validation_report
+            if report is not None and any(issue.code == "islands" for issue in report.issues):
+                # List the islands now that someone is looking
+                issues = [issue for issue in report.issues if issue.code != "islands"]
+                report = ValidationReport(self._validator().check_connectivity() + issues)
+                self._validation_report = report
+                self._validation_label.setToolTip(report.details())
+        return super().eventFilter(obj, event)
     
     def _on_run_simulation(self):
         """Start simulation."""
@@ -1140,6 +1278,17 @@ class MainWindow(QMainWindow):
         # Update config from dialog
         self.sim_config = dialog.get_config()
         
+        # Don't spend a full ns-3 run on a topology that can't work
+        report = self._validator().validate(self.sim_config.flows)
+        self._update_validation(report)
+        if report.has_errors:
+            QMessageBox.warning(
+                self,
+                "Cannot Run",
+                f"Fix these problems before running:\n\n{report.details()}"
+            )
+            return
+        
         # Generate ns-3 script
         self.simulation_state.status = SimulationStatus.BUILDING
         self.toolbar.set_running(True)
@@ -1156,6 +1305,7 @@ class MainWindow(QMainWindow):
                 self.sim_config,
                 self._sim_output_dir
             )
+            self._trace_map = generator.trace_map()
         except Exception as e:
             self.simulation_state.set_error(f"Script generation failed: {e}")
             self.toolbar.set_running(False)
@@ -1213,8 +1363,22 @@ class MainWindow(QMainWindow):
         self.stats_panel.reset()
         self.statusBar().showMessage("Running ns-3 simulation...")
         
-        # Run simulation
-        success = self.sim_manager.run_simulation(script, self._sim_output_dir, required_files)
+        # Run simulation (recorded in the project's run history when one is open)
+        run_store_path = None
+        if self._current_project and self._current_project.run_store_path:
+            run_store_path = str(self._current_project.run_store_path)
+        success = self.sim_manager.run_simulation(
+            script, self._sim_output_dir, required_files, mpi_ranks=self.sim_config.mpi_ranks,
+            run_store_path=run_store_path,
+            run_parameters={
+                "duration": self.sim_config.duration,
+                "random_seed": self.sim_config.random_seed,
+                "mpi_ranks": self.sim_config.mpi_ranks,
+                "node_count": len(self.network_model.nodes),
+                "link_count": len(self.network_model.links),
+                "flow_count": len(self.sim_config.flows),
+            },
+        )
         if not success:
             self.simulation_state.set_error("Failed to start simulation")
             self.toolbar.set_running(False)
@@ -1271,12 +1435,7 @@ class MainWindow(QMainWindow):
         from models.network import NodeType
         
         # Get all nodes connected to source via links
-        connected_ids = set()
-        for link in self.network_model.links.values():
-            if link.source_node_id == source_node.id:
-                connected_ids.add(link.target_node_id)
-            elif link.target_node_id == source_node.id:
-                connected_ids.add(link.source_node_id)
+        connected_ids = set(self.network_model.get_neighbors(source_node.id))
         
         # If directly connected, prefer hosts over routers/switches
         for node_id in connected_ids:
@@ -1369,6 +1528,11 @@ class MainWindow(QMainWindow):
         self.toolbar.reset_time()
         self.toolbar.set_total_time(self.sim_config.duration)
         
+        # Live metric snapshots start from a clean dashboard
+        self.metrics_dashboard.reset_metrics()
+        self._live_link_load.clear()
+        self.canvas.topology_scene.refresh_heatmap()
+        
         # Clear sender-to-target mapping from previous run
         self._sender_targets = {}
         
@@ -1420,6 +1584,7 @@ class MainWindow(QMainWindow):
             
             # Load trace for playback if we have packet events
             if results.console_output:
+                self._load_trace_map()
                 loaded = self.trace_player.load_output(results.console_output)
                 if loaded and self.trace_player.event_count > 0:
                     self.playback_controls.setVisible(True)
@@ -1452,8 +1617,8 @@ class MainWindow(QMainWindow):
         from models.project import SimulationRun
         
         try:
-            # Create timestamped run directory
-            run_dir = self._current_project.create_run_dir()
+            # Create timestamped run directory (named like the run store entry)
+            run_dir = self._current_project.create_run_dir(results.run_id or None)
             run_id = run_dir.name
             
             # Save console output
@@ -1501,6 +1666,11 @@ class MainWindow(QMainWindow):
                 trace_file_path = f"results/{run_id}/trace.xml"
                 self.stats_panel.log_console("INFO", f"Trace file saved to: {trace_dest}")
             
+            # Keep the trace map so saved traces can be replayed on the canvas
+            trace_map_file = Path(self._sim_output_dir) / TRACE_MAP_FILE
+            if self._sim_output_dir and trace_map_file.exists():
+                shutil.copy2(trace_map_file, run_dir / TRACE_MAP_FILE)
+            
             # Copy PCAP files if any
             if results.pcap_files:
                 pcap_dir = run_dir / "pcap"
@@ -1538,7 +1708,8 @@ class MainWindow(QMainWindow):
                         "packet_loss_percent": f.packet_loss_percent,
                         "throughput_mbps": f.throughput_mbps,
                         "mean_delay_ms": f.mean_delay_ms,
-                        "mean_jitter_ms": f.mean_jitter_ms
+                        "mean_jitter_ms": f.mean_jitter_ms,
+                        "partial": f.partial
                     }
                     for f in results.flow_stats
                 ]
@@ -1600,6 +1771,7 @@ class MainWindow(QMainWindow):
             )
             
             self.stats_panel.log_console("SUCCESS", f"Results saved to project: {run_dir}")
+            self.stats_panel.refresh_runs()
             
         except Exception as e:
             self.stats_panel.log_console("ERROR", f"Failed to save results: {e}")
@@ -1828,7 +2000,7 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'canvas') and self.canvas:
             # Clear shape cache
             shape_manager = get_shape_manager()
-            shape_manager._path_cache.clear()
+            shape_manager.clear_cache()
             
             # Update all nodes on canvas
             self.canvas.topology_scene.update()
@@ -1860,9 +2032,21 @@ class MainWindow(QMainWindow):
         s = self.settings_manager.settings.ui
         self.trace_player.speed = s.animation_speed
         self.canvas.topology_scene.animation_manager.enabled = s.show_packet_animations
+        self._show_fps_action.setChecked(s.show_fps)
+        self._apply_canvas_settings()
         
         self.statusBar().showMessage("Settings updated", 2000)
     
+    def _apply_canvas_settings(self):
+        """Apply level-of-detail thresholds and the fps readout to the canvas."""
+        s = self.settings_manager.settings.ui
+        scene = self.canvas.topology_scene
+        scene.lod_reduced_scale = s.lod_reduced_scale
+        scene.lod_minimal_scale = s.lod_minimal_scale
+        self.canvas.show_fps = s.show_fps
+        self.canvas.update_detail_level()
+        self.canvas.viewport().update()
+    
     def _on_simulation_status_changed(self, status: SimulationStatus):
         """Handle simulation status changes."""
         status_text = {
@@ -1884,6 +2068,7 @@ class MainWindow(QMainWindow):
             project = dialog.get_project()
             if project:
                 self._current_project = project
+                self.stats_panel.set_run_store(project.run_store_path)
                 # Clear current topology for new project
                 self.canvas.topology_scene.clear_topology()
                 self.property_panel.set_selection(None)
@@ -1907,13 +2092,17 @@ class MainWindow(QMainWindow):
             project = dialog.get_project()
             if project:
                 self._current_project = project
+                self.stats_panel.set_run_store(project.run_store_path)
                 
                 # Load topology if present
                 try:
                     # Clear current topology first
+                    self._release_autosave()
                     self.canvas.topology_scene.clear_topology()
                     
-                    network = self.project_mgr.load_topology(project)
+                    network = self._offer_autosave_recovery(project.topology_path)
+                    if network is None:
+                        network = self.project_mgr.load_topology(project)
                     if network:
                         # Replace network model and rebuild canvas
                         self.network_model = network
@@ -1994,6 +2183,7 @@ class MainWindow(QMainWindow):
                     
                     # Load script into node
                     node.app_script = script_content
+                    self.network_model.notify_changed("node", node.id)
                     loaded_count += 1
                     
                     # Update visual indicator
@@ -2077,14 +2267,6 @@ class MainWindow(QMainWindow):
             # Save flows to network model before saving project
             self._sync_flows_to_network_model()
             
-            # Save project with all components
-            self.project_mgr.save_project(
-                self._current_project, 
-                network_model=self.network_model,
-                sim_config=self.sim_config,
-                output_dir=self._sim_output_dir if self._sim_output_dir else None
-            )
-            
             # Build status message
             node_count = len(self.network_model.nodes)
             link_count = len(self.network_model.links)
@@ -2095,7 +2277,19 @@ class MainWindow(QMainWindow):
                 msg += f", {flow_count} flows"
             msg += ")"
             
-            self.statusBar().showMessage(msg, 3000)
+            # Save project with all components (topology in the background
+            # when autosave mirrors the model)
+            background = self._autosave_active()
+            self.project_mgr.save_project(
+                self._current_project, 
+                network_model=self.network_model,
+                sim_config=self.sim_config,
+                output_dir=self._sim_output_dir if self._sim_output_dir else None,
+                save_topology=(lambda path: self._save_in_background(path, msg)) if background else None
+            )
+            
+            if not background:
+                self.statusBar().showMessage(msg, 3000)
             return True
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save project:\n{e}")
@@ -2127,6 +2321,117 @@ class MainWindow(QMainWindow):
                 echo_interval=flow.echo_interval
             )
             self.network_model.saved_flows.append(saved_flow)
+        self.network_model.notify_changed("flows")
+    
+    # ==================== Autosave ====================
+    
+    def _setup_autosave(self):
+        """Start journaled autosave if enabled in settings."""
+        self.autosave: Optional[AutosaveManager] = None
+        self._autosave_recovered = False
+        self.backgroundSaveFinished.connect(self._on_background_save_finished)
+        ui = self.settings_manager.settings.ui
+        if not ui.auto_save:
+            return
+        self.autosave = AutosaveManager(compact_interval=float(ui.auto_save_interval))
+        
+        # An untitled topology from a session that didn't exit cleanly
+        recovered = self._offer_autosave_recovery(self._autosave_target())
+        if recovered is not None:
+            self.network_model = recovered
+            self.property_panel.set_network_model(self.network_model)
+            self._rebuild_canvas_from_model()
+            self._update_counts()
+        
+        self._autosave_timer = QTimer(self)
+        self._autosave_timer.timeout.connect(self._on_autosave_tick)
+        self._autosave_timer.start(AUTOSAVE_FLUSH_MS)
+        self._on_autosave_tick()
+    
+    def _autosave_target(self) -> Path:
+        """File the current topology is saved to (autosave data sits beside it)."""
+        if self._current_project and self._current_project.topology_path:
+            return self._current_project.topology_path
+        if self.project_manager.current_file:
+            return Path(self.project_manager.current_file)
+        return Path(self.settings_manager.get_topologies_dir()) / "untitled.json"
+    
+    def _on_autosave_tick(self):
+        """Follow the current model and file, and flush pending edits."""
+        autosave = self.autosave
+        target = self._autosave_target()
+        if autosave.network is self.network_model and autosave.target == target:
+            autosave.flush()
+            error = autosave.pop_error()
+            if error is not None:
+                self.statusBar().showMessage(f"Autosave failed: {error}", 5000)
+            return
+        if autosave.network is self.network_model:
+            # Saved under a new name: the old recovery data is obsolete
+            autosave.mark_saved()
+        autosave.attach(self.network_model, target, recovered=self._autosave_recovered)
+        self._autosave_recovered = False
+    
+    def _release_autosave(self):
+        """Stop autosaving the current model before it is replaced."""
+        if self.autosave is not None:
+            self.autosave.close()  # Recovery files stay if it had unsaved edits
+    
+    def _autosave_active(self) -> bool:
+        """Whether the autosave writer mirrors the current model."""
+        return self.autosave is not None and self.autosave.network is self.network_model
+    
+    def _offer_autosave_recovery(self, target: Optional[Path]) -> Optional[NetworkModel]:
+        """
+        Ask whether to restore autosaved edits for target.
+        
+        Returns the recovered model, or None (declined recovery data is deleted).
+        """
+        if self.autosave is None or not target or not AutosaveManager.has_recovery(target):
+            return None
+        reply = QMessageBox.question(
+            self,
+            "Recover Unsaved Changes",
+            f"Unsaved changes to {target.name} were found from a previous session.\n\n"
+            "Do you want to recover them?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            AutosaveManager.discard_recovery(target)
+            return None
+        try:
+            network = AutosaveManager.recover(target)
+        except Exception as e:
+            QMessageBox.warning(self, "Recovery Failed", f"Could not recover unsaved changes:\n{e}")
+            return None
+        self._autosave_recovered = True
+        return network
+    
+    def _load_network_file(self, filepath: Path) -> Optional[NetworkModel]:
+        """Load a topology file, or its autosaved edits if the user recovers them."""
+        recovered = self._offer_autosave_recovery(filepath)
+        if recovered is not None:
+            self.project_manager._current_file = filepath
+            return recovered
+        return self.project_manager.load(filepath)
+    
+    def _save_in_background(self, filepath: Path, message: str):
+        """Write the autosave mirror to filepath; report through backgroundSaveFinished."""
+        future = self.autosave.save_to(filepath)
+        
+        def done(f):
+            # Runs on the writer thread; the signal queues it to the GUI thread
+            error = f.exception()
+            self.backgroundSaveFinished.emit(message, f"{filepath}\n\nError: {error}" if error else "")
+        
+        future.add_done_callback(done)
+        self.statusBar().showMessage(f"Saving {filepath.name}...")
+    
+    def _on_background_save_finished(self, message: str, error: str):
+        if error:
+            QMessageBox.critical(self, "Error Saving File", f"Failed to save topology to:\n{error}")
+        else:
+            self.statusBar().showMessage(message, 3000)
     
     # ==================== File Operations ====================
 
@@ -2159,7 +2464,7 @@ class MainWindow(QMainWindow):
             self,
             "Open Topology",
             default_dir,
-            "NS-3 GUI Topology (*.json);;All Files (*)"
+            "NS-3 GUI Topology (*.json *.ns3z);;All Files (*)"
         )
         
         if not filepath:
@@ -2170,10 +2475,11 @@ class MainWindow(QMainWindow):
         
         try:
             # Clear current topology
+            self._release_autosave()
             self.canvas.topology_scene.clear_topology()
             
             # Load the file
-            loaded_network = self.project_manager.load(Path(filepath))
+            loaded_network = self._load_network_file(Path(filepath))
             
             if loaded_network is None:
                 raise ValueError("Failed to parse topology file")
@@ -2191,10 +2497,13 @@ class MainWindow(QMainWindow):
             # Track current project path
             self._current_project_path = filepath
             
-            # Log success info
+            # Log success info (flows of compact files load on first use)
             node_count = len(self.network_model.nodes)
             link_count = len(self.network_model.links)
-            flow_count = len(self.network_model.saved_flows)
+            flow_count = (
+                len(self.network_model.saved_flows)
+                if self.network_model.is_section_loaded("saved_flows") else 0
+            )
             
             msg = f"Opened {Path(filepath).name}: {node_count} nodes, {link_count} links"
             if flow_count > 0:
@@ -2221,31 +2530,7 @@ class MainWindow(QMainWindow):
         try:
             scene = self.canvas.topology_scene
             scene.network_model = self.network_model
-            
-            # Create node graphics items
-            from PyQt6.QtCore import QPointF
-            from views.topology_canvas import NodeGraphicsItem, LinkGraphicsItem
-            
-            for node in self.network_model.nodes.values():
-                item = NodeGraphicsItem(node)
-                scene.addItem(item)
-                scene._node_items[node.id] = item
-            
-            # Create link graphics items
-            for link in self.network_model.links.values():
-                source_item = scene._node_items.get(link.source_node_id)
-                target_item = scene._node_items.get(link.target_node_id)
-                
-                if source_item and target_item:
-                    link_item = LinkGraphicsItem(link, source_item, target_item)
-                    scene.addItem(link_item)
-                    link_item.setZValue(-1)
-                    scene._link_items[link.id] = link_item
-            
-            # Update port appearances after all links are created
-            for node_item in scene._node_items.values():
-                node_item.update_ports()
-                
+            scene.reload_from_model()
         except Exception as e:
             print(f"Error in _rebuild_canvas_from_model: {e}")
             import traceback
@@ -2288,20 +2573,20 @@ class MainWindow(QMainWindow):
         default_dir = self.settings_manager.get_save_directory()
         default_path = os.path.join(default_dir, "topology.json") if default_dir else "topology.json"
         
-        filepath, _ = QFileDialog.getSaveFileName(
+        filepath, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Save Topology",
             default_path,
-            "NS-3 GUI Topology (*.json);;All Files (*)"
+            "NS-3 GUI Topology (*.json);;Compact Topology (*.ns3z);;All Files (*)"
         )
         
         if filepath:
             # Remember the directory for next time
             self.settings_manager.set_save_directory(filepath)
             
-            # Ensure .json extension
-            if not filepath.endswith('.json'):
-                filepath += '.json'
+            # Ensure .json or .ns3z extension (the format follows it)
+            if not filepath.endswith(('.json', '.ns3z')):
+                filepath += '.ns3z' if 'ns3z' in selected_filter else '.json'
             self._save_to_file(Path(filepath))
     
     def _save_to_file(self, filepath: Path):
@@ -2310,22 +2595,30 @@ class MainWindow(QMainWindow):
             # Sync flows to network model before saving
             self._sync_flows_to_network_model()
             
-            if self.project_manager.save(self.network_model, filepath):
+            # Build detailed status message
+            node_count = len(self.network_model.nodes)
+            link_count = len(self.network_model.links)
+            flow_count = len(self.network_model.saved_flows)
+            
+            msg = f"Saved to {filepath.name}: {node_count} nodes, {link_count} links"
+            if flow_count > 0:
+                msg += f", {flow_count} flows"
+            
+            if self._autosave_active():
+                # Written by the autosave thread from its mirror of the model
+                self._save_in_background(filepath, msg)
+                self.project_manager._current_file = filepath
+                saved = True
+            else:
+                saved = self.project_manager.save(self.network_model, filepath)
+                if saved:
+                    self.statusBar().showMessage(msg, 3000)
+            
+            if saved:
                 self._update_window_title()
                 
                 # Track current project path
                 self._current_project_path = str(filepath)
-                
-                # Build detailed status message
-                node_count = len(self.network_model.nodes)
-                link_count = len(self.network_model.links)
-                flow_count = len(self.network_model.saved_flows)
-                
-                msg = f"Saved to {filepath.name}: {node_count} nodes, {link_count} links"
-                if flow_count > 0:
-                    msg += f", {flow_count} flows"
-                
-                self.statusBar().showMessage(msg, 3000)
             else:
                 raise IOError("Save operation returned failure")
         except Exception as e:
@@ -2406,10 +2699,11 @@ class MainWindow(QMainWindow):
         """Load a topology file into the canvas."""
         try:
             # Clear current topology
+            self._release_autosave()
             self.canvas.topology_scene.clear_topology()
             
             # Load the file
-            loaded_network = self.project_manager.load(filepath)
+            loaded_network = self._load_network_file(filepath)
             
             if loaded_network is None:
                 raise ValueError("Failed to parse topology file")
@@ -2455,6 +2749,13 @@ class MainWindow(QMainWindow):
         """Reset view to default."""
         self.canvas.reset_view()
     
+    def _on_toggle_show_fps(self, checked: bool):
+        """Show or hide the canvas frame rate readout."""
+        self.settings_manager.settings.ui.show_fps = checked
+        self.settings_manager.save()
+        self.canvas.show_fps = checked
+        self.canvas.viewport().update()
+    
     def _on_toggle_show_routes(self, checked: bool):
         """Toggle showing all routes."""
         if checked:
@@ -2758,6 +3059,26 @@ class SimulationConfigDialog(QDialog):
         self._seed_spin.setValue(self._config.random_seed)
         general_layout.addRow("Random Seed:", self._seed_spin)
         
+        self._mpi_ranks_spin = QSpinBox()
+        self._mpi_ranks_spin.setRange(1, 256)
+        self._mpi_ranks_spin.setValue(self._config.mpi_ranks)
+        self._mpi_ranks_spin.setToolTip(
+            "Split the topology across MPI ranks and run with mpirun (1 = sequential)"
+        )
+        general_layout.addRow("MPI Ranks:", self._mpi_ranks_spin)
+        
+        self._metrics_interval_spin = QDoubleSpinBox()
+        self._metrics_interval_spin.setRange(0.0, 3600.0)
+        self._metrics_interval_spin.setDecimals(3)
+        self._metrics_interval_spin.setSingleStep(0.5)
+        self._metrics_interval_spin.setValue(self._config.metrics_interval)
+        self._metrics_interval_spin.setSuffix(" seconds")
+        self._metrics_interval_spin.setSpecialValueText("Off")
+        self._metrics_interval_spin.setToolTip(
+            "Simulated time between live metric snapshots (0 = off)"
+        )
+        general_layout.addRow("Metrics Interval:", self._metrics_interval_spin)
+        
         layout.addWidget(general_group)
         
         # Traffic flows
@@ -2827,8 +3148,34 @@ class SimulationConfigDialog(QDialog):
         self._pcap_check.setChecked(self._config.enable_pcap)
         output_layout.addWidget(self._pcap_check)
         
+        from models import ResultsFormat
+        
+        results_layout = QFormLayout()
+        self._results_format_combo = QComboBox()
+        for fmt, label in (
+            (ResultsFormat.AUTO, "Auto (binary for large runs)"),
+            (ResultsFormat.XML, "FlowMonitor XML"),
+            (ResultsFormat.CSV, "CSV"),
+            (ResultsFormat.BINARY, "Binary (columnar)"),
+        ):
+            self._results_format_combo.addItem(label, fmt)
+        self._results_format_combo.setCurrentIndex(
+            self._results_format_combo.findData(self._config.results_format)
+        )
+        results_layout.addRow("Flow Results:", self._results_format_combo)
+        
+        self._histogram_bins_spin = QSpinBox()
+        self._histogram_bins_spin.setRange(0, 1000)
+        self._histogram_bins_spin.setValue(self._config.delay_histogram_bins)
+        self._histogram_bins_spin.setSpecialValueText("Off")
+        self._histogram_bins_spin.setToolTip("Per-flow delay histogram bins (CSV/binary only)")
+        results_layout.addRow("Delay Histogram Bins:", self._histogram_bins_spin)
+        output_layout.addLayout(results_layout)
+        
         layout.addWidget(output_group)
         
+        layout.addWidget(self._create_trace_scope_group())
+        
         # Buttons
         buttons = QDialogButtonBox(
             QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
@@ -2837,6 +3184,40 @@ class SimulationConfigDialog(QDialog):
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
     
+    def _create_trace_scope_group(self) -> QGroupBox:
+        """Create the per-link/node trace selection table."""
+        from views.trace_scope import TraceScopeWidget
+        
+        trace = self._config.trace
+        group = QGroupBox("Trace Scope")
+        group_layout = QVBoxLayout(group)
+        
+        hint = QLabel("Trace only the checked links/nodes. Leave all unchecked to trace every device.")
+        hint.setStyleSheet("color: #6B7280; font-size: 11px;")
+        hint.setWordWrap(True)
+        group_layout.addWidget(hint)
+        
+        self._trace_scope = TraceScopeWidget(self._network, trace)
+        group_layout.addWidget(self._trace_scope)
+        
+        sampling_layout = QFormLayout()
+        self._sample_rate_spin = QDoubleSpinBox()
+        self._sample_rate_spin.setRange(0.01, 1.0)
+        self._sample_rate_spin.setSingleStep(0.05)
+        self._sample_rate_spin.setValue(trace.sample_rate)
+        self._sample_rate_spin.setToolTip("Fraction of packets kept in PKT records")
+        sampling_layout.addRow("PKT Sample Rate:", self._sample_rate_spin)
+        
+        self._snap_length_spin = QSpinBox()
+        self._snap_length_spin.setRange(0, 65535)
+        self._snap_length_spin.setValue(trace.snap_length)
+        self._snap_length_spin.setSpecialValueText("Full packet")
+        self._snap_length_spin.setSuffix(" bytes")
+        sampling_layout.addRow("PCAP Snap Length:", self._snap_length_spin)
+        group_layout.addLayout(sampling_layout)
+        
+        return group
+    
     def _update_flow_list(self):
         """Update the flow list display."""
         self._flow_list.clear()
@@ -3019,9 +3400,18 @@ class SimulationConfigDialog(QDialog):
         """Get the updated configuration."""
         self._config.duration = self._duration_spin.value()
         self._config.random_seed = self._seed_spin.value()
+        self._config.mpi_ranks = self._mpi_ranks_spin.value()
+        self._config.metrics_interval = self._metrics_interval_spin.value()
         self._config.enable_flow_monitor = self._flowmon_check.isChecked()
         self._config.enable_ascii_trace = self._ascii_check.isChecked()
         self._config.enable_pcap = self._pcap_check.isChecked()
+        self._config.results_format = self._results_format_combo.currentData()
+        self._config.delay_histogram_bins = self._histogram_bins_spin.value()
+        
+        trace = self._config.trace
+        self._trace_scope.model.apply_to(trace)
+        trace.sample_rate = self._sample_rate_spin.value()
+        trace.snap_length = self._snap_length_spin.value()
         return self._config
 
 
@@ -3201,7 +3591,7 @@ class FlowEditorDialog(QDialog):
     
     def get_flow(self) -> TrafficFlow:
         """Get the configured flow."""
-        self._flow.name = self._name_edit.text() or f"flow_{self._flow.id[:4]}"
+        self._flow.name = self._name_edit.text() or f"flow_{short_id(self._flow.id)}"
         self._flow.source_node_id = self._source_combo.currentData()
         self._flow.target_node_id = self._target_combo.currentData()
         self._flow.application = self._app_combo.currentData()
@@ -574,6 +574,9 @@ class MetricsDashboard(QWidget):
             critical_threshold=500,
         )
         
+        # Cumulative per-flow counters from live metric snapshots
+        self._flow_totals: Dict[int, Dict] = {}
+        
         self._setup_ui()
         
         # Demo data timer (for testing)
@@ -782,8 +785,44 @@ class MetricsDashboard(QWidget):
         self.success_gauge.set_value(success_rate)
         self.health_gauge.set_value(health)
     
+    def add_metrics_snapshot(self, snapshot):
+        """
+        Add a live MetricsSnapshot streamed from a running simulation.
+        
+        Samples are timestamped with simulated time.
+        """
+        if self.demo_timer.isActive():
+            return
+        
+        if snapshot.flows:
+            self.add_latency_sample(snapshot.mean_delay_ms, snapshot.time)
+            self.add_loss_sample(snapshot.loss_percent, snapshot.time)
+        self.add_throughput_sample(snapshot.throughput_kbps, snapshot.time)
+        
+        for delta in snapshot.flows:
+            totals = self._flow_totals.setdefault(delta.flow_id, {
+                "tx": 0, "rx": 0, "lost": 0, "delay_ms": 0.0,
+            })
+            totals["tx"] += delta.tx_packets
+            totals["rx"] += delta.rx_packets
+            totals["lost"] += delta.lost_packets
+            totals["delay_ms"] += delta.delay_sum_ms
+        
+        flows = []
+        for flow_id, totals in sorted(self._flow_totals.items()):
+            loss = totals["lost"] / totals["tx"] * 100 if totals["tx"] else 0.0
+            flows.append({
+                "name": f"Flow {flow_id}",
+                "status": "warning" if loss >= self.loss_series.warning_threshold > 0 else "active",
+                "latency_ms": totals["delay_ms"] / totals["rx"] if totals["rx"] else 0.0,
+                "packets_sent": totals["tx"],
+                "packets_lost": totals["lost"],
+            })
+        self.update_flow_status(flows)
+    
     def reset_metrics(self):
         """Reset all metrics."""
+        self._flow_totals.clear()
         self.latency_series.samples.clear()
         self.loss_series.samples.clear()
         self.throughput_series.samples.clear()
@@ -123,12 +123,15 @@ class NewProjectDialog(QDialog):
 class OpenProjectDialog(QDialog):
     """Dialog for opening an existing project."""
     
+    projectsRefreshed = pyqtSignal(list)  # Listing from a background index refresh
+    
     def __init__(self, project_manager: ProjectManager, parent=None):
         super().__init__(parent)
         self.project_manager = project_manager
         self._selected_project: Optional[Project] = None
         
         self._setup_ui()
+        self.projectsRefreshed.connect(self._show_projects)
         self._load_projects()
     
     def _setup_ui(self):
@@ -201,12 +204,32 @@ class OpenProjectDialog(QDialog):
         layout.addLayout(btn_layout)
     
     def _load_projects(self):
-        """Load and display projects."""
+        """Show the indexed projects at once, then refresh them in the background."""
+        try:
+            self._show_projects(self.project_manager.list_projects(refresh=False), loading=True)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to load projects:\n{e}")
+            return
+        
+        def done(projects):
+            # Called on the index thread; the signal queues it to the GUI thread
+            try:
+                self.projectsRefreshed.emit(projects)
+            except RuntimeError:
+                pass  # Dialog already closed
+        
+        self.project_manager.project_index.refresh_in_background(done)
+    
+    def _show_projects(self, projects: list, loading: bool = False):
+        """Fill the project list, keeping the selection."""
+        selected = self._project_tree.selectedItems()
+        selected_path = None
+        if selected:
+            proj = selected[0].data(0, Qt.ItemDataRole.UserRole)
+            selected_path = proj.get("path") if proj else None
         self._project_tree.clear()
         
         try:
-            projects = self.project_manager.list_projects()
-            
             for proj in projects:
                 item = QTreeWidgetItem([
                     proj["name"],
@@ -216,9 +239,12 @@ class OpenProjectDialog(QDialog):
                 ])
                 item.setData(0, Qt.ItemDataRole.UserRole, proj)
                 self._project_tree.addTopLevelItem(item)
+                if proj["path"] == selected_path:
+                    item.setSelected(True)
             
             if not projects:
-                item = QTreeWidgetItem(["(No projects found)", "", "", ""])
+                label = "(Loading projects...)" if loading else "(No projects found)"
+                item = QTreeWidgetItem([label, "", "", ""])
                 item.setFlags(Qt.ItemFlag.NoItemFlags)
                 self._project_tree.addTopLevelItem(item)
                 
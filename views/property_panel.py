@@ -1316,8 +1316,9 @@ class NodePropertiesWidget(QWidget):
         from views.routing_dialog import RoutingTableDialog
         
         dialog = RoutingTableDialog(self._node, self._network, self)
-        dialog.routingChanged.connect(self.propertiesChanged.emit)
         dialog.exec()
+        # Routes are added and removed in place, even if the dialog is cancelled
+        self.propertiesChanged.emit()
     
     def _on_add_port(self):
         if self._node:
@@ -1638,10 +1639,16 @@ class PropertyPanel(QWidget):
     def _on_node_properties_changed(self):
         """Forward node properties changed with node ID."""
         node_id = self._current_node_id or ""
+        if node_id and self._network_model is not None:
+            # Edited in place; tell change listeners (autosave)
+            self._network_model.notify_changed("node", node_id)
         self.propertiesChanged.emit(node_id)
     
     def _on_link_properties_changed(self):
         """Forward link properties changed (empty node_id)."""
+        link = self._link_props._link
+        if link is not None and self._network_model is not None:
+            self._network_model.notify_changed("link", link.id, link)
         self.propertiesChanged.emit("")
     
     def scroll_to_port(self, port_id: str):
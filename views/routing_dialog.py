@@ -18,6 +18,7 @@ from models import (
     NodeModel, NetworkModel, NodeType, LinkModel,
     RoutingMode, RouteType, RouteEntry
 )
+from models.ipam import network_address, netmask_to_prefix
 
 
 class RoutingTableDialog(QDialog):
@@ -249,36 +250,44 @@ class RoutingTableDialog(QDialog):
         # Update UI state
         self._update_ui_state()
     
+    def _link_endpoint_address(self, link: LinkModel, node_id: str) -> Tuple[Optional[str], str]:
+        """
+        Get the (ip, netmask) of a node's end of a link.
+        
+        Uses the port's configured address, falling back to the subnet
+        the network's IPAM allocated for the link.
+        """
+        is_source = link.source_node_id == node_id
+        node = self._network.nodes.get(node_id)
+        port = node.get_port(link.source_port_id if is_source else link.target_port_id) if node else None
+        if port and port.ip_address:
+            return (port.ip_address, port.netmask or "255.255.255.0")
+        
+        subnet = self._network.ipam.get(link.id)
+        if subnet:
+            return (subnet.host(1 if is_source else 2), subnet.netmask)
+        return (None, "255.255.255.0")
+    
     def _detect_connected_networks(self):
         """Detect directly connected networks from topology."""
         self._connected_networks.clear()
         
         interface_idx = 0
-        for link_id, link in self._network.links.items():
-            if link.source_node_id == self._node.id:
-                # This node is the source
-                other_node = self._network.nodes.get(link.target_node_id)
-                other_name = other_node.name if other_node else "unknown"
-                
-                # Determine network based on link index
-                link_idx = list(self._network.links.keys()).index(link_id)
-                network = f"10.1.{link_idx + 1}.0"
-                my_ip = f"10.1.{link_idx + 1}.1"
-                
-                self._connected_networks.append((network, 24, interface_idx, other_name, my_ip, link_id))
-                interface_idx += 1
-                
-            elif link.target_node_id == self._node.id:
-                # This node is the target
-                other_node = self._network.nodes.get(link.source_node_id)
-                other_name = other_node.name if other_node else "unknown"
-                
-                link_idx = list(self._network.links.keys()).index(link_id)
-                network = f"10.1.{link_idx + 1}.0"
-                my_ip = f"10.1.{link_idx + 1}.2"
-                
-                self._connected_networks.append((network, 24, interface_idx, other_name, my_ip, link_id))
-                interface_idx += 1
+        for link in self._network.get_links_for_node(self._node.id):
+            link_id = link.id
+            other_id = link.target_node_id if link.source_node_id == self._node.id else link.source_node_id
+            other_node = self._network.nodes.get(other_id)
+            other_name = other_node.name if other_node else "unknown"
+            
+            my_ip, netmask = self._link_endpoint_address(link, self._node.id)
+            if my_ip:
+                network = network_address(my_ip, netmask)
+                prefix = netmask_to_prefix(netmask)
+            else:
+                network, prefix, my_ip = "unassigned", 0, "-"
+            
+            self._connected_networks.append((network, prefix, interface_idx, other_name, my_ip, link_id))
+            interface_idx += 1
     
     def _populate_connected_table(self):
         """Populate the connected networks table."""
@@ -426,7 +435,7 @@ class RoutingTableDialog(QDialog):
         existing_dests = {r.destination for r in self._node.routing_table}
         
         for network, prefix, iface, other_name, my_ip, link_id in self._connected_networks:
-            if network not in existing_dests:
+            if prefix and network not in existing_dests:
                 self._node.routing_table.append(RouteEntry(
                     destination=network,
                     prefix_length=prefix,
@@ -448,11 +457,9 @@ class RoutingTableDialog(QDialog):
                         
                         if other_node and other_node.node_type == NodeType.ROUTER:
                             # Determine router's IP on this link
-                            link_idx = list(self._network.links.keys()).index(link_id)
-                            if link.source_node_id == self._node.id:
-                                router_ip = f"10.1.{link_idx + 1}.2"
-                            else:
-                                router_ip = f"10.1.{link_idx + 1}.1"
+                            router_ip, _ = self._link_endpoint_address(link, other_id)
+                            if not router_ip:
+                                continue
                             
                             self._node.routing_table.append(RouteEntry(
                                 destination="0.0.0.0",
@@ -471,8 +478,9 @@ class RoutingTableDialog(QDialog):
             # Find all networks in topology
             all_networks = set()
             for link_idx, (link_id, link) in enumerate(self._network.links.items()):
-                network = f"10.1.{link_idx + 1}.0"
-                all_networks.add((network, 24, link_idx))
+                ip, netmask = self._link_endpoint_address(link, link.source_node_id)
+                if ip:
+                    all_networks.add((network_address(ip, netmask), netmask_to_prefix(netmask), link_idx))
             
             # Add routes to networks we're not directly connected to
             connected_network_addrs = {n[0] for n in self._connected_networks}
@@ -398,6 +398,23 @@ class SettingsDialog(QDialog):
         self._grid_size_spin.setSuffix(" px")
         canvas_layout.addRow("Grid Size:", self._grid_size_spin)
         
+        self._lod_reduced_spin = QDoubleSpinBox()
+        self._lod_reduced_spin.setRange(0.05, 2.0)
+        self._lod_reduced_spin.setSingleStep(0.05)
+        self._lod_reduced_spin.setSuffix("x")
+        self._lod_reduced_spin.setToolTip("Labels, ports and IP addresses are hidden below this zoom")
+        canvas_layout.addRow("Hide Labels Below:", self._lod_reduced_spin)
+        
+        self._lod_minimal_spin = QDoubleSpinBox()
+        self._lod_minimal_spin.setRange(0.01, 2.0)
+        self._lod_minimal_spin.setSingleStep(0.05)
+        self._lod_minimal_spin.setSuffix("x")
+        self._lod_minimal_spin.setToolTip("Nodes are drawn as dots and links as straight lines below this zoom")
+        canvas_layout.addRow("Overview Below:", self._lod_minimal_spin)
+        
+        self._show_fps_check = QCheckBox("Show frame rate")
+        canvas_layout.addRow("", self._show_fps_check)
+        
         layout.addWidget(canvas_group)
         
         # Animation group
@@ -466,6 +483,9 @@ class SettingsDialog(QDialog):
         # UI tab
         self._show_grid_check.setChecked(s.ui.show_grid)
         self._grid_size_spin.setValue(s.ui.grid_size)
+        self._lod_reduced_spin.setValue(s.ui.lod_reduced_scale)
+        self._lod_minimal_spin.setValue(s.ui.lod_minimal_scale)
+        self._show_fps_check.setChecked(s.ui.show_fps)
         self._show_animations_check.setChecked(s.ui.show_packet_animations)
         self._anim_speed_spin.setValue(s.ui.animation_speed)
         self._recent_files_spin.setValue(s.ui.recent_files_max)
@@ -508,6 +528,9 @@ class SettingsDialog(QDialog):
         # UI tab
         s.ui.show_grid = self._show_grid_check.isChecked()
         s.ui.grid_size = self._grid_size_spin.value()
+        s.ui.lod_reduced_scale = self._lod_reduced_spin.value()
+        s.ui.lod_minimal_scale = min(self._lod_minimal_spin.value(), s.ui.lod_reduced_scale)
+        s.ui.show_fps = self._show_fps_check.isChecked()
         s.ui.show_packet_animations = self._show_animations_check.isChecked()
         s.ui.animation_speed = self._anim_speed_spin.value()
         s.ui.recent_files_max = self._recent_files_spin.value()
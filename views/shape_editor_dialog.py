@@ -50,7 +50,7 @@ from models.shape_definition import (
     ControlPoint, Edge, PrimitiveType, PointType, EdgeType,
     ConnectorDirection
 )
-from services.shape_manager import get_shape_manager
+from services.shape_manager import get_shape_manager, PathLookup
 
 
 # =============================================================================
@@ -1319,36 +1319,19 @@ class ConnectorHandle(QGraphicsEllipseItem):
 
     def handle_drag(self, scene_pos: QPointF):
         """Handle drag to new position - snap to edge."""
-        path = self.canvas.current_path
-        if not path or path.isEmpty():
-            return
+        self._snap_to(scene_pos)
 
-        # Find nearest point on path
-        best_t = 0.0
-        best_dist = float('inf')
-
-        for i in range(101):
-            t = i / 100.0
-            pt = path.pointAtPercent(t)
-            dist = (pt.x() - scene_pos.x())**2 + (pt.y() - scene_pos.y())**2
-            if dist < best_dist:
-                best_dist = dist
-                best_t = t
-
-        # Fine search
-        for i in range(-10, 11):
-            t = max(0, min(1, best_t + i / 1000.0))
-            pt = path.pointAtPercent(t)
-            dist = (pt.x() - scene_pos.x())**2 + (pt.y() - scene_pos.y())**2
-            if dist < best_dist:
-                best_dist = dist
-                best_t = t
+    def _snap_to(self, pos: QPointF):
+        """Move to the nearest point on the shape edge."""
+        lookup = self.canvas.path_lookup()
+        if lookup is None:
+            return
 
+        best_t, x, y = lookup.nearest(pos.x(), pos.y())
         self.connector.edge_position = best_t
 
         self._updating = True
-        final_pt = path.pointAtPercent(best_t)
-        self.setPos(final_pt)
+        self.setPos(QPointF(x, y))
         self._updating = False
         self._update_tooltip()
 
@@ -1365,40 +1348,7 @@ class ConnectorHandle(QGraphicsEllipseItem):
             if not self._dragging:
                 return value
 
-            pos = self.pos()
-            path = self.canvas.current_path
-
-            if path and not path.isEmpty():
-                # Find nearest point on path
-                best_t = 0.0
-                best_dist = float('inf')
-
-                for i in range(101):
-                    t = i / 100.0
-                    pt = path.pointAtPercent(t)
-                    dist = (pt.x() - pos.x())**2 + (pt.y() - pos.y())**2
-                    if dist < best_dist:
-                        best_dist = dist
-                        best_t = t
-
-                # Fine search
-                for i in range(-10, 11):
-                    t = max(0, min(1, best_t + i / 1000.0))
-                    pt = path.pointAtPercent(t)
-                    dist = (pt.x() - pos.x())**2 + (pt.y() - pos.y())**2
-                    if dist < best_dist:
-                        best_dist = dist
-                        best_t = t
-
-                self.connector.edge_position = best_t
-
-                self._updating = True
-                final_pt = path.pointAtPercent(best_t)
-                self.setPos(final_pt)
-                self._updating = False
-                self._update_tooltip()
-
-                self.canvas.connector_moved.emit(self.connector.id)
+            self._snap_to(self.pos())
 
         return value
 
@@ -1642,6 +1592,7 @@ class ShapeEditorCanvas(QGraphicsView):
         # Shape being edited
         self.shape: Optional[ShapeDefinition] = None
         self.current_path: Optional[QPainterPath] = None
+        self._path_lookup: Optional[PathLookup] = None  # Built on first snap
 
         # Graphics items
         self._primitive_items: Dict[str, SelectablePrimitiveItem] = {}
@@ -1870,8 +1821,15 @@ class ShapeEditorCanvas(QGraphicsView):
         border.setZValue(-9)
         self._grid_items.append(border)
 
+    def path_lookup(self) -> Optional[PathLookup]:
+        """Lookup table of current_path for connector snapping (None if no path)."""
+        if self._path_lookup is None and self.current_path and not self.current_path.isEmpty():
+            self._path_lookup = PathLookup(self.current_path)
+        return self._path_lookup
+
     def _update_current_path(self):
         """Compute unified path from all primitives."""
+        self._path_lookup = None
         if not self.shape or not self.shape.primitives:
             self.current_path = None
             return
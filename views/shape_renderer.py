@@ -10,12 +10,15 @@ This provides a unified rendering pipeline that both the canvas
 and palette use, ensuring consistent appearance.
 """
 
+import math
+from collections import OrderedDict
 from typing import Optional, Tuple, List
 from PyQt6.QtCore import Qt, QRectF, QPointF
 from PyQt6.QtGui import (
     QPainter, QColor, QPen, QBrush, QFont, QPainterPath,
     QPixmap, QLinearGradient, QRadialGradient
 )
+from PyQt6.QtWidgets import QStyleOptionGraphicsItem
 
 from models.shape_definition import ShapeDefinition, ShapeStyle
 from services.shape_manager import ShapeManager, get_shape_manager
@@ -293,6 +296,98 @@ class ShapeRenderer:
         return pixmap
 
 
+class ShapePixmapCache:
+    """
+    Rendered node glyphs, so repainting identical nodes is a blit.
+    
+    Entries are keyed by shape ID, size, zoom bucket, device pixel ratio
+    and selected/hover state. Zoom is rounded to quarter octaves, so a
+    glyph is scaled by at most ~9% when drawn and zooming re-renders
+    once per bucket rather than once per frame. A shape's entries are
+    dropped when ShapeManager reports it changed or removed.
+    
+    Usage:
+        get_shape_pixmap_cache().draw(painter, shape, rect, selected=True)
+    """
+    
+    BUCKETS_PER_OCTAVE = 4
+    MAX_ENTRIES = 512
+    MAX_PIXELS = 1024  # Glyphs larger than this on screen are drawn directly
+    
+    def __init__(self, shape_manager: Optional[ShapeManager] = None):
+        self._entries: "OrderedDict[tuple, QPixmap]" = OrderedDict()
+        self.shape_manager = manager = shape_manager or get_shape_manager()
+        manager.shapeChanged.connect(self.invalidate)
+        manager.shapeRemoved.connect(self.invalidate)
+        manager.allShapesReloaded.connect(self.clear)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @classmethod
+    def zoom_bucket(cls, zoom: float) -> float:
+        """Zoom rounded to the nearest bucket."""
+        steps = round(math.log2(max(zoom, 1e-3)) * cls.BUCKETS_PER_OCTAVE)
+        return 2.0 ** (steps / cls.BUCKETS_PER_OCTAVE)
+    
+    @staticmethod
+    def glyph_margin(shape: ShapeDefinition) -> float:
+        """Room around the shape rect for its stroke and selection outline."""
+        return max(shape.style.stroke_width, 4.0) / 2 + 1
+    
+    def draw(self, painter: QPainter, shape: ShapeDefinition, rect: QRectF,
+             selected: bool = False, hover: bool = False):
+        """Draw a shape like ShapeRenderer.render(), from the cache."""
+        zoom = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        device = painter.device()
+        dpr = device.devicePixelRatioF() if device is not None else 1.0
+        scale = self.zoom_bucket(zoom) * dpr
+        
+        margin = self.glyph_margin(shape)
+        target = rect.adjusted(-margin, -margin, margin, margin)
+        if max(target.width(), target.height()) * scale > self.MAX_PIXELS:
+            ShapeRenderer.render(painter, shape, rect, selected=selected, hover=hover)
+            return
+        
+        key = (shape.id, round(rect.width(), 1), round(rect.height(), 1), scale, selected, hover)
+        pixmap = self._entries.get(key)
+        if pixmap is None:
+            pixmap = self._render(shape, rect, margin, scale, selected, hover)
+            self._entries[key] = pixmap
+            if len(self._entries) > self.MAX_ENTRIES:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+        painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+    
+    @staticmethod
+    def _render(shape: ShapeDefinition, rect: QRectF, margin: float, scale: float,
+                selected: bool, hover: bool) -> QPixmap:
+        pixmap = QPixmap(
+            math.ceil((rect.width() + 2 * margin) * scale),
+            math.ceil((rect.height() + 2 * margin) * scale)
+        )
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.scale(scale, scale)
+        ShapeRenderer.render(
+            painter, shape, QRectF(margin, margin, rect.width(), rect.height()),
+            selected=selected, hover=hover
+        )
+        painter.end()
+        return pixmap
+    
+    def invalidate(self, shape_id: str):
+        """Drop the glyphs of one shape."""
+        for key in [key for key in self._entries if key[0] == shape_id]:
+            del self._entries[key]
+    
+    def clear(self):
+        self._entries.clear()
+
+
 class NodeShapeRenderer:
     """
     Specialized renderer for node graphics items on the canvas.
@@ -468,3 +563,14 @@ def render_shape(painter: QPainter, shape_id: str, rect: QRectF, **kwargs):
 def create_shape_preview(shape_id: str, size: int = 32) -> QPixmap:
     """Convenience function to create a shape preview pixmap."""
     return ShapeRenderer.render_preview_by_id(shape_id, size)
+
+
+_pixmap_cache: Optional[ShapePixmapCache] = None
+
+
+def get_shape_pixmap_cache() -> ShapePixmapCache:
+    """Get the global node glyph cache (created on first use)."""
+    global _pixmap_cache
+    if _pixmap_cache is None or _pixmap_cache.shape_manager is not get_shape_manager():
+        _pixmap_cache = ShapePixmapCache()
+    return _pixmap_cache
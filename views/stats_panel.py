@@ -2,9 +2,12 @@
 Statistics panel for displaying simulation metrics.
 
 Shows packet counts, throughput, and other statistics.
-Includes tabs for summary, per-flow details, and console output.
+Includes tabs for summary, per-flow details, run comparison and
+console output.
 """
 
+import sqlite3
+from pathlib import Path
 from typing import Optional, List
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont, QColor
@@ -12,13 +15,15 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QFrame, QGridLayout, QProgressBar, QSizePolicy,
     QTabWidget, QTableWidget, QTableWidgetItem, QHeaderView,
-    QTextEdit, QScrollArea, QPushButton, QTreeWidget, QTreeWidgetItem
+    QTextEdit, QScrollArea, QPushButton, QTreeWidget, QTreeWidgetItem,
+    QComboBox, QSpinBox
 )
 
 from models import (
     SimulationStats, SimulationState, SimulationStatus, 
     SimulationResults, FlowStats
 )
+from services.run_store import RunStore, FLOW_METRICS
 
 
 class StatCard(QFrame):
@@ -221,7 +226,11 @@ class FlowsTab(QWidget):
             self._table.setItem(row, 5, QTableWidgetItem(str(flow.rx_packets)))
             
             # Lost
-            lost_item = QTableWidgetItem(f"{flow.lost_packets} ({flow.packet_loss_percent:.1f}%)")
+            if flow.partial:
+                lost_item = QTableWidgetItem("unknown")
+                lost_item.setToolTip("Flow crosses MPI ranks and no rank's monitor saw it received")
+            else:
+                lost_item = QTableWidgetItem(f"{flow.lost_packets} ({flow.packet_loss_percent:.1f}%)")
             if flow.packet_loss_percent > 5:
                 lost_item.setForeground(QColor("#EF4444"))
             self._table.setItem(row, 6, lost_item)
@@ -239,6 +248,105 @@ class FlowsTab(QWidget):
         self._empty_label.show()
 
 
+class RunsTab(QWidget):
+    """Compares a per-flow metric across the project's recent runs."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._store_path: Optional[Path] = None
+        self._setup_ui()
+    
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 12, 0, 0)
+        layout.setSpacing(2)
+        
+        controls = QHBoxLayout()
+        self._metric_combo = QComboBox()
+        for column, label in FLOW_METRICS.items():
+            self._metric_combo.addItem(label, column)
+        self._metric_combo.currentIndexChanged.connect(self.refresh)
+        controls.addWidget(self._metric_combo, 1)
+        
+        controls.addWidget(QLabel("Last"))
+        self._count_spin = QSpinBox()
+        self._count_spin.setRange(2, 50)
+        self._count_spin.setValue(5)
+        self._count_spin.valueChanged.connect(self.refresh)
+        controls.addWidget(self._count_spin)
+        controls.addWidget(QLabel("runs"))
+        layout.addLayout(controls)
+        
+        self._table = QTableWidget()
+        self._table.setStyleSheet("""
+            QTableWidget {
+                background: white;
+                border: 1px solid #E5E7EB;
+                border-radius: 6px;
+                gridline-color: #F3F4F6;
+            }
+            QHeaderView::section {
+                background: #F9FAFB;
+                border: none;
+                border-bottom: 1px solid #E5E7EB;
+                padding: 2px;
+                font-weight: 600;
+                color: #374151;
+            }
+        """)
+        self._table.verticalHeader().setVisible(False)
+        self._table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self._table.setAlternatingRowColors(True)
+        layout.addWidget(self._table)
+        
+        self._empty_label = QLabel("No run history.\nRuns of a saved project are compared here.")
+        self._empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._empty_label.setStyleSheet("color: #9CA3AF; font-size: 12px; padding: 4px;")
+        layout.addWidget(self._empty_label)
+        
+        self._table.hide()
+    
+    def set_store_path(self, path: Optional[Path]):
+        """Show runs from this run store (None for no project)."""
+        self._store_path = Path(path) if path else None
+        self.refresh()
+    
+    def refresh(self):
+        """Re-read the comparison from the run store."""
+        runs, table = [], {}
+        if self._store_path is not None and self._store_path.exists():
+            try:
+                with RunStore(self._store_path) as store:
+                    runs = list(reversed(store.list_runs(limit=self._count_spin.value())))
+                    table = store.compare_runs([run["id"] for run in runs], self._metric_combo.currentData())
+            except sqlite3.Error as e:
+                print(f"Error reading run history: {e}")
+        
+        if not table:
+            self._table.hide()
+            self._empty_label.show()
+            return
+        self._empty_label.hide()
+        self._table.show()
+        
+        self._table.setColumnCount(len(runs) + 1)
+        self._table.setHorizontalHeaderLabels(
+            ["Flow"] + [run["id"].removeprefix("run_") for run in runs]
+        )
+        for column, run in enumerate(runs, start=1):
+            self._table.horizontalHeaderItem(column).setToolTip(f"{run['id']} ({run['status']})")
+        self._table.setRowCount(len(table))
+        for row, (key, values) in enumerate(table.items()):
+            self._table.setItem(row, 0, QTableWidgetItem(key))
+            for column, run in enumerate(runs, start=1):
+                value = values.get(run["id"])
+                text = "-" if value is None else f"{value:.2f}" if isinstance(value, float) else str(value)
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self._table.setItem(row, column, item)
+        self._table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+
+
 class ConsoleTab(QWidget):
     """Console output tab with timestamps and log levels."""
     
@@ -652,6 +760,7 @@ class StatsPanel(QWidget):
     Shows:
     - Summary statistics
     - Per-flow details
+    - Per-flow comparison across runs (from the project's run store)
     - Console output
     """
     
@@ -749,6 +858,9 @@ class StatsPanel(QWidget):
         self._flows_tab = FlowsTab()
         self._tabs.addTab(self._flows_tab, "Flows")
         
+        self._runs_tab = RunsTab()
+        self._tabs.addTab(self._runs_tab, "Runs")
+        
         self._routing_tab = RoutingTab()
         self._tabs.addTab(self._routing_tab, "Routing")
         
@@ -804,6 +916,14 @@ class StatsPanel(QWidget):
         if results.flow_stats:
             self._tabs.setCurrentIndex(0)
     
+    def set_run_store(self, path: Optional[Path]):
+        """Compare runs from this run store (None when no project is open)."""
+        self._runs_tab.set_store_path(path)
+    
+    def refresh_runs(self):
+        """Re-read the run comparison after a run was recorded."""
+        self._runs_tab.refresh()
+    
     def append_console_line(self, line: str):
         """Append a line to the console output."""
         self._console_tab.append_line(line)
@@ -8,19 +8,22 @@ on each node that can be selected and connected.
 
 import math
 import logging
-from typing import Optional, List
-from PyQt6.QtCore import Qt, QPointF, QRectF, pyqtSignal, QLineF, QTimer, QObject
+from collections import deque
+from enum import Enum, auto
+from typing import Callable, Dict, Optional, List, Iterable, Iterator
+from PyQt6.QtCore import Qt, QPointF, QRectF, pyqtSignal, QLineF, QTimer, QObject, QElapsedTimer
 from PyQt6.QtGui import (
-    QPainter, QPen, QBrush, QColor, QFont, QPainterPath,
+    QPainter, QPen, QBrush, QColor, QFont, QPainterPath, QPixmap,
     QPolygonF, QTransform, QWheelEvent, QMouseEvent, QKeyEvent
 )
 from PyQt6.QtWidgets import (
     QGraphicsView, QGraphicsScene, QGraphicsItem,
-    QGraphicsEllipseItem, QGraphicsPathItem, QGraphicsTextItem,
+    QGraphicsEllipseItem, QGraphicsPathItem, QGraphicsTextItem, QGraphicsSimpleTextItem,
     QGraphicsRectItem, QApplication, QToolTip, QMenu
 )
 
 from models import NodeType, MediumType, ChannelType, PortType, Position, NetworkModel, NodeModel, LinkModel, PortConfig
+from models.connectivity import ShortestPathTrees
 
 # Import shape rendering (Phase 3)
 from services.shape_manager import get_shape_manager
@@ -62,6 +65,13 @@ COLORS = {
 }
 
 
+class DetailLevel(Enum):
+    """How much the canvas draws at the current zoom."""
+    FULL = auto()     # Labels, ports, IP text and curved links
+    REDUCED = auto()  # Node shapes and curved links, no text or ports
+    MINIMAL = auto()  # Nodes and straight links batch-drawn by OverviewLayerItem
+
+
 class PortGraphicsItem(QGraphicsEllipseItem):
     """
     Visual representation of a port on a node.
@@ -108,8 +118,9 @@ class PortGraphicsItem(QGraphicsEllipseItem):
         self._is_dragging = False
         self._drag_start_angle = 0.0
         
-        # Create label for port type
-        self._label = QGraphicsTextItem(self)
+        # Create label for port type (simple text: cheap to create in bulk)
+        self._label = QGraphicsSimpleTextItem(self)
+        self._label.setFont(self._label_font())
         self._update_label()
         
         # Create IP address label (positioned outside port)
@@ -140,16 +151,20 @@ class PortGraphicsItem(QGraphicsEllipseItem):
         self._angle = angle
         self._update_position_from_angle()
     
+    _LABEL_FONT: Optional[QFont] = None
+    
+    @classmethod
+    def _label_font(cls) -> QFont:
+        """Port type label font, shared by all ports."""
+        if cls._LABEL_FONT is None:
+            cls._LABEL_FONT = QFont("SF Pro Display", 6)
+            cls._LABEL_FONT.setWeight(QFont.Weight.Bold)
+        return cls._LABEL_FONT
+    
     def _update_label(self):
         """Update the port type label text."""
         label_text = self.PORT_TYPE_LABELS.get(self.port.port_type, "?")
-        self._label.setPlainText(label_text)
-        
-        # Style the label
-        font = QFont("SF Pro Display", 6)
-        font.setWeight(QFont.Weight.Bold)
-        self._label.setFont(font)
-        self._label.setDefaultTextColor(QColor("white"))
+        self._label.setText(label_text)
         
         # Center the label
         label_rect = self._label.boundingRect()
@@ -219,13 +234,13 @@ class PortGraphicsItem(QGraphicsEllipseItem):
         
         # Update label color for better contrast
         if self._is_selected or self._is_hovered:
-            self._label.setDefaultTextColor(QColor("white"))
+            self._label.setBrush(QColor("white"))
         elif not self.port.enabled:
-            self._label.setDefaultTextColor(QColor("#FECACA"))  # Light red
+            self._label.setBrush(QColor("#FECACA"))  # Light red
         elif self.port.is_connected:
-            self._label.setDefaultTextColor(QColor("white"))
+            self._label.setBrush(QColor("white"))
         else:
-            self._label.setDefaultTextColor(QColor("white"))
+            self._label.setBrush(QColor("white"))
     
     def update_from_model(self):
         """Update appearance from the port model (call after port type changes)."""
@@ -414,6 +429,9 @@ class NodeGraphicsItem(QGraphicsEllipseItem):
         self._app_indicator: Optional[QGraphicsRectItem] = None
         self._app_indicator_label: Optional[QGraphicsTextItem] = None
         
+        # Zoom level of detail (set by the scene)
+        self._detail_level = DetailLevel.FULL
+        
         # Enable interactions
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, True)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
@@ -473,6 +491,8 @@ class NodeGraphicsItem(QGraphicsEllipseItem):
                 -label_rect.width() / 2,
                 badge_y + (badge_height - label_rect.height()) / 2
             )
+            if self._detail_level != DetailLevel.FULL:
+                self._apply_detail_level()
         elif not has_app and self._app_indicator:
             # Remove the indicator and label
             scene = self.scene()
@@ -557,6 +577,9 @@ class NodeGraphicsItem(QGraphicsEllipseItem):
             
             port_item = PortGraphicsItem(port, angle, self.NODE_RADIUS, self)
             self._port_items[port.id] = port_item
+        
+        if self._detail_level != DetailLevel.FULL:
+            self._apply_detail_level()
     
     def _get_icon_char(self) -> str:
         """Get character icon for node type and medium."""
@@ -582,6 +605,27 @@ class NodeGraphicsItem(QGraphicsEllipseItem):
         
         return base
     
+    def set_detail_level(self, level: DetailLevel):
+        """Show only the parts of the node that are readable at a zoom level."""
+        if level == self._detail_level:
+            return
+        self._detail_level = level
+        self._apply_detail_level()
+    
+    def _apply_detail_level(self):
+        full = self._detail_level == DetailLevel.FULL
+        self._label.setVisible(full)
+        for port_item in self._port_items.values():
+            port_item.setVisible(full)  # Hides the port's type and IP labels too
+        if self._app_indicator:
+            self._app_indicator.setVisible(full)
+            self._app_indicator_label.setVisible(full)
+        # Still selectable and hit-tested; OverviewLayerItem draws it
+        self.setFlag(
+            QGraphicsItem.GraphicsItemFlag.ItemHasNoContents,
+            self._detail_level == DetailLevel.MINIMAL
+        )
+    
     def get_port_item(self, port_id: str) -> Optional[PortGraphicsItem]:
         """Get the graphics item for a specific port."""
         return self._port_items.get(port_id)
@@ -616,6 +660,9 @@ class NodeGraphicsItem(QGraphicsEllipseItem):
             shape_manager._invalidate_cache(self._get_shape_id())
         
         self.update()
+        scene = self.scene()
+        if isinstance(scene, TopologyScene):
+            scene.invalidate_overview()
     
     def update_ports(self):
         """Refresh port indicators to match model."""
@@ -636,10 +683,11 @@ class NodeGraphicsItem(QGraphicsEllipseItem):
             self.node_model.position.x = pos.x()
             self.node_model.position.y = pos.y()
             
-            # Notify scene to update connected links
+            # Queue connected links for the scene's next link flush
             scene = self.scene()
             if scene and isinstance(scene, TopologyScene):
-                scene.update_links_for_node(self.node_model.id)
+                scene.mark_node_moved(self.node_model.id)
+                scene.network_model.notify_changed("node", self.node_model.id)
         
         return super().itemChange(change, value)
     
@@ -813,9 +861,10 @@ class NodeGraphicsItem(QGraphicsEllipseItem):
         self.node_model.medium_type = medium_type
         self.update_appearance()
         
-        # Notify scene
+        # Notify model listeners (autosave) and the scene
         scene = self.scene()
         if scene and isinstance(scene, TopologyScene):
+            scene.network_model.notify_changed("node", self.node_model.id)
             scene.mediumTypeChanged.emit(self.node_model.id, medium_type)
     
     def paint(self, painter: QPainter, option, widget):
@@ -838,7 +887,7 @@ class NodeGraphicsItem(QGraphicsEllipseItem):
     def _paint_with_shape_renderer(self, painter: QPainter):
         """Paint the node using ShapeManager shapes."""
         # Import here to avoid circular imports
-        from views.shape_renderer import ShapeRenderer
+        from views.shape_renderer import get_shape_pixmap_cache
         
         # Get the shape ID based on node type
         shape_id = self._get_shape_id()
@@ -851,13 +900,11 @@ class NodeGraphicsItem(QGraphicsEllipseItem):
             # Create rect for shape rendering
             rect = self.rect()  # This is already set up in __init__
             
-            # Render using ShapeRenderer
-            ShapeRenderer.render(
+            # Blit the cached glyph (ports are drawn by our own items)
+            get_shape_pixmap_cache().draw(
                 painter, shape, rect,
                 selected=self.isSelected(),
-                hover=self._is_hovered,
-                show_connectors=False,  # We have our own port rendering
-                opacity=1.0
+                hover=self._is_hovered
             )
         else:
             # Fallback to legacy rendering
@@ -874,12 +921,17 @@ class NodeGraphicsItem(QGraphicsEllipseItem):
     
     def _get_shape_id(self) -> str:
         """Get the shape ID for this node."""
+        return self.shape_id_for(self.node_model)
+    
+    @staticmethod
+    def shape_id_for(node_model: NodeModel) -> str:
+        """Get the shape ID used to draw a node model."""
         # Check for grid node type first
-        if hasattr(self.node_model, 'grid_type') and self.node_model.grid_type:
-            return self.node_model.grid_type.name
+        if hasattr(node_model, 'grid_type') and node_model.grid_type:
+            return node_model.grid_type.name
         
         # Fall back to standard node type
-        return self.node_model.node_type.name
+        return node_model.node_type.name
 
 
 
@@ -1126,6 +1178,7 @@ class LinkGraphicsItem(QGraphicsPathItem):
         self._guard_setpos = False  # Prevent recursion during snapping
         self._show_handles = False
         self._handles_created = False
+        self._detail_level = DetailLevel.FULL
         
         # Enable selection
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
@@ -1160,12 +1213,25 @@ class LinkGraphicsItem(QGraphicsPathItem):
             self.setPen(QPen(color, 3, Qt.PenStyle.SolidLine, 
                             Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin))
     
+    def set_detail_level(self, level: DetailLevel):
+        """Leave drawing to OverviewLayerItem at MINIMAL detail."""
+        if level == self._detail_level:
+            return
+        self._detail_level = level
+        self.setFlag(
+            QGraphicsItem.GraphicsItemFlag.ItemHasNoContents,
+            level == DetailLevel.MINIMAL
+        )
+    
     def set_route_highlight(self, highlighted: bool, is_default: bool = False):
         """Set route highlighting state."""
         self._route_highlighted = highlighted
         self._is_default_route = is_default
         self._setup_appearance()
         self.update()
+        scene = self.scene()
+        if isinstance(scene, TopologyScene):
+            scene.invalidate_overview()
     
     def set_activity(self, active: bool, direction: str = 'both'):
         """Set link activity state for visual feedback during simulation."""
@@ -1456,6 +1522,8 @@ class LinkGraphicsItem(QGraphicsPathItem):
         """Show or hide the editing handles."""
         if show and not self._handles_created:
             self._create_handle_items()
+        elif show and not self._show_handles:
+            self._sync_all_items()  # Hidden handles aren't moved with the curve
         
         self._show_handles = show
         
@@ -1563,7 +1631,8 @@ class LinkGraphicsItem(QGraphicsPathItem):
         self._anchors[-1].tout = QPointF(-self._anchors[-1].tin.x(), -self._anchors[-1].tin.y())
         
         self._rebuild_path()
-        self._sync_all_items()
+        if self._show_handles:
+            self._sync_all_items()
     
     def add_intermediate_anchor(self, t: float = 0.5):
         """
@@ -1677,14 +1746,253 @@ class TempLinkItem(QGraphicsPathItem):
         self.setPath(path)
 
 
-class PacketAnimationItem(QGraphicsEllipseItem):
+class OverviewLayerItem(QGraphicsItem):
+    """
+    Draws the whole topology in a few calls when zoomed far out.
+    
+    At DetailLevel.MINIMAL node and link items paint nothing but stay in
+    the scene for selection and dragging. This layer draws the links as
+    straight lines with one drawLines() call per color, and the nodes as
+    a cached dot sprite per color with one drawPixmapFragments() call.
+    The geometry is gathered by rebuild(), not on every paint.
+    """
+    
+    DOT_RADIUS = NodeGraphicsItem.NODE_RADIUS
+    SPRITE_SCALE = 0.5  # Sprite pixels per scene unit (only shown zoomed out)
+    
+    def __init__(self, parent: Optional[QGraphicsItem] = None):
+        super().__init__(parent)
+        self.setZValue(-0.5)  # Where links and nodes would be
+        self.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+        self._bounds = QRectF()
+        self._lines: List[tuple] = []      # (QPen, [QLineF])
+        self._dots: List[tuple] = []       # (QPixmap, [PixmapFragment])
+        self._selected: List[QPointF] = []
+        self._sprites: dict[int, QPixmap] = {}
+        size = math.ceil(self.SPRITE_SCALE * self.DOT_RADIUS * 2)
+        self._sprite_rect = QRectF(0, 0, size, size)
+    
+    def _sprite(self, color: QColor) -> QPixmap:
+        sprite = self._sprites.get(color.rgba())
+        if sprite is None:
+            size = int(self._sprite_rect.width())
+            sprite = QPixmap(size, size)
+            sprite.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(sprite)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setBrush(QBrush(color))
+            painter.setPen(QPen(color.darker(120), 1))
+            painter.drawEllipse(QRectF(0.5, 0.5, size - 1, size - 1))
+            painter.end()
+            self._sprites[color.rgba()] = sprite
+        return sprite
+    
+    def rebuild(self, node_items: Iterable[NodeGraphicsItem], link_items: Iterable[LinkGraphicsItem]):
+        """Gather node positions and link endpoints from the scene items."""
+        lines: dict[int, tuple] = {}
+        for item in link_items:
+            color = item.pen().color()
+            segment = QLineF(item.source_item.pos(), item.target_item.pos())
+            lines.setdefault(color.rgba(), (color, []))[1].append(segment)
+        
+        create = QPainter.PixmapFragment.create
+        source = self._sprite_rect
+        scale = 1.0 / self.SPRITE_SCALE
+        dots: dict[int, tuple] = {}
+        selected = []
+        xs, ys = [], []
+        for item in node_items:
+            pos = item.pos()
+            xs.append(pos.x())
+            ys.append(pos.y())
+            color = item.brush().color()
+            dots.setdefault(color.rgba(), (color, []))[1].append(create(pos, source, scale, scale))
+            if item.isSelected():
+                selected.append(pos)
+        
+        self._lines = []
+        for color, segments in lines.values():
+            pen = QPen(color, 2)
+            pen.setCosmetic(True)  # Stays visible however far out
+            self._lines.append((pen, segments))
+        self._dots = [(self._sprite(color), fragments) for color, fragments in dots.values()]
+        self._selected = selected
+        
+        if xs:
+            margin = self.DOT_RADIUS + 8
+            bounds = QRectF(
+                min(xs) - margin, min(ys) - margin,
+                max(xs) - min(xs) + 2 * margin, max(ys) - min(ys) + 2 * margin
+            )
+        else:
+            bounds = QRectF()
+        if bounds != self._bounds:
+            self.prepareGeometryChange()
+            self._bounds = bounds
+        self.update()
+    
+    def boundingRect(self) -> QRectF:
+        return self._bounds
+    
+    def paint(self, painter: QPainter, option, widget=None):
+        for pen, segments in self._lines:
+            painter.setPen(pen)
+            painter.drawLines(segments)
+        for sprite, fragments in self._dots:
+            painter.drawPixmapFragments(fragments, sprite)
+        if self._selected:
+            pen = QPen(COLORS["selection"], 2)
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            radius = self.DOT_RADIUS + 5
+            for pos in self._selected:
+                painter.drawEllipse(pos, radius, radius)
+
+
+class HeatmapLayerItem(QGraphicsItem):
+    """
+    Colors and thickens links by load (0..1) in one paint() call.
+    
+    Values are bucketed into LEVELS steps from green to red, widening
+    with load, and each step is drawn with one pen: the links' curves,
+    culled to the exposed rect, or at DetailLevel.MINIMAL straight lines
+    in one drawLines() call. A heatmap frame is one update() however many
+    links changed. Links without load are left to their own items.
+    """
+    
+    LEVELS = 8
+    MIN_WIDTH = 5.0     # Scene units at the lowest level
+    MAX_WIDTH = 14.0
+    MIN_COSMETIC_WIDTH = 3.0  # Pixels at DetailLevel.MINIMAL
+    MAX_COSMETIC_WIDTH = 8.0
+    LOW_COLOR = QColor("#22C55E")
+    MID_COLOR = QColor("#FACC15")
+    HIGH_COLOR = QColor("#EF4444")
+    
+    def __init__(self, parent: Optional[QGraphicsItem] = None):
+        super().__init__(parent)
+        self.setZValue(-0.75)  # Over link items, under nodes and the overview
+        self.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption, True)
+        self._bounds = QRectF()
+        self._paths: List[tuple] = []   # (QPen, [(QRectF, QPainterPath)])
+        self._lines: List[tuple] = []   # (QPen, [QLineF])
+    
+    @classmethod
+    def level_color(cls, fraction: float) -> QColor:
+        """Green through yellow to red for 0..1."""
+        if fraction < 0.5:
+            low, high, t = cls.LOW_COLOR, cls.MID_COLOR, fraction * 2
+        else:
+            low, high, t = cls.MID_COLOR, cls.HIGH_COLOR, fraction * 2 - 1
+        return QColor(
+            round(low.red() + (high.red() - low.red()) * t),
+            round(low.green() + (high.green() - low.green()) * t),
+            round(low.blue() + (high.blue() - low.blue()) * t),
+            220,
+        )
+    
+    def _pen(self, level: int, cosmetic: bool) -> QPen:
+        fraction = level / (self.LEVELS - 1)
+        if cosmetic:
+            width = self.MIN_COSMETIC_WIDTH + (self.MAX_COSMETIC_WIDTH - self.MIN_COSMETIC_WIDTH) * fraction
+        else:
+            width = self.MIN_WIDTH + (self.MAX_WIDTH - self.MIN_WIDTH) * fraction
+        pen = QPen(self.level_color(fraction), width, Qt.PenStyle.SolidLine,
+                   Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin)
+        pen.setCosmetic(cosmetic)
+        return pen
+    
+    def rebuild(self, link_items: Dict[str, LinkGraphicsItem], values: Dict[str, float], straight: bool = False):
+        """
+        Gather the loaded links' geometry by level.
+        
+        Args:
+            link_items: Scene link items by link ID
+            values: Load per link ID (0..1); others are not drawn
+            straight: Draw source-to-target lines (zoomed far out)
+        """
+        top = self.LEVELS - 1
+        levels: Dict[int, list] = {}
+        for link_id, value in values.items():
+            item = link_items.get(link_id)
+            if item is None or value <= 0:
+                continue
+            level = min(top, int(value * top + 0.5))
+            levels.setdefault(level, []).append(item)
+        
+        bounds = QRectF()
+        self._paths = []
+        self._lines = []
+        for level in sorted(levels):
+            items = levels[level]
+            pen = self._pen(level, straight)
+            if straight:
+                segments = [QLineF(item.source_item.pos(), item.target_item.pos()) for item in items]
+                self._lines.append((pen, segments))
+                for segment in segments:
+                    bounds = bounds.united(QRectF(segment.p1(), segment.p2()).normalized())
+            else:
+                margin = pen.widthF() / 2
+                paths = []
+                for item in items:
+                    path = item.path()
+                    rect = path.boundingRect().adjusted(-margin, -margin, margin, margin)
+                    paths.append((rect, path))
+                    bounds = bounds.united(rect)
+                self._paths.append((pen, paths))
+        
+        if bounds != self._bounds:
+            self.prepareGeometryChange()
+            self._bounds = bounds
+        self.update()
+    
+    def clear(self):
+        self.rebuild({}, {})
+    
+    def boundingRect(self) -> QRectF:
+        return self._bounds
+    
+    def paint(self, painter: QPainter, option, widget=None):
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        exposed = option.exposedRect if option is not None else self._bounds
+        for pen, paths in self._paths:
+            painter.setPen(pen)
+            for rect, path in paths:
+                if rect.intersects(exposed):
+                    painter.drawPath(path)
+        for pen, segments in self._lines:
+            painter.setPen(pen)
+            painter.drawLines(segments)
+
+
+class _Packet:
+    """One in-flight packet (plain data, painted by PacketLayerItem)."""
+    __slots__ = ("x", "y", "dx", "dy", "start", "duration", "kind")
+    
+    def __init__(self, source: QPointF, target: QPointF, start: int, duration: int, kind: str):
+        self.x = source.x()
+        self.y = source.y()
+        self.dx = target.x() - self.x
+        self.dy = target.y() - self.y
+        self.start = start
+        self.duration = max(1, duration)
+        self.kind = kind
+
+
+class PacketLayerItem(QGraphicsItem):
     """
-    Animated packet moving along a link.
+    Paints every in-flight packet in one paint() call.
     
-    Shows packet transmission/reception with smooth animation.
+    Packets are plain records rather than scene items, so starting one
+    costs no item allocation or scene index update. Each packet type is
+    pre-rendered once as a sprite, and all packets of a type are blitted
+    with a single drawPixmapFragments() call.
     """
     
     PACKET_RADIUS = 6
+    SPRITE_SCALE = 2  # Sprite pixels per scene unit (crisp when zoomed in)
     
     # Colors for different packet types
     COLORS = {
@@ -1694,95 +2002,100 @@ class PacketAnimationItem(QGraphicsEllipseItem):
         'default': QColor("#F59E0B"),  # Orange - default
     }
     
-    def __init__(
-        self, 
-        source_pos: QPointF,
-        target_pos: QPointF,
-        packet_type: str = 'tx',
-        parent: Optional[QGraphicsItem] = None
-    ):
-        r = self.PACKET_RADIUS
-        super().__init__(-r, -r, r * 2, r * 2, parent)
-        
-        self._source_pos = source_pos
-        self._target_pos = target_pos
-        self._progress = 0.0
-        
-        # Visual setup
-        color = self.COLORS.get(packet_type, self.COLORS['default'])
-        self.setBrush(QBrush(color))
-        self.setPen(QPen(color.darker(120), 1))
+    def __init__(self, parent: Optional[QGraphicsItem] = None):
+        super().__init__(parent)
         self.setZValue(50)  # Above links, below UI elements
-        
-        # Start at source
-        self.setPos(source_pos)
-        
-        # Animation
-        self._animation_timer: Optional[QTimer] = None
-        self._animation_duration_ms = 300
-        self._animation_start_time = 0
-    
-    @property
-    def progress(self) -> float:
-        return self._progress
-    
-    @progress.setter
-    def progress(self, value: float):
-        """Set position along path (0.0 = source, 1.0 = target)."""
-        self._progress = max(0.0, min(1.0, value))
-        
-        # Interpolate position
-        x = self._source_pos.x() + (self._target_pos.x() - self._source_pos.x()) * self._progress
-        y = self._source_pos.y() + (self._target_pos.y() - self._source_pos.y()) * self._progress
-        self.setPos(x, y)
-    
-    def animate(self, duration_ms: int = 300, on_complete: Optional[callable] = None):
-        """Animate packet from source to target."""
-        self._animation_duration_ms = duration_ms
-        self._on_complete = on_complete
-        self._animation_elapsed = 0
-        
-        self._animation_timer = QTimer()
-        self._animation_timer.timeout.connect(self._animate_step)
-        self._animation_timer.start(16)  # ~60fps
-    
-    def _animate_step(self):
-        """Advance animation one step."""
-        self._animation_elapsed += 16
-        t = self._animation_elapsed / self._animation_duration_ms
-        
-        if t >= 1.0:
-            self.progress = 1.0
-            self._animation_timer.stop()
-            self._animation_timer = None
-            if self._on_complete:
-                self._on_complete(self)
+        self.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+        self.packets: List[_Packet] = []
+        self.now = 0  # Clock time (ms) the packets are painted at
+        self._bounds = QRectF()
+        self._sprites = {kind: self._render_sprite(color) for kind, color in self.COLORS.items()}
+        size = self.SPRITE_SCALE * (self.PACKET_RADIUS + 1) * 2
+        self._sprite_rect = QRectF(0, 0, size, size)
+    
+    @classmethod
+    def _render_sprite(cls, color: QColor) -> QPixmap:
+        """A packet dot with its outline, drawn once per type."""
+        scale = cls.SPRITE_SCALE
+        r = cls.PACKET_RADIUS
+        pixmap = QPixmap(scale * (r + 1) * 2, scale * (r + 1) * 2)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.scale(scale, scale)
+        painter.setBrush(QBrush(color))
+        painter.setPen(QPen(color.darker(120), 1))
+        painter.drawEllipse(QPointF(r + 1, r + 1), r, r)
+        painter.end()
+        return pixmap
+    
+    def boundingRect(self) -> QRectF:
+        return self._bounds
+    
+    def update_bounds(self):
+        """Fit the bounding rect to the paths of the current packets."""
+        if self.packets:
+            xs = [p.x for p in self.packets] + [p.x + p.dx for p in self.packets]
+            ys = [p.y for p in self.packets] + [p.y + p.dy for p in self.packets]
+            margin = self.PACKET_RADIUS + 2
+            bounds = QRectF(
+                min(xs) - margin, min(ys) - margin,
+                max(xs) - min(xs) + 2 * margin, max(ys) - min(ys) + 2 * margin
+            )
         else:
-            # Ease in-out
-            t = t * t * (3 - 2 * t)
-            self.progress = t
-    
-    def stop_animation(self):
-        """Stop ongoing animation."""
-        if self._animation_timer:
-            self._animation_timer.stop()
-            self._animation_timer = None
+            bounds = QRectF()
+        if bounds != self._bounds:
+            self.prepareGeometryChange()
+            self._bounds = bounds
+    
+    def paint(self, painter: QPainter, option, widget=None):
+        now = self.now
+        source = self._sprite_rect
+        scale = 1.0 / self.SPRITE_SCALE
+        create = QPainter.PixmapFragment.create
+        fragments = {}
+        for p in self.packets:
+            t = (now - p.start) / p.duration
+            if t > 1.0:
+                t = 1.0
+            t = t * t * (3 - 2 * t)  # Ease in-out
+            fragments.setdefault(p.kind, []).append(
+                create(QPointF(p.x + p.dx * t, p.y + p.dy * t), source, scale, scale)
+            )
+        
+        for kind, kind_fragments in fragments.items():
+            sprite = self._sprites.get(kind, self._sprites['default'])
+            painter.drawPixmapFragments(kind_fragments, sprite)
 
 
 class PacketAnimationManager(QObject):
     """
-    Manages multiple packet animations on the canvas.
+    Manages packet animations on the canvas.
     
-    Coordinates packet creation, animation, and cleanup.
+    One clock drives every in-flight packet: a single timer runs while
+    packets are in flight, prunes finished ones and repaints the packet
+    layer once per frame. Positions follow elapsed wall time, so a slow
+    frame doesn't slow the packets down.
     """
     
+    FRAME_INTERVAL_MS = 16  # ~60fps
+    DEFAULT_MAX_PACKETS = 5000
+    
     def __init__(self, scene: 'TopologyScene', parent: Optional[QObject] = None):
         super().__init__(parent)
         self._scene = scene
-        self._active_packets: List[PacketAnimationItem] = []
-        self._max_packets = 50  # Limit for performance
+        self._layer = PacketLayerItem()
+        self._max_packets = self.DEFAULT_MAX_PACKETS  # Oldest packets are dropped beyond this
         self._enabled = True
         self._animation_speed = 1.0
+        
+        self._clock = QElapsedTimer()
+        self._clock.start()
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(self.FRAME_INTERVAL_MS)
+        self._timer.timeout.connect(self._tick)
+        self._bounds_dirty = False
     
     @property
     def enabled(self) -> bool:
@@ -1802,6 +2115,19 @@ class PacketAnimationManager(QObject):
     def animation_speed(self, value: float):
         self._animation_speed = max(0.1, min(10.0, value))
     
+    @property
+    def max_packets(self) -> int:
+        return self._max_packets
+    
+    @max_packets.setter
+    def max_packets(self, value: int):
+        self._max_packets = max(1, value)
+    
+    @property
+    def active_count(self) -> int:
+        """Packets currently in flight."""
+        return len(self._layer.packets)
+    
     def animate_packet(
         self,
         source_node_id: str,
@@ -1828,23 +2154,7 @@ class PacketAnimationManager(QObject):
         if not source_item or not target_item:
             return
         
-        source_pos = source_item.scenePos()
-        target_pos = target_item.scenePos()
-        
-        # Limit active packets
-        if len(self._active_packets) >= self._max_packets:
-            self._remove_oldest()
-        
-        # Create packet
-        packet = PacketAnimationItem(source_pos, target_pos, packet_type)
-        self._scene.addItem(packet)
-        self._active_packets.append(packet)
-        
-        # Adjust duration for speed
-        adjusted_duration = int(duration_ms / self._animation_speed)
-        
-        # Animate
-        packet.animate(adjusted_duration, self._on_packet_complete)
+        self._start_packet(source_item.scenePos(), target_item.scenePos(), packet_type, duration_ms)
     
     def animate_packet_on_link(
         self,
@@ -1876,37 +2186,44 @@ class PacketAnimationManager(QObject):
             source_pos = link_item.target_item.scenePos()
             target_pos = link_item.source_item.scenePos()
         
-        # Limit active packets
-        if len(self._active_packets) >= self._max_packets:
-            self._remove_oldest()
-        
-        # Create and animate packet
-        packet = PacketAnimationItem(source_pos, target_pos, packet_type)
-        self._scene.addItem(packet)
-        self._active_packets.append(packet)
+        self._start_packet(source_pos, target_pos, packet_type, duration_ms)
+    
+    def _start_packet(self, source_pos: QPointF, target_pos: QPointF, packet_type: str, duration_ms: int):
+        packets = self._layer.packets
+        if len(packets) >= self._max_packets:
+            del packets[:len(packets) - self._max_packets + 1]  # Drop the oldest
         
+        # Adjust duration for speed
         adjusted_duration = int(duration_ms / self._animation_speed)
-        packet.animate(adjusted_duration, self._on_packet_complete)
-    
-    def _on_packet_complete(self, packet: PacketAnimationItem):
-        """Handle packet animation completion."""
-        if packet in self._active_packets:
-            self._active_packets.remove(packet)
-        self._scene.removeItem(packet)
-    
-    def _remove_oldest(self):
-        """Remove oldest packet to make room."""
-        if self._active_packets:
-            packet = self._active_packets.pop(0)
-            packet.stop_animation()
-            self._scene.removeItem(packet)
+        packets.append(_Packet(source_pos, target_pos, self._clock.elapsed(), adjusted_duration, packet_type))
+        self._bounds_dirty = True
+        
+        if self._layer.scene() is not self._scene:
+            self._scene.addItem(self._layer)
+        if not self._timer.isActive():
+            self._timer.start()
+            self._tick()
+    
+    def _tick(self):
+        """Advance all packets to the current clock time and repaint once."""
+        layer = self._layer
+        now = self._clock.elapsed()
+        count = len(layer.packets)
+        layer.packets = [p for p in layer.packets if now - p.start < p.duration]
+        if len(layer.packets) != count or self._bounds_dirty:
+            self._bounds_dirty = False
+            layer.update_bounds()
+        layer.now = now
+        layer.update()
+        if not layer.packets:
+            self._timer.stop()
     
     def clear_all(self):
         """Remove all active packets."""
-        for packet in self._active_packets[:]:
-            packet.stop_animation()
-            self._scene.removeItem(packet)
-        self._active_packets.clear()
+        self._timer.stop()
+        self._layer.packets = []
+        self._layer.update_bounds()
+        self._layer.update()
 
 
 class TopologyScene(QGraphicsScene):
@@ -1925,6 +2242,16 @@ class TopologyScene(QGraphicsScene):
     mediumTypeChanged = pyqtSignal(str, object)  # node_id, new_medium_type
     nodeDoubleClicked = pyqtSignal(str)  # node_id - for opening script editor
     shapeEdited = pyqtSignal(str)        # shape_id - emitted when shape editor saves
+    topologyReplaced = pyqtSignal()      # All items rebuilt from the model
+    loadProgress = pyqtSignal(int, int)  # items created, total (reload_from_model)
+    
+    # Default zoom scales below which detail is dropped
+    LOD_REDUCED_SCALE = 0.6   # Hide labels, ports and IP text
+    LOD_MINIMAL_SCALE = 0.3   # Batch-draw nodes as dots and links as lines
+    LOD_BATCH_SIZE = 500      # Off-screen items updated per event loop pass
+    LOAD_PASS_MS = 50         # Item creation time per event loop pass when loading
+    LOAD_CHUNKED_MIN = 2000   # Smaller topologies are loaded in one pass
+    HEATMAP_INTERVAL_MS = 100 # Minimum time between heatmap frames
     
     def __init__(self, network_model: NetworkModel, parent=None):
         super().__init__(parent)
@@ -1933,6 +2260,46 @@ class TopologyScene(QGraphicsScene):
         # Graphics items tracking
         self._node_items: dict[str, NodeGraphicsItem] = {}
         self._link_items: dict[str, LinkGraphicsItem] = {}
+        self._route_links: set[str] = set()  # Links with route highlighting
+        
+        # Level of detail
+        self.lod_reduced_scale = self.LOD_REDUCED_SCALE
+        self.lod_minimal_scale = self.LOD_MINIMAL_SCALE
+        self._detail_level = DetailLevel.FULL
+        self._detail_pending: List[QGraphicsItem] = []
+        self._detail_timer = QTimer(self)
+        self._detail_timer.setInterval(0)
+        self._detail_timer.timeout.connect(self._apply_pending_detail)
+        self._overview = OverviewLayerItem()
+        self._overview_timer = QTimer(self)
+        self._overview_timer.setSingleShot(True)
+        self._overview_timer.setInterval(0)
+        self._overview_timer.timeout.connect(self._rebuild_overview)
+        self.selectionChanged.connect(self.invalidate_overview)
+        
+        # Chunked item creation (see reload_from_model)
+        self._load_queue: Optional[Iterator[None]] = None
+        self._load_done = 0
+        self._load_total = 0
+        self._load_index_method = self.itemIndexMethod()
+        self._load_timer = QTimer(self)
+        self._load_timer.setInterval(0)
+        self._load_timer.timeout.connect(self._load_next_batch)
+        
+        # Links of moved nodes, rebuilt once per frame (see flush_link_updates)
+        self._moved_nodes: dict[str, None] = {}
+        self._link_flush_timer = QTimer(self)
+        self._link_flush_timer.setSingleShot(True)
+        self._link_flush_timer.setInterval(0)
+        self._link_flush_timer.timeout.connect(self.flush_link_updates)
+        
+        # Link heatmap: values pulled from a provider at most once per interval
+        self._heatmap = HeatmapLayerItem()
+        self._heatmap_provider: Optional[Callable[[], Dict[str, float]]] = None
+        self._heatmap_timer = QTimer(self)
+        self._heatmap_timer.setSingleShot(True)
+        self._heatmap_timer.setInterval(self.HEATMAP_INTERVAL_MS)
+        self._heatmap_timer.timeout.connect(self._update_heatmap)
         
         # Link creation state
         self._temp_link: Optional[TempLinkItem] = None
@@ -1951,6 +2318,264 @@ class TopologyScene(QGraphicsScene):
         """Get the packet animation manager."""
         return self._animation_manager
     
+    @property
+    def network_model(self) -> NetworkModel:
+        """The model shown by this scene."""
+        return self._network_model
+    
+    @network_model.setter
+    def network_model(self, model: NetworkModel):
+        old = getattr(self, "_network_model", None)
+        if old is model:
+            return
+        if old is not None:
+            old.remove_topology_listener(self._on_topology_replaced)
+            self._paths.detach()
+        self._network_model = model
+        model.add_topology_listener(self._on_topology_replaced)
+        # Routing views: shortest-path trees, memoized per destination
+        self._paths = ShortestPathTrees(model)
+    
+    def _on_topology_replaced(self, network_model: NetworkModel):
+        self.reload_from_model()
+    
+    # ----- level of detail -----
+    
+    @property
+    def detail_level(self) -> DetailLevel:
+        return self._detail_level
+    
+    def detail_level_for_scale(self, scale: float) -> DetailLevel:
+        if scale < self.lod_minimal_scale:
+            return DetailLevel.MINIMAL
+        if scale < self.lod_reduced_scale:
+            return DetailLevel.REDUCED
+        return DetailLevel.FULL
+    
+    def set_view_scale(self, scale: float, visible_rect: Optional[QRectF] = None):
+        """Pick the detail level for a view's zoom (call after zooming)."""
+        self.set_detail_level(self.detail_level_for_scale(scale), visible_rect)
+    
+    def set_detail_level(self, level: DetailLevel, visible_rect: Optional[QRectF] = None):
+        """
+        Switch every node and link to a detail level.
+        
+        Items inside visible_rect switch immediately; the rest are switched
+        in batches from the event loop, so zooming in on a large topology
+        only pays for what is on screen before the next frame.
+        """
+        if level == self._detail_level:
+            return
+        self._detail_level = level
+        
+        items = list(self._node_items.values()) + list(self._link_items.values())
+        if visible_rect is not None:
+            on_screen = set(self.items(visible_rect))
+            now = [item for item in items if item in on_screen]
+            self._detail_pending = [item for item in items if item not in on_screen]
+        else:
+            now = items
+            self._detail_pending = []
+        for item in now:
+            item.set_detail_level(level)
+        if self._detail_pending:
+            self._detail_timer.start()
+        else:
+            self._detail_timer.stop()
+        
+        if level == DetailLevel.MINIMAL:
+            if self._overview.scene() is not self:
+                self.addItem(self._overview)
+            self._rebuild_overview()
+            self._overview.setVisible(True)
+        else:
+            self._overview.setVisible(False)
+        self.refresh_heatmap()
+    
+    def _apply_pending_detail(self):
+        batch = self._detail_pending[:self.LOD_BATCH_SIZE]
+        del self._detail_pending[:self.LOD_BATCH_SIZE]
+        for item in batch:
+            if item.scene() is self:
+                item.set_detail_level(self._detail_level)
+        if not self._detail_pending:
+            self._detail_timer.stop()
+    
+    def _apply_detail(self, item):
+        """Bring a new item to the current detail level."""
+        if self._detail_level != DetailLevel.FULL:
+            item.set_detail_level(self._detail_level)
+        self.invalidate_overview()
+    
+    def invalidate_overview(self):
+        """Redraw the overview after nodes, links or their colors changed."""
+        if self._detail_level == DetailLevel.MINIMAL:
+            self._overview_timer.start()
+    
+    def _rebuild_overview(self):
+        self._overview.rebuild(self._node_items.values(), self._link_items.values())
+    
+    # ----- link heatmap -----
+    
+    @property
+    def heatmap_enabled(self) -> bool:
+        return self._heatmap_provider is not None
+    
+    def set_heatmap(self, provider: Optional[Callable[[], Dict[str, float]]]):
+        """
+        Show a load heatmap over the links, or hide it (provider None).
+        
+        provider() returns the load of each busy link as link ID -> 0..1.
+        It is called when refresh_heatmap() was requested, at most once
+        per HEATMAP_INTERVAL_MS, and the whole overlay is redrawn at once.
+        """
+        self._heatmap_provider = provider
+        if provider is None:
+            self._heatmap_timer.stop()
+            self._heatmap.clear()
+            self._heatmap.setVisible(False)
+            return
+        if self._heatmap.scene() is not self:
+            self.addItem(self._heatmap)
+        self._heatmap.setVisible(True)
+        self._update_heatmap()
+    
+    def refresh_heatmap(self):
+        """Request a heatmap frame (throttled; cheap to call often)."""
+        if self._heatmap_provider is not None and not self._heatmap_timer.isActive():
+            self._heatmap_timer.start()
+    
+    def _update_heatmap(self):
+        if self._heatmap_provider is None:
+            return
+        self._heatmap.rebuild(
+            self._link_items, self._heatmap_provider(),
+            straight=self._detail_level == DetailLevel.MINIMAL
+        )
+    
+    def reload_from_model(self, chunked: Optional[bool] = None):
+        """
+        Recreate all node and link items from the network model.
+        
+        Used after bulk changes; emits topologyReplaced once instead of
+        per-item added/removed signals. Item indexing and view updates
+        are suspended while items are created.
+        
+        Args:
+            chunked: Create items for LOAD_PASS_MS per event loop pass,
+                reporting loadProgress, so the window stays responsive;
+                topologyReplaced follows the last pass. By default only
+                topologies of more than LOAD_CHUNKED_MIN items are chunked.
+        """
+        self._cancel_load()
+        if self._link_source_port:
+            self.cancel_link_creation()
+        self._selected_port = None
+        
+        for link_item in self._link_items.values():
+            try:
+                link_item._remove_handle_items()
+            except (RuntimeError, AttributeError):
+                pass
+            self.removeItem(link_item)
+        for node_item in self._node_items.values():
+            self.removeItem(node_item)
+        self._link_items.clear()
+        self._node_items.clear()
+        self._route_links.clear()
+        self._heatmap.clear()
+        
+        nodes = list(self.network_model.nodes.values())
+        links = list(self.network_model.links.values())
+        self._load_total = len(nodes) + len(links)
+        self._load_done = 0
+        self._load_queue = self._create_items(nodes, links)
+        self._suspend_updates(True)
+        
+        # Resolve each node type's shape once rather than on first paint
+        shape_manager = get_shape_manager()
+        size = NodeGraphicsItem.NODE_RADIUS * 2
+        for shape_id in {NodeGraphicsItem.shape_id_for(node) for node in nodes}:
+            shape_manager.get_unified_path(shape_id, size, size)
+        
+        if chunked is None:
+            chunked = self._load_total > self.LOAD_CHUNKED_MIN
+        if chunked:
+            self.loadProgress.emit(0, self._load_total)
+            self._load_timer.start()
+        else:
+            self._load_next_batch(budget_ms=None)
+    
+    @property
+    def is_loading(self) -> bool:
+        """Whether a chunked reload_from_model() is still creating items."""
+        return self._load_queue is not None
+    
+    def _create_items(self, nodes: List[NodeModel], links: List[LinkModel]) -> Iterator[None]:
+        """Create node items, then link items, yielding after each."""
+        for node in nodes:
+            item = NodeGraphicsItem(node)
+            self.addItem(item)
+            self._node_items[node.id] = item
+            yield
+        
+        # Ports already show their connection state from the model
+        for link in links:
+            source_item = self._node_items.get(link.source_node_id)
+            target_item = self._node_items.get(link.target_node_id)
+            if source_item and target_item:
+                link_item = LinkGraphicsItem(link, source_item, target_item)
+                self.addItem(link_item)
+                link_item.setZValue(-1)
+                self._link_items[link.id] = link_item
+            yield
+    
+    def _load_next_batch(self, budget_ms: Optional[int] = LOAD_PASS_MS):
+        """Create items for budget_ms (None: all) and finish after the last."""
+        if self._load_queue is None:
+            return
+        clock = QElapsedTimer()
+        clock.start()
+        for _ in self._load_queue:
+            self._load_done += 1
+            if budget_ms is not None and clock.elapsed() >= budget_ms:
+                break
+        if self._load_done < self._load_total:
+            self.loadProgress.emit(self._load_done, self._load_total)
+            return
+        
+        self._load_queue = None
+        self._load_timer.stop()
+        self._suspend_updates(False)
+        
+        if self._detail_level != DetailLevel.FULL:
+            self._detail_pending = []
+            for item in list(self._node_items.values()) + list(self._link_items.values()):
+                item.set_detail_level(self._detail_level)
+            self.invalidate_overview()
+        self.refresh_heatmap()
+        
+        self.loadProgress.emit(self._load_total, self._load_total)
+        self.topologyReplaced.emit()
+    
+    def _cancel_load(self):
+        """Stop a chunked reload (items created so far stay in the scene)."""
+        if self._load_queue is not None:
+            self._load_queue = None
+            self._load_timer.stop()
+            self._suspend_updates(False)
+    
+    def _suspend_updates(self, suspend: bool):
+        """Turn off item indexing, view painting and interaction for a reload."""
+        if suspend:
+            self._load_index_method = self.itemIndexMethod()
+            self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+        else:
+            self.setItemIndexMethod(self._load_index_method)
+        for view in self.views():
+            view.setInteractive(not suspend)
+            view.setUpdatesEnabled(not suspend)
+    
     def _draw_grid(self):
         """Draw background grid."""
         grid_size = 50
@@ -1964,6 +2589,7 @@ class TopologyScene(QGraphicsScene):
         item = NodeGraphicsItem(node_model)
         self.addItem(item)
         self._node_items[node_model.id] = item
+        self._apply_detail(item)
         self.nodeAdded.emit(node_model)
         return item
     
@@ -1979,6 +2605,7 @@ class TopologyScene(QGraphicsScene):
                 self.cancel_link_creation()
             
             self.removeItem(item)
+            self.invalidate_overview()
             self.nodeRemoved.emit(node_id)
     
     def add_link(self, link_model: LinkModel) -> Optional[LinkGraphicsItem]:
@@ -1994,6 +2621,7 @@ class TopologyScene(QGraphicsScene):
             self.addItem(item)
             item.setZValue(-1)  # Behind nodes
             self._link_items[link_model.id] = item
+            self._apply_detail(item)
             
             # Update port appearances
             source_item.update_ports()
@@ -2028,6 +2656,8 @@ class TopologyScene(QGraphicsScene):
                 pass  # Items were deleted
             
             self.removeItem(link_item)
+            self.invalidate_overview()
+            self.refresh_heatmap()
             self.linkRemoved.emit(link_id)
     
     def get_node_item(self, node_id: str) -> Optional[NodeGraphicsItem]:
@@ -2048,24 +2678,18 @@ class TopologyScene(QGraphicsScene):
             duration_ms: Duration of flash in milliseconds
         """
         # Find nodes by name
-        source_node_id = None
-        target_node_id = None
+        source_node = self.network_model.find_node_by_name(source_name)
+        target_node = self.network_model.find_node_by_name(target_name)
         
-        for node_id, node in self.network_model.nodes.items():
-            if node.name == source_name:
-                source_node_id = node_id
-            elif node.name == target_name:
-                target_node_id = node_id
-        
-        if not source_node_id or not target_node_id:
+        if not source_node or not target_node:
             return
         
         # Find and flash link(s) between these nodes
-        for link_id, link_item in self._link_items.items():
-            link = link_item.link_model
-            if ((link.source_node_id == source_node_id and link.target_node_id == target_node_id) or
-                (link.source_node_id == target_node_id and link.target_node_id == source_node_id)):
-                link_item.flash_activity(duration_ms)
+        for link in self.network_model.get_links_for_node(source_node.id):
+            if target_node.id in (link.source_node_id, link.target_node_id):
+                link_item = self._link_items.get(link.id)
+                if link_item:
+                    link_item.flash_activity(duration_ms)
     
     def flash_links_for_node(self, node_name: str, duration_ms: int = 300):
         """
@@ -2076,49 +2700,16 @@ class TopologyScene(QGraphicsScene):
             duration_ms: Duration of flash in milliseconds
         """
         # Find node by name
-        node_id = None
-        for nid, node in self.network_model.nodes.items():
-            if node.name == node_name:
-                node_id = nid
-                break
-        
-        if not node_id:
+        node = self.network_model.find_node_by_name(node_name)
+        if not node:
             return
         
         # Flash all links connected to this node
-        for link_id, link_item in self._link_items.items():
-            link = link_item.link_model
-            if link.source_node_id == node_id or link.target_node_id == node_id:
+        for link in self.network_model.get_links_for_node(node.id):
+            link_item = self._link_items.get(link.id)
+            if link_item:
                 link_item.flash_activity(duration_ms)
     
-    def _get_links_for_path(self, path: list) -> list:
-        """
-        Get all link items along a path of nodes.
-        
-        Args:
-            path: List of node IDs forming the path
-            
-        Returns:
-            List of LinkGraphicsItem objects along the path
-        """
-        if len(path) < 2:
-            return []
-        
-        links = []
-        for i in range(len(path) - 1):
-            node_a = path[i]
-            node_b = path[i + 1]
-            
-            # Find link between these two nodes
-            for link_id, link_item in self._link_items.items():
-                link = link_item.link_model
-                if ((link.source_node_id == node_a and link.target_node_id == node_b) or
-                    (link.source_node_id == node_b and link.target_node_id == node_a)):
-                    links.append(link_item)
-                    break
-        
-        return links
-    
     def flash_path(self, source_name: str, target_name: str, duration_ms: int = 1500):
         """
         Flash all links along the path from source to target node.
@@ -2133,71 +2724,19 @@ class TopologyScene(QGraphicsScene):
         """
         logger.debug(f"flash_path called: source='{source_name}', target='{target_name}'")
         
-        # Find node IDs by name
-        source_id = None
-        target_id = None
+        # Find nodes by name
+        source_node = self.network_model.find_node_by_name(source_name)
+        target_node = self.network_model.find_node_by_name(target_name)
         
-        for node_id, node in self.network_model.nodes.items():
-            if node.name == source_name:
-                source_id = node_id
-                logger.debug(f"Found source node: {source_id}")
-            if node.name == target_name:
-                target_id = node_id
-                logger.debug(f"Found target node: {target_id}")
-        
-        if not source_id or not target_id:
+        if not source_node or not target_node:
             logger.debug(f"Missing source or target, falling back to flash_links_for_node")
             self.flash_links_for_node(source_name, duration_ms)
             return
         
-        # Find path between nodes using BFS
-        if source_id == target_id:
-            path = [source_id]
-            logger.debug(f"Source equals target, path: {path}")
-        else:
-            # Build adjacency list from links
-            adjacency = {}
-            for nid in self.network_model.nodes:
-                adjacency[nid] = []
-            
-            for link in self.network_model.links.values():
-                if link.source_node_id in adjacency:
-                    adjacency[link.source_node_id].append(link.target_node_id)
-                if link.target_node_id in adjacency:
-                    adjacency[link.target_node_id].append(link.source_node_id)
-            
-            logger.debug(f"Adjacency list: {adjacency}")
-            
-            # BFS to find shortest path
-            from collections import deque
-            queue = deque([(source_id, [source_id])])
-            visited = {source_id}
-            path = []
-            
-            while queue:
-                current, current_path = queue.popleft()
-                logger.debug(f"BFS visiting: {current}, path: {current_path}")
-                
-                for neighbor in adjacency.get(current, []):
-                    if neighbor == target_id:
-                        path = current_path + [neighbor]
-                        logger.debug(f"Found path: {path}")
-                        break
-                    if neighbor not in visited:
-                        visited.add(neighbor)
-                        queue.append((neighbor, current_path + [neighbor]))
-                
-                if path:
-                    break
-        
-        if not path:
-            logger.debug(f"No path found, falling back to flash_links_for_node")
-            self.flash_links_for_node(source_name, duration_ms)
-            return
-        
-        # Get all links along the path and flash them
-        links = self._get_links_for_path(path)
-        logger.debug(f"Got {len(links)} links to flash for path {path}")
+        # Shortest path from the cached tree toward the target
+        link_ids = self._paths.path_links(source_node.id, target_node.id)
+        links = [self._link_items[link_id] for link_id in link_ids if link_id in self._link_items]
+        logger.debug(f"Got {len(links)} links to flash for path {link_ids}")
         
         if links:
             for link_item in links:
@@ -2271,11 +2810,45 @@ class TopologyScene(QGraphicsScene):
                     port_item.clear_assigned_ip()
     
     def update_links_for_node(self, node_id: str):
-        """Update all links connected to a node."""
-        for link_item in self._link_items.values():
-            if (link_item.link_model.source_node_id == node_id or 
-                link_item.link_model.target_node_id == node_id):
+        """Update all links connected to a node now."""
+        self.mark_node_moved(node_id)
+        self.flush_link_updates()
+    
+    def mark_node_moved(self, node_id: str):
+        """Queue a node's links for the next flush_link_updates()."""
+        self._moved_nodes[node_id] = None
+        if not self._link_flush_timer.isActive():
+            self._link_flush_timer.start()
+    
+    def flush_link_updates(self):
+        """
+        Rebuild the links of all nodes moved since the last flush.
+        
+        Dragging a selection moves every selected node per mouse event;
+        links between two moved nodes are still rebuilt only once. Runs
+        after each scene mouse move, and from a zero-delay timer for
+        moves made outside a drag.
+        """
+        if not self._moved_nodes:
+            return
+        self._link_flush_timer.stop()
+        moved, self._moved_nodes = self._moved_nodes, {}
+        
+        link_ids: dict[str, None] = {}
+        for node_id in moved:
+            for link in self.network_model.get_links_for_node(node_id):
+                link_ids[link.id] = None
+        for link_id in link_ids:
+            link_item = self._link_items.get(link_id)
+            if link_item:
                 link_item.update_position()
+        self.invalidate_overview()
+        self.refresh_heatmap()
+    
+    def mouseMoveEvent(self, event):
+        """Move items, then update the links of moved nodes once."""
+        super().mouseMoveEvent(event)
+        self.flush_link_updates()
     
     def refresh_nodes_of_type(self, shape_id: str):
         """
@@ -2330,7 +2903,9 @@ class TopologyScene(QGraphicsScene):
                 node_item.update()
                 
                 # Update connected links to reflect new port positions
-                self.update_links_for_node(node_item.node_model.id)
+                self.mark_node_moved(node_item.node_model.id)
+        
+        self.flush_link_updates()
     
     def on_port_clicked(self, port_item):
         """Handle port selection."""
@@ -2484,6 +3059,7 @@ class TopologyScene(QGraphicsScene):
     
     def clear_topology(self):
         """Clear all nodes and links."""
+        self._cancel_load()
         for link_id in list(self._link_items.keys()):
             self.remove_link(link_id)
         for node_id in list(self._node_items.keys()):
@@ -2512,9 +3088,7 @@ class TopologyScene(QGraphicsScene):
             
             # Find links that would carry traffic for this route
             path_links = self._find_path_for_route(node_id, route)
-            for link_id in path_links:
-                if link_id in self._link_items:
-                    self._link_items[link_id].set_route_highlight(True, route.is_default_route)
+            self._highlight_route_links(path_links, route.is_default_route)
     
     def show_routes_to_node(self, target_node_id: str):
         """Highlight routes from all nodes that can reach this node."""
@@ -2524,16 +3098,8 @@ class TopologyScene(QGraphicsScene):
         if not target_node:
             return
         
-        # Find all hosts that have routes to this node's networks
-        for node_id, node in self.network_model.nodes.items():
-            if node_id == target_node_id:
-                continue
-            
-            # Check if this node can reach the target
-            path_links = self._find_path_between_nodes(node_id, target_node_id)
-            for link_id in path_links:
-                if link_id in self._link_items:
-                    self._link_items[link_id].set_route_highlight(True, False)
+        # Every node's shortest path to the target follows the target's tree
+        self._highlight_route_links(self._paths.tree_links(target_node_id))
     
     def show_all_routes(self):
         """Show all configured routes in the network."""
@@ -2554,14 +3120,23 @@ class TopologyScene(QGraphicsScene):
                     continue
                 
                 path_links = self._find_path_for_route(node_id, route)
-                for link_id in path_links:
-                    if link_id in self._link_items:
-                        self._link_items[link_id].set_route_highlight(True, route.is_default_route)
+                self._highlight_route_links(path_links, route.is_default_route)
+    
+    def _highlight_route_links(self, link_ids: Iterable[str], is_default: bool = False):
+        """Highlight links as part of a route (undone by clear_route_highlights)."""
+        for link_id in link_ids:
+            link_item = self._link_items.get(link_id)
+            if link_item:
+                link_item.set_route_highlight(True, is_default)
+                self._route_links.add(link_id)
     
     def clear_route_highlights(self):
         """Clear all route highlighting."""
-        for link_item in self._link_items.values():
-            link_item.set_route_highlight(False, False)
+        for link_id in self._route_links:
+            link_item = self._link_items.get(link_id)
+            if link_item:
+                link_item.set_route_highlight(False, False)
+        self._route_links.clear()
     
     def _find_path_for_route(self, source_node_id: str, route) -> list:
         """Find link IDs that would be used for a route."""
@@ -2571,29 +3146,19 @@ class TopologyScene(QGraphicsScene):
         if route.is_direct:
             # Find link connected to this interface
             interface_idx = route.interface
-            current_iface = 0
-            
-            for link_id, link in self.network_model.links.items():
-                if link.source_node_id == source_node_id:
-                    if current_iface == interface_idx:
-                        path_links.append(link_id)
-                        break
-                    current_iface += 1
-                elif link.target_node_id == source_node_id:
-                    if current_iface == interface_idx:
-                        path_links.append(link_id)
-                        break
-                    current_iface += 1
+            node_links = self.network_model.get_links_for_node(source_node_id)
+            if 0 <= interface_idx < len(node_links):
+                path_links.append(node_links[interface_idx].id)
         else:
             # For gateway routes, find link to gateway
             gateway = route.gateway
             
             # Find the link that connects to the gateway
-            for link_id, link in self.network_model.links.items():
+            for link in self.network_model.get_links_for_node(source_node_id):
+                link_id = link.id
                 # Check link endpoints to see if gateway is reachable
-                link_idx = list(self.network_model.links.keys()).index(link_id)
-                source_ip = f"10.1.{link_idx + 1}.1"
-                target_ip = f"10.1.{link_idx + 1}.2"
+                source_ip = self._link_endpoint_ip(link, is_source=True)
+                target_ip = self._link_endpoint_ip(link, is_source=False)
                 
                 if link.source_node_id == source_node_id and target_ip == gateway:
                     path_links.append(link_id)
@@ -2604,38 +3169,18 @@ class TopologyScene(QGraphicsScene):
         
         return path_links
     
+    def _link_endpoint_ip(self, link, is_source: bool) -> Optional[str]:
+        """Get the IP of one end of a link (port config, then IPAM)."""
+        node = self.network_model.nodes.get(link.source_node_id if is_source else link.target_node_id)
+        port = node.get_port(link.source_port_id if is_source else link.target_port_id) if node else None
+        if port and port.ip_address:
+            return port.ip_address
+        subnet = self.network_model.ipam.get(link.id)
+        return subnet.host(1 if is_source else 2) if subnet else None
+    
     def _find_path_between_nodes(self, source_id: str, target_id: str) -> list:
-        """Find links on the path between two nodes (simple BFS)."""
-        from collections import deque
-        
-        if source_id == target_id:
-            return []
-        
-        # Build adjacency list
-        adjacency = {}
-        for node_id in self.network_model.nodes:
-            adjacency[node_id] = []
-        
-        for link_id, link in self.network_model.links.items():
-            adjacency[link.source_node_id].append((link.target_node_id, link_id))
-            adjacency[link.target_node_id].append((link.source_node_id, link_id))
-        
-        # BFS to find path
-        visited = {source_id}
-        queue = deque([(source_id, [])])
-        
-        while queue:
-            current, path = queue.popleft()
-            
-            for neighbor, link_id in adjacency.get(current, []):
-                if neighbor == target_id:
-                    return path + [link_id]
-                
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append((neighbor, path + [link_id]))
-        
-        return []
+        """Find links on the shortest path between two nodes (cached per target)."""
+        return self._paths.path_links(source_id, target_id)
 
 
 class RouteOverlayItem(QGraphicsPathItem):
@@ -2665,13 +3210,18 @@ class TopologyCanvas(QGraphicsView):
     """
     Main canvas widget for viewing and editing the network topology.
     
-    Provides zooming, panning, and interaction handling.
+    Provides zooming, panning, and interaction handling. Zooming sets
+    the scene's level of detail; with show_fps set, the frame rate and
+    paint time are drawn in the corner of the view.
     """
     
     # Signals
     itemSelected = pyqtSignal(object)  # NodeModel, LinkModel, or None
     portSelected = pyqtSignal(object, object)  # NodeModel, PortConfig
     
+    FPS_WINDOW_NS = 1_000_000_000  # Frames counted for the fps readout
+    MIN_GRID_SPACING_PX = 8  # Grid lines closer than this on screen are thinned out
+    
     def __init__(self, network_model: NetworkModel, parent=None):
         super().__init__(parent)
         
@@ -2697,6 +3247,12 @@ class TopologyCanvas(QGraphicsView):
         self._is_creating_link = False
         self._link_start_button = None  # Track which button started link creation
         
+        # Frame timing (see paintEvent)
+        self.show_fps = False
+        self._frame_clock = QElapsedTimer()
+        self._frame_clock.start()
+        self._frames: deque = deque()  # (end time ns, paint duration ns)
+        
         # Connect selection changes
         self.topology_scene.selectionChanged.connect(self._on_selection_changed)
     
@@ -2704,25 +3260,82 @@ class TopologyCanvas(QGraphicsView):
         """Draw grid background."""
         super().drawBackground(painter, rect)
         
-        # Draw grid
+        # Draw grid, coarser when zoomed out so lines stay apart on screen
         grid_size = 50
+        while grid_size * self.transform().m11() < self.MIN_GRID_SPACING_PX:
+            grid_size *= 5
         
         left = int(rect.left()) - (int(rect.left()) % grid_size)
         top = int(rect.top()) - (int(rect.top()) % grid_size)
         
         painter.setPen(QPen(COLORS["grid"], 1))
+        lines = []
         
         # Vertical lines
         x = left
         while x < rect.right():
-            painter.drawLine(int(x), int(rect.top()), int(x), int(rect.bottom()))
+            lines.append(QLineF(x, rect.top(), x, rect.bottom()))
             x += grid_size
         
         # Horizontal lines
         y = top
         while y < rect.bottom():
-            painter.drawLine(int(rect.left()), int(y), int(rect.right()), int(y))
+            lines.append(QLineF(rect.left(), y, rect.right(), y))
             y += grid_size
+        
+        painter.drawLines(lines)
+    
+    def paintEvent(self, event):
+        """Paint the view, recording how long the frame took."""
+        start = self._frame_clock.nsecsElapsed()
+        super().paintEvent(event)
+        end = self._frame_clock.nsecsElapsed()
+        frames = self._frames
+        frames.append((end, end - start))
+        while frames and frames[0][0] < end - self.FPS_WINDOW_NS:
+            frames.popleft()
+    
+    @property
+    def fps(self) -> float:
+        """Frames painted during the last second."""
+        frames = self._frames
+        if len(frames) < 2:
+            return 0.0
+        span = frames[-1][0] - frames[0][0]
+        return (len(frames) - 1) * 1e9 / span if span > 0 else 0.0
+    
+    @property
+    def paint_ms(self) -> float:
+        """Average paint time of the frames in the last second."""
+        if not self._frames:
+            return 0.0
+        return sum(duration for _, duration in self._frames) / len(self._frames) / 1e6
+    
+    def drawForeground(self, painter: QPainter, rect: QRectF):
+        super().drawForeground(painter, rect)
+        if not self.show_fps:
+            return
+        text = (
+            f"{self.fps:.0f} fps  {self.paint_ms:.1f} ms/frame  "
+            f"{self.topology_scene.detail_level.name.lower()} detail  "
+            f"zoom {self.transform().m11():.2f}"
+        )
+        painter.save()
+        painter.resetTransform()  # Draw in viewport pixels
+        painter.setFont(QFont("Consolas", 9))
+        box = painter.fontMetrics().boundingRect(text).adjusted(-6, -4, 6, 4)
+        box.moveTopLeft(self.viewport().rect().topLeft() + QPointF(8, 8).toPoint())
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(17, 24, 39, 180))
+        painter.drawRoundedRect(QRectF(box), 4, 4)
+        painter.setPen(QColor("white"))
+        painter.drawText(box, Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+    
+    def update_detail_level(self):
+        """Match the scene's level of detail to the current zoom."""
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        self.topology_scene.set_view_scale(self.transform().m11(), visible)
     
     def add_node_at_center(self, node_type: NodeType) -> NodeGraphicsItem:
         """Add a new node at the center of the visible area."""
@@ -2775,6 +3388,8 @@ class TopologyCanvas(QGraphicsView):
             self._zoom_factor = 0.1
         elif self._zoom_factor > 5:
             self._zoom_factor = 5
+        
+        self.update_detail_level()
     
     def mousePressEvent(self, event: QMouseEvent):
         """Handle mouse press."""
@@ -2945,9 +3560,11 @@ class TopologyCanvas(QGraphicsView):
         """Fit view to show all items."""
         self.fitInView(self.topology_scene.itemsBoundingRect().adjusted(-50, -50, 50, 50),
                        Qt.AspectRatioMode.KeepAspectRatio)
+        self.update_detail_level()
     
     def reset_view(self):
         """Reset to default zoom and position."""
         self.resetTransform()
         self._zoom_factor = 1.0
         self.centerOn(0, 0)
+        self.update_detail_level()
@@ -0,0 +1,282 @@
+"""
+Trace scope selection for the simulation configuration dialog.
+
+Lists every link, node and grid role with a trace format through a
+QAbstractTableModel, so the table only creates widgets for the rows on
+screen and stays usable with tens of thousands of elements. Formats are
+edited through a combo box delegate; filtering and bulk selection work
+on the filtered rows.
+"""
+
+from typing import Iterable, Optional
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QTimer
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox,
+    QPushButton, QTableView, QHeaderView, QStyledItemDelegate
+)
+
+from models import NetworkModel, TraceConfig, TraceFormat
+
+
+class TraceScopeModel(QAbstractTableModel):
+    """
+    One row per link, node and grid role, with its trace selection.
+
+    Labels are built on demand from the network, so the model only keeps
+    the row keys, a checked flag and a format per row.
+    """
+
+    ELEMENT_COLUMN = 0
+    TYPE_COLUMN = 1
+    FORMAT_COLUMN = 2
+    HEADERS = ("Element", "Type", "Format")
+
+    def __init__(self, network: NetworkModel, trace: TraceConfig, parent=None):
+        super().__init__(parent)
+        self._network = network
+
+        # (kind, key) per row; kind is "link", "node" or "role"
+        self._rows: list[tuple[str, str]] = []
+        self._rows.extend(("link", link_id) for link_id in network.links)
+        self._rows.extend(("node", node_id) for node_id in network.nodes)
+        roles = sorted({
+            node.grid_role.name for node in network.nodes.values()
+            if getattr(node, 'grid_role', None) is not None
+        })
+        self._rows.extend(("role", role) for role in roles)
+
+        selected = {"link": trace.link_formats, "node": trace.node_formats, "role": trace.grid_role_formats}
+        default = next(iter(TraceFormat))
+        self._formats = [selected[kind].get(key) or default for kind, key in self._rows]
+        self._checked = bytearray(key in selected[kind] for kind, key in self._rows)
+
+    # ------------------------------------------------------------------
+    # QAbstractTableModel interface
+    # ------------------------------------------------------------------
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+
+        if column == self.ELEMENT_COLUMN:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._label(row)
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if self._checked[row] else Qt.CheckState.Unchecked
+        elif column == self.TYPE_COLUMN:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._type(row)
+        elif column == self.FORMAT_COLUMN:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._formats[row].name
+            if role == Qt.ItemDataRole.EditRole:
+                return self._formats[row]
+        return None
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid():
+            return False
+        row = index.row()
+        if index.column() == self.ELEMENT_COLUMN and role == Qt.ItemDataRole.CheckStateRole:
+            self._checked[row] = Qt.CheckState(value) == Qt.CheckState.Checked
+            self.dataChanged.emit(index, index, [role])
+            return True
+        if index.column() == self.FORMAT_COLUMN and role == Qt.ItemDataRole.EditRole:
+            self._formats[row] = value
+            self._checked[row] = True  # Picking a format selects the element
+            self.dataChanged.emit(self.index(row, 0), index)
+            return True
+        return False
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        flags = super().flags(index)
+        if index.column() == self.ELEMENT_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        elif index.column() == self.FORMAT_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    # ------------------------------------------------------------------
+    # Bulk selection
+    # ------------------------------------------------------------------
+
+    def set_rows(self, rows: Iterable[int], checked: bool, trace_format: Optional[TraceFormat] = None):
+        """Check or uncheck many rows at once (and optionally set their format)."""
+        rows = list(rows)
+        if not rows:
+            return
+        for row in rows:
+            self._checked[row] = checked
+            if trace_format is not None:
+                self._formats[row] = trace_format
+        self.dataChanged.emit(self.index(min(rows), 0), self.index(max(rows), self.FORMAT_COLUMN))
+
+    def clear(self):
+        """Uncheck every row."""
+        self.set_rows(range(len(self._rows)), False)
+
+    @property
+    def checked_count(self) -> int:
+        """Number of selected elements."""
+        return sum(self._checked)
+
+    def apply_to(self, trace: TraceConfig):
+        """Replace the trace selections with the checked rows."""
+        trace.clear()
+        targets = {"link": trace.link_formats, "node": trace.node_formats, "role": trace.grid_role_formats}
+        for row, (kind, key) in enumerate(self._rows):
+            if self._checked[row]:
+                targets[kind][key] = self._formats[row]
+
+    # ------------------------------------------------------------------
+    # Row text
+    # ------------------------------------------------------------------
+
+    def _label(self, row: int) -> str:
+        kind, key = self._rows[row]
+        if kind == "link":
+            link = self._network.links.get(key)
+            source = self._network.nodes.get(link.source_node_id) if link else None
+            target = self._network.nodes.get(link.target_node_id) if link else None
+            return f"{source.name if source else '?'} <-> {target.name if target else '?'}"
+        if kind == "node":
+            node = self._network.nodes.get(key)
+            return node.name if node else key
+        return key
+
+    def _type(self, row: int) -> str:
+        kind, key = self._rows[row]
+        if kind == "link":
+            link = self._network.links.get(key)
+            return f"Link ({link.channel_type.name})" if link else "Link"
+        if kind == "node":
+            node = self._network.nodes.get(key)
+            if node is None:
+                return "Node"
+            role = getattr(node, 'grid_role', None)
+            return f"Node ({node.node_type.name}, {role.name})" if role is not None else f"Node ({node.node_type.name})"
+        return "Grid role"
+
+
+class TraceFormatDelegate(QStyledItemDelegate):
+    """Combo box editor for the Format column."""
+
+    def createEditor(self, parent, option, index):
+        combo = QComboBox(parent)
+        for trace_format in TraceFormat:
+            combo.addItem(trace_format.name, trace_format)
+        return combo
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentIndex(max(0, editor.findData(index.data(Qt.ItemDataRole.EditRole))))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentData(), Qt.ItemDataRole.EditRole)
+
+
+class TraceScopeWidget(QWidget):
+    """
+    Trace selection table with a name/type/role filter and bulk actions.
+
+    The filter accepts wildcards ("core-*", "*ROUTER*", "*SUBSTATION*")
+    and matches the element name and its type column; "Select Shown" and
+    "Clear Shown" act on every row the filter lets through.
+    """
+
+    def __init__(self, network: NetworkModel, trace: TraceConfig, parent=None):
+        super().__init__(parent)
+        self._model = TraceScopeModel(network, trace, self)
+        self._proxy = QSortFilterProxyModel(self)
+        self._proxy.setSourceModel(self._model)
+        self._proxy.setFilterKeyColumn(-1)  # Name and type
+        self._proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self._setup_ui()
+
+    @property
+    def model(self) -> TraceScopeModel:
+        return self._model
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        filter_layout = QHBoxLayout()
+        self._filter_edit = QLineEdit()
+        self._filter_edit.setPlaceholderText("Filter by name, type or grid role (wildcards allowed)")
+        self._filter_timer = QTimer(self)  # Refilter once typing pauses
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(250)
+        self._filter_timer.timeout.connect(self._apply_filter)
+        self._filter_edit.textChanged.connect(self._filter_timer.start)
+        filter_layout.addWidget(self._filter_edit, 1)
+
+        self._bulk_format_combo = QComboBox()
+        for trace_format in TraceFormat:
+            self._bulk_format_combo.addItem(trace_format.name, trace_format)
+        self._bulk_format_combo.setToolTip("Format applied by Select Shown")
+        filter_layout.addWidget(self._bulk_format_combo)
+
+        select_btn = QPushButton("Select Shown")
+        select_btn.setToolTip("Trace every element matching the filter with the chosen format")
+        select_btn.clicked.connect(lambda: self._set_shown(True))
+        filter_layout.addWidget(select_btn)
+
+        clear_shown_btn = QPushButton("Clear Shown")
+        clear_shown_btn.clicked.connect(lambda: self._set_shown(False))
+        filter_layout.addWidget(clear_shown_btn)
+
+        clear_all_btn = QPushButton("Clear All")
+        clear_all_btn.clicked.connect(self._model.clear)
+        filter_layout.addWidget(clear_all_btn)
+        layout.addLayout(filter_layout)
+
+        self._table = QTableView()
+        self._table.setModel(self._proxy)
+        self._table.setItemDelegateForColumn(TraceScopeModel.FORMAT_COLUMN, TraceFormatDelegate(self._table))
+        self._table.setEditTriggers(
+            QTableView.EditTrigger.DoubleClicked | QTableView.EditTrigger.SelectedClicked
+        )
+        self._table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self._table.verticalHeader().setVisible(False)
+        self._table.verticalHeader().setDefaultSectionSize(22)
+        self._table.setMaximumHeight(180)
+        layout.addWidget(self._table)
+
+        self._count_label = QLabel()
+        self._count_label.setStyleSheet("color: #6B7280; font-size: 11px;")
+        layout.addWidget(self._count_label)
+        self._model.dataChanged.connect(self._update_count)
+        self._update_count()
+
+    def _apply_filter(self):
+        self._proxy.setFilterWildcard(self._filter_edit.text().strip())
+        self._update_count()
+
+    def _set_shown(self, checked: bool):
+        if self._filter_timer.isActive():
+            self._filter_timer.stop()
+            self._apply_filter()
+        rows = (
+            self._proxy.mapToSource(self._proxy.index(row, 0)).row()
+            for row in range(self._proxy.rowCount())
+        )
+        self._model.set_rows(rows, checked, self._bulk_format_combo.currentData() if checked else None)
+
+    def _update_count(self, *args):
+        self._count_label.setText(
+            f"{self._model.checked_count} of {self._model.rowCount()} selected, "
+            f"{self._proxy.rowCount()} shown"
+        )